@@ -0,0 +1,15 @@
+"""
+Smart Talent Insight Hub — Insights Aggregation
+Shared constants for the GET /insights aggregates (columnar.py folds scan
+pages, sqlite_store.py builds the same results from GROUP BY rows).
+"""
+
+SENTIMENTS  = ("positive", "negative", "neutral")
+RECENT_SIZE = 50
+
+# Attributes the aggregation actually reads (everything else — message text,
+# email, strengths … — is left on the server by the scan projection).
+PROJECTED_FIELDS = (
+    "feedbackId", "sentiment", "timestamp", "summary", "aiProcessed", "topics",
+    "employeeName", "department", "reviewPeriod", "rating",
+)
@@ -0,0 +1,114 @@
+"""
+Smart Talent Insight Hub — Content-Addressed AI Result Cache
+Skips re-analysing identical feedback text (templated reviews, client retries).
+
+Key = sha256(normalized message, provider, model id, prompt version), so a
+change of BEDROCK_MODEL_ID, AI_PROVIDER or the prompt text lands on fresh
+keys and old entries simply stop being read (the DynamoDB TTL reaps them).
+
+Tiers:
+  1. in-memory LRU (per warm container)
+  2. DynamoDB table (hash key cacheKey, TTL attribute expiresAt), optional
+Tier-2 errors are logged and treated as misses — the cache never fails an analysis.
+"""
+
+import copy
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_message(message: str) -> str:
+    """Case-fold and collapse whitespace so trivially different copies share a key."""
+    return _WS.sub(" ", (message or "").casefold()).strip()
+
+
+def cache_key(message: str, provider: str, model_id: str, prompt_version: str) -> str:
+    h = hashlib.sha256()
+    for part in (provider, model_id, prompt_version, normalize_message(message)):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class AIResultCache:
+    def __init__(self, table: Any = None, max_entries: int = 1024, ttl_days: float = 30.0,
+                 clock=time.time) -> None:
+        self.table       = table
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = int(ttl_days * 86400)
+        self._clock      = clock
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = {"memory_hit": 0, "table_hit": 0, "miss": 0, "table_error": 0}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = sum(self.counters[k] for k in ("memory_hit", "table_hit", "miss"))
+            hits    = self.counters["memory_hit"] + self.counters["table_hit"]
+            return {
+                **self.counters,
+                "entries":  len(self._memory),
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            }
+
+    def _remember(self, key: str, result: Dict[str, Any]) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.counters["memory_hit"] += 1
+                return copy.deepcopy(result)
+
+        if self.table is not None:
+            try:
+                item = self.table.get_item(Key={"cacheKey": key}).get("Item")
+            except Exception as exc:
+                print(f"[AI CACHE] table read failed: {exc}")
+                item = None
+                with self._lock:
+                    self.counters["table_error"] += 1
+            # TTL deletion is lazy (up to ~48h) — honour expiresAt ourselves.
+            if item and int(item.get("expiresAt", 0)) > self._clock():
+                result = item["result"]
+                self._remember(key, result)
+                with self._lock:
+                    self.counters["table_hit"] += 1
+                return copy.deepcopy(result)
+
+        with self._lock:
+            self.counters["miss"] += 1
+        return None
+
+    def put(self, key: str, result: Dict[str, Any], **metadata: str) -> None:
+        result = copy.deepcopy(result)
+        self._remember(key, result)
+        if self.table is None:
+            return
+        now = int(self._clock())
+        try:
+            self.table.put_item(Item={
+                "cacheKey":  key,
+                "result":    result,
+                "createdAt": now,
+                "expiresAt": now + self.ttl_seconds,
+                **metadata,
+            })
+        except Exception as exc:
+            print(f"[AI CACHE] table write failed: {exc}")
+            with self._lock:
+                self.counters["table_error"] += 1
@@ -0,0 +1,133 @@
+"""
+Smart Talent Insight Hub — Lazy AWS Client Registry
+Builds boto3 clients / DynamoDB tables on first use instead of at import,
+so a cold start only pays for the services its invocation path touches
+(POST /feedback needs DynamoDB + EventBridge, never Bedrock or Comprehend).
+
+  • one boto3 Session (one botocore loader / credential chain) shared by all
+  • per-service botocore Config: pool size, TCP keep-alive, connect/read
+    timeouts, adaptive retry mode (attempts capped where the caller retries)
+  • LazyClient proxies keep the module-level names (`table.put_item(...)`)
+    working unchanged, and can still be replaced wholesale in benchmarks
+
+Client construction is serialised with a lock (boto3 sessions are not
+thread-safe); the clients themselves are, so the pooled threads share them.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import boto3
+from botocore.config import Config
+
+# connect / read timeouts in seconds; Bedrock answers can take a while to generate.
+SERVICE_TIMEOUTS: Dict[str, tuple] = {
+    "bedrock-runtime": (2, 60),
+    "comprehend":      (2, 10),
+    "dynamodb":        (1, 5),
+    "events":          (1, 3),
+    "s3":              (2, 10),
+}
+DEFAULT_TIMEOUTS = (2, 10)
+
+# SDK attempts per call where the caller retries itself: a failed PutEvents is
+# left to the event outbox (outbox.py) instead of stalling the POST.
+SERVICE_MAX_ATTEMPTS: Dict[str, int] = {
+    "events": 1,
+}
+
+
+def client_config(service: str, max_pool_connections: int = 16, max_attempts: int = 4) -> Config:
+    connect_timeout, read_timeout = SERVICE_TIMEOUTS.get(service, DEFAULT_TIMEOUTS)
+    return Config(
+        max_pool_connections=max_pool_connections,
+        tcp_keepalive=True,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        retries={"mode": "adaptive", "total_max_attempts": SERVICE_MAX_ATTEMPTS.get(service, max_attempts)},
+    )
+
+
+class LazyClient:
+    """Stands in for a client until the first attribute access, then forwards."""
+
+    __slots__ = ("_factory", "_target", "_name")
+
+    def __init__(self, name: str, factory: Callable[[], Any]) -> None:
+        self._name    = name
+        self._factory = factory     # idempotent: the registry builds each client once
+        self._target  = None
+
+    @property
+    def built(self) -> bool:
+        return self._target is not None
+
+    def resolve(self) -> Any:
+        if self._target is None:
+            self._target = self._factory()
+        return self._target
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self) -> str:
+        state = "built" if self.built else "lazy"
+        return f"<LazyClient {self._name} ({state})>"
+
+
+class ClientRegistry:
+    def __init__(self, region: str, max_pool_connections: int = 16, max_attempts: int = 4) -> None:
+        self.region               = region
+        self.max_pool_connections = max_pool_connections
+        self.max_attempts         = max_attempts
+        self._session: Optional[boto3.session.Session] = None
+        self._built: Dict[str, Any] = {}
+        self._proxies: Dict[str, LazyClient] = {}
+        self._lock = threading.RLock()
+
+    def _get_session(self) -> boto3.session.Session:
+        if self._session is None:
+            self._session = boto3.session.Session(region_name=self.region)
+        return self._session
+
+    def _build(self, key: str, factory: Callable[[boto3.session.Session], Any]) -> Any:
+        with self._lock:
+            if key not in self._built:
+                self._built[key] = factory(self._get_session())
+            return self._built[key]
+
+    def _config(self, service: str) -> Config:
+        return client_config(service, self.max_pool_connections, self.max_attempts)
+
+    def client(self, service: str) -> LazyClient:
+        key = f"client:{service}"
+        if key not in self._proxies:
+            self._proxies[key] = LazyClient(service, lambda: self._build(
+                key, lambda session: session.client(service, config=self._config(service))))
+        return self._proxies[key]
+
+    def resource(self, service: str) -> LazyClient:
+        key = f"resource:{service}"
+        if key not in self._proxies:
+            self._proxies[key] = LazyClient(service, lambda: self._build(
+                key, lambda session: session.resource(service, config=self._config(service))))
+        return self._proxies[key]
+
+    def table(self, name: str) -> LazyClient:
+        key = f"table:{name}"
+        if key not in self._proxies:
+            dynamodb = self.resource("dynamodb")
+            self._proxies[key] = LazyClient(f"dynamodb:{name}", lambda: self._build(
+                key, lambda _session: dynamodb.resolve().Table(name)))
+        return self._proxies[key]
+
+    def prewarm(self, names: Iterable[str]) -> None:
+        """Build the named proxies now ("all" = every one registered), e.g. during init."""
+        names = set(names)
+        for key, proxy in list(self._proxies.items()):
+            if "all" in names or key.split(":", 1)[1] in names or proxy._name in names:
+                proxy.resolve()
+
+    def built(self) -> list:
+        with self._lock:
+            return sorted(self._built)
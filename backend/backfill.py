@@ -0,0 +1,374 @@
+"""
+Smart Talent Insight Hub — Bulk Reprocessing / Backfill
+Re-runs AI analysis for feedback that failed, never got analysed, or was
+analysed with a different provider / model / prompt version.
+
+  • finds work with a filtered parallel scan (Segment/TotalSegments)
+  • analyses with bounded concurrency behind an AIMD rate limiter that backs
+    off on throttling errors and creeps back up on success
+  • scans full (1 MB) pages — Limit counts items read before the filter, so
+    a small Limit means a Scan call per handful of items — and feeds each
+    page's matches to the workers a chunk at a time
+  • checkpoints each segment's position after every page (and at the last
+    finished chunk when the deadline stops it mid-page), so an interrupted
+    run resumes where it stopped; a checkpoint for another mode / filter, or
+    one that is complete, is not resumed
+  • writes results conditionally (never over a result newer than the run)
+
+Runs as a Lambda event ({"action": "backfill", ...}, time-boxed by the
+remaining invocation time — re-invoke with the same runId to continue) or
+as a CLI from backend/:
+
+    python backfill.py --mode pending --segments 4 --concurrency 8 --rate 5
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from botocore.exceptions import ClientError
+
+THROTTLE_CODES = {
+    "ThrottlingException", "TooManyRequestsException", "Throttling",
+    "ProvisionedThroughputExceededException", "RequestLimitExceeded",
+    "ServiceQuotaExceededException",
+}
+MODES = ("pending", "failed", "stale")
+
+
+def is_throttle(exc: Exception) -> bool:
+    if isinstance(exc, ClientError):
+        return exc.response.get("Error", {}).get("Code") in THROTTLE_CODES
+    return False
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# RATE LIMITER
+# ─────────────────────────────────────────────────────────────────────────────
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose refill rate follows AIMD: each success adds roughly
+    `increase` req/s per second of traffic, each throttle multiplies the rate
+    by `decrease`. Thread-safe; acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, min_rate: float = 0.2, max_rate: float = 50.0,
+                 increase: float = 0.5, decrease: float = 0.5) -> None:
+        self.rate     = max(min_rate, min(rate, max_rate))
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.throttles = 0
+        self._tokens  = 1.0
+        self._last    = time.monotonic()
+        self._lock    = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(max(1.0, self.rate), self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait_s = (1.0 - self._tokens) / self.rate
+            time.sleep(wait_s)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase / max(self.rate, 1.0))
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            self.throttles += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._tokens = min(self._tokens, 0.0)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CHECKPOINTS
+# ─────────────────────────────────────────────────────────────────────────────
+
+class FileCheckpointStore:
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def save(self, state: Dict[str, Any]) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(state, fh, default=str)
+        os.replace(tmp, self.path)
+
+
+class S3CheckpointStore:
+    def __init__(self, s3: Any, bucket: str, key: str) -> None:
+        self.s3, self.bucket, self.key = s3, bucket, key
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        try:
+            obj = self.s3.get_object(Bucket=self.bucket, Key=self.key)
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                return None
+            raise
+        return json.loads(obj["Body"].read())
+
+    def save(self, state: Dict[str, Any]) -> None:
+        self.s3.put_object(Bucket=self.bucket, Key=self.key,
+                           Body=json.dumps(state, default=str),
+                           ContentType="application/json")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# FILTERS
+# ─────────────────────────────────────────────────────────────────────────────
+
+def filter_signature(scan_kwargs: Dict[str, Any]) -> str:
+    """What a checkpoint must match to be resumed: the filter minus the moving cutoff."""
+    values = {k: v for k, v in scan_kwargs.get("ExpressionAttributeValues", {}).items() if k != ":cutoff"}
+    return json.dumps([scan_kwargs.get("FilterExpression"), values], sort_keys=True, default=str)
+
+
+def scan_filter(mode: str, current: Sequence[Tuple[str, str]], prompt_version: str,
+                cutoff: str) -> Dict[str, Any]:
+    """
+    FilterExpression + projection for the items a mode should reprocess.
+    `current` lists the (aiProvider, aiModel) pairs that count as up to date
+    (two under AI_PROVIDER=tiered). Unprocessed items younger than `cutoff`
+    are skipped — their EventBridge analysis is most likely still in flight.
+    """
+    names = {
+        "#id": "feedbackId", "#msg": "message", "#ts": "timestamp",
+        "#p": "aiProcessed", "#at": "aiAnalyzedAt",
+    }
+    values: Dict[str, Any] = {}
+    failed = "(#p = :false AND #ts < :cutoff)"
+    current_models = " OR ".join(f"(#prov = :prov{i} AND #model = :model{i})" for i in range(len(current)))
+    stale  = f"(#p = :true AND (attribute_not_exists(#pv) OR #pv <> :pv OR NOT ({current_models})))"
+    clauses: List[str] = []
+    if mode in ("pending", "failed"):
+        values.update({":false": False, ":cutoff": cutoff})
+        clauses.append(failed)
+    if mode in ("pending", "stale"):
+        names.update({"#pv": "aiPromptVersion", "#model": "aiModel", "#prov": "aiProvider"})
+        values.update({":true": True, ":pv": prompt_version})
+        for i, (provider, model_id) in enumerate(current):
+            values.update({f":prov{i}": provider, f":model{i}": model_id})
+        clauses.append(stale)
+    return {
+        "FilterExpression":          " OR ".join(clauses),
+        "ProjectionExpression":      "#id, #msg, #ts, #p, #at",
+        "ExpressionAttributeNames":  names,
+        "ExpressionAttributeValues": values,
+    }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# RUNNER
+# ─────────────────────────────────────────────────────────────────────────────
+
+class BackfillRun:
+    """
+    `analyse(item) -> result` may raise; throttling errors are retried with
+    backoff, anything else goes to `on_failure(item, exc)`.
+    `write(item, result, started_at) -> bool` returns False when a newer
+    result already exists (conditional write lost).
+    """
+
+    def __init__(self, client: Any, table_name: str, mode: str, scan_kwargs: Dict[str, Any],
+                 analyse: Callable[[Dict[str, Any]], Dict[str, Any]],
+                 write: Callable[[Dict[str, Any], Dict[str, Any], str], bool],
+                 on_failure: Callable[[Dict[str, Any], Exception], None],
+                 limiter: AdaptiveRateLimiter, checkpoints: Any,
+                 run_id: str, segments: int = 4, concurrency: int = 4,
+                 page_size: Optional[int] = None, max_attempts: int = 5,
+                 deadline: Optional[Callable[[], bool]] = None) -> None:
+        self.client       = client
+        self.table_name   = table_name
+        self.mode         = mode
+        self.scan_kwargs  = scan_kwargs
+        self.analyse      = analyse
+        self.write        = write
+        self.on_failure   = on_failure
+        self.limiter      = limiter
+        self.checkpoints  = checkpoints
+        self.run_id       = run_id
+        self.segments     = max(1, segments)
+        self.concurrency  = max(1, concurrency)
+        self.page_size    = page_size   # None: DynamoDB's 1 MB page
+        self.max_attempts = max_attempts
+        self.deadline     = deadline or (lambda: False)
+        self._lock  = threading.Lock()
+        self._state = self._initial_state()
+
+    def _initial_state(self) -> Dict[str, Any]:
+        state = self.checkpoints.load()
+        signature = filter_signature(self.scan_kwargs)
+        if state and state.get("runId") == self.run_id:
+            if (state.get("segments"), state.get("mode"), state.get("filter")) == \
+                    (self.segments, self.mode, signature):
+                print(f"[BACKFILL] Resuming run {self.run_id}")
+                return state
+            print(f"[BACKFILL] Checkpoint {self.run_id} was for another segments / mode / filter — restarting")
+        return {
+            "runId":    self.run_id,
+            "mode":     self.mode,
+            "filter":   signature,
+            "complete": False,
+            "segments": self.segments,
+            "cursors":  {str(s): None for s in range(self.segments)},
+            "done":     [],
+            "stats":    {"scanned": 0, "written": 0, "skipped": 0, "failed": 0, "retries": 0},
+            "elapsed":  0.0,
+        }
+
+    def _bump(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._state["stats"][key] += n
+
+    def _checkpoint(self, segment: int, cursor: Optional[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._state["cursors"][str(segment)] = cursor
+            if cursor is None and segment not in self._state["done"]:
+                self._state["done"].append(segment)
+            snapshot = json.loads(json.dumps(self._state, default=str))
+        self.checkpoints.save(snapshot)
+
+    def _process(self, item: Dict[str, Any]) -> None:
+        started_at = _now_iso()
+        for attempt in range(self.max_attempts):
+            self.limiter.acquire()
+            try:
+                result = self.analyse(item)
+            except Exception as exc:
+                if is_throttle(exc) and attempt + 1 < self.max_attempts:
+                    self.limiter.on_throttle()
+                    self._bump("retries")
+                    time.sleep(min(10.0, 0.2 * (2 ** attempt)))
+                    continue
+                self.on_failure(item, exc)
+                self._bump("failed")
+                return
+            self.limiter.on_success()
+            try:
+                written = self.write(item, result, started_at)
+            except Exception as exc:
+                self.on_failure(item, exc)
+                self._bump("failed")
+                return
+            self._bump("written" if written else "skipped")
+            return
+
+    def _segment(self, segment: int, pool: ThreadPoolExecutor) -> None:
+        if segment in self._state["done"]:
+            return
+        kwargs = dict(self.scan_kwargs, TableName=self.table_name)
+        if self.page_size:
+            kwargs["Limit"] = self.page_size
+        if self.segments > 1:
+            kwargs.update(Segment=segment, TotalSegments=self.segments)
+        chunk = self.concurrency * 2   # analyses queued at once
+        cursor = self._state["cursors"].get(str(segment))
+        while not self.deadline():
+            if cursor:
+                kwargs["ExclusiveStartKey"] = cursor
+            response = self.client.scan(**kwargs)
+            items = response.get("Items", [])
+            for i in range(0, len(items), chunk):
+                batch = items[i:i + chunk]
+                self._bump("scanned", len(batch))
+                wait([pool.submit(self._process, item) for item in batch])
+                if i + chunk < len(items) and self.deadline():
+                    # Resume after the last finished item: a scan key is the item's key.
+                    self._checkpoint(segment, {"feedbackId": items[i + chunk - 1]["feedbackId"]})
+                    return
+            cursor = response.get("LastEvaluatedKey")
+            self._checkpoint(segment, cursor)
+            if not cursor:
+                return
+
+    def run(self) -> Dict[str, Any]:
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="backfill") as pool, \
+                ThreadPoolExecutor(max_workers=self.segments, thread_name_prefix="segment") as scanners:
+            for future in [scanners.submit(self._segment, s, pool) for s in range(self.segments)]:
+                future.result()
+        elapsed = time.monotonic() - start
+
+        with self._lock:
+            self._state["elapsed"] = self._state.get("elapsed", 0.0) + elapsed
+            stats = dict(self._state["stats"])
+            complete = len(self._state["done"]) == self.segments
+            self._state["complete"] = complete
+            total_elapsed = self._state["elapsed"]
+        self.checkpoints.save(self._state)
+
+        handled = stats["written"] + stats["skipped"] + stats["failed"]
+        report = {
+            "runId":          self.run_id,
+            "complete":       complete,
+            **stats,
+            "throttles":      self.limiter.throttles,
+            "finalRate":      round(self.limiter.rate, 2),
+            "seconds":        round(elapsed, 2),
+            "itemsPerSecond": round(handled / total_elapsed, 2) if total_elapsed else 0.0,
+        }
+        print(f"[BACKFILL] {json.dumps(report)}")
+        return report
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def new_run_id() -> str:
+    return time.strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:6]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CLI
+# ─────────────────────────────────────────────────────────────────────────────
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-run AI analysis for failed / stale feedback.")
+    parser.add_argument("--mode", choices=MODES, default="pending")
+    parser.add_argument("--segments", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=2.0, help="initial model calls per second")
+    parser.add_argument("--max-rate", type=float, default=20.0)
+    parser.add_argument("--grace-minutes", type=int, default=15)
+    parser.add_argument("--checkpoint", default=".backfill-checkpoint.json")
+    parser.add_argument("--run-id", default="",
+                        help="resume this run (default: resume an unfinished checkpoint of this mode)")
+    args = parser.parse_args()
+
+    import lambda_function as lf   # CLI only: pulls table/model config from the environment
+
+    store = FileCheckpointStore(args.checkpoint)
+    existing = store.load()
+    resumable = existing and not existing.get("complete") and existing.get("mode") == args.mode
+    run_id = args.run_id or (existing["runId"] if resumable else new_run_id())
+    lf.run_backfill(
+        mode=args.mode, run_id=run_id, segments=args.segments,
+        concurrency=args.concurrency, rate=args.rate, max_rate=args.max_rate,
+        grace_minutes=args.grace_minutes, checkpoints=store,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Smart Talent Insight Hub — Micro-batched AI Analysis
+Packing of feedback records into token-bounded batches and parsing of the
+keyed JSON-array answer a batched Bedrock prompt returns.
+"""
+
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, List, Mapping
+
+# Rough Claude tokenizer ratio for English text; only used for packing budgets.
+CHARS_PER_TOKEN = 4
+# Per-item framing the batch prompt adds around every message (id label, fences).
+ITEM_OVERHEAD_TOKENS = 12
+# Keys whose absence means the model did not really answer for an item.
+REQUIRED_KEYS = ("sentiment", "summary")
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def detail_records(detail: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Normalise an event detail into analysis records. Accepts the single-item
+    shape {feedbackId, message, timestamp} or a batch {"items": [...]}.
+    """
+    raw = detail.get("items") if isinstance(detail.get("items"), list) else [detail]
+    return [
+        {
+            "feedbackId": str(r["feedbackId"]),
+            "message":    r.get("message", "") or "",
+            "timestamp":  r.get("timestamp", "") or "",
+        }
+        for r in raw
+        if isinstance(r, dict) and r.get("feedbackId")
+    ]
+
+
+def pack_batches(records: Iterable[Dict[str, Any]], max_items: int,
+                 max_input_tokens: int) -> List[List[Dict[str, Any]]]:
+    """
+    Greedy first-fit packing in arrival order. A batch closes when adding the
+    next message would exceed max_items or the input token budget; a message
+    that alone exceeds the budget gets a batch of its own (analysed singly).
+    """
+    batches: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    used = 0
+    for record in records:
+        cost = estimate_tokens(record.get("message", "")) + ITEM_OVERHEAD_TOKENS
+        if current and (len(current) >= max_items or used + cost > max_input_tokens):
+            batches.append(current)
+            current, used = [], 0
+        current.append(record)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _load_json_array(raw: str) -> Any:
+    cleaned = re.sub(r"```(?:json)?", "", raw).strip()
+    try:
+        return json.loads(cleaned)
+    except json.JSONDecodeError:
+        pass
+    match = re.search(r"\[.*\]", cleaned, re.DOTALL)
+    if match:
+        try:
+            return json.loads(match.group())
+        except json.JSONDecodeError:
+            pass
+    return None
+
+
+def parse_keyed_results(raw: str, labels: Mapping[str, Any],
+                        normalize: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Map a batched answer back to its item labels. Accepts a JSON array of
+    {"id": ..., ...} objects (the requested shape) or an object keyed by id.
+    Unknown ids, duplicates after the first, and entries missing the required
+    keys are dropped so the caller retries those items on their own.
+    """
+    parsed = _load_json_array(raw)
+    if isinstance(parsed, dict):
+        parsed = [
+            {**v, "id": k} for k, v in parsed.items() if isinstance(v, dict)
+        ]
+    if not isinstance(parsed, list):
+        print(f"[BATCH PARSE FAILED] Raw response: {raw[:200]}")
+        return {}
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for entry in parsed:
+        if not isinstance(entry, dict):
+            continue
+        label = str(entry.get("id", "")).strip()
+        if label not in labels or label in results:
+            continue
+        if any(not entry.get(k) for k in REQUIRED_KEYS):
+            continue
+        results[label] = normalize(entry)
+    return results
@@ -0,0 +1,145 @@
+"""
+Smart Talent Insight Hub — Streaming Bedrock Responses
+Reads `invoke_model_with_response_stream` answers as they are generated and
+stops as soon as the JSON value the prompt asked for is complete, instead of
+waiting for the whole completion and salvaging JSON from it afterwards.
+
+  JsonScanner     incremental scan of streamed text for the first top-level
+                  `{...}` (or `[...]`) that parses; string- and escape-aware,
+                  so braces inside summaries do not count. Text before it
+                  (a ```json fence, a preamble) is skipped, and so is any
+                  candidate that turns out not to be valid JSON.
+  read_stream     consumes the Anthropic messages event stream (message_start
+                  / content_block_delta / message_delta) and closes it once
+                  the scanner has its value; trailing fences or prose are
+                  never waited for.
+  output_budget   max_tokens sized to the message: Bedrock reserves
+                  max_tokens against the tokens-per-minute quota when a
+                  request starts, so a tight budget admits more concurrent
+                  analyses. A truncated answer is retried once at the ceiling.
+"""
+
+import json
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from batch_analysis import estimate_tokens
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class JsonScanner:
+    def __init__(self, opener: str = "{") -> None:
+        self.opener = opener
+        self.value: Any = None
+        self._parts: List[str] = []   # text of the candidate value so far
+        self._depth  = 0
+        self._in_str = False
+        self._escape = False
+
+    @property
+    def done(self) -> bool:
+        return self.value is not None
+
+    def feed(self, chunk: str) -> bool:
+        """Scan one more piece of text; True once a complete, valid value has been seen."""
+        if self.value is not None:
+            return True
+        start = 0 if self._depth else -1
+        for i, ch in enumerate(chunk):
+            if self._depth == 0:
+                if ch == self.opener:
+                    start, self._depth = i, 1
+                continue
+            if self._in_str:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_str = False
+            elif ch == '"':
+                self._in_str = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    candidate = "".join(self._parts) + chunk[start:i + 1]
+                    self._parts = []
+                    if self._accept(candidate):
+                        return True
+                    start = -1   # not JSON after all: look for the next opener
+        if self._depth and start >= 0:
+            self._parts.append(chunk[start:])
+        return False
+
+    def _accept(self, candidate: str) -> bool:
+        try:
+            value = json.loads(candidate)
+        except json.JSONDecodeError:
+            return False
+        if not isinstance(value, dict if self.opener == "{" else list):
+            return False
+        self.value = value
+        return True
+
+
+class StreamedReply(NamedTuple):
+    text:          str                  # everything received (up to the early stop)
+    value:         Any                  # the parsed JSON value, or None
+    stop_reason:   Optional[str]        # None when we stopped reading first
+    input_tokens:  int
+    output_tokens: int                  # as reported, else estimated from the text
+    first_token_ms: float
+    early:         bool                 # closed before the model finished
+
+
+def read_stream(response: Dict[str, Any], opener: str = "{",
+                started: Optional[float] = None) -> StreamedReply:
+    started = time.perf_counter() if started is None else started
+    scanner = JsonScanner(opener)
+    stream: Iterable[Dict[str, Any]] = response["body"]
+    chunks: List[str] = []
+    stop_reason: Optional[str] = None
+    input_tokens = output_tokens = 0
+    first_token_ms = 0.0
+    early = False
+
+    for event in stream:
+        payload = event.get("chunk")
+        if not payload:
+            continue
+        message = json.loads(payload["bytes"])
+        kind = message.get("type")
+        if kind == "message_start":
+            input_tokens = (message.get("message") or {}).get("usage", {}).get("input_tokens", 0)
+        elif kind == "content_block_delta":
+            text = (message.get("delta") or {}).get("text", "")
+            if not text:
+                continue
+            if not chunks:
+                first_token_ms = (time.perf_counter() - started) * 1000
+            chunks.append(text)
+            if scanner.feed(text):
+                early = True
+                break
+        elif kind == "message_delta":
+            stop_reason = (message.get("delta") or {}).get("stop_reason")
+            output_tokens = (message.get("usage") or {}).get("output_tokens", output_tokens)
+
+    if early:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()   # stop downloading; the connection is not reused
+    text = "".join(chunks)
+    return StreamedReply(
+        text=text, value=scanner.value, stop_reason=stop_reason,
+        input_tokens=input_tokens, output_tokens=output_tokens or estimate_tokens(text),
+        first_token_ms=first_token_ms, early=early,
+    )
+
+
+def output_budget(message: str, floor: int, ceiling: int) -> int:
+    """max_tokens for one analysis: the fixed schema plus a little per input token."""
+    return max(1, min(ceiling, floor + estimate_tokens(message) // 4))
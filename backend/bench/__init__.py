@@ -0,0 +1 @@
+"""Local benchmarks for the Lambda backend. Run from backend/: python -m bench.<name>"""
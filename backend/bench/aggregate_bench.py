@@ -0,0 +1,123 @@
+"""
+/insights aggregation CPU and memory: the original one-dict-at-a-time loop
+vs. the row-wise page fold (bench/row_fold.InsightsAccumulator) vs. the
+columnar fold (columnar.ColumnarAccumulator), over 100k–1M synthetic items.
+
+Items are cycled from a pool of pre-built 1000-item pages, so the timings
+are aggregation only. Peak memory is what each mode allocates while
+aggregating (tracemalloc). The scanned items themselves are excluded; the
+original loop also held all of them in memory at once.
+
+    python -m bench.aggregate_bench --items 100000,250000,500000,1000000
+"""
+
+import argparse
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from aggregation import PROJECTED_FIELDS
+from columnar import ColumnarAccumulator
+
+from bench.row_fold import InsightsAccumulator
+from bench.synthetic import feedback_items
+
+MONTH     = "2026-03"
+PAGE_SIZE = 1000
+
+
+def _original_loop(pages: Iterator[List[Dict[str, Any]]]) -> Tuple[int, Counter]:
+    """The pre-engine handler: materialise everything, then one pass per item."""
+    items: List[Dict[str, Any]] = []
+    for page in pages:
+        items.extend(page)
+
+    sentiment_counts = {"positive": 0, "negative": 0, "neutral": 0}
+    summaries: List[Dict[str, Any]] = []
+    reviews: List[Dict[str, Any]] = []
+    all_topics: List[str] = []
+    monthly_sentiment: Dict[str, Dict[str, int]] = {}
+    this_month = 0
+    for item in items:
+        sentiment = (item.get("sentiment") or "neutral").lower()
+        if sentiment not in sentiment_counts:
+            sentiment = "neutral"
+        sentiment_counts[sentiment] += 1
+        ts = item.get("timestamp", "")
+        month_key = ts[:7] if ts else "unknown"
+        if month_key == MONTH:
+            this_month += 1
+        if month_key not in monthly_sentiment:
+            monthly_sentiment[month_key] = {"positive": 0, "negative": 0, "neutral": 0}
+        monthly_sentiment[month_key][sentiment] += 1
+        if item.get("summary") and item.get("aiProcessed"):
+            summaries.append({"summary": item["summary"], "sentiment": sentiment,
+                              "topics": item.get("topics", []), "timestamp": ts[:10] if ts else ""})
+            reviews.append({
+                "employeeName": item.get("employeeName", "Unknown Employee"),
+                "department": item.get("department", ""), "reviewPeriod": item.get("reviewPeriod", ""),
+                "rating": item.get("rating", 0), "sentiment": sentiment,
+                "summary": item.get("summary", ""), "topics": item.get("topics", []),
+                "timestamp": ts[:10] if ts else "",
+            })
+        if isinstance(item.get("topics"), list):
+            all_topics.extend(item["topics"])
+    topic_counter = Counter(all_topics)
+    topic_counter.most_common(10)
+    return len(items), topic_counter
+
+
+def _fold(cls: Callable[[str], Any]) -> Callable[[Iterator[List[Dict[str, Any]]]], Tuple[int, Counter]]:
+    def run(pages: Iterator[List[Dict[str, Any]]]) -> Tuple[int, Counter]:
+        acc = cls(MONTH)
+        for page in pages:
+            acc.add_page(page)
+        acc.topics.most_common(10)
+        acc.reviews()
+        return acc.total, acc.topics
+    return run
+
+
+MODES = [
+    ("per-item loop (orig)", _original_loop),
+    ("row fold", _fold(InsightsAccumulator)),
+    ("columnar fold", _fold(ColumnarAccumulator)),
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", default="100000,250000,500000,1000000")
+    parser.add_argument("--pool", type=int, default=20000, help="distinct synthetic items to cycle")
+    args = parser.parse_args()
+
+    pool = [{f: it[f] for f in PROJECTED_FIELDS if f in it}
+            for it in feedback_items(args.pool, message_words=0)]
+    pool_pages = [pool[i:i + PAGE_SIZE] for i in range(0, len(pool), PAGE_SIZE)]
+
+    def pages(n: int) -> Iterator[List[Dict[str, Any]]]:
+        for i in range(n // PAGE_SIZE):
+            yield pool_pages[i % len(pool_pages)]
+
+    print(f"{'items':>9}  {'mode':<22}{'seconds':>9}{'speed-up':>10}{'peak MiB':>10}")
+    for n in [int(x) for x in args.items.split(",") if x.strip()]:
+        base = None
+        reference = None
+        for label, fn in MODES:
+            start = time.perf_counter()
+            total, topics = fn(pages(n))
+            secs = time.perf_counter() - start
+            tracemalloc.start()
+            fn(pages(n))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            if reference is None:
+                reference = (total, topics)
+            assert (total, topics) == reference, label
+            base = base or secs
+            print(f"{n:>9}  {label:<22}{secs:>9.3f}{base / secs:>10.2f}{peak / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Per-item vs micro-batched analysis through lambda_function's async paths,
+against the in-process Bedrock/Comprehend/DynamoDB stand-ins.
+
+    python -m bench.batch_bench --items 200 --batch-size 8 --latency-ms 400
+    python -m bench.batch_bench --provider comprehend --items 500 --latency-ms 60
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+import lambda_function as lf
+import storage
+
+from bench.local_aws import Latency, LocalBedrock, LocalComprehend, LocalDynamoDB
+from bench.synthetic import feedback_item
+
+
+def _run(records, batched: bool, latency_ms: float, per_token_ms: float, drop: int) -> dict:
+    ddb = LocalDynamoDB()
+    lf.table   = ddb.Table("FeedbackSubmissions")
+    lf.store   = storage.DynamoFeedbackStore(lf.table, lf.TABLE_NAME, lf.INGEST_CONCURRENCY)
+    lf.s3      = None
+    lf.ai_result_cache = lf.ai_cache.AIResultCache(None, max_entries=0)
+    lf.bedrock = LocalBedrock(Latency(latency_ms), per_token_ms,
+                              drop_ids=[f"f{i + 1}" for i in range(drop)])
+    lf.comprehend = LocalComprehend(Latency(latency_ms), error_indexes=list(range(drop)))
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if batched:
+            lf.handle_batch_analysis(records)
+        else:
+            for record in records:
+                lf.handle_async_analysis(record)
+    elapsed = time.perf_counter() - start
+    processed = sum(1 for i in lf.table.items.values() if i.get("aiProcessed"))
+    calls = lf.bedrock.calls + sum(lf.comprehend.calls.values())
+    return {
+        "seconds": elapsed, "calls": calls,
+        "in_tokens": lf.bedrock.input_tokens, "out_tokens": lf.bedrock.output_tokens,
+        "processed": processed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--provider", choices=["bedrock", "comprehend"], default="bedrock")
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=400.0, help="model round trip per call")
+    parser.add_argument("--per-token-ms", type=float, default=2.0, help="output generation per token")
+    parser.add_argument("--drop", type=int, default=1, help="entries the model omits per batch (retried singly)")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    records = [
+        {k: it[k] for k in ("feedbackId", "message", "timestamp")}
+        for it in (feedback_item(rng, message_words=60) for _ in range(args.items))
+    ]
+    lf.AI_PROVIDER = lf.MODEL_PROVIDER = args.provider
+    lf.BEDROCK_BATCH_SIZE = args.batch_size
+
+    print(f"provider={args.provider} items={args.items} batch_size={args.batch_size} latency={args.latency_ms}ms")
+    print(f"{'mode':<12}{'seconds':>10}{'calls':>8}{'in tok':>10}{'out tok':>10}{'processed':>11}")
+    for label, batched in (("per-item", False), ("batched", True)):
+        r = _run(records, batched, args.latency_ms, args.per_token_ms, args.drop)
+        print(f"{label:<12}{r['seconds']:>10.2f}{r['calls']:>8}{r['in_tokens']:>10}"
+              f"{r['out_tokens']:>10}{r['processed']:>11}")
+
+
+if __name__ == "__main__":
+    main()
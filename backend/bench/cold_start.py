@@ -0,0 +1,88 @@
+"""
+Cold-start cost of importing lambda_function with eager vs. lazy AWS clients.
+Every trial is a fresh interpreter, so module and botocore caches start cold.
+
+  eager (before)  AWS_CLIENT_PREWARM=all — every client built at import,
+                  as the handler did before the registry
+  lazy  (after)   nothing built at import; the path's clients on first use
+
+"first use" builds only the clients an invocation path needs (no network
+calls are made), so import + first use is the init work that path pays.
+
+    python -m bench.cold_start --trials 15
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+# Clients each invocation path touches (names as in lambda_function).
+PATHS: Dict[str, List[str]] = {
+    "post_feedback": ["table", "events"],
+    "get_insights":  ["table", "rollup_table"],
+    "analysis":      ["bedrock", "table", "s3"],
+}
+
+_CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+import lambda_function as lf
+t1 = time.perf_counter()
+for name in sys.argv[1].split(","):
+    client = getattr(lf, name)
+    if client is not None:
+        client.resolve()
+t2 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "first_use_ms": (t2 - t1) * 1000}))
+"""
+
+
+def _trial(names: List[str], prewarm: str) -> Dict[str, float]:
+    env = {
+        **os.environ,
+        "AWS_DEFAULT_REGION":  os.environ.get("AWS_DEFAULT_REGION", "ca-central-1"),
+        "AWS_CLIENT_PREWARM":  prewarm,
+        "ROLLUP_TABLE_NAME":   os.environ.get("ROLLUP_TABLE_NAME", "FeedbackSubmissions-rollups"),
+        "EXPORT_BUCKET_NAME":  os.environ.get("EXPORT_BUCKET_NAME", "bench-exports"),
+    }
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, ",".join(names)],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _pct(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--trials", type=int, default=15)
+    parser.add_argument("--paths", default=",".join(PATHS))
+    args = parser.parse_args()
+
+    print(f"trials={args.trials} python={sys.version.split()[0]}")
+    print(f"{'path':<15}{'mode':<16}{'import p50':>12}{'first use':>12}{'total p50':>12}{'total p95':>12}")
+    for path in [p for p in args.paths.split(",") if p]:
+        names = PATHS[path]
+        baseline = None
+        for mode, prewarm in (("eager (before)", "all"), ("lazy (after)", "")):
+            runs = [_trial(names, prewarm) for _ in range(args.trials)]
+            imports = [r["import_ms"] for r in runs]
+            first   = [r["first_use_ms"] for r in runs]
+            totals  = [r["import_ms"] + r["first_use_ms"] for r in runs]
+            p50 = statistics.median(totals)
+            baseline = baseline or p50
+            print(f"{path:<15}{mode:<16}{statistics.median(imports):>10.1f}ms"
+                  f"{statistics.median(first):>10.1f}ms{p50:>10.1f}ms{_pct(totals, 0.95):>10.1f}ms"
+                  + ("" if p50 == baseline else f"   ({baseline / p50:.2f}x)"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Async analysis wall-clock (≈ billed Lambda duration) with the independent
+AWS calls run in sequence (IO_CONCURRENCY=0) vs. overlapped (fanout.py),
+against the local stand-ins with injected round-trip latency.
+
+Per FeedbackSubmitted event: AI cache read, then the analysis (Comprehend:
+detect_sentiment ‖ detect_key_phrases; Bedrock: one invoke_model), then the
+feedback update ‖ AI cache fill. Messages are unique, so every event misses
+the cache and pays for the whole path.
+
+    python -m bench.fanout_bench --events 40 --ddb-ms 8 --comprehend-ms 60 --bedrock-ms 400
+"""
+
+import argparse
+import contextlib
+import os
+import statistics
+import time
+from typing import Any, Dict, List
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ca-central-1")
+os.environ.pop("AI_CACHE_TABLE_NAME", None)
+os.environ["METRICS_ENABLED"] = "false"
+
+import ai_cache               # noqa: E402
+import fanout                 # noqa: E402
+import lambda_function as lf  # noqa: E402
+import storage                # noqa: E402
+
+from bench.local_aws import Latency, LocalBedrock, LocalComprehend, LocalDynamoDB   # noqa: E402
+
+
+def _install(provider: str, workers: int, args: argparse.Namespace) -> None:
+    ddb = LocalDynamoDB(Latency(args.ddb_ms))
+    lf.table = ddb.Table(lf.TABLE_NAME)
+    lf.store = storage.DynamoFeedbackStore(lf.table, lf.TABLE_NAME, lf.INGEST_CONCURRENCY)
+    lf.ai_result_cache = ai_cache.AIResultCache(ddb.Table("ai-cache", "cacheKey"), max_entries=0)
+    lf.comprehend = LocalComprehend(Latency(args.comprehend_ms))
+    lf.bedrock = LocalBedrock(Latency(args.bedrock_ms))
+    lf.AI_PROVIDER = lf.MODEL_PROVIDER = provider
+    lf.io = fanout.FanOut(workers)
+
+
+def _run(provider: str, workers: int, args: argparse.Namespace) -> List[float]:
+    _install(provider, workers, args)
+    samples = []
+    for i in range(args.events):
+        lf.table.put_item(Item={"feedbackId": f"f{i}", "timestamp": "2026-10-01T00:00:00+00:00"})
+        event = {"source": "talent.feedback", "detail-type": "FeedbackSubmitted", "detail": {
+            "feedbackId": f"f{i}", "timestamp": "2026-10-01T00:00:00+00:00",
+            "message": f"Clear communicator who mentors juniors and ships on time. Event {i}.",
+        }}
+        start = time.perf_counter()
+        lf.lambda_handler(event, None)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=40)
+    parser.add_argument("--providers", default="comprehend,bedrock")
+    parser.add_argument("--ddb-ms", type=float, default=8.0)
+    parser.add_argument("--comprehend-ms", type=float, default=60.0)
+    parser.add_argument("--bedrock-ms", type=float, default=400.0)
+    args = parser.parse_args()
+
+    rows: List[Dict[str, Any]] = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for provider in [p.strip() for p in args.providers.split(",") if p.strip()]:
+            seq = _run(provider, 0, args)
+            par = _run(provider, 8, args)
+            rows.append({"provider": provider, "seq": seq, "par": par})
+
+    print(f"{args.events} events, DynamoDB {args.ddb_ms:g} ms, Comprehend {args.comprehend_ms:g} ms, "
+          f"Bedrock {args.bedrock_ms:g} ms\n")
+    print(f"{'provider':<12}{'sequential p50':>16}{'fan-out p50':>13}{'saved':>9}{'speed-up':>10}")
+    for row in rows:
+        seq, par = statistics.median(row["seq"]), statistics.median(row["par"])
+        print(f"{row['provider']:<12}{seq:>14.1f}ms{par:>11.1f}ms{seq - par:>7.1f}ms{seq / par:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
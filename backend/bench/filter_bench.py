@@ -0,0 +1,99 @@
+"""
+Filtered GET /insights: GSI Query plan vs. a filtered parallel scan of the
+whole table, against the in-process DynamoDB stand-in. The Query cost tracks
+the slice; the scan cost tracks the table.
+
+    python -m bench.filter_bench --items 20000,100000 --latency-ms 25
+"""
+
+import argparse
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+import insights_query
+import scan_engine
+from aggregation import PROJECTED_FIELDS
+from columnar import ColumnarAccumulator
+
+from bench.local_aws import Latency, LocalDynamoDB
+from bench.synthetic import feedback_items
+
+SLICES: List[Dict[str, str]] = [
+    {"department": "Engineering"},
+    {"department": "Engineering", "reviewPeriod": "2026-H1"},
+    {"reviewPeriod": "2025-H2", "from": "2025-07-01", "to": "2025-12-31"},
+    {"from": "2026-03-01", "to": "2026-03-31"},
+    {"from": "2025-10-01", "to": "2025-12-31"},
+    {"from": "2030-01-01"},   # starts in the future: empty plan, nothing read
+]
+
+
+class _Metered:
+    """Counts requests and items read (ScannedCount) through a low-level client."""
+
+    def __init__(self, client: Any) -> None:
+        self.client, self.requests, self.read = client, 0, 0
+
+    def _call(self, op: str, **kwargs: Any) -> Dict[str, Any]:
+        response = getattr(self.client, op)(**kwargs)
+        self.requests += 1
+        self.read += response.get("ScannedCount", 0)
+        return response
+
+    def scan(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._call("scan", **kwargs)
+
+    def query(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._call("query", **kwargs)
+
+
+def _run(client: Any, table_name: str, f: insights_query.InsightsFilter, use_index: bool):
+    month = datetime.now(timezone.utc).strftime("%Y-%m")
+    queries = insights_query.plan_queries(f, datetime.now(timezone.utc).isoformat()) if use_index else None
+    common = dict(new_partial=lambda: ColumnarAccumulator(month),
+                  fold_page=ColumnarAccumulator.add_page,
+                  merge=ColumnarAccumulator.merge,
+                  projection=PROJECTED_FIELDS)
+    if queries is None:
+        return scan_engine.parallel_scan(client, table_name, 4,
+                                         scan_kwargs=insights_query.scan_filter(f), **common)
+    return scan_engine.parallel_query(client, table_name, queries, **common)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", default="20000,100000")
+    parser.add_argument("--latency-ms", type=float, default=25.0, help="round trip per page")
+    parser.add_argument("--per-kb-ms", type=float, default=0.02, help="transfer cost per KB returned")
+    args = parser.parse_args()
+
+    print(f"page_latency={args.latency_ms}ms per_kb={args.per_kb_ms}ms (scan fallback: 4 segments)")
+    print(f"{'items':>8}  {'slice':<52}{'matched':>8}"
+          f"{'scan s':>9}{'read':>9}{'query s':>9}{'read':>9}{'reqs':>6}")
+    for n in [int(x) for x in args.items.split(",") if x.strip()]:
+        ddb = LocalDynamoDB(Latency(args.latency_ms, args.per_kb_ms))
+        table = ddb.Table("FeedbackSubmissions")
+        table.add_index(insights_query.DEPARTMENT_INDEX, "department", "timestamp")
+        table.add_index(insights_query.REVIEW_PERIOD_INDEX, "reviewPeriod", "timestamp")
+        table.add_index(insights_query.TIME_BUCKET_INDEX, "timeBucket", "timestamp")
+        table.load(list(feedback_items(n)))
+        table.scan(Limit=1)   # build the stand-in's index outside the timings
+
+        for params in SLICES:
+            f = insights_query.parse_filters(params)
+            timings = []
+            for use_index in (False, True):
+                client = _Metered(table.meta.client)
+                start = time.perf_counter()
+                acc = _run(client, table.name, f, use_index)
+                timings.append((time.perf_counter() - start, client.read, client.requests, acc.total))
+            (scan_s, scan_read, _, matched), (query_s, query_read, reqs, q_matched) = timings
+            assert matched == q_matched, (matched, q_matched)
+            label = "&".join(f"{k}={v}" for k, v in params.items())
+            print(f"{n:>8}  {label:<52}{matched:>8}"
+                  f"{scan_s:>9.3f}{scan_read:>9}{query_s:>9.3f}{query_read:>9}{reqs:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Ingest throughput: N records sent as N POST /feedback invocations (one
+put_item + one single-entry put_events each) vs. POST /feedback/batch
+(BatchWriteItem in 25s, PutEvents in 10s), against the local stand-ins with
+injected round-trip latency. Per-record invocations run sequentially, the
+way the HRIS sync calls them today.
+
+--unprocessed / --reject make the stand-ins return that share of writes as
+UnprocessedItems and of events as failed entries, to exercise the retries.
+
+    python -m bench.ingest_bench --records 500 --batch 100,500 --ddb-ms 8 --events-ms 20
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import time
+from typing import Any, Dict, List
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ca-central-1")
+os.environ.pop("ROLLUP_TABLE_NAME", None)
+os.environ.pop("AI_CACHE_TABLE_NAME", None)
+os.environ["METRICS_ENABLED"] = "false"
+
+import lambda_function as lf   # noqa: E402
+import storage                 # noqa: E402
+
+from bench.local_aws import Latency, LocalDynamoDB, LocalEventBridge   # noqa: E402
+
+
+def _records(n: int) -> List[Dict[str, Any]]:
+    return [{
+        "name": "HRIS Sync", "email": f"sync{i}@example.com",
+        "message": f"Strong quarter, communicates clearly and mentors juniors well. Record {i}.",
+        "employeeName": f"Employee {i}", "department": "Engineering",
+        "reviewPeriod": "2026-H1", "rating": 1 + i % 5,
+    } for i in range(n)]
+
+
+def _install(args: argparse.Namespace) -> Any:
+    ddb = LocalDynamoDB(Latency(args.ddb_ms))
+    ddb.meta.client.unprocessed_rate = args.unprocessed
+    lf.table = ddb.Table(lf.TABLE_NAME)
+    lf.store = storage.DynamoFeedbackStore(lf.table, lf.TABLE_NAME, lf.INGEST_CONCURRENCY)
+    lf.events = LocalEventBridge(Latency(args.events_ms), reject_rate=args.reject)
+    return lf.table
+
+
+def _post(path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    return lf.lambda_handler({"httpMethod": "POST", "path": path, "headers": {},
+                              "body": json.dumps(body)}, None)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=500)
+    parser.add_argument("--batch", default="100,500", help="records per POST /feedback/batch")
+    parser.add_argument("--ddb-ms", type=float, default=8.0)
+    parser.add_argument("--events-ms", type=float, default=20.0)
+    parser.add_argument("--unprocessed", type=float, default=0.0)
+    parser.add_argument("--reject", type=float, default=0.0)
+    args = parser.parse_args()
+    records = _records(args.records)
+
+    rows = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        table = _install(args)
+        start = time.perf_counter()
+        ok = sum(1 for r in records if _post("/feedback", r)["statusCode"] == 201)
+        rows.append(("per-record", time.perf_counter() - start, ok, len(table.items),
+                     lf.events.calls))
+
+        for size in [int(b) for b in args.batch.split(",") if b.strip()]:
+            table = _install(args)
+            start = time.perf_counter()
+            ok = 0
+            for i in range(0, len(records), size):
+                resp = json.loads(_post("/feedback/batch", {"records": records[i:i + size]})["body"])
+                ok += resp["accepted"]
+            rows.append((f"batch {size}", time.perf_counter() - start, ok, len(table.items),
+                         lf.events.calls))
+
+    base = rows[0][1]
+    print(f"{args.records} records, DynamoDB {args.ddb_ms:g} ms, EventBridge {args.events_ms:g} ms\n")
+    print(f"{'mode':<12}{'seconds':>9}{'records/s':>11}{'speed-up':>10}{'stored':>8}{'put_events':>12}")
+    for label, secs, ok, stored, calls in rows:
+        print(f"{label:<12}{secs:>9.2f}{ok / secs:>11.0f}{base / secs:>10.1f}{stored:>8}{calls:>12}")
+
+
+if __name__ == "__main__":
+    main()
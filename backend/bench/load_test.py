@@ -0,0 +1,368 @@
+"""
+Load test for the lambda_handler paths, driven in-process against the local
+AWS stand-ins (bench/local_aws.py) with per-service latency injected.
+
+  post_feedback   POST /feedback: put_item + put_events
+  post_feedback_batch  POST /feedback/batch of 100 records: BatchWriteItem +
+                  10-entry PutEvents (req/s × 100 = records/s)
+  analysis        EventBridge FeedbackSubmitted event: AI analysis + update_item
+  get_insights    GET /insights, rotating unfiltered / compact / department /
+                  date-window requests (scan and GSI Query paths)
+  get_reviews     GET /reviews, alternating the first page and a page resumed
+                  from a cursor at a random analysed item
+  stream          DynamoDB stream batch of 100 records: S3 analytics export
+  mixed           weighted mix of the above (--mix)
+
+Each (table size, path) scenario runs in a fresh interpreter, so the peak RSS
+it reports belongs to that scenario alone: the synthetic table plus the
+path's working set (`setup MiB` is the table alone). Requests are replayed
+by --concurrency threads sharing one warm container and its /insights cache.
+Real Lambda gives each concurrent request its own container, so these
+threads also measure lock and GIL contention that production does not see.
+Handler log lines are discarded during the run.
+
+Not modelled: the rollups table (the stand-in client has no
+transact_write_items / batch_get_item), so /insights takes the scan
+fallback and stream batches only export.
+
+    python -m bench.load_test --sizes 1k,100k,1m --requests 400 --concurrency 8 \\
+        --out bench-results-$(git rev-parse --short HEAD).json
+    python -m bench.load_test --sizes 1k --compare bench-results-<older>.json   # p95 vs. an earlier run
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PATHS = ("post_feedback", "post_feedback_batch", "analysis", "get_insights", "get_reviews",
+         "stream", "mixed")
+
+# Round trips in ms; override any of them with --latency svc=ms,...
+DEFAULT_LATENCY = {"dynamodb": 5.0, "events": 15.0, "s3": 20.0, "bedrock": 400.0, "comprehend": 60.0}
+DEFAULT_MIX     = "post_feedback=6,get_insights=3,analysis=1"
+
+INSIGHTS_QUERIES: List[Optional[Dict[str, str]]] = [
+    None,
+    {"view": "compact"},
+    {"department": "Engineering"},
+    {"from": "2026-01-01", "to": "2026-03-31"},
+]
+
+STREAM_BATCH = 100
+INGEST_BATCH = 100
+
+
+def _size(text: str) -> int:
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def _pairs(text: str) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for part in text.split(","):
+        if part.strip():
+            key, _, value = part.partition("=")
+            out[key.strip()] = float(value)
+    return out
+
+
+def _pct(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))] if ordered else 0.0
+
+
+def _peak_rss_mib() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024   # bytes on macOS, KiB on Linux
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CHILD: one scenario in a fresh interpreter
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _request_factories(items: List[Dict[str, Any]], rng: random.Random,
+                       ) -> Dict[str, Callable[[int], Dict[str, Any]]]:
+    from boto3.dynamodb.types import TypeSerializer
+
+    import review_index
+    serializer = TypeSerializer()
+    lock = threading.Lock()
+    reviewed = [it for it in items if it.get(review_index.REVIEW_BUCKET)]
+
+    def record(i: int) -> Dict[str, Any]:
+        with lock:
+            words = " ".join(rng.choice(("clear", "late", "helpful", "ownership", "planning",
+                                         "strong", "improve", "mentor")) for _ in range(40))
+        return {
+            "name": "Load Test", "email": f"load{i}@example.com", "message": f"{words} #{i}",
+            "employeeName": f"Employee {i % 5000}", "department": "Engineering",
+            "reviewPeriod": "2026-H1", "rating": 1 + i % 5,
+        }
+
+    def post_feedback(i: int) -> Dict[str, Any]:
+        return {"httpMethod": "POST", "path": "/feedback", "headers": {}, "body": json.dumps(record(i))}
+
+    def post_feedback_batch(i: int) -> Dict[str, Any]:
+        records = [record(i * INGEST_BATCH + j) for j in range(INGEST_BATCH)]
+        return {"httpMethod": "POST", "path": "/feedback/batch", "headers": {},
+                "body": json.dumps({"records": records})}
+
+    def analysis(i: int) -> Dict[str, Any]:
+        item = items[i % len(items)]
+        return {"source": "talent.feedback", "detail-type": "FeedbackSubmitted", "detail": {
+            "feedbackId": item["feedbackId"], "message": f"{item['message']} #{i}",
+            "timestamp": item["timestamp"],
+        }}
+
+    def get_insights(i: int) -> Dict[str, Any]:
+        return {"httpMethod": "GET", "path": "/insights", "headers": {"Accept-Encoding": "gzip"},
+                "queryStringParameters": INSIGHTS_QUERIES[i % len(INSIGHTS_QUERIES)]}
+
+    def get_reviews(i: int) -> Dict[str, Any]:
+        params = {"limit": "20"}
+        if i % 2 and reviewed:
+            with lock:
+                item = rng.choice(reviewed)
+            params["cursor"] = review_index.encode_cursor(item[review_index.REVIEW_BUCKET], {
+                "feedbackId": item["feedbackId"], "timestamp": item["timestamp"],
+                review_index.REVIEW_BUCKET: item[review_index.REVIEW_BUCKET],
+            })
+        return {"httpMethod": "GET", "path": "/reviews", "headers": {}, "queryStringParameters": params}
+
+    def stream(i: int) -> Dict[str, Any]:
+        records = []
+        for j in range(STREAM_BATCH):
+            new = dict(items[(i * STREAM_BATCH + j) % len(items)], aiProcessed=True,
+                       aiAnalyzedAt=f"2026-10-01T00:00:{j % 60:02d}+00:00#{i}")
+            records.append({
+                "eventID": f"{i}-{j}", "eventName": "MODIFY", "eventSource": "aws:dynamodb",
+                "dynamodb": {
+                    "SequenceNumber": f"{i:012d}{j:04d}",
+                    "NewImage": {k: serializer.serialize(v) for k, v in new.items() if v is not None},
+                },
+            })
+        return {"Records": records}
+
+    return {"post_feedback": post_feedback, "post_feedback_batch": post_feedback_batch, "analysis": analysis,
+            "get_insights": get_insights, "get_reviews": get_reviews, "stream": stream}
+
+
+def _ok(path: str, response: Dict[str, Any]) -> bool:
+    status = response.get("statusCode", 200)
+    return (200 <= status < 300) or (path == "get_insights" and status == 304)
+
+
+def run_scenario(spec: Dict[str, Any]) -> Dict[str, Any]:
+    os.environ.setdefault("AWS_DEFAULT_REGION", "ca-central-1")
+    os.environ["AI_PROVIDER"] = spec["provider"]
+    os.environ["EXPORT_BUCKET_NAME"] = "bench-exports"
+    os.environ.pop("ROLLUP_TABLE_NAME", None)
+    os.environ.pop("AI_CACHE_TABLE_NAME", None)
+    if spec["no_insights_cache"]:
+        os.environ["INSIGHTS_CACHE_TTL"] = "0"
+
+    import insights_query
+    import lambda_function as lf
+    import review_index
+    import storage
+    from bench.local_aws import (Latency, LocalBedrock, LocalComprehend, LocalDynamoDB,
+                                 LocalEventBridge, LocalS3)
+    from bench.synthetic import feedback_items
+
+    lat = {svc: Latency(ms) for svc, ms in spec["latency"].items()}
+    setup_start = time.perf_counter()
+    ddb = LocalDynamoDB(lat["dynamodb"])
+    table = ddb.Table(lf.TABLE_NAME)
+    for index, attr in ((insights_query.DEPARTMENT_INDEX, "department"),
+                        (insights_query.REVIEW_PERIOD_INDEX, "reviewPeriod"),
+                        (insights_query.TIME_BUCKET_INDEX, insights_query.TIME_BUCKET_ATTR),
+                        (review_index.REVIEW_INDEX, review_index.REVIEW_BUCKET)):
+        table.add_index(index, attr, "timestamp")
+    items = list(feedback_items(spec["size"], seed=spec["seed"], message_words=spec["message_words"]))
+    table.load(items)
+
+    lf.table, lf.rollup_table = table, None
+    lf.store = storage.DynamoFeedbackStore(table, lf.TABLE_NAME, lf.INGEST_CONCURRENCY)
+    lf.events     = LocalEventBridge(lat["events"], fail=spec.get("events_down", False))
+    lf.bedrock    = LocalBedrock(lat["bedrock"])
+    lf.comprehend = LocalComprehend(lat["comprehend"])
+    lf.s3         = LocalS3(lat["s3"])
+    setup_s = time.perf_counter() - setup_start
+    setup_rss = _peak_rss_mib()
+
+    rng = random.Random(spec["seed"])
+    factories = _request_factories(items, rng)
+    if spec["path"] == "mixed":
+        names, weights = zip(*spec["mix"].items())
+        plan = rng.choices(names, weights=weights, k=spec["requests"])
+    else:
+        plan = [spec["path"]] * spec["requests"]
+    events = [(path, factories[path](i)) for i, path in enumerate(plan)]
+
+    samples: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    sample_lock = threading.Lock()
+
+    def invoke(job: Tuple[str, Dict[str, Any]]) -> None:
+        path, event = job
+        start = time.perf_counter()
+        try:
+            ok = _ok(path, lf.lambda_handler(event, None))
+        except Exception:
+            ok = False
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with sample_lock:
+            samples.setdefault(path, []).append(elapsed_ms)
+            if not ok:
+                errors[path] = errors.get(path, 0) + 1
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        wall_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=spec["concurrency"]) as pool:
+            list(pool.map(invoke, events))
+        wall_s = time.perf_counter() - wall_start
+
+    per_path = {
+        path: {
+            "requests": len(ms),
+            "errors":   errors.get(path, 0),
+            "p50_ms":   round(_pct(ms, 0.50), 2),
+            "p95_ms":   round(_pct(ms, 0.95), 2),
+            "p99_ms":   round(_pct(ms, 0.99), 2),
+            "max_ms":   round(max(ms), 2),
+        }
+        for path, ms in sorted(samples.items())
+    }
+    return {
+        "size":           spec["size"],
+        "path":           spec["path"],
+        "requests":       len(events),
+        "concurrency":    spec["concurrency"],
+        "wall_s":         round(wall_s, 3),
+        "throughput_rps": round(len(events) / wall_s, 2) if wall_s else 0.0,
+        "setup_s":        round(setup_s, 2),
+        "setup_rss_mib":  round(setup_rss, 1),
+        "peak_rss_mib":   round(_peak_rss_mib(), 1),
+        "paths":          per_path,
+    }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PARENT: scenario matrix, report, comparison
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _spawn(spec: Dict[str, Any]) -> Dict[str, Any]:
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [backend, os.environ.get("PYTHONPATH")]))}
+    out = subprocess.run(
+        [sys.executable, "-m", "bench.load_test", "--child", json.dumps(spec)],
+        cwd=backend, env=env, capture_output=True, text=True,
+    )
+    if out.returncode != 0:
+        raise RuntimeError(f"scenario {spec['path']}@{spec['size']} failed:\n{out.stderr[-2000:]}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _key(result: Dict[str, Any], path: str) -> Tuple[int, str, str]:
+    return result["size"], result["path"], path
+
+
+def _print_results(results: List[Dict[str, Any]],
+                   baseline: Optional[Dict[Tuple[int, str, str], Dict[str, Any]]] = None) -> None:
+    print(f"{'items':>9}  {'scenario':<21}{'path':<21}{'n':>6}{'err':>5}{'p50 ms':>9}{'p95 ms':>9}"
+          f"{'p99 ms':>9}{'req/s':>9}{'setup MiB':>11}{'peak MiB':>10}" + ("  p95 vs base" if baseline else ""))
+    for r in results:
+        for path, s in r["paths"].items():
+            line = (f"{r['size']:>9}  {r['path']:<21}{path:<21}{s['requests']:>6}{s['errors']:>5}"
+                    f"{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}{s['p99_ms']:>9.1f}{r['throughput_rps']:>9.1f}"
+                    f"{r['setup_rss_mib']:>11.1f}{r['peak_rss_mib']:>10.1f}")
+            old = (baseline or {}).get(_key(r, path))
+            if old and old["p95_ms"]:
+                line += f"  {(s['p95_ms'] - old['p95_ms']) / old['p95_ms'] * 100:+.1f}%"
+            print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1k,100k,1m", help="table sizes, e.g. 1k,100k,1m")
+    parser.add_argument("--paths", default=",".join(PATHS))
+    parser.add_argument("--requests", type=int, default=400, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", default="", help="per-service ms, e.g. bedrock=800,dynamodb=8")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="weights for the mixed scenario")
+    parser.add_argument("--provider", default="bedrock", choices=("bedrock", "comprehend", "local", "tiered"))
+    parser.add_argument("--message-words", type=int, default=30, help="words per synthetic message")
+    parser.add_argument("--no-insights-cache", action="store_true", help="INSIGHTS_CACHE_TTL=0")
+    parser.add_argument("--events-down", action="store_true",
+                        help="every PutEvents fails (POST paths fall back to the outbox)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default="", help="write results JSON here")
+    parser.add_argument("--compare", default="", help="earlier results JSON to diff p95 against")
+    parser.add_argument("--child", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_scenario(json.loads(args.child))))
+        return
+
+    paths = [p for p in args.paths.split(",") if p]
+    unknown = sorted(set(paths) - set(PATHS))
+    if unknown:
+        parser.error(f"unknown paths: {', '.join(unknown)}")
+    latency = {**DEFAULT_LATENCY, **_pairs(args.latency)}
+    config = {
+        "requests": args.requests, "concurrency": args.concurrency, "latency": latency,
+        "mix": _pairs(args.mix), "provider": args.provider, "message_words": args.message_words,
+        "no_insights_cache": args.no_insights_cache, "events_down": args.events_down, "seed": args.seed,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = {_key(r, p): s for r in json.load(fh)["results"] for p, s in r["paths"].items()}
+
+    results: List[Dict[str, Any]] = []
+    for size in [_size(s) for s in args.sizes.split(",") if s.strip()]:
+        for path in paths:
+            results.append(_spawn({**config, "size": size, "path": path}))
+            print(f"  done {path}@{size}: {results[-1]['wall_s']}s", file=sys.stderr)
+
+    _print_results(results, baseline)
+    if args.out:
+        report = {
+            "meta": {
+                "commit":  _git_commit(),
+                "at":      datetime.now(timezone.utc).isoformat(),
+                "python":  platform.python_version(),
+                "machine": platform.machine(),
+                "config":  config,
+            },
+            "results": results,
+        }
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
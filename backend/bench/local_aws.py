@@ -0,0 +1,854 @@
+"""
+In-process stand-ins for the AWS services the Lambda talks to, used by the
+benchmarks under backend/bench. Latency is injected with time.sleep (which
+releases the GIL, like a real socket wait), so thread-pool fan-out behaves
+the way it would against the real service.
+
+Only the call shapes lambda_function.py actually uses are implemented.
+"""
+
+import bisect
+import copy
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Set
+
+from botocore.exceptions import ClientError
+
+PAGE_BYTES = 1024 * 1024   # DynamoDB Scan/Query page limit (measured before projection)
+
+
+class Latency:
+    """Per-call latency model: fixed round trip + optional transfer cost."""
+
+    def __init__(self, base_ms: float = 0.0, per_kb_ms: float = 0.0) -> None:
+        self.base_ms   = base_ms
+        self.per_kb_ms = per_kb_ms
+
+    def wait(self, payload_bytes: int = 0) -> None:
+        delay = self.base_ms + self.per_kb_ms * (payload_bytes / 1024.0)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+
+def _size(item: Dict[str, Any]) -> int:
+    return len(json.dumps(item, default=str))
+
+
+def _segment_of(key: Any, total: int) -> int:
+    digest = hashlib.md5(str(key).encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") % total
+
+
+def _projected_fields(kwargs: Dict[str, Any]) -> Optional[List[str]]:
+    expr = kwargs.get("ProjectionExpression")
+    if not expr:
+        return None
+    names = kwargs.get("ExpressionAttributeNames", {})
+    return [names.get(p.strip(), p.strip()) for p in expr.split(",")]
+
+
+# ── Condition / filter expressions (the subset the handler uses) ─────────────
+_TOKEN = re.compile(r"\s*(<>|<=|>=|=|<|>|\(|\)|,|[#:]?[A-Za-z_][\w.]*)")
+
+
+class _Expr:
+    """
+    Recursive-descent evaluator for DynamoDB condition expressions: comparisons,
+    BETWEEN, AND / OR / NOT, parentheses, attribute_exists / attribute_not_exists
+    and begins_with. Names and values resolve through the usual # / : maps.
+    """
+
+    def __init__(self, text: str, names: Dict[str, str], values: Dict[str, Any]) -> None:
+        self.tokens = [t for t in _TOKEN.findall(text) if t]
+        self.names, self.values = names, values
+        self.pos = 0
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _take(self) -> str:
+        tok = self.tokens[self.pos]
+        self.pos += 1
+        return tok
+
+    def _operand(self, item: Dict[str, Any]) -> Any:
+        tok = self._take()
+        if tok.startswith(":"):
+            return self.values[tok]
+        return item.get(self.names.get(tok, tok), _MISSING)
+
+    def evaluate(self, item: Dict[str, Any]) -> bool:
+        self.pos = 0
+        return self._or(item)
+
+    def _or(self, item: Dict[str, Any]) -> bool:
+        result = self._and(item)
+        while (self._peek() or "").upper() == "OR":
+            self._take()
+            rhs = self._and(item)
+            result = result or rhs
+        return result
+
+    def _and(self, item: Dict[str, Any]) -> bool:
+        result = self._not(item)
+        while (self._peek() or "").upper() == "AND":
+            self._take()
+            rhs = self._not(item)
+            result = result and rhs
+        return result
+
+    def _not(self, item: Dict[str, Any]) -> bool:
+        if (self._peek() or "").upper() == "NOT":
+            self._take()
+            return not self._not(item)
+        return self._atom(item)
+
+    def _atom(self, item: Dict[str, Any]) -> bool:
+        tok = self._peek()
+        if tok == "(":
+            self._take()
+            result = self._or(item)
+            self._take()   # ")"
+            return result
+        if tok in ("attribute_exists", "attribute_not_exists", "begins_with"):
+            fn = self._take()
+            self._take()   # "("
+            value = self._operand(item)
+            prefix = None
+            if self._peek() == ",":
+                self._take()
+                prefix = self._operand(item)
+            self._take()   # ")"
+            if fn == "attribute_exists":
+                return value is not _MISSING
+            if fn == "attribute_not_exists":
+                return value is _MISSING
+            return isinstance(value, str) and value.startswith(prefix)
+        lhs = self._operand(item)
+        op = self._take()
+        if op.upper() == "BETWEEN":
+            lo = self._operand(item)
+            self._take()   # AND
+            hi = self._operand(item)
+            return lhs is not _MISSING and _cmp(lhs, ">=", lo) and _cmp(lhs, "<=", hi)
+        rhs = self._operand(item)
+        return _cmp(lhs, op, rhs)
+
+
+class _Missing:
+    pass
+
+
+_MISSING = _Missing()
+
+
+def _cmp(lhs: Any, op: str, rhs: Any) -> bool:
+    if op == "=":
+        return lhs is not _MISSING and lhs == rhs
+    if op == "<>":
+        return lhs is _MISSING or lhs != rhs
+    if lhs is _MISSING or rhs is _MISSING or type(lhs) is not type(rhs) and not (
+            isinstance(lhs, (int, float)) and isinstance(rhs, (int, float))):
+        return False
+    return {"<": lhs < rhs, "<=": lhs <= rhs, ">": lhs > rhs, ">=": lhs >= rhs}[op]
+
+
+def matches(expression: Optional[str], item: Dict[str, Any], kwargs: Dict[str, Any]) -> bool:
+    if not expression:
+        return True
+    return _Expr(expression, kwargs.get("ExpressionAttributeNames", {}),
+                 kwargs.get("ExpressionAttributeValues", {})).evaluate(item)
+
+
+def conditional_check_failed(op: str) -> ClientError:
+    return ClientError(
+        {"Error": {"Code": "ConditionalCheckFailedException", "Message": "The conditional request failed"}},
+        op,
+    )
+
+
+def _update_sections(expression: str) -> List[tuple]:
+    parts = re.split(r"\b(SET|REMOVE|ADD|DELETE)\b", expression)
+    return [(parts[i], parts[i + 1]) for i in range(1, len(parts) - 1, 2)]
+
+
+class LocalTable:
+    """Dict-backed table keyed by a single hash key."""
+
+    def __init__(self, name: str, hash_key: str, latency: Optional[Latency] = None) -> None:
+        self.name     = name
+        self.hash_key = hash_key
+        self.latency  = latency or Latency()
+        self.items: Dict[Any, Dict[str, Any]] = {}
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._ordered: Optional[List[Any]] = None
+        self._segments: Dict[int, List[List[Any]]] = {}
+        self._sizes: Dict[Any, Dict[str, int]] = {}
+        self.indexes: Dict[str, tuple] = {}                  # name → (hash attr, range attr)
+        self._partitions: Dict[str, Dict[Any, List[tuple]]] = {}
+
+    def add_index(self, name: str, hash_attr: str, range_attr: str) -> "LocalTable":
+        """Declare a GSI; like DynamoDB, items missing either key attribute are not in it."""
+        self.indexes[name] = (hash_attr, range_attr)
+        return self
+
+    def _count(self, op: str) -> None:
+        with self._lock:
+            self.calls[op] = self.calls.get(op, 0) + 1
+
+    def load(self, items: List[Dict[str, Any]]) -> None:
+        for item in items:
+            self.items[item[self.hash_key]] = item
+        self._ordered = None
+
+    # ── item ops ──────────────────────────────────────────────────────────────
+    def put_item(self, Item: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        self._count("PutItem")
+        self.latency.wait(_size(Item))
+        key = Item[self.hash_key]
+        with self._lock:
+            if not matches(kwargs.get("ConditionExpression"), self.items.get(key, {}), kwargs):
+                raise conditional_check_failed("PutItem")
+            old = self.items.get(key)
+            self.items[key] = copy.deepcopy(Item)
+            self._touch(key, old)
+        return {}
+
+    def delete_item(self, Key: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        self._count("DeleteItem")
+        self.latency.wait()
+        key = Key[self.hash_key]
+        with self._lock:
+            if not matches(kwargs.get("ConditionExpression"), self.items.get(key, {}), kwargs):
+                raise conditional_check_failed("DeleteItem")
+            if self.items.pop(key, None) is not None:
+                self._ordered = None   # rare here; indexes rebuild on next read
+        return {}
+
+    def batch_put(self, items: List[Dict[str, Any]], unprocessed_rate: float = 0.0) -> List[Dict[str, Any]]:
+        """One BatchWriteItem round trip; returns the items left unprocessed."""
+        self._count("BatchWriteItem")
+        self.latency.wait(sum(_size(i) for i in items))
+        left = [i for i in items if unprocessed_rate and random.random() < unprocessed_rate]
+        skipped = {id(i) for i in left}
+        with self._lock:
+            for item in items:
+                if id(item) in skipped:
+                    continue
+                key = item[self.hash_key]
+                old = self.items.get(key)
+                self.items[key] = copy.deepcopy(item)
+                self._touch(key, old)
+        return left
+
+    def get_item(self, Key: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        self._count("GetItem")
+        item = self.items.get(Key[self.hash_key])
+        self.latency.wait(_size(item) if item else 0)
+        return {"Item": copy.deepcopy(item)} if item else {}
+
+    def update_item(self, Key: Dict[str, Any], UpdateExpression: str,
+                    ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+                    ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+                    **kwargs: Any) -> Dict[str, Any]:
+        """Supports flat `SET a = :x, …`, `ADD a :n, …` and `REMOVE a, …` clauses."""
+        self._count("UpdateItem")
+        self.latency.wait()
+        names  = ExpressionAttributeNames or {}
+        values = ExpressionAttributeValues or {}
+        cond_kwargs = {"ExpressionAttributeNames": names, "ExpressionAttributeValues": values}
+        with self._lock:
+            current = self.items.get(Key[self.hash_key], {})
+            old = dict(current) if current else None
+            if not matches(kwargs.get("ConditionExpression"), current, cond_kwargs):
+                raise conditional_check_failed("UpdateItem")
+            item = self.items.setdefault(Key[self.hash_key], dict(Key))
+            for action, clauses in _update_sections(UpdateExpression):
+                for clause in clauses.split(","):
+                    clause = clause.strip()
+                    if action == "SET":
+                        attr, _, ref = clause.partition("=")
+                        item[names.get(attr.strip(), attr.strip())] = copy.deepcopy(values[ref.strip()])
+                    elif action == "REMOVE":
+                        item.pop(names.get(clause, clause), None)
+                    elif action == "ADD":
+                        attr, ref = clause.split()
+                        attr = names.get(attr, attr)
+                        value = values[ref]
+                        if isinstance(value, set):
+                            item[attr] = set(item.get(attr, set())) | value
+                        else:
+                            item[attr] = item.get(attr, 0) + value
+            self._touch(Key[self.hash_key], old)
+        return {}
+
+    # ── scan ──────────────────────────────────────────────────────────────────
+    def _refresh(self) -> None:
+        """Sorted keys and per-attribute sizes, rebuilt after writes. Caller holds _lock."""
+        if self._ordered is None:
+            self._ordered  = sorted(self.items)
+            self._segments = {}
+            self._partitions = {}
+            self._sizes    = {
+                k: {a: _size({a: v}) for a, v in self.items[k].items()}
+                for k in self._ordered
+            }
+
+    def _touch(self, key: Any, old: Optional[Dict[str, Any]]) -> None:
+        """Keep the scan/query indexes current after a single-item write. Caller holds _lock."""
+        if self._ordered is None:
+            return
+        item = self.items[key]
+        self._sizes[key] = {a: _size({a: v}) for a, v in item.items()}
+        if old is None:
+            bisect.insort(self._ordered, key)
+            for total, buckets in self._segments.items():
+                bisect.insort(buckets[_segment_of(key, total) if total > 1 else 0], key)
+        for index, parts in self._partitions.items():
+            hash_attr, range_attr = self.indexes[index]
+            if old and hash_attr in old and range_attr in old:
+                entries = parts.get(old[hash_attr], [])
+                pos = bisect.bisect_left(entries, (old[range_attr], key))
+                if pos < len(entries) and entries[pos] == (old[range_attr], key):
+                    entries.pop(pos)
+            if hash_attr in item and range_attr in item:
+                bisect.insort(parts.setdefault(item[hash_attr], []), (item[range_attr], key))
+
+    def _index(self, total: int) -> List[List[Any]]:
+        """Sorted keys per segment."""
+        with self._lock:
+            self._refresh()
+            if total not in self._segments:
+                buckets: List[List[Any]] = [[] for _ in range(total)]
+                for key in self._ordered:
+                    buckets[_segment_of(key, total) if total > 1 else 0].append(key)
+                self._segments[total] = buckets
+            return self._segments[total]
+
+    def scan(self, **kwargs: Any) -> Dict[str, Any]:
+        self._count("Scan")
+        total   = kwargs.get("TotalSegments", 1)
+        keys    = self._index(total)[kwargs.get("Segment", 0)]
+        start   = kwargs.get("ExclusiveStartKey")
+        limit   = kwargs.get("Limit")
+        fields  = _projected_fields(kwargs)
+
+        begin = bisect.bisect_right(keys, start[self.hash_key]) if start else 0
+        page: List[Dict[str, Any]] = []
+        read_bytes = returned_bytes = 0
+        last_key = None
+        filter_expr = kwargs.get("FilterExpression")
+        scanned = 0
+        for key in keys[begin:]:
+            item  = self.items[key]
+            sizes = self._sizes[key]
+            read_bytes += sum(sizes.values())
+            scanned += 1
+            if read_bytes >= PAGE_BYTES or (limit and scanned >= limit):
+                last_key = key
+            if filter_expr and not matches(filter_expr, item, kwargs):
+                if last_key is not None:
+                    break
+                continue
+            if fields is None:
+                page.append(dict(item))
+                returned_bytes += sum(sizes.values())
+            else:
+                page.append({f: item[f] for f in fields if f in item})
+                returned_bytes += sum(sizes.get(f, 0) for f in fields)
+            if last_key is not None:
+                break
+
+        if last_key is not None and last_key == keys[-1]:
+            last_key = None
+        self.latency.wait(returned_bytes)
+        response: Dict[str, Any] = {"Items": page, "Count": len(page), "ScannedCount": scanned}
+        if last_key is not None:
+            response["LastEvaluatedKey"] = {self.hash_key: last_key}
+        return response
+
+    # ── query (GSIs declared with add_index) ──────────────────────────────────
+    def _partition(self, index: str, hash_value: Any) -> List[tuple]:
+        with self._lock:
+            self._refresh()
+            if index not in self._partitions:
+                hash_attr, range_attr = self.indexes[index]
+                parts: Dict[Any, List[tuple]] = {}
+                for key in self._ordered:
+                    item = self.items[key]
+                    if hash_attr in item and range_attr in item:
+                        parts.setdefault(item[hash_attr], []).append((item[range_attr], key))
+                for entries in parts.values():
+                    entries.sort()
+                self._partitions[index] = parts
+            return self._partitions[index].get(hash_value, [])
+
+    def query(self, IndexName: str, KeyConditionExpression: str, **kwargs: Any) -> Dict[str, Any]:
+        """Reads (and bills latency for) only the addressed GSI partition."""
+        self._count("Query")
+        hash_attr, range_attr = self.indexes[IndexName]
+        names  = kwargs.get("ExpressionAttributeNames", {})
+        values = kwargs.get("ExpressionAttributeValues", {})
+        hash_value = None
+        for name, ref in re.findall(r"([#\w]+)\s*=\s*(:\w+)", KeyConditionExpression):
+            if names.get(name, name) == hash_attr:
+                hash_value = values[ref]
+        entries = self._partition(IndexName, hash_value)
+        start  = kwargs.get("ExclusiveStartKey")
+        limit  = kwargs.get("Limit")
+        fields = _projected_fields(kwargs)
+        filter_expr = kwargs.get("FilterExpression")
+
+        if kwargs.get("ScanIndexForward", True):
+            begin = bisect.bisect_right(entries, (start[range_attr], start[self.hash_key])) if start else 0
+            ordered = entries[begin:]
+        else:
+            end = bisect.bisect_left(entries, (start[range_attr], start[self.hash_key])) if start else len(entries)
+            ordered = entries[:end][::-1]
+        page: List[Dict[str, Any]] = []
+        read_bytes = returned_bytes = scanned = 0
+        last = None
+        for range_value, key in ordered:
+            item = self.items[key]
+            if not matches(KeyConditionExpression, item, kwargs):
+                continue
+            sizes = self._sizes[key]
+            read_bytes += sum(sizes.values())
+            scanned += 1
+            if read_bytes >= PAGE_BYTES or (limit and scanned >= limit):
+                last = (range_value, key)
+            if not filter_expr or matches(filter_expr, item, kwargs):
+                if fields is None:
+                    page.append(dict(item))
+                    returned_bytes += sum(sizes.values())
+                else:
+                    page.append({f: item[f] for f in fields if f in item})
+                    returned_bytes += sum(sizes.get(f, 0) for f in fields)
+            if last is not None:
+                break
+
+        if last is not None and last == ordered[-1]:
+            last = None
+        self.latency.wait(returned_bytes)
+        response: Dict[str, Any] = {"Items": page, "Count": len(page), "ScannedCount": scanned}
+        if last is not None:
+            response["LastEvaluatedKey"] = {
+                self.hash_key: last[1], range_attr: last[0], hash_attr: hash_value,
+            }
+        return response
+
+
+class LocalDynamoDBClient:
+    """Low-level-client facade (`client.scan(TableName=…)` etc.) over LocalTables."""
+
+    def __init__(self) -> None:
+        self.tables: Dict[str, LocalTable] = {}
+        self.unprocessed_rate = 0.0   # share of BatchWriteItem puts returned as UnprocessedItems
+        self.tokens: Set[str] = set() # TransactWriteItems client request tokens seen
+
+    def batch_write_item(self, RequestItems: Dict[str, List[Dict[str, Any]]], **kwargs: Any) -> Dict[str, Any]:
+        if sum(len(r) for r in RequestItems.values()) > 25:
+            raise ClientError({"Error": {"Code": "ValidationException",
+                                         "Message": "Too many items requested for the BatchWriteItem call"}},
+                              "BatchWriteItem")
+        unprocessed: Dict[str, List[Dict[str, Any]]] = {}
+        for name, requests in RequestItems.items():
+            left = self.tables[name].batch_put([r["PutRequest"]["Item"] for r in requests],
+                                               self.unprocessed_rate)
+            if left:
+                unprocessed[name] = [{"PutRequest": {"Item": item}} for item in left]
+        return {"UnprocessedItems": unprocessed}
+
+    def scan(self, TableName: str, **kwargs: Any) -> Dict[str, Any]:
+        return self.tables[TableName].scan(**kwargs)
+
+    def query(self, TableName: str, **kwargs: Any) -> Dict[str, Any]:
+        return self.tables[TableName].query(**kwargs)
+
+    def update_item(self, TableName: str, **kwargs: Any) -> Dict[str, Any]:
+        return self.tables[TableName].update_item(**kwargs)
+
+    def batch_get_item(self, RequestItems: Dict[str, Dict[str, Any]], **kwargs: Any) -> Dict[str, Any]:
+        responses = {name: [r["Item"] for r in (self.tables[name].get_item(Key=key) for key in req["Keys"])
+                            if "Item" in r]
+                     for name, req in RequestItems.items()}
+        return {"Responses": responses, "UnprocessedKeys": {}}
+
+    def transact_write_items(self, TransactItems: List[Dict[str, Any]], ClientRequestToken: str = "",
+                             **kwargs: Any) -> Dict[str, Any]:
+        """Update-only transactions; a repeated ClientRequestToken is a no-op, as in DynamoDB."""
+        if ClientRequestToken in self.tokens:
+            return {}
+        self.tokens.add(ClientRequestToken)
+        for entry in TransactItems:
+            update = dict(entry["Update"])
+            self.tables[update.pop("TableName")].update_item(**update)
+        return {}
+
+
+class LocalDynamoDB:
+    """Stand-in for `boto3.resource("dynamodb")`: `.Table(name)` and `.meta.client`."""
+
+    def __init__(self, latency: Optional[Latency] = None) -> None:
+        self.latency = latency or Latency()
+        self.meta    = SimpleNamespace(client=LocalDynamoDBClient())
+
+    def Table(self, name: str, hash_key: str = "feedbackId") -> LocalTable:
+        tables = self.meta.client.tables
+        if name not in tables:
+            table = LocalTable(name, hash_key, self.latency)
+            table.meta = self.meta
+            tables[name] = table
+        return tables[name]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# BEDROCK RUNTIME
+# ─────────────────────────────────────────────────────────────────────────────
+
+_BATCH_LABEL = re.compile(r'Feedback id="(f\d+)":')
+
+
+class _Body:
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+
+    def read(self) -> bytes:
+        return self._data
+
+
+class _EventStream:
+    """Iterable of {"chunk": {"bytes": ...}} events, like botocore's EventStream."""
+
+    def __init__(self, events) -> None:
+        self._events = events
+        self.closed  = False
+
+    def __iter__(self):
+        return self._events
+
+    def close(self) -> None:
+        self.closed = True
+        self._events.close()
+
+
+class LocalBedrock:
+    """
+    Deterministic stand-in for `bedrock-runtime.invoke_model` and
+    `invoke_model_with_response_stream` on Claude messages. Single prompts
+    get one JSON object; batched prompts (items labelled `Feedback id="fN"`)
+    get a JSON array keyed by id. `drop_ids` and `malformed_ids` let callers
+    exercise the per-item retry path; `capacity` throttles calls beyond that
+    many in flight, and `down` fails every call with ServiceUnavailableException.
+
+    Latency is `latency` to the first token plus `per_output_token_ms` per
+    generated token; answers stop at the request's max_tokens. `preamble` /
+    `trailer` wrap the JSON (a ```json fence, a closing remark), as models
+    sometimes do. Streams send `chunk_tokens` tokens per content delta and
+    stop generating when the caller closes them.
+    """
+
+    def __init__(self, latency: Optional[Latency] = None, per_output_token_ms: float = 0.0,
+                 drop_ids: Optional[List[str]] = None,
+                 malformed_ids: Optional[List[str]] = None,
+                 capacity: Optional[int] = None,
+                 preamble: str = "", trailer: str = "", chunk_tokens: int = 4) -> None:
+        self.latency   = latency or Latency()
+        self.per_output_token_ms = per_output_token_ms
+        self.drop_ids  = set(drop_ids or [])
+        self.malformed_ids = set(malformed_ids or [])
+        self.capacity  = capacity
+        self.preamble  = preamble
+        self.trailer   = trailer
+        self.chunk_tokens = max(1, chunk_tokens)
+        self.max_tokens_requested: List[int] = []
+        self.down      = False
+        self.calls     = 0
+        self.rejected  = 0
+        self.in_flight = 0
+        self.input_tokens  = 0
+        self.output_tokens = 0
+        self._lock = threading.Lock()
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self.down:
+                self.rejected += 1
+                raise ClientError({"Error": {"Code": "ServiceUnavailableException",
+                                             "Message": "Bedrock is unavailable."}}, "InvokeModel")
+            if self.capacity is not None and self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise ClientError({"Error": {"Code": "ThrottlingException",
+                                             "Message": "Too many requests, please wait."}}, "InvokeModel")
+            self.in_flight += 1
+
+    @staticmethod
+    def analysis(text: str) -> Dict[str, Any]:
+        lowered = text.lower()
+        positive = sum(lowered.count(w) for w in ("great", "strong", "helpful", "clearly", "initiative"))
+        negative = sum(lowered.count(w) for w in ("misses", "improve", "late", "poor"))
+        sentiment = "positive" if positive > negative else "negative" if negative > positive else "neutral"
+        return {
+            "sentiment": sentiment,
+            "topics": ["communication skills", "collaboration", "time management"],
+            "summary": f"Feedback is {sentiment} overall with clear themes for HR review.",
+            "strengths": ["communication"] if positive else [],
+            "improvements": ["planning"] if negative else [],
+            "competency_areas": ["Communication"],
+            "priority_level": "medium",
+        }
+
+    def invoke_model(self, modelId: str, body: str, **kwargs: Any) -> Dict[str, Any]:
+        self._admit()
+        try:
+            prompt, text, stop_reason = self._answer(body)
+            out_tokens = self._account(prompt, len(text) // 4 + 1)
+            self.latency.wait()
+            if self.per_output_token_ms:
+                time.sleep(self.per_output_token_ms * out_tokens / 1000.0)
+            payload = {
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": stop_reason,
+                "usage":   {"input_tokens": len(prompt) // 4 + 1, "output_tokens": out_tokens},
+            }
+            return {"body": _Body(json.dumps(payload).encode("utf-8"))}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def invoke_model_with_response_stream(self, modelId: str, body: str, **kwargs: Any) -> Dict[str, Any]:
+        self._admit()
+        try:
+            prompt, text, stop_reason = self._answer(body)
+        except Exception:
+            with self._lock:
+                self.in_flight -= 1
+            raise
+        self.latency.wait()   # time to first token
+        return {"body": _EventStream(self._events(prompt, text, stop_reason))}
+
+    def _events(self, prompt: str, text: str, stop_reason: str):
+        def event(payload: Dict[str, Any]) -> Dict[str, Any]:
+            return {"chunk": {"bytes": json.dumps(payload).encode("utf-8")}}
+
+        in_tokens, sent = len(prompt) // 4 + 1, 0   # sent: characters
+        step = 4 * self.chunk_tokens
+        try:
+            yield event({"type": "message_start", "message": {
+                "role": "assistant", "usage": {"input_tokens": in_tokens, "output_tokens": 1}}})
+            yield event({"type": "content_block_start", "index": 0,
+                         "content_block": {"type": "text", "text": ""}})
+            for start in range(0, len(text), step):
+                piece = text[start:start + step]
+                if self.per_output_token_ms:
+                    time.sleep(self.per_output_token_ms * len(piece) / 4 / 1000.0)
+                sent += len(piece)
+                yield event({"type": "content_block_delta", "index": 0,
+                             "delta": {"type": "text_delta", "text": piece}})
+            yield event({"type": "content_block_stop", "index": 0})
+            yield event({"type": "message_delta", "delta": {"stop_reason": stop_reason},
+                         "usage": {"output_tokens": len(text) // 4 + 1}})
+            yield event({"type": "message_stop"})
+        finally:
+            # Closed early or finished: only what was generated is billed.
+            self._account(prompt, sent // 4 + 1)
+            with self._lock:
+                self.in_flight -= 1
+
+    def _account(self, prompt: str, out_tokens: int) -> int:
+        with self._lock:
+            self.calls += 1
+            self.input_tokens  += len(prompt) // 4 + 1
+            self.output_tokens += out_tokens
+        return out_tokens
+
+    def _answer(self, body: str) -> tuple:
+        request = json.loads(body)
+        prompt  = request["messages"][0]["content"][0]["text"]
+        labels  = _BATCH_LABEL.findall(prompt)
+        if labels:
+            chunks = re.split(r'Feedback id="f\d+":', prompt)[1:]
+            answer: List[Dict[str, Any]] = []
+            for label, chunk in zip(labels, chunks):
+                if label in self.drop_ids:
+                    continue
+                entry: Dict[str, Any] = {"id": label, **self.analysis(chunk.split('"""')[1])}
+                if label in self.malformed_ids:
+                    entry.pop("summary")
+                answer.append(entry)
+            text = json.dumps(answer)
+        else:
+            text = json.dumps(self.analysis(prompt.split('"""')[1] if '"""' in prompt else prompt))
+        text = self.preamble + text + self.trailer
+
+        max_tokens = int(request.get("max_tokens", 4096))
+        with self._lock:
+            self.max_tokens_requested.append(max_tokens)
+        if len(text) // 4 + 1 > max_tokens:
+            return prompt, text[:max_tokens * 4], "max_tokens"
+        return prompt, text, "end_turn"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# COMPREHEND
+# ─────────────────────────────────────────────────────────────────────────────
+
+class LocalComprehend:
+    """Stand-in for the Comprehend sentiment / key-phrase calls (single and batch)."""
+
+    def __init__(self, latency: Optional[Latency] = None,
+                 error_indexes: Optional[List[int]] = None) -> None:
+        self.latency = latency or Latency()
+        self.error_indexes = set(error_indexes or [])
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, op: str) -> None:
+        with self._lock:
+            self.calls[op] = self.calls.get(op, 0) + 1
+
+    @staticmethod
+    def _sentiment(text: str) -> str:
+        return LocalBedrock.analysis(text)["sentiment"].upper()
+
+    @staticmethod
+    def _phrases(text: str) -> List[Dict[str, Any]]:
+        words = [w.strip(".,") for w in text.split() if len(w) > 5]
+        return [{"Text": w, "Score": 0.9} for w in dict.fromkeys(words)][:8]
+
+    def detect_sentiment(self, Text: str, LanguageCode: str) -> Dict[str, Any]:
+        self._count("DetectSentiment")
+        self.latency.wait()
+        return {"Sentiment": self._sentiment(Text)}
+
+    def detect_key_phrases(self, Text: str, LanguageCode: str) -> Dict[str, Any]:
+        self._count("DetectKeyPhrases")
+        self.latency.wait()
+        return {"KeyPhrases": self._phrases(Text)}
+
+    def _batch(self, op: str, texts: List[str], fn) -> Dict[str, Any]:
+        self._count(op)
+        if len(texts) > 25:
+            raise ClientError({"Error": {"Code": "BatchSizeLimitExceededException",
+                                         "Message": "too many documents"}}, op)
+        self.latency.wait()
+        results, errors = [], []
+        for i, text in enumerate(texts):
+            if i in self.error_indexes:
+                errors.append({"Index": i, "ErrorCode": "InternalServerException",
+                               "ErrorMessage": "simulated"})
+            else:
+                results.append({"Index": i, **fn(text)})
+        return {"ResultList": results, "ErrorList": errors}
+
+    def batch_detect_sentiment(self, TextList: List[str], LanguageCode: str) -> Dict[str, Any]:
+        return self._batch("BatchDetectSentiment", TextList,
+                           lambda t: {"Sentiment": self._sentiment(t)})
+
+    def batch_detect_key_phrases(self, TextList: List[str], LanguageCode: str) -> Dict[str, Any]:
+        return self._batch("BatchDetectKeyPhrases", TextList,
+                           lambda t: {"KeyPhrases": self._phrases(t)})
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# S3
+# ─────────────────────────────────────────────────────────────────────────────
+
+class LocalS3:
+    """Dict-backed buckets: put/get/list_objects_v2 (paginated)/delete_objects."""
+
+    def __init__(self, latency: Optional[Latency] = None) -> None:
+        self.latency = latency or Latency()
+        self.objects: Dict[str, Dict[str, bytes]] = {}
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, op: str) -> None:
+        with self._lock:
+            self.calls[op] = self.calls.get(op, 0) + 1
+
+    def put_object(self, Bucket: str, Key: str, Body: Any, **kwargs: Any) -> Dict[str, Any]:
+        self._count("PutObject")
+        data = Body.encode("utf-8") if isinstance(Body, str) else bytes(Body)
+        self.latency.wait(len(data))
+        with self._lock:
+            self.objects.setdefault(Bucket, {})[Key] = data
+        return {"ETag": '"' + hashlib.md5(data).hexdigest() + '"'}
+
+    def get_object(self, Bucket: str, Key: str, **kwargs: Any) -> Dict[str, Any]:
+        self._count("GetObject")
+        data = self.objects.get(Bucket, {}).get(Key)
+        if data is None:
+            raise ClientError({"Error": {"Code": "NoSuchKey", "Message": "The specified key does not exist."}},
+                              "GetObject")
+        self.latency.wait(len(data))
+        return {"Body": _Body(data), "ContentLength": len(data)}
+
+    def list_objects_v2(self, Bucket: str, Prefix: str = "", MaxKeys: int = 1000,
+                        ContinuationToken: Optional[str] = None, **kwargs: Any) -> Dict[str, Any]:
+        self._count("ListObjectsV2")
+        self.latency.wait()
+        keys = sorted(k for k in self.objects.get(Bucket, {}) if k.startswith(Prefix))
+        begin = bisect.bisect_right(keys, ContinuationToken) if ContinuationToken else 0
+        page = keys[begin:begin + MaxKeys]
+        response: Dict[str, Any] = {
+            "Contents": [{"Key": k, "Size": len(self.objects[Bucket][k])} for k in page],
+            "KeyCount": len(page),
+            "IsTruncated": begin + MaxKeys < len(keys),
+        }
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = page[-1]
+        return response
+
+    def delete_objects(self, Bucket: str, Delete: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        self._count("DeleteObjects")
+        self.latency.wait()
+        if len(Delete["Objects"]) > 1000:
+            raise ClientError({"Error": {"Code": "MalformedXML", "Message": "too many keys"}}, "DeleteObjects")
+        with self._lock:
+            for obj in Delete["Objects"]:
+                self.objects.get(Bucket, {}).pop(obj["Key"], None)
+        return {"Deleted": [{"Key": o["Key"]} for o in Delete["Objects"]]}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# EVENTBRIDGE
+# ─────────────────────────────────────────────────────────────────────────────
+
+class LocalEventBridge:
+    """Stand-in for `events.put_events`; accepted entries are kept in `entries`."""
+
+    def __init__(self, latency: Optional[Latency] = None, fail: bool = False,
+                 reject_rate: float = 0.0) -> None:
+        self.latency = latency or Latency()
+        self.fail    = fail
+        self.reject_rate = reject_rate   # share of entries answered with an ErrorCode
+        self.entries: List[Dict[str, Any]] = []
+        self.calls   = 0
+        self._lock = threading.Lock()
+
+    def put_events(self, Entries: List[Dict[str, Any]], **kwargs: Any) -> Dict[str, Any]:
+        with self._lock:
+            self.calls += 1
+        if len(Entries) > 10:
+            raise ClientError({"Error": {"Code": "ValidationException",
+                                         "Message": "Entries exceeds 10"}}, "PutEvents")
+        self.latency.wait(sum(len(e.get("Detail", "")) for e in Entries))
+        if self.fail:
+            raise ClientError({"Error": {"Code": "InternalException", "Message": "unavailable"}}, "PutEvents")
+        results: List[Dict[str, Any]] = []
+        with self._lock:
+            for entry in Entries:
+                if self.reject_rate and random.random() < self.reject_rate:
+                    results.append({"ErrorCode": "InternalFailure", "ErrorMessage": "throttled"})
+                    continue
+                self.entries.append(entry)
+                results.append({"EventId": hashlib.md5(entry.get("Detail", "").encode("utf-8")).hexdigest()})
+        return {"FailedEntryCount": sum(1 for r in results if "ErrorCode" in r), "Entries": results}
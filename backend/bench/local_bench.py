@@ -0,0 +1,47 @@
+"""
+Local lexicon analysis (local_analysis.analyse) throughput on one core, and
+how much of the traffic AI_PROVIDER=tiered would keep local at a few
+confidence thresholds.
+
+    python -m bench.local_bench --items 20000 --words 20,60,200
+"""
+
+import argparse
+import time
+from collections import Counter
+
+import local_analysis
+
+from bench.synthetic import feedback_items
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument("--words", default="20,60,200", help="message lengths (words) to test")
+    parser.add_argument("--thresholds", default="0.4,0.6,0.8")
+    parser.add_argument("--max-chars", type=int, default=600, help="tiered LOCAL_MAX_CHARS")
+    args = parser.parse_args()
+    thresholds = [float(t) for t in args.thresholds.split(",") if t.strip()]
+
+    print(f"{'words':>6}{'msgs/s':>10}{'us/msg':>9}  sentiment mix" + "".join(
+        f"{f'kept@{t:g}':>10}" for t in thresholds))
+    for words in [int(w) for w in args.words.split(",") if w.strip()]:
+        messages = [it["message"] for it in feedback_items(args.items, message_words=words)]
+        start = time.perf_counter()
+        results = [local_analysis.analyse(m) for m in messages]
+        secs = time.perf_counter() - start
+
+        mix = Counter(r.result["sentiment"] for r in results)
+        kept = [
+            sum(1 for m, r in zip(messages, results)
+                if r.confidence >= t and len(m) <= args.max_chars) / len(results)
+            for t in thresholds
+        ]
+        print(f"{words:>6}{len(messages) / secs:>10.0f}{secs / len(messages) * 1e6:>9.1f}  "
+              f"{'/'.join(str(mix[s]) for s in ('positive', 'neutral', 'negative')):<13}"
+              + "".join(f"{k:>10.0%}" for k in kept))
+
+
+if __name__ == "__main__":
+    main()
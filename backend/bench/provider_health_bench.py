@@ -0,0 +1,120 @@
+"""
+Bedrock under a burst and during an outage, with and without the provider
+health layer (provider_health.py), against the local stand-ins.
+
+  burst   `--events` FeedbackSubmitted events from `--threads` concurrent
+          callers; Bedrock throttles beyond `--capacity` calls in flight
+  outage  Bedrock answers every call with ServiceUnavailableException
+
+"before" calls Bedrock directly (a throttle or outage marks aiError);
+"after" runs the AIMD limit + circuit breaker with Comprehend failover.
+The stand-ins raise at once where the SDK would retry first, so the
+"before" error counts are an upper bound.
+
+    python -m bench.provider_health_bench --events 200 --threads 32 --capacity 6
+"""
+
+import argparse
+import contextlib
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ca-central-1")
+os.environ.pop("AI_CACHE_TABLE_NAME", None)
+os.environ.pop("PROVIDER_HEALTH_TABLE_NAME", None)
+os.environ["METRICS_ENABLED"] = "false"
+
+import ai_cache               # noqa: E402
+import fanout                 # noqa: E402
+import lambda_function as lf  # noqa: E402
+import provider_health        # noqa: E402
+import storage                # noqa: E402
+
+from bench.local_aws import Latency, LocalBedrock, LocalComprehend, LocalDynamoDB   # noqa: E402
+
+_guarded = lf.guarded_bedrock_analysis
+
+
+def _direct(message: str, failover: bool = True) -> Dict[str, Any]:
+    return lf.call_bedrock_analysis(message)
+
+
+def _install(guarded: bool, args: argparse.Namespace) -> None:
+    ddb = LocalDynamoDB(Latency(args.ddb_ms))
+    lf.table = ddb.Table(lf.TABLE_NAME)
+    lf.store = storage.DynamoFeedbackStore(lf.table, lf.TABLE_NAME, lf.INGEST_CONCURRENCY)
+    lf.ai_result_cache = ai_cache.AIResultCache(ddb.Table("ai-cache", "cacheKey"), max_entries=0)
+    lf.comprehend = LocalComprehend(Latency(args.comprehend_ms))
+    lf.bedrock = LocalBedrock(Latency(args.bedrock_ms), capacity=args.capacity)
+    lf.AI_PROVIDER = lf.MODEL_PROVIDER = "bedrock"
+    lf.io = fanout.FanOut(8)
+    lf.guarded_bedrock_analysis = _guarded if guarded else _direct
+    lf.bedrock_health = provider_health.ProviderHealth(
+        provider_health.ConcurrencyLimiter(args.limit, max_limit=64),
+        provider_health.CircuitBreaker("bedrock", failure_threshold=5, open_seconds=args.open_seconds),
+        max_wait_s=args.queue_wait_ms / 1000,
+    )
+
+
+def _run(scenario: str, guarded: bool, args: argparse.Namespace) -> Dict[str, Any]:
+    _install(guarded, args)
+    lf.bedrock.down = scenario == "outage"
+
+    def _event(i: int) -> None:
+        lf.table.put_item(Item={"feedbackId": f"f{i}", "timestamp": "2026-10-01T00:00:00+00:00"})
+        lf.lambda_handler({"source": "talent.feedback", "detail-type": "FeedbackSubmitted", "detail": {
+            "feedbackId": f"f{i}", "timestamp": "2026-10-01T00:00:00+00:00",
+            "message": f"Great communicator who takes initiative and mentors juniors. Event {i}.",
+        }}, None)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(_event, range(args.events)))
+    elapsed = time.perf_counter() - start
+
+    outcome = Counter(
+        "aiError" if item.get("aiError") else item.get("aiProvider", "none")
+        for item in lf.table.items.values()
+    )
+    return {
+        "scenario": scenario, "mode": "after" if guarded else "before", "seconds": elapsed,
+        "bedrock": outcome["bedrock"], "comprehend": outcome["comprehend"], "errors": outcome["aiError"],
+        "attempts": lf.bedrock.calls + lf.bedrock.rejected, "rejected": lf.bedrock.rejected,
+        "breaker": lf.bedrock_health.breaker.opened,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--capacity", type=int, default=6, help="Bedrock calls in flight before throttling")
+    parser.add_argument("--limit", type=int, default=8, help="starting AIMD limit")
+    parser.add_argument("--queue-wait-ms", type=float, default=2000.0)
+    parser.add_argument("--open-seconds", type=float, default=30.0)
+    parser.add_argument("--ddb-ms", type=float, default=5.0)
+    parser.add_argument("--comprehend-ms", type=float, default=60.0)
+    parser.add_argument("--bedrock-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    rows = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), \
+            contextlib.redirect_stderr(devnull):
+        for scenario in ("burst", "outage"):
+            for guarded in (False, True):
+                rows.append(_run(scenario, guarded, args))
+
+    print(f"{args.events} events, {args.threads} concurrent callers, Bedrock {args.bedrock_ms:g} ms "
+          f"(capacity {args.capacity}), Comprehend {args.comprehend_ms:g} ms\n")
+    print(f"{'scenario':<9}{'mode':<8}{'bedrock':>8}{'comprehend':>11}{'aiError':>8}"
+          f"{'attempts':>10}{'rejected':>10}{'opened':>8}{'wall':>9}")
+    for r in rows:
+        print(f"{r['scenario']:<9}{r['mode']:<8}{r['bedrock']:>8}{r['comprehend']:>11}{r['errors']:>8}"
+              f"{r['attempts']:>10}{r['rejected']:>10}{r['breaker']:>8}{r['seconds']:>8.1f}s")
+
+
+if __name__ == "__main__":
+    main()
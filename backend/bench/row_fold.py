@@ -0,0 +1,99 @@
+"""
+Row-wise /insights fold: the dict-at-a-time accumulator the columnar engine
+(columnar.ColumnarAccumulator) replaced. Kept as aggregate_bench's reference
+mode; the Lambda does not use it.
+"""
+
+import heapq
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import topic_norm
+from aggregation import RECENT_SIZE, SENTIMENTS
+
+
+class InsightsAccumulator:
+    """Fold feedback items page by page; merge accumulators across segments."""
+
+    def __init__(self, current_month: str, recent_size: int = RECENT_SIZE,
+                 normalize: Callable[[Any], str] = topic_norm.normalize_topic) -> None:
+        self.current_month = current_month
+        self._normalize    = normalize
+        self.recent_size   = recent_size
+        self.total         = 0
+        self.this_month    = 0
+        self.sentiment_counts: Dict[str, int] = {s: 0 for s in SENTIMENTS}
+        self.monthly: Dict[str, Dict[str, int]] = {}
+        self.topics: Counter = Counter()
+        # min-heap of (timestamp, feedbackId, review) → newest N processed reviews
+        self._recent: List[Tuple[str, str, Dict[str, Any]]] = []
+
+    def add(self, item: Dict[str, Any]) -> None:
+        sentiment = (item.get("sentiment") or "neutral").lower()
+        if sentiment not in self.sentiment_counts:
+            sentiment = "neutral"
+        self.total += 1
+        self.sentiment_counts[sentiment] += 1
+
+        ts = item.get("timestamp", "")
+        month_key = ts[:7] if ts else "unknown"
+        if month_key == self.current_month:
+            self.this_month += 1
+        bucket = self.monthly.get(month_key)
+        if bucket is None:
+            bucket = self.monthly[month_key] = {s: 0 for s in SENTIMENTS}
+        bucket[sentiment] += 1
+
+        if item.get("summary") and item.get("aiProcessed"):
+            self._push_recent((ts, item.get("feedbackId", ""), {
+                "employeeName": item.get("employeeName", "Unknown Employee"),
+                "department":   item.get("department", ""),
+                "reviewPeriod": item.get("reviewPeriod", ""),
+                "rating":       item.get("rating", 0),
+                "sentiment":    sentiment,
+                "summary":      item.get("summary", ""),
+                "topics":       item.get("topics", []),
+                "timestamp":    ts[:10] if ts else "",
+            }))
+
+        topics = item.get("topics")
+        if isinstance(topics, list):
+            for topic in topics:
+                label = self._normalize(topic)
+                if label:
+                    self.topics[label] += 1
+
+    def add_page(self, items: Iterable[Dict[str, Any]]) -> None:
+        for item in items:
+            self.add(item)
+
+    def _push_recent(self, entry: Tuple[str, str, Dict[str, Any]]) -> None:
+        if len(self._recent) < self.recent_size:
+            heapq.heappush(self._recent, entry)
+        elif entry[:2] > self._recent[0][:2]:
+            heapq.heapreplace(self._recent, entry)
+
+    def merge(self, other: "InsightsAccumulator") -> "InsightsAccumulator":
+        self.total      += other.total
+        self.this_month += other.this_month
+        for s, n in other.sentiment_counts.items():
+            self.sentiment_counts[s] += n
+        for month, counts in other.monthly.items():
+            bucket = self.monthly.setdefault(month, {s: 0 for s in SENTIMENTS})
+            for s, n in counts.items():
+                bucket[s] += n
+        self.topics.update(other.topics)
+        for entry in other._recent:
+            self._push_recent(entry)
+        return self
+
+    def reviews(self) -> List[Dict[str, Any]]:
+        """Newest processed reviews, oldest first (so [-N:] keeps the newest N)."""
+        return [r for _, _, r in sorted(self._recent, key=lambda e: e[:2])]
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        return [
+            {"summary": r["summary"], "sentiment": r["sentiment"],
+             "topics": r["topics"], "timestamp": r["timestamp"]}
+            for r in self.reviews()
+        ]
@@ -0,0 +1,81 @@
+"""
+Parallel segmented scan vs. the original sequential scan-then-aggregate loop,
+against the in-process DynamoDB stand-in with injected page latency.
+
+    python -m bench.scan_bench --items 50000 --segments 1,2,4,8 --latency-ms 25
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+import scan_engine
+from aggregation import PROJECTED_FIELDS
+from columnar import ColumnarAccumulator
+
+from bench.local_aws import Latency, LocalDynamoDB
+from bench.synthetic import feedback_items
+
+
+def _baseline(table: Any, month: str) -> ColumnarAccumulator:
+    """The pre-engine shape: one sequential full-attribute scan into a list, then fold."""
+    items: List[Dict[str, Any]] = []
+    response = table.scan()
+    items.extend(response.get("Items", []))
+    while "LastEvaluatedKey" in response:
+        response = table.scan(ExclusiveStartKey=response["LastEvaluatedKey"])
+        items.extend(response.get("Items", []))
+    acc = ColumnarAccumulator(month)
+    acc.add_page(items)
+    return acc
+
+
+def _engine(table: Any, month: str, segments: int) -> ColumnarAccumulator:
+    return scan_engine.parallel_scan(
+        table.meta.client, table.name, segments,
+        new_partial=lambda: ColumnarAccumulator(month),
+        fold_page=ColumnarAccumulator.add_page,
+        merge=ColumnarAccumulator.merge,
+        projection=PROJECTED_FIELDS,
+    )
+
+
+def _measure(fn: Callable[[], ColumnarAccumulator]) -> Tuple[float, float, int]:
+    start = time.perf_counter()
+    acc = fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024), acc.total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=20000)
+    parser.add_argument("--segments", default="1,2,4,8")
+    parser.add_argument("--latency-ms", type=float, default=25.0, help="round trip per Scan page")
+    parser.add_argument("--per-kb-ms", type=float, default=0.02, help="transfer cost per KB returned")
+    args = parser.parse_args()
+
+    ddb = LocalDynamoDB(Latency(args.latency_ms, args.per_kb_ms))
+    table = ddb.Table("FeedbackSubmissions")
+    table.load(list(feedback_items(args.items)))
+    month = datetime.now(timezone.utc).strftime("%Y-%m")
+    table.scan(Limit=1)   # build the stand-in's index outside the timings
+
+    print(f"items={args.items} page_latency={args.latency_ms}ms per_kb={args.per_kb_ms}ms")
+    print(f"{'mode':<22}{'seconds':>10}{'speed-up':>10}{'peak MiB':>10}{'items':>10}")
+    base_s, base_mb, n = _measure(lambda: _baseline(table, month))
+    print(f"{'sequential (before)':<22}{base_s:>10.3f}{1.0:>10.2f}{base_mb:>10.1f}{n:>10}")
+    for segments in [int(s) for s in args.segments.split(",") if s.strip()]:
+        secs, mb, n = _measure(lambda: _engine(table, month, segments))
+        label = f"parallel x{segments}"
+        print(f"{label:<22}{secs:>10.3f}{base_s / secs:>10.2f}{mb:>10.1f}{n:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Storage backends side by side (STORAGE_BACKEND, storage.py / sqlite_store.py).
+
+  parity   the same handler sequence — seeded items, POST /feedback,
+           POST /feedback/batch, the async analyses their events trigger,
+           GET /insights (full, compact, filtered) and a paged GET /reviews
+           walk — run on the local DynamoDB stand-in (no rollups: scan, GSI
+           queries, review index) and on a SQLite file; responses compared
+  scale    uncached GET /insights on a SQLite file of --rows items, i.e. the
+           GROUP BY pushdown on its own (0 skips it)
+
+    python -m bench.storage_bench --items 3000 --rows 1000000
+"""
+
+import argparse
+import contextlib
+import copy
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ca-central-1")
+os.environ.pop("AI_CACHE_TABLE_NAME", None)
+os.environ["METRICS_ENABLED"] = "false"
+
+import insights_query         # noqa: E402
+import lambda_function as lf  # noqa: E402
+import review_index           # noqa: E402
+import storage                # noqa: E402
+from sqlite_store import SQLiteFeedbackStore   # noqa: E402
+
+from bench.local_aws import LocalBedrock, LocalComprehend, LocalDynamoDB, LocalEventBridge   # noqa: E402
+from bench.synthetic import feedback_items   # noqa: E402
+
+INSIGHTS_QUERIES: List[Optional[Dict[str, str]]] = [
+    None,
+    {"view": "compact"},
+    {"department": "Engineering"},
+    {"reviewPeriod": "2026-H1", "view": "compact"},
+    {"from": "2026-01-01", "to": "2026-03-31"},
+    {"department": "Sales", "from": "2025-06-01"},
+]
+REVIEW_PAGES = 8
+
+
+def _seed_items(count: int) -> List[Dict[str, Any]]:
+    # The review index is walked back from the current month: no future items.
+    now = datetime.now(timezone.utc).strftime("%Y-%m")
+    return [it for it in feedback_items(count, seed=11, message_words=20) if it["timestamp"][:7] <= now]
+
+
+def _sqlite_store(path: str) -> SQLiteFeedbackStore:
+    return SQLiteFeedbackStore(path, lf.topic_normalizer,
+                               row_builder=lambda item: lf._review_row(item, date_only=True))
+
+
+def _install(backend: str, items: List[Dict[str, Any]], path: str) -> None:
+    ddb = LocalDynamoDB()
+    lf.table, lf.rollup_table = ddb.Table(lf.TABLE_NAME), None
+    if backend == storage.DYNAMODB:
+        for index, attr in ((insights_query.DEPARTMENT_INDEX, "department"),
+                            (insights_query.REVIEW_PERIOD_INDEX, "reviewPeriod"),
+                            (insights_query.TIME_BUCKET_INDEX, insights_query.TIME_BUCKET_ATTR),
+                            (review_index.REVIEW_INDEX, review_index.REVIEW_BUCKET)):
+            lf.table.add_index(index, attr, "timestamp")
+        lf.table.load(copy.deepcopy(items))
+        lf.store = storage.DynamoFeedbackStore(lf.table, lf.TABLE_NAME, lf.INGEST_CONCURRENCY)
+    else:
+        lf.store = _sqlite_store(path)
+        lf.store.put_many(copy.deepcopy(items))
+    lf.events     = LocalEventBridge()
+    lf.bedrock    = LocalBedrock()
+    lf.comprehend = LocalComprehend()
+    lf.insights_cache.invalidate()
+
+
+def _call(event: Dict[str, Any]) -> Any:
+    resp = lf.lambda_handler(event, None)
+    body = resp.get("body")
+    return resp["statusCode"], json.loads(body) if body else None
+
+
+def _get(path: str, params: Optional[Dict[str, str]]) -> Any:
+    lf.insights_cache.invalidate()
+    return _call({"httpMethod": "GET", "path": path, "headers": {}, "queryStringParameters": params})
+
+
+def _record(i: int) -> Dict[str, Any]:
+    return {
+        "name": "Bench", "email": f"bench{i}@example.com",
+        "message": f"Clear communicator who mentors juniors; estimates slip at times. #{i}",
+        "employeeName": f"Employee {i}", "department": ("Engineering", "Sales")[i % 2],
+        "reviewPeriod": "2026-H2", "rating": 1 + i % 5,
+    }
+
+
+def _normalised_insights(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Topic ties may come out in any order: sort them; timestamps are dates already."""
+    out = dict(payload)
+    top = sorted(payload.get("topTopics", []), key=lambda t: (-t["count"], t["topic"]))
+    out["topTopics"] = [(t["topic"], t["count"]) for t in top]
+    if top:
+        out["topTopic"] = top[0]["topic"]
+    topics = payload.get("topics", [])
+    out["topics"] = sorted(json.dumps(t, sort_keys=True) for t in topics)
+    return out
+
+
+def _scenario(backend: str, items: List[Dict[str, Any]], path: str) -> Dict[str, Any]:
+    _install(backend, items, path)
+    results: Dict[str, Any] = {}
+    results["post"] = [_call({"httpMethod": "POST", "path": "/feedback", "headers": {},
+                              "body": json.dumps(_record(i))})[0] for i in range(20)]
+    status, body = _call({"httpMethod": "POST", "path": "/feedback/batch", "headers": {},
+                          "body": json.dumps({"records": [_record(100 + i) for i in range(60)] + [{}]})})
+    results["batch"] = (status, body["accepted"], body["rejected"])
+
+    for entry in lf.events.entries:
+        detail = json.loads(entry["Detail"])
+        lf.lambda_handler({"source": entry["Source"], "detail-type": entry["DetailType"],
+                           "detail": detail}, None)
+
+    for params in INSIGHTS_QUERIES:
+        status, payload = _get("/insights", params)
+        results[f"insights {json.dumps(params)}"] = (status, _normalised_insights(payload))
+
+    rows, cursor, pages = [], None, 0
+    while pages < REVIEW_PAGES:
+        status, body = _get("/reviews", {"limit": "25", **({"cursor": cursor} if cursor else {})})
+        rows += [{k: v for k, v in r.items() if k not in ("feedbackId", "timestamp")}
+                 for r in body["reviews"]]
+        cursor, pages = body["nextCursor"], pages + 1
+        if not cursor:
+            break
+    results["reviews"] = rows
+    results["bad cursor"] = _get("/reviews", {"cursor": "bm9wZQ"})[0]
+    return results
+
+
+def _parity(args: argparse.Namespace, workdir: str) -> bool:
+    items = _seed_items(args.items)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        ddb = _scenario(storage.DYNAMODB, items, "")
+        lite = _scenario(storage.SQLITE, items, os.path.join(workdir, "parity.db"))
+    print(f"parity: {len(items)} seeded items + 80 posted, {len(ddb)} checks")
+    same = True
+    for key in ddb:
+        ok = ddb[key] == lite[key]
+        same &= ok
+        if not ok:
+            print(f"  DIFFERENT  {key}")
+    print(f"  {'all responses identical' if same else 'MISMATCH'}\n")
+    return same
+
+
+def _fill(path: str, rows: int) -> float:
+    store = _sqlite_store(path)
+    start = time.perf_counter()
+    chunk: List[Dict[str, Any]] = []
+    for item in feedback_items(rows, seed=5, message_words=20):
+        chunk.append(item)
+        if len(chunk) == 10_000:
+            store.put_many(chunk)
+            chunk = []
+    store.put_many(chunk)
+    store.connection().execute("ANALYZE")
+    return time.perf_counter() - start
+
+
+def _scale(args: argparse.Namespace, workdir: str) -> None:
+    path = args.db or os.path.join(workdir, "scale.db")
+    if not os.path.exists(path):
+        print(f"loading {args.rows:,} rows into {path} ...")
+        print(f"  {_fill(path, args.rows):.1f}s\n")
+    lf.store = _sqlite_store(path)
+    total = lf.store.connection().execute("SELECT COUNT(*) FROM feedback").fetchone()[0]
+    print(f"GET /insights on SQLite, {total:,} rows, cache off, median of {args.repeat}")
+    print(f"{'query':<52}{'p50':>10}{'bytes':>12}")
+    for params in INSIGHTS_QUERIES:
+        samples, size = [], 0
+        for _ in range(args.repeat):
+            lf.insights_cache.invalidate()
+            start = time.perf_counter()
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                resp = lf.lambda_handler({"httpMethod": "GET", "path": "/insights", "headers": {},
+                                          "queryStringParameters": params}, None)
+            samples.append((time.perf_counter() - start) * 1000)
+            size = len(resp["body"])
+        print(f"{json.dumps(params):<52}{statistics.median(samples):>8.0f}ms{size:>12,}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=3000, help="seeded items for the parity run")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="SQLite rows for the scale run")
+    parser.add_argument("--db", default="", help="reuse (or create) this SQLite file for the scale run")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        same = _parity(args, workdir)
+        if args.rows:
+            _scale(args, workdir)
+    raise SystemExit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Single-analysis time-to-result and token use: blocking invoke_model with the
+old fixed max_tokens=500 vs. invoke_model_with_response_stream with early
+JSON termination and the message-sized budget (bedrock_stream.py), against
+the local Bedrock stub emitting chunked streaming events.
+
+  clean    the model answers with the bare JSON object
+  wrapped  the JSON comes inside a ```json fence followed by a closing
+           remark, which the blocking call has to wait for
+
+    python -m bench.stream_bench --calls 30 --first-token-ms 300 --token-ms 8
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import statistics
+import time
+from typing import Any, Dict, List
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ca-central-1")
+os.environ["METRICS_ENABLED"] = "false"
+
+import lambda_function as lf  # noqa: E402
+
+from bench.local_aws import Latency, LocalBedrock   # noqa: E402
+
+TRAILER = ("\n```\n\nThis analysis highlights the employee's collaborative strengths and the areas "
+           "HR may want to follow up on in the next review cycle. Let me know if you need more detail.")
+
+_SENTENCES = [
+    "Great communicator who keeps stakeholders informed.",
+    "Takes initiative on cross-team incidents and writes clear postmortems.",
+    "Deadlines occasionally slip when priorities change late in the sprint.",
+    "Mentors junior engineers patiently and reviews code thoroughly.",
+    "Could improve estimation accuracy on larger pieces of work.",
+]
+
+
+def _messages(count: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(_SENTENCES) for _ in range(rng.randint(1, 12))) for _ in range(count)]
+
+
+def _run(streaming: bool, wrapped: bool, messages: List[str], args: argparse.Namespace) -> Dict[str, Any]:
+    lf.bedrock = LocalBedrock(
+        Latency(args.first_token_ms), per_output_token_ms=args.token_ms, chunk_tokens=args.chunk_tokens,
+        preamble="```json\n" if wrapped else "", trailer=TRAILER if wrapped else "",
+    )
+    lf.BEDROCK_STREAMING = streaming
+    lf.BEDROCK_OUTPUT_TOKENS_MIN = args.floor if streaming else 500
+    samples, failures = [], 0
+    for message in messages:
+        start = time.perf_counter()
+        result = lf.call_bedrock_analysis(message)
+        samples.append((time.perf_counter() - start) * 1000)
+        failures += bool(result.get("parseFailed"))
+    return {
+        "p50": statistics.median(samples), "mean": statistics.fmean(samples),
+        "out": lf.bedrock.output_tokens / len(messages),
+        "reserved": statistics.fmean(lf.bedrock.max_tokens_requested),
+        "calls": lf.bedrock.calls, "failures": failures,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=30)
+    parser.add_argument("--first-token-ms", type=float, default=300.0)
+    parser.add_argument("--token-ms", type=float, default=8.0, help="per generated output token")
+    parser.add_argument("--chunk-tokens", type=int, default=4, help="tokens per streamed delta")
+    parser.add_argument("--floor", type=int, default=lf.BEDROCK_OUTPUT_TOKENS_MIN)
+    args = parser.parse_args()
+
+    messages = _messages(args.calls)
+    rows = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for wrapped in (False, True):
+            for streaming in (False, True):
+                rows.append((("wrapped" if wrapped else "clean"), ("stream" if streaming else "blocking"),
+                             _run(streaming, wrapped, messages, args)))
+
+    print(f"{args.calls} analyses, first token {args.first_token_ms:g} ms, {args.token_ms:g} ms/token\n")
+    print(f"{'answer':<9}{'mode':<10}{'p50':>9}{'mean':>9}{'out tok':>9}{'max_tokens':>12}"
+          f"{'calls':>7}{'parse fail':>12}")
+    for answer, mode, r in rows:
+        print(f"{answer:<9}{mode:<10}{r['p50']:>7.0f}ms{r['mean']:>7.0f}ms{r['out']:>9.1f}"
+              f"{r['reserved']:>12.0f}{r['calls']:>7}{r['failures']:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Deterministic synthetic FeedbackSubmissions items for the benchmarks.
+"""
+
+import random
+import uuid
+from typing import Any, Dict, Iterator
+
+TOPICS = [
+    "communication skills", "technical expertise", "leadership", "time management",
+    "collaboration", "problem-solving", "ownership", "mentoring", "code quality",
+    "stakeholder management", "innovation", "customer focus", "adaptability",
+    "attention to detail", "planning", "documentation", "testing", "delivery",
+]
+DEPARTMENTS = ["Engineering", "Sales", "Marketing", "HR", "Finance", "Support"]
+PERIODS     = ["2025-H1", "2025-H2", "2026-H1", "2026-H2"]
+SENTIMENTS  = ["positive", "positive", "positive", "neutral", "negative"]
+WORDS = (
+    "great team player delivers on time communicates clearly needs to improve "
+    "planning shows initiative mentors juniors misses deadlines occasionally "
+    "strong technical depth helpful in reviews could document more proactive"
+).split()
+
+
+def feedback_item(rng: random.Random, processed_ratio: float = 0.9,
+                  message_words: int = 120) -> Dict[str, Any]:
+    month = rng.randint(1, 12)
+    year  = rng.choice([2025, 2026])
+    ts    = f"{year}-{month:02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00+00:00"
+    processed = rng.random() < processed_ratio
+    item: Dict[str, Any] = {
+        "feedbackId":   str(uuid.UUID(int=rng.getrandbits(128))),
+        "name":         "Reviewer",
+        "email":        "r***@example.com",
+        "message":      " ".join(rng.choice(WORDS) for _ in range(message_words)),
+        "timestamp":    ts,
+        "timeBucket":   ts[:7],
+        "aiProcessed":  processed,
+        "aiProvider":   "bedrock",
+        "employeeName": f"Employee {rng.randint(1, 5000)}",
+        "department":   rng.choice(DEPARTMENTS),
+        "reviewPeriod": rng.choice(PERIODS),
+        "rating":       rng.randint(1, 5),
+        "sentiment":    rng.choice(SENTIMENTS) if processed else None,
+        "topics":       rng.sample(TOPICS, rng.randint(3, 6)) if processed else [],
+        "summary":      "Solid contributor with clear growth areas." if processed else None,
+    }
+    if processed:
+        item["reviewBucket"] = ts[:7]   # sparse review index: analysed items only
+    return item
+
+
+def feedback_items(n: int, seed: int = 7, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield feedback_item(rng, **kwargs)
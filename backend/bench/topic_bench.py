@@ -0,0 +1,95 @@
+"""
+Topic counting: exact Counter vs. the Space-Saving sketch (topic_norm) on a
+Zipf-distributed topic stream with a long tail of distinct topics, folded in
+1000-occurrence pages across merged partials like the scan engine does.
+
+Reports peak memory, seconds, top-10 agreement with the exact count, the
+largest observed overcount and the N/k bound it must stay under.
+
+    python -m bench.topic_bench --occurrences 1000000 --distinct 200000 --capacity 100,1000
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from collections import Counter
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from topic_norm import SpaceSaving
+
+PAGE = 1000
+
+
+def _stream(n: int, distinct: int, skew: float, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    weights = [1.0 / (rank ** skew) for rank in range(1, distinct + 1)]
+    return [f"topic {i}" for i in rng.choices(range(distinct), weights=weights, k=n)]
+
+
+def _pages(stream: List[str]) -> Iterator[Counter]:
+    for start in range(0, len(stream), PAGE):
+        yield Counter(stream[start:start + PAGE])
+
+
+def _exact(stream: List[str], partials: int) -> Dict[str, int]:
+    parts = [Counter() for _ in range(partials)]
+    for i, page in enumerate(_pages(stream)):
+        parts[i % partials].update(page)
+    total = parts[0]
+    for part in parts[1:]:
+        total.update(part)
+    return total
+
+
+def _sketch(capacity: int) -> Callable[[List[str], int], Dict[str, int]]:
+    def run(stream: List[str], partials: int) -> Dict[str, int]:
+        parts = [SpaceSaving(capacity) for _ in range(partials)]
+        for i, page in enumerate(_pages(stream)):
+            parts[i % partials].update(page)
+        total = parts[0]
+        for part in parts[1:]:
+            total.merge(part)
+        return dict(total.top(len(total)))
+    return run
+
+
+def _measure(fn: Callable[[], Dict[str, int]]) -> Tuple[Dict[str, int], float, float]:
+    start = time.perf_counter()
+    fn()
+    secs = time.perf_counter() - start
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, secs, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--occurrences", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=200_000)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent")
+    parser.add_argument("--capacity", default="100,1000")
+    parser.add_argument("--partials", type=int, default=4, help="merged partial aggregates (scan segments)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    stream = _stream(args.occurrences, args.distinct, args.skew, args.seed)
+    exact, secs, mib = _measure(lambda: _exact(stream, args.partials))
+    top10 = [t for t, _ in Counter(exact).most_common(10)]
+    print(f"{args.occurrences} occurrences, {len(exact)} distinct topics, {args.partials} partials\n")
+    print(f"{'mode':<16}{'seconds':>9}{'peak MiB':>10}{'top-10':>8}{'max err':>9}{'N/k':>9}")
+    print(f"{'exact Counter':<16}{secs:>9.3f}{mib:>10.1f}{'10/10':>8}{0:>9}{'-':>9}")
+
+    for capacity in [int(c) for c in args.capacity.split(",") if c.strip()]:
+        est, secs, mib = _measure(lambda: _sketch(capacity)(stream, args.partials))
+        got = [t for t, _ in sorted(est.items(), key=lambda kv: -kv[1])[:10]]
+        worst = max((est[t] - exact[t] for t in est), default=0)
+        assert all(est[t] >= exact[t] for t in est), "Space-Saving must never undercount"
+        print(f"{f'sketch k={capacity}':<16}{secs:>9.3f}{mib:>10.1f}"
+              f"{f'{len(set(got) & set(top10))}/10':>8}{worst:>9}{args.occurrences // capacity:>9}")
+
+
+if __name__ == "__main__":
+    main()
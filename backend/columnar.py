@@ -0,0 +1,185 @@
+"""
+Smart Talent Insight Hub — Columnar Insights Aggregation
+Mergeable partial aggregates for GET /insights. Each scan segment / query
+folds its pages into its own accumulator, and the partials are merged at the
+end. A page is folded as columns instead of one dict at a time:
+
+  • the page's timestamp / sentiment / topics are pulled into flat columns
+    with comprehensions, then counted with collections.Counter (C loop)
+  • months are interned to small integer ids; counts live in a flat
+    array('q') indexed by month_id * 3 + sentiment_code, so normalising
+    (lowercase, validate) runs once per distinct raw value, not per item
+  • topics are counted per page in C, normalised per distinct raw string
+    (topic_norm.TopicNormalizer, memoised) and folded into a Space-Saving sketch,
+    so topic memory is bounded by the sketch capacity, not the vocabulary
+  • the recent-review window only builds review dicts for the page's top-N
+    candidates (heapq.nlargest over row indices), not for every item
+
+Memory is bounded by the distinct months, the topic sketch and the recent-
+review window, never by the number of items scanned. bench/row_fold.py keeps
+the row-wise fold it replaced, for aggregate_bench.
+"""
+
+import heapq
+from array import array
+from collections import Counter
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import topic_norm
+from aggregation import RECENT_SIZE, SENTIMENTS
+
+_SENTIMENT_CODE = {s: i for i, s in enumerate(SENTIMENTS)}
+_NEUTRAL = _SENTIMENT_CODE["neutral"]
+_WIDTH = len(SENTIMENTS)
+
+
+def _sentiment_code(raw: Any) -> int:
+    if not raw or not isinstance(raw, str):
+        return _NEUTRAL
+    return _SENTIMENT_CODE.get(raw.lower(), _NEUTRAL)
+
+
+class ColumnarAccumulator:
+    def __init__(self, current_month: str, recent_size: int = RECENT_SIZE,
+                 normalize: Callable[[Any], str] = topic_norm.normalize_topic,
+                 topic_capacity: int = topic_norm.DEFAULT_CAPACITY) -> None:
+        self.current_month = current_month
+        self.recent_size   = recent_size
+        self.total         = 0
+        self._month_ids: Dict[str, int] = {}
+        self._months: List[str] = []
+        self._cells = array("q")            # [month_id * 3 + sentiment_code] → count
+        self._normalize    = normalize
+        self._topic_sketch = topic_norm.SpaceSaving(topic_capacity)
+        self._codes: Dict[Any, int] = {}    # raw sentiment value → code (memo)
+        self._recent: List[Tuple[str, str, Dict[str, Any]]] = []
+        self._topics_cache: Optional[Counter] = None
+
+    # ── interning ─────────────────────────────────────────────────────────────
+    def _month_id(self, month: str) -> int:
+        mid = self._month_ids.get(month)
+        if mid is None:
+            mid = self._month_ids[month] = len(self._months)
+            self._months.append(month)
+            self._cells.extend([0] * _WIDTH)
+        return mid
+
+    def _code(self, raw: Any) -> int:
+        code = self._codes.get(raw)
+        if code is None:
+            code = self._codes[raw] = _sentiment_code(raw)
+        return code
+
+    # ── folding ───────────────────────────────────────────────────────────────
+    def add(self, item: Dict[str, Any]) -> None:
+        self.add_page([item])
+
+    def add_page(self, items: Iterable[Dict[str, Any]]) -> None:
+        items = items if isinstance(items, list) else list(items)
+        if not items:
+            return
+        self._topics_cache = None
+        self.total += len(items)
+
+        stamps = [it.get("timestamp") or "" for it in items]
+        sentiments = [it.get("sentiment") for it in items]
+
+        # (month, raw sentiment) pairs counted in C; normalised per distinct pair.
+        cells = self._cells
+        for (month, raw), n in Counter(zip([ts[:7] or "unknown" for ts in stamps], sentiments)).items():
+            cells[self._month_id(month) * _WIDTH + self._code(raw)] += n
+
+        topic_lists = [it.get("topics") for it in items]
+        page_topics: Counter = Counter()
+        normalize = self._normalize
+        for raw, n in Counter(chain.from_iterable(
+                t for t in topic_lists if isinstance(t, list))).items():
+            label = normalize(raw) if raw else ""
+            if label:
+                page_topics[label] += n
+        self._topic_sketch.update(page_topics)
+
+        self._fold_recent(items, stamps, sentiments)
+
+    def _fold_recent(self, items: List[Dict[str, Any]], stamps: List[str], sentiments: List[Any]) -> None:
+        if self.recent_size <= 0:   # window served elsewhere (review index)
+            return
+        floor = self._recent[0][:2] if len(self._recent) >= self.recent_size else None
+        rows = [
+            i for i, it in enumerate(items)
+            if it.get("summary") and it.get("aiProcessed")
+            and (floor is None or (stamps[i], it.get("feedbackId", "")) > floor)
+        ]
+        if not rows:
+            return
+        key = lambda i: (stamps[i], items[i].get("feedbackId", ""))   # noqa: E731
+        for i in heapq.nlargest(self.recent_size, rows, key=key):
+            item, ts = items[i], stamps[i]
+            self._push_recent((ts, item.get("feedbackId", ""), {
+                "employeeName": item.get("employeeName", "Unknown Employee"),
+                "department":   item.get("department", ""),
+                "reviewPeriod": item.get("reviewPeriod", ""),
+                "rating":       item.get("rating", 0),
+                "sentiment":    SENTIMENTS[self._code(sentiments[i])],
+                "summary":      item.get("summary", ""),
+                "topics":       item.get("topics", []),
+                "timestamp":    ts[:10] if ts else "",
+            }))
+
+    def _push_recent(self, entry: Tuple[str, str, Dict[str, Any]]) -> None:
+        if len(self._recent) < self.recent_size:
+            heapq.heappush(self._recent, entry)
+        elif entry[:2] > self._recent[0][:2]:
+            heapq.heapreplace(self._recent, entry)
+
+    def merge(self, other: "ColumnarAccumulator") -> "ColumnarAccumulator":
+        self._topics_cache = None
+        self.total += other.total
+        for month, mid in other._month_ids.items():
+            base, other_base = self._month_id(month) * _WIDTH, mid * _WIDTH
+            for s in range(_WIDTH):
+                self._cells[base + s] += other._cells[other_base + s]
+        self._topic_sketch.merge(other._topic_sketch)
+        for entry in other._recent:
+            self._push_recent(entry)
+        return self
+
+    # ── results ───────────────────────────────────────────────────────────────
+    @property
+    def this_month(self) -> int:
+        mid = self._month_ids.get(self.current_month)
+        return 0 if mid is None else sum(self._cells[mid * _WIDTH:(mid + 1) * _WIDTH])
+
+    @property
+    def sentiment_counts(self) -> Dict[str, int]:
+        return {s: sum(self._cells[i::_WIDTH]) for i, s in enumerate(SENTIMENTS)}
+
+    @property
+    def monthly(self) -> Dict[str, Dict[str, int]]:
+        return {
+            month: dict(zip(SENTIMENTS, self._cells[mid * _WIDTH:(mid + 1) * _WIDTH]))
+            for month, mid in self._month_ids.items()
+        }
+
+    @property
+    def topics(self) -> Counter:
+        """Sketch estimates, largest first (exact while distinct topics ≤ capacity)."""
+        if self._topics_cache is None:
+            sketch = self._topic_sketch
+            self._topics_cache = Counter(dict(sketch.top(len(sketch))))
+        return self._topics_cache
+
+    def top_topics(self, k: int) -> List[Tuple[str, int]]:
+        return self._topic_sketch.top(k)
+
+    def reviews(self) -> List[Dict[str, Any]]:
+        """Newest processed reviews, oldest first (so [-N:] keeps the newest N)."""
+        return [r for _, _, r in sorted(self._recent, key=lambda e: e[:2])]
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        return [
+            {"summary": r["summary"], "sentiment": r["sentiment"],
+             "topics": r["topics"], "timestamp": r["timestamp"]}
+            for r in self.reviews()
+        ]
@@ -0,0 +1,297 @@
+"""
+Smart Talent Insight Hub — Analytics Export Pipeline
+Replaces the per-feedback `exports/YYYY-MM/<id>.json` PUT with batched,
+partitioned, compressed files:
+
+  exports/ndjson/month=YYYY-MM/part-<batch>.ndjson.gz     written per stream batch
+  exports/compacted/month=YYYY-MM/part-<parts>.parquet    written by compaction
+
+Analysed items are exported from the feedback table's DynamoDB stream: one
+gzip'd NDJSON object per month per stream batch. The key and the bytes
+(gzip mtime=0) derive from the batch, so a retried batch rewrites the same
+object. Compaction (scheduled, {"action": "compact_exports"}) folds a
+month's new NDJSON parts, a bounded group at a time, into new Parquet files
+(newest analysis per feedbackId within the file) and deletes each group's
+parts once its file is written. Earlier compacted files are never re-read or
+rewritten, so a run's cost tracks the new parts, not the month; the reader
+dedupes across files. A run that reaches its deadline leaves the rest of the
+parts for the next one.
+Parquet needs pyarrow (e.g. the AWS SDK for pandas Lambda layer); without
+it compaction writes gzip'd NDJSON parts instead, and the reader takes both.
+
+CLI from backend/ (uses the default AWS credentials):
+
+    python exports.py read --bucket B --month 2026-10 [--out rows.ndjson]
+    python exports.py compact --bucket B --month 2026-10
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+PREFIX = "exports"
+
+# Exported columns — analysis output plus slicing keys; no reviewer PII or message text.
+EXPORT_FIELDS = (
+    "feedbackId", "timestamp", "department", "reviewPeriod", "rating",
+    "sentiment", "topics", "summary", "strengths", "improvements",
+    "competency_areas", "priority_level",
+    "aiProvider", "aiModel", "aiPromptVersion", "aiAnalyzedAt",
+)
+LIST_FIELDS = ("topics", "strengths", "improvements", "competency_areas")
+
+
+def _month(timestamp: str) -> str:
+    return (timestamp or "")[:7] or "unknown"
+
+
+def ndjson_prefix(month: str, prefix: str = PREFIX) -> str:
+    return f"{prefix}/ndjson/month={month}/"
+
+
+def compacted_prefix(month: str, prefix: str = PREFIX) -> str:
+    return f"{prefix}/compacted/month={month}/"
+
+
+def _plain(value: Any) -> Any:
+    """DynamoDB types → JSON/Parquet-friendly values."""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(_plain(v) for v in value)
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    return value
+
+
+def export_row(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {f: _plain(item[f]) for f in EXPORT_FIELDS if item.get(f) is not None}
+
+
+def newly_analysed(old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> bool:
+    """A stream change worth exporting: a (re)analysis landed on the item."""
+    if not new or not new.get("aiProcessed"):
+        return False
+    if not old or not old.get("aiProcessed"):
+        return True
+    return old.get("aiAnalyzedAt") != new.get("aiAnalyzedAt")
+
+
+def _newer(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    return b if (b.get("aiAnalyzedAt") or "") >= (a.get("aiAnalyzedAt") or "") else a
+
+
+def dedupe(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Latest analysis per feedbackId, ordered by submission time."""
+    latest: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        fid = row.get("feedbackId")
+        if fid:
+            latest[fid] = _newer(latest[fid], row) if fid in latest else row
+    return sorted(latest.values(), key=lambda r: (r.get("timestamp", ""), r["feedbackId"]))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ENCODING
+# ─────────────────────────────────────────────────────────────────────────────
+
+def encode_ndjson(rows: Iterable[Dict[str, Any]]) -> bytes:
+    text = "".join(json.dumps(r, separators=(",", ":"), default=str) + "\n" for r in rows)
+    return gzip.compress(text.encode("utf-8"), compresslevel=6, mtime=0)
+
+
+def decode_ndjson(data: bytes) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in gzip.decompress(data).splitlines() if line.strip()]
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        return None
+
+
+def _parquet_schema(pa: Any) -> Any:
+    types = {"rating": pa.int64()}
+    return pa.schema([
+        (f, pa.list_(pa.string()) if f in LIST_FIELDS else types.get(f, pa.string()))
+        for f in EXPORT_FIELDS
+    ])
+
+
+def encode_parquet(rows: List[Dict[str, Any]]) -> bytes:
+    pa = _pyarrow()
+    table = pa.Table.from_pylist(
+        [{f: row.get(f) for f in EXPORT_FIELDS} for row in rows], schema=_parquet_schema(pa))
+    sink = io.BytesIO()
+    pa.parquet.write_table(table, sink, compression="zstd")
+    return sink.getvalue()
+
+
+def decode_parquet(data: bytes) -> List[Dict[str, Any]]:
+    pa = _pyarrow()
+    if pa is None:
+        raise RuntimeError("pyarrow is required to read Parquet exports")
+    rows = pa.parquet.read_table(io.BytesIO(data)).to_pylist()
+    return [{k: v for k, v in row.items() if v is not None} for row in rows]
+
+
+def decode_object(key: str, data: bytes) -> List[Dict[str, Any]]:
+    return decode_parquet(data) if key.endswith(".parquet") else decode_ndjson(data)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# STREAM → NDJSON PARTS
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _batch_id(records: List[Dict[str, Any]]) -> str:
+    seqs = [r.get("dynamodb", {}).get("SequenceNumber", "") for r in records]
+    ids  = [r.get("eventID", "") for r in records]
+    return hashlib.sha256(json.dumps([seqs, ids]).encode("utf-8")).hexdigest()[:24]
+
+
+def export_stream_batch(s3: Any, bucket: str, records: List[Dict[str, Any]],
+                        pairs: List[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]],
+                        prefix: str = PREFIX) -> Dict[str, int]:
+    """Write one NDJSON part per month touched by the batch's newly analysed items."""
+    by_month: Dict[str, List[Dict[str, Any]]] = {}
+    for old, new in pairs:
+        if newly_analysed(old, new):
+            row = export_row(new)
+            by_month.setdefault(_month(row.get("timestamp", "")), []).append(row)
+
+    batch = _batch_id(records)
+    for month, rows in sorted(by_month.items()):
+        key = f"{ndjson_prefix(month, prefix)}part-{batch}.ndjson.gz"
+        s3.put_object(Bucket=bucket, Key=key, Body=encode_ndjson(rows),
+                      ContentType="application/x-ndjson")
+    return {"rows": sum(len(r) for r in by_month.values()), "objects": len(by_month)}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# LISTING / READING
+# ─────────────────────────────────────────────────────────────────────────────
+
+def list_keys(s3: Any, bucket: str, prefix: str) -> List[str]:
+    keys: List[str] = []
+    kwargs: Dict[str, Any] = {"Bucket": bucket, "Prefix": prefix}
+    while True:
+        response = s3.list_objects_v2(**kwargs)
+        keys.extend(obj["Key"] for obj in response.get("Contents", []))
+        if not response.get("IsTruncated"):
+            return keys
+        kwargs["ContinuationToken"] = response["NextContinuationToken"]
+
+
+def _fetch(s3: Any, bucket: str, key: str) -> List[Dict[str, Any]]:
+    return decode_object(key, s3.get_object(Bucket=bucket, Key=key)["Body"].read())
+
+
+def _fetch_all(s3: Any, bucket: str, keys: List[str], workers: int) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    if not keys:
+        return rows
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(keys))),
+                            thread_name_prefix="export-read") as pool:
+        for part in pool.map(lambda k: _fetch(s3, bucket, k), keys):
+            rows.extend(part)
+    return rows
+
+
+def read_partition(s3: Any, bucket: str, month: str, prefix: str = PREFIX,
+                   workers: int = 16) -> List[Dict[str, Any]]:
+    """Every exported row of a month (compacted + not-yet-compacted), deduplicated."""
+    keys = list_keys(s3, bucket, compacted_prefix(month, prefix)) + \
+        list_keys(s3, bucket, ndjson_prefix(month, prefix))
+    return dedupe(_fetch_all(s3, bucket, keys, workers))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# COMPACTION
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _delete_keys(s3: Any, bucket: str, keys: List[str]) -> None:
+    for start in range(0, len(keys), 1000):
+        s3.delete_objects(Bucket=bucket, Delete={
+            "Objects": [{"Key": k} for k in keys[start:start + 1000]], "Quiet": True,
+        })
+
+
+def compact_partition(s3: Any, bucket: str, month: str, prefix: str = PREFIX,
+                      rows_per_file: int = 50_000, workers: int = 16,
+                      fmt: Optional[str] = None,
+                      deadline: Optional[Callable[[], bool]] = None) -> Dict[str, Any]:
+    """
+    Fold a month's NDJSON parts into new compacted files, `workers` parts
+    read at a time until a file holds about `rows_per_file` rows, so memory
+    is bounded by one file. Each file is named after the parts it holds and
+    those parts are deleted only after it is written: a retried group
+    rewrites the same file, and a row in two files is deduped by the reader.
+    Stops between files once `deadline()` is true.
+    """
+    fmt = fmt or ("parquet" if _pyarrow() is not None else "ndjson")
+    ext = ".parquet" if fmt == "parquet" else ".ndjson.gz"
+    encode = encode_parquet if fmt == "parquet" else encode_ndjson
+    parts = list_keys(s3, bucket, ndjson_prefix(month, prefix))
+    stats = {"month": month, "parts": 0, "rows": 0, "files": 0, "remaining": len(parts), "format": fmt}
+
+    while parts and not (deadline is not None and deadline()):
+        group: List[str] = []
+        rows: List[Dict[str, Any]] = []
+        while parts and len(rows) < rows_per_file:
+            batch, parts = parts[:workers], parts[workers:]
+            rows.extend(_fetch_all(s3, bucket, batch, workers))
+            group.extend(batch)
+        rows = dedupe(rows)
+        name = hashlib.sha256("\n".join(sorted(group)).encode("utf-8")).hexdigest()[:24]
+        s3.put_object(Bucket=bucket, Key=f"{compacted_prefix(month, prefix)}part-{name}{ext}",
+                      Body=encode(rows))
+        _delete_keys(s3, bucket, group)
+        stats["parts"] += len(group)
+        stats["rows"] += len(rows)
+        stats["files"] += 1
+        stats["remaining"] = len(parts)
+
+    if stats["remaining"]:
+        print(f"[EXPORT COMPACTION] stopping early: {stats['remaining']} parts left for the next run")
+    print(f"[EXPORT COMPACTION] {json.dumps(stats)}")
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Read or compact a month of analytics exports.")
+    parser.add_argument("command", choices=("read", "compact"))
+    parser.add_argument("--bucket", required=True)
+    parser.add_argument("--month", required=True, help="YYYY-MM")
+    parser.add_argument("--prefix", default=PREFIX)
+    parser.add_argument("--out", default="", help="read: write NDJSON here instead of stdout")
+    args = parser.parse_args()
+
+    import boto3   # CLI only
+    s3 = boto3.client("s3")
+    if args.command == "compact":
+        compact_partition(s3, args.bucket, args.month, args.prefix)
+        return
+    rows = read_partition(s3, args.bucket, args.month, args.prefix)
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        for row in rows:
+            out.write(json.dumps(row, default=str) + "\n")
+    finally:
+        if args.out:
+            out.close()
+    print(f"{len(rows)} rows", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Smart Talent Insight Hub — I/O Fan-Out
+One warm-container thread pool for overlapping independent AWS round trips,
+so a request pays for the slowest of them rather than their sum.
+
+  together(*calls)  run the calls concurrently (the last one on the calling
+                    thread) and return their results in call order. Every
+                    call runs to completion before the first failure, in call
+                    order, is re-raised, so the outcome of one call never
+                    depends on the speed of another.
+  background(fn)    start a best-effort write now (AI cache fills); drain(),
+                    run by lambda_handler before it returns, waits for it.
+                    The write overlaps the rest of the request, and the
+                    container is not frozen with it in flight.
+
+Calls handed to the pool must not fan out themselves (a saturated pool
+would wait on itself). With max_workers=0 everything runs inline, in order.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class FanOut:
+    def __init__(self, max_workers: int = 8) -> None:
+        self.max_workers = max(0, max_workers)
+        self._pool = (ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="io")
+                      if self.max_workers else None)
+        self._pending: List[Future] = []
+        self._lock = threading.Lock()
+
+    def together(self, *calls: Callable[[], Any]) -> List[Any]:
+        if self._pool is None or len(calls) < 2:
+            return [call() for call in calls]
+        futures = [self._pool.submit(call) for call in calls[:-1]]
+        last = _settle(calls[-1])
+        outcomes = [_settle(f.result) for f in futures] + [last]
+        for _, exc in outcomes:
+            if exc is not None:
+                raise exc
+        return [result for result, _ in outcomes]
+
+    def background(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        if self._pool is None:
+            fn(*args, **kwargs)
+            return
+        future = self._pool.submit(fn, *args, **kwargs)
+        with self._lock:
+            self._pending = [f for f in self._pending if not f.done()]
+            self._pending.append(future)
+
+    def drain(self, timeout: Optional[float] = None) -> int:
+        """Wait for background writes; returns how many were still running at `timeout`."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+        done, not_done = wait(pending, timeout=timeout)
+        for future in done:
+            if future.exception() is not None:
+                print(f"[FANOUT] background write failed: {future.exception()}")
+        return len(not_done)
+
+
+def _settle(call: Callable[[], Any]) -> Tuple[Any, Optional[BaseException]]:
+    try:
+        return call(), None
+    except Exception as exc:
+        return None, exc
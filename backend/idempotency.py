@@ -0,0 +1,180 @@
+"""
+Smart Talent Insight Hub — Idempotent POST /feedback
+Turns client retries and double submits into replays of the first response,
+so they cost no second item, event or AI analysis.
+
+Key: the `Idempotency-Key` header ("key:<value>"), else a digest of reviewer
+email, employee, review period and message ("auto:<sha256>"), so an
+unchanged resubmission within the TTL counts as the same request.
+
+Record (table hash key idempotencyKey, TTL attribute expiresAt):
+  requestHash   digest of the validated submission fields (not the raw JSON:
+                rating 5 vs "5", key order and whitespace do not matter);
+                the same key with a different submission is refused (422)
+  feedbackId    chosen by the first request, reused by every retry
+  state         "pending" while the first request writes, then "done" with
+                statusCode / responseBody
+  lease / leaseUntil
+                owner token and epoch expiry of a pending record; past it,
+                the owner died mid-write and a retry may take over
+
+claim() is one conditional PutItem (absent OR expired), so of N concurrent
+duplicates on any number of containers exactly one wins. The others read
+the record strongly consistent: done → replay, pending → in progress,
+lease expired → conditional takeover, keeping the same feedbackId. The
+taker writes the item only if absent: the dead owner may have written it.
+"""
+
+import hashlib
+import json
+import re
+import time
+import uuid
+from typing import Any, Dict, NamedTuple, Optional
+
+from botocore.exceptions import ClientError
+
+NEW         = "new"
+REPLAY      = "replay"
+IN_PROGRESS = "in_progress"
+MISMATCH    = "mismatch"
+
+PENDING = "pending"
+DONE    = "done"
+
+MAX_KEY_LEN    = 255
+CLAIM_ATTEMPTS = 3
+
+_KEY_CHARS = re.compile(r"^[\x21-\x7e]+$")   # visible ASCII, no spaces
+
+
+def _digest(*parts: Any) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part if part is not None else "").strip().encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def request_key(header: Optional[str], body: Dict[str, Any]) -> str:
+    """Record key for a validated submission. Raises ValueError for a malformed header."""
+    if header is not None:
+        header = header.strip()
+        if not header or len(header) > MAX_KEY_LEN or not _KEY_CHARS.match(header):
+            raise ValueError(f"Idempotency-Key must be 1-{MAX_KEY_LEN} visible ASCII characters.")
+        return f"key:{header}"
+    return "auto:" + _digest(_email(body), body.get("employeeName"),
+                             body.get("reviewPeriod"), body.get("message"))
+
+
+def request_hash(item: Dict[str, Any], email: str) -> str:
+    """Digest of a validated item (its email is masked at rest, so the plain one is passed)."""
+    return _digest(item.get("name"), (email or "").strip().casefold(), *(item.get(f) for f in (
+        "message", "employeeName", "department", "reviewPeriod", "rating")))
+
+
+def _email(body: Dict[str, Any]) -> str:
+    return (body.get("email") or "").strip().casefold()
+
+
+class Claim(NamedTuple):
+    outcome:     str
+    feedback_id: str = ""
+    token:       str = ""                          # lease token, when NEW
+    response:    Optional[Dict[str, Any]] = None   # {"statusCode", "body"}, when REPLAY
+
+
+def _condition_failed(exc: ClientError) -> bool:
+    return exc.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException"
+
+
+class IdempotencyStore:
+    def __init__(self, table: Any, ttl_seconds: int = 86400, lease_seconds: int = 30,
+                 clock=time.time) -> None:
+        self.table         = table
+        self.ttl_seconds   = ttl_seconds
+        self.lease_seconds = lease_seconds
+        self._clock        = clock
+
+    def claim(self, key: str, req_hash: str, feedback_id: str) -> Claim:
+        """Own `key` (NEW) or learn who does. `feedback_id` is used only if the key is free."""
+        for _ in range(CLAIM_ATTEMPTS):
+            now, token = int(self._clock()), uuid.uuid4().hex
+            try:
+                self.table.put_item(
+                    Item={
+                        "idempotencyKey": key, "requestHash": req_hash, "feedbackId": feedback_id,
+                        "state": PENDING, "lease": token, "leaseUntil": now + self.lease_seconds,
+                        "createdAt": now, "expiresAt": now + self.ttl_seconds,
+                    },
+                    # TTL deletion is lazy (up to ~48h): an expired record counts as absent.
+                    ConditionExpression="attribute_not_exists(#k) OR #x < :now",
+                    ExpressionAttributeNames={"#k": "idempotencyKey", "#x": "expiresAt"},
+                    ExpressionAttributeValues={":now": now},
+                )
+                return Claim(NEW, feedback_id, token)
+            except ClientError as exc:
+                if not _condition_failed(exc):
+                    raise
+
+            current = self.table.get_item(Key={"idempotencyKey": key}, ConsistentRead=True).get("Item")
+            if current is None or int(current.get("expiresAt", 0)) < now:
+                continue   # expired or reaped since the put: try again
+            if current.get("requestHash") != req_hash:
+                return Claim(MISMATCH, current.get("feedbackId", ""))
+            if current.get("state") == DONE:
+                return Claim(REPLAY, current["feedbackId"], response={
+                    "statusCode": int(current["statusCode"]),
+                    "body":       json.loads(current["responseBody"]),
+                })
+            if int(current.get("leaseUntil", 0)) >= now:
+                return Claim(IN_PROGRESS, current["feedbackId"])
+            if self._take_over(key, current, token, now):
+                print(f"[IDEMPOTENCY] took over stale claim for feedbackId={current['feedbackId']}")
+                return Claim(NEW, current["feedbackId"], token)
+        return Claim(IN_PROGRESS, feedback_id)
+
+    def _take_over(self, key: str, current: Dict[str, Any], token: str, now: int) -> bool:
+        try:
+            self.table.update_item(
+                Key={"idempotencyKey": key},
+                UpdateExpression="SET #l = :token, #lu = :until",
+                ConditionExpression="#s = :pending AND #l = :seen",
+                ExpressionAttributeNames={"#s": "state", "#l": "lease", "#lu": "leaseUntil"},
+                ExpressionAttributeValues={
+                    ":token": token, ":until": now + self.lease_seconds,
+                    ":pending": PENDING, ":seen": current.get("lease", ""),
+                },
+            )
+            return True
+        except ClientError as exc:
+            if _condition_failed(exc):
+                return False
+            raise
+
+    def complete(self, key: str, token: str, status_code: int, body: Dict[str, Any]) -> None:
+        """Store the response for replays. Best effort: a lost lease or error only logs."""
+        try:
+            self.table.update_item(
+                Key={"idempotencyKey": key},
+                UpdateExpression="SET #s = :done, #c = :code, #b = :body REMOVE #l, #lu",
+                ConditionExpression="#l = :token",
+                ExpressionAttributeNames={"#s": "state", "#c": "statusCode", "#b": "responseBody",
+                                          "#l": "lease", "#lu": "leaseUntil"},
+                ExpressionAttributeValues={":done": DONE, ":code": status_code,
+                                           ":body": json.dumps(body), ":token": token},
+            )
+        except ClientError as exc:
+            print(f"[IDEMPOTENCY] could not record response for {key[:40]}: {exc}")
+
+    def release(self, key: str, token: str) -> None:
+        """Drop our pending claim after a failed write, so a retry starts fresh."""
+        try:
+            self.table.delete_item(
+                Key={"idempotencyKey": key},
+                ConditionExpression="#l = :token",
+                ExpressionAttributeNames={"#l": "lease"},
+                ExpressionAttributeValues={":token": token},
+            )
+        except ClientError as exc:
+            print(f"[IDEMPOTENCY] could not release {key[:40]}: {exc}")
@@ -0,0 +1,110 @@
+"""
+Smart Talent Insight Hub — Bulk Ingest
+Write paths for POST /feedback/batch: many records per invocation.
+
+  write_items()  BatchWriteItem in 25-item chunks, `concurrency` chunks in
+                 flight; UnprocessedItems are retried with capped exponential
+                 backoff and full jitter. Returns the items still unwritten
+                 after `max_attempts`, so the caller can report them.
+  put_events()   PutEvents in 10-entry calls. Entries rejected individually
+                 (FailedEntryCount > 0) or by a failed call are retried the
+                 same way. Returns the indices of entries never accepted.
+
+Both are plain functions over the low-level clients, so the bench and
+the load test drive them against the local stand-ins unchanged.
+"""
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+MAX_BATCH_WRITE  = 25    # DynamoDB BatchWriteItem limit
+MAX_PUT_EVENTS   = 10    # EventBridge PutEvents limit
+MAX_ATTEMPTS     = 6
+BASE_DELAY_S     = 0.05
+MAX_DELAY_S      = 2.0
+
+
+def backoff_delay(attempt: int, base: float = BASE_DELAY_S, cap: float = MAX_DELAY_S) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def _chunks(values: List[Any], size: int) -> List[List[Any]]:
+    return [values[i:i + size] for i in range(0, len(values), size)]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# DynamoDB BatchWriteItem
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _write_chunk(client: Any, table_name: str, items: List[Dict[str, Any]],
+                 max_attempts: int, sleep: Callable[[float], None]) -> List[Dict[str, Any]]:
+    requests = [{"PutRequest": {"Item": item}} for item in items]
+    for attempt in range(max_attempts):
+        if attempt:
+            sleep(backoff_delay(attempt - 1))
+        resp = client.batch_write_item(RequestItems={table_name: requests})
+        requests = (resp.get("UnprocessedItems") or {}).get(table_name, [])
+        if not requests:
+            return []
+        print(f"[INGEST] {len(requests)} unprocessed item(s), attempt {attempt + 1}/{max_attempts}")
+    return [r["PutRequest"]["Item"] for r in requests]
+
+
+def write_items(client: Any, table_name: str, items: List[Dict[str, Any]],
+                concurrency: int = 4, max_attempts: int = MAX_ATTEMPTS,
+                sleep: Callable[[float], None] = time.sleep) -> List[Dict[str, Any]]:
+    """Put `items`; returns those still unprocessed once retries are exhausted."""
+    chunks = _chunks(items, MAX_BATCH_WRITE)
+    if not chunks:
+        return []
+    write = lambda chunk: _write_chunk(client, table_name, chunk, max_attempts, sleep)  # noqa: E731
+    if concurrency <= 1 or len(chunks) == 1:
+        results = [write(c) for c in chunks]
+    else:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks))) as pool:
+            results = list(pool.map(write, chunks))
+    return [item for failed in results for item in failed]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# EventBridge PutEvents
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _put_chunk(events: Any, entries: List[Dict[str, Any]], indices: List[int],
+               max_attempts: int, sleep: Callable[[float], None]) -> List[int]:
+    pending = list(range(len(entries)))
+    for attempt in range(max_attempts):
+        if attempt:
+            sleep(backoff_delay(attempt - 1))
+        try:
+            resp = events.put_events(Entries=[entries[i] for i in pending])
+        except (BotoCoreError, ClientError) as exc:
+            print(f"[INGEST] PutEvents failed ({exc}), attempt {attempt + 1}/{max_attempts}")
+            continue
+        if not resp.get("FailedEntryCount"):
+            return []
+        results = resp.get("Entries", [])
+        pending = [i for i, r in zip(pending, results) if r.get("ErrorCode")]
+        print(f"[INGEST] {len(pending)} event(s) rejected, attempt {attempt + 1}/{max_attempts}")
+    return [indices[i] for i in pending]
+
+
+def put_events(events: Any, entries: List[Dict[str, Any]], concurrency: int = 4,
+               max_attempts: int = 3, sleep: Callable[[float], None] = time.sleep) -> List[int]:
+    """Send `entries` 10 at a time; returns indices (into `entries`) never accepted."""
+    indices = list(range(len(entries)))
+    chunks = list(zip(_chunks(entries, MAX_PUT_EVENTS), _chunks(indices, MAX_PUT_EVENTS)))
+    if not chunks:
+        return []
+    put = lambda chunk: _put_chunk(events, chunk[0], chunk[1], max_attempts, sleep)  # noqa: E731
+    if concurrency <= 1 or len(chunks) == 1:
+        results = [put(c) for c in chunks]
+    else:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks))) as pool:
+            results = list(pool.map(put, chunks))
+    return sorted(i for failed in results for i in failed)
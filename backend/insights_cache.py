@@ -0,0 +1,147 @@
+"""
+Smart Talent Insight Hub — Warm-Container Insights Cache
+Module-level cache for the serialized GET /insights body. It lives as long
+as the Lambda execution environment stays warm.
+
+  fresh  (age <= ttl)         → HIT: served as-is, no scan / aggregation / json.dumps
+  stale  (ttl < age <= +swr)  → STALE: served as-is, one background refresh started
+  older / absent              → MISS: computed inline
+
+Background refreshes run on a daemon thread. If the invocation returns first,
+Lambda freezes the thread and it finishes on the next thaw; the stale body
+keeps being served meanwhile. Entries are LRU-bounded by max_entries.
+
+invalidate() bumps a generation: a computation (background or inline) that
+started before it returns its body to its caller but does not store it, so a
+refresh racing a write cannot put the pre-write body back.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+
+class CacheEntry(NamedTuple):
+    body:       str
+    etag:       str
+    created_at: float
+
+
+def make_etag(body: str) -> str:
+    return '"' + hashlib.sha256(body.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 7232 weak comparison against an If-None-Match header value."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == bare:
+            return True
+    return False
+
+
+class InsightsCache:
+    def __init__(self, ttl_seconds: float, swr_seconds: float, max_entries: int,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl         = max(0.0, ttl_seconds)
+        self.swr         = max(0.0, swr_seconds)
+        self.max_entries = max(1, max_entries)
+        self._clock      = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._refreshing: set = set()
+        self._epoch = 0                         # bumped by invalidate() of everything
+        self._generations: Dict[str, int] = {}  # bumped by invalidate(key)
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = {"hit": 0, "stale": 0, "miss": 0, "refresh_error": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.counters, "entries": len(self._entries)}
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._generations.clear()
+                self._epoch += 1
+            else:
+                self._entries.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+    def _generation(self, key: str) -> Tuple[int, int]:
+        # Caller holds the lock.
+        return self._epoch, self._generations.get(key, 0)
+
+    def _store(self, key: str, body: str, generation: Tuple[int, int]) -> CacheEntry:
+        entry = CacheEntry(body, make_etag(body), self._clock())
+        with self._lock:
+            if self._generation(key) != generation:
+                return entry   # invalidated while computing: serve it, don't cache it
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def _refresh(self, key: str, compute: Callable[[], str], generation: Tuple[int, int]) -> None:
+        try:
+            self._store(key, compute(), generation)
+        except Exception as exc:
+            with self._lock:
+                self.counters["refresh_error"] += 1
+            print(f"[INSIGHTS CACHE] background refresh failed: {exc}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get_or_compute(self, key: str, compute: Callable[[], str]) -> Tuple[CacheEntry, str]:
+        """Return (entry, "HIT" | "STALE" | "MISS"). `compute` returns the serialized body."""
+        if not self.enabled:
+            with self._lock:
+                self.counters["miss"] += 1
+            body = compute()
+            return CacheEntry(body, make_etag(body), self._clock()), "MISS"
+
+        now = self._clock()
+        with self._lock:
+            generation = self._generation(key)
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry.created_at
+                if age <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.counters["hit"] += 1
+                    return entry, "HIT"
+                if age <= self.ttl + self.swr:
+                    self._entries.move_to_end(key)
+                    self.counters["stale"] += 1
+                    start_refresh = key not in self._refreshing
+                    if start_refresh:
+                        self._refreshing.add(key)
+                else:
+                    entry = None
+            if entry is None:
+                self.counters["miss"] += 1
+
+        if entry is not None:
+            if start_refresh:
+                threading.Thread(
+                    target=self._refresh, args=(key, compute, generation),
+                    name="insights-refresh", daemon=True,
+                ).start()
+            return entry, "STALE"
+
+        return self._store(key, compute(), generation), "MISS"
@@ -0,0 +1,170 @@
+"""
+Smart Talent Insight Hub — Filtered Insights Queries
+Turns GET /insights?department=&reviewPeriod=&from=&to= into DynamoDB Query
+requests against the feedback table's GSIs, so a slice costs what the slice
+holds rather than what the table holds.
+
+  department (+ reviewPeriod filter)  → department-timestamp-index
+  reviewPeriod                        → reviewPeriod-timestamp-index
+  from / to only                      → timeBucket-timestamp-index, one Query
+                                        per month bucket, run concurrently
+  to without from, or a window wider
+  than max_buckets months             → filtered parallel scan (no cheap key)
+
+The date window is always a key condition on the index sort key (timestamp).
+"""
+
+from datetime import datetime, time, timezone
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional
+
+DEPARTMENT_INDEX    = "department-timestamp-index"
+REVIEW_PERIOD_INDEX = "reviewPeriod-timestamp-index"
+TIME_BUCKET_INDEX   = "timeBucket-timestamp-index"
+TIME_BUCKET_ATTR    = "timeBucket"
+
+
+def time_bucket(timestamp: str) -> str:
+    """Month partition of the time-bucket GSI — "YYYY-MM" of the ISO timestamp."""
+    return timestamp[:7]
+
+
+class InsightsFilter(NamedTuple):
+    department:    str = ""
+    review_period: str = ""
+    from_ts:       str = ""
+    to_ts:         str = ""
+
+    @property
+    def empty(self) -> bool:
+        return not any(self)
+
+    def cache_key(self) -> str:
+        return "insights?" + "&".join(f"{k}={v}" for k, v in self._asdict().items() if v)
+
+
+def _parse_bound(value: str, end_of_day: bool) -> str:
+    """
+    ISO date or datetime → UTC ISO string comparable with stored timestamps
+    (datetime.now(timezone.utc).isoformat()). A bare date `to` covers the whole day.
+    """
+    value = value.strip()
+    try:
+        if len(value) == 10:
+            day = datetime.strptime(value, "%Y-%m-%d").date()
+            parsed = datetime.combine(day, time.max if end_of_day else time.min, timezone.utc)
+        else:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+    except ValueError:
+        raise ValueError(f"invalid date '{value}' (expected YYYY-MM-DD or ISO 8601)")
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+def parse_filters(params: Optional[Mapping[str, str]]) -> InsightsFilter:
+    """Validate query-string parameters. Raises ValueError with a client-facing message."""
+    params = params or {}
+    department    = (params.get("department")   or "").strip()[:100]
+    review_period = (params.get("reviewPeriod") or "").strip()[:50]
+    from_ts = _parse_bound(params["from"], end_of_day=False) if params.get("from") else ""
+    to_ts   = _parse_bound(params["to"], end_of_day=True) if params.get("to") else ""
+    if from_ts and to_ts and from_ts > to_ts:
+        raise ValueError("'from' must not be after 'to'")
+    return InsightsFilter(department, review_period, from_ts, to_ts)
+
+
+def month_buckets(from_ts: str, to_ts: str) -> List[str]:
+    year, month = int(from_ts[:4]), int(from_ts[5:7])
+    last = time_bucket(to_ts)
+    buckets: List[str] = []
+    while True:
+        bucket = f"{year:04d}-{month:02d}"
+        if bucket > last:
+            return buckets
+        buckets.append(bucket)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _range_condition(f: InsightsFilter, names: Dict[str, str], values: Dict[str, Any]) -> str:
+    if not (f.from_ts or f.to_ts):
+        return ""
+    names["#ts"] = "timestamp"
+    if f.from_ts and f.to_ts:
+        values.update({":from": f.from_ts, ":to": f.to_ts})
+        return " AND #ts BETWEEN :from AND :to"
+    if f.from_ts:
+        values[":from"] = f.from_ts
+        return " AND #ts >= :from"
+    values[":to"] = f.to_ts
+    return " AND #ts <= :to"
+
+
+def plan_queries(f: InsightsFilter, now_ts: str, max_buckets: int = 60) -> Optional[List[Dict[str, Any]]]:
+    """
+    Query kwargs (without TableName / projection) for a non-empty filter, or
+    None when no index gives a bounded key condition — the caller then scans
+    with scan_filter(f).
+    """
+    names: Dict[str, str] = {}
+    values: Dict[str, Any] = {}
+
+    if f.department or f.review_period:
+        if f.department:
+            index, attr, value = DEPARTMENT_INDEX, "department", f.department
+        else:
+            index, attr, value = REVIEW_PERIOD_INDEX, "reviewPeriod", f.review_period
+        names["#pk"] = attr
+        values[":pk"] = value
+        query: Dict[str, Any] = {
+            "IndexName":              index,
+            "KeyConditionExpression": "#pk = :pk" + _range_condition(f, names, values),
+        }
+        if f.department and f.review_period:
+            names["#rp"] = "reviewPeriod"
+            values[":rp"] = f.review_period
+            query["FilterExpression"] = "#rp = :rp"
+        query["ExpressionAttributeNames"]  = names
+        query["ExpressionAttributeValues"] = values
+        return [query]
+
+    if not f.from_ts:
+        return None
+    to_ts = f.to_ts or now_ts
+    buckets = month_buckets(f.from_ts, to_ts)
+    if len(buckets) > max_buckets:
+        return None
+    bounded = f._replace(to_ts=to_ts)
+    queries = []
+    for bucket in buckets:
+        names = {"#pk": TIME_BUCKET_ATTR}
+        values = {":pk": bucket}
+        condition = "#pk = :pk" + _range_condition(bounded, names, values)
+        queries.append({
+            "IndexName":                 TIME_BUCKET_INDEX,
+            "KeyConditionExpression":    condition,
+            "ExpressionAttributeNames":  names,
+            "ExpressionAttributeValues": values,
+        })
+    return queries
+
+
+def scan_filter(f: InsightsFilter) -> Dict[str, Any]:
+    """FilterExpression equivalent of `f` for the scan fallback."""
+    names: Dict[str, str] = {}
+    values: Dict[str, Any] = {}
+    clauses: List[str] = []
+    for attr, value, alias in (("department", f.department, "dep"),
+                               ("reviewPeriod", f.review_period, "rp")):
+        if value:
+            names[f"#{alias}"] = attr
+            values[f":{alias}"] = value
+            clauses.append(f"#{alias} = :{alias}")
+    range_clause = _range_condition(f, names, values)
+    if range_clause:
+        clauses.append(range_clause[len(" AND "):])
+    return {
+        "FilterExpression":          " AND ".join(clauses),
+        "ExpressionAttributeNames":  names,
+        "ExpressionAttributeValues": values,
+    }
+
@@ -2,40 +2,179 @@
 Smart Talent Insight Hub — Lambda Handler
 Handles:
   POST /feedback  — validate, store in DynamoDB, trigger async AI via EventBridge
-  GET  /insights  — aggregate analytics from DynamoDB
+                    (Idempotency-Key: retries replay the first response)
+  POST /feedback/batch — same per record, BatchWriteItem + 10-entry PutEvents
+  Outbox sweep    — republish events a degraded EventBridge did not take
+  GET  /insights  — aggregate analytics (rollup point reads, scan fallback)
+  GET  /reviews   — newest AI-processed reviews, cursor-paginated (review_index.py)
   POST /analyse   — internal trigger from EventBridge → calls Bedrock/Comprehend
+  SQS / batch     — micro-batched analysis: several messages per Bedrock call
+  Stream records  — DynamoDB stream → incremental insights rollups
+
+Storage is DynamoDB, or an embedded SQLite file for self-hosted / local runs
+(STORAGE_BACKEND, storage.py / sqlite_store.py); the handlers are the same.
 
 All resources in ca-central-1 (Canada Central).
 """
 
+import base64
+import copy
+import hashlib
 import json
 import os
 import re
+import time
 import uuid
 import traceback
 from collections import Counter
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
-import boto3
 from botocore.exceptions import BotoCoreError, ClientError
 
+import ai_cache
+import aws_clients
+import backfill
+import batch_analysis
+import bedrock_stream
+import exports
+import fanout
+import idempotency
+import ingest
+import insights_query
+import local_analysis
+import outbox
+import provider_health
+import responses
+import review_index
+import rollups
+import scan_engine
+import storage
+import topic_norm
+from aggregation import PROJECTED_FIELDS, RECENT_SIZE
+from columnar import ColumnarAccumulator
+from insights_cache import InsightsCache, etag_matches
+from metrics import COUNT, MILLISECONDS, Metrics
+from sqlite_store import SQLiteFeedbackStore
+
 # ── ENV CONFIG ────────────────────────────────────────────────────────────────
 TABLE_NAME       = os.environ.get("FEEDBACK_TABLE_NAME", "FeedbackSubmissions")
+STORAGE_BACKEND  = os.environ.get("STORAGE_BACKEND", "dynamodb").strip().lower()   # dynamodb | sqlite
+SQLITE_PATH      = os.environ.get("SQLITE_PATH", "/tmp/talent-insights.db")
 EXPORT_BUCKET    = os.environ.get("EXPORT_BUCKET_NAME", "")
 BEDROCK_MODEL_ID = os.environ.get("BEDROCK_MODEL_ID", "anthropic.claude-3-haiku-20240307-v1:0")
 AWS_REGION       = os.environ.get("AWS_REGION", "ca-central-1")
-AI_PROVIDER      = os.environ.get("AI_PROVIDER", "bedrock").strip().lower()
+AI_PROVIDER      = os.environ.get("AI_PROVIDER", "bedrock").strip().lower()   # bedrock | comprehend | local | tiered
 EVENT_BUS_NAME   = os.environ.get("EVENT_BUS_NAME", "default")
 MAX_MESSAGE_LEN  = int(os.environ.get("MAX_MESSAGE_LEN", "3000"))
+FEEDBACK_BATCH_MAX = int(os.environ.get("FEEDBACK_BATCH_MAX", "500"))       # records per POST /feedback/batch
+INGEST_CONCURRENCY = max(1, int(os.environ.get("INGEST_CONCURRENCY", "4")))  # BatchWriteItem / PutEvents calls in flight
+OUTBOX_GRACE_SECONDS = int(os.environ.get("OUTBOX_GRACE_SECONDS", "120"))   # marker age before the sweeper republishes
+OUTBOX_MAX_ATTEMPTS  = int(os.environ.get("OUTBOX_MAX_ATTEMPTS", "5"))      # republishes before leaving it to backfill
+OUTBOX_LEASE_SECONDS = int(os.environ.get("OUTBOX_LEASE_SECONDS", "60"))    # analysis in flight; > function timeout
+IDEMPOTENCY_TABLE_NAME    = os.environ.get("IDEMPOTENCY_TABLE_NAME", "")
+IDEMPOTENCY_TTL_HOURS     = float(os.environ.get("IDEMPOTENCY_TTL_HOURS", "24"))   # replay window
+IDEMPOTENCY_LEASE_SECONDS = int(os.environ.get("IDEMPOTENCY_LEASE_SECONDS", "60")) # > function timeout
+ROLLUP_TABLE_NAME = os.environ.get("ROLLUP_TABLE_NAME", "")
+ROLLUP_PRUNE_SECONDS = int(os.environ.get("ROLLUP_PRUNE_SECONDS", "3600"))   # topic-shard cap, per warm container
+SCAN_SEGMENTS    = max(1, int(os.environ.get("SCAN_SEGMENTS", "4")))
+INSIGHTS_CACHE_TTL = int(os.environ.get("INSIGHTS_CACHE_TTL", "30"))       # seconds fresh
+INSIGHTS_CACHE_SWR = int(os.environ.get("INSIGHTS_CACHE_SWR", "300"))      # seconds stale-while-revalidate
+INSIGHTS_CACHE_MAX = int(os.environ.get("INSIGHTS_CACHE_MAX_ENTRIES", "32"))
+INSIGHTS_MAX_TIME_BUCKETS = int(os.environ.get("INSIGHTS_MAX_TIME_BUCKETS", "60"))  # months queried per date window
+INSIGHTS_TOPIC_LIMIT      = int(os.environ.get("INSIGHTS_TOPIC_LIMIT", "50"))        # word-cloud entries (compact view)
+COMPRESS_MIN_BYTES        = int(os.environ.get("COMPRESS_MIN_BYTES", "1024"))
+REVIEWS_PAGE_DEFAULT      = int(os.environ.get("REVIEWS_PAGE_DEFAULT", "20"))        # GET /reviews without ?limit
+REVIEWS_PAGE_MAX          = int(os.environ.get("REVIEWS_PAGE_MAX", "100"))
+REVIEWS_MAX_EMPTY_MONTHS  = int(os.environ.get("REVIEWS_MAX_EMPTY_MONTHS", "12"))    # empty months before the walk back stops
+TOPIC_SKETCH_CAPACITY     = int(os.environ.get("TOPIC_SKETCH_CAPACITY", "1000"))     # Space-Saving counters per aggregate
+TOPIC_SYNONYMS            = os.environ.get("TOPIC_SYNONYMS", "")                      # JSON {"variant": "label"}, merged over defaults
+BEDROCK_BATCH_SIZE         = max(1, int(os.environ.get("BEDROCK_BATCH_SIZE", "8")))
+BEDROCK_BATCH_INPUT_TOKENS = int(os.environ.get("BEDROCK_BATCH_INPUT_TOKENS", "6000"))
+BEDROCK_BATCH_OUTPUT_TOKENS = int(os.environ.get("BEDROCK_BATCH_OUTPUT_TOKENS", "400"))  # per item
+BEDROCK_MAX_OUTPUT_TOKENS  = int(os.environ.get("BEDROCK_MAX_OUTPUT_TOKENS", "4096"))
+BEDROCK_OUTPUT_TOKENS      = int(os.environ.get("BEDROCK_OUTPUT_TOKENS", "500"))       # single-analysis ceiling
+BEDROCK_OUTPUT_TOKENS_MIN  = int(os.environ.get("BEDROCK_OUTPUT_TOKENS_MIN", "300"))   # floor, + 1/4 of the input tokens
+BEDROCK_STREAMING = os.environ.get("BEDROCK_STREAMING", "true").strip().lower() not in ("0", "false", "no", "off")
+LOCAL_CONFIDENCE_MIN = float(os.environ.get("LOCAL_CONFIDENCE_MIN", "0.6"))   # tiered: keep local results at/above this
+LOCAL_MAX_CHARS      = int(os.environ.get("LOCAL_MAX_CHARS", "600"))           # tiered: longer messages go to Bedrock
+AI_CACHE_TABLE_NAME  = os.environ.get("AI_CACHE_TABLE_NAME", "")
+AI_CACHE_MAX_ENTRIES = int(os.environ.get("AI_CACHE_MAX_ENTRIES", "1024"))
+AI_CACHE_TTL_DAYS    = float(os.environ.get("AI_CACHE_TTL_DAYS", "30"))
+AWS_MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "16"))
+AWS_MAX_ATTEMPTS         = int(os.environ.get("AWS_MAX_ATTEMPTS", "4"))
+AWS_CLIENT_PREWARM       = os.environ.get("AWS_CLIENT_PREWARM", "")   # e.g. "all" or "events,dynamodb"
+IO_CONCURRENCY           = int(os.environ.get("IO_CONCURRENCY", "8"))  # overlapped AWS calls; 0 = sequential
+BEDROCK_FAILOVER            = os.environ.get("BEDROCK_FAILOVER", "true").strip().lower() not in ("0", "false", "no", "off")
+BEDROCK_CONCURRENCY         = int(os.environ.get("BEDROCK_CONCURRENCY", "8"))           # starting AIMD limit per container
+BEDROCK_CONCURRENCY_MAX     = int(os.environ.get("BEDROCK_CONCURRENCY_MAX", "64"))
+BEDROCK_LATENCY_TARGET_MS   = float(os.environ.get("BEDROCK_LATENCY_TARGET_MS", "15000"))  # slower calls shrink the limit
+BEDROCK_QUEUE_WAIT_MS       = float(os.environ.get("BEDROCK_QUEUE_WAIT_MS", "2000"))       # then fail over instead of queueing
+BREAKER_FAILURE_THRESHOLD   = int(os.environ.get("BREAKER_FAILURE_THRESHOLD", "5"))     # consecutive failures that open it
+BREAKER_OPEN_SECONDS        = float(os.environ.get("BREAKER_OPEN_SECONDS", "30"))
+PROVIDER_HEALTH_TABLE_NAME  = os.environ.get("PROVIDER_HEALTH_TABLE_NAME", "")          # shared breaker state; "" = per container
+PROVIDER_HEALTH_REFRESH_SECONDS = float(os.environ.get("PROVIDER_HEALTH_REFRESH_SECONDS", "5"))
+METRICS_ENABLED   = os.environ.get("METRICS_ENABLED", "true").strip().lower() not in ("0", "false", "no", "off")
+METRICS_NAMESPACE = os.environ.get("METRICS_NAMESPACE", "SmartTalentInsightHub")
+LOG_PAYLOAD_SAMPLE_RATE = float(os.environ.get("LOG_PAYLOAD_SAMPLE_RATE", "0.01"))  # share of AI payloads logged in full
+
+# Remote model behind AI_PROVIDER: tiered escalates to Bedrock, local has none.
+MODEL_PROVIDER = "bedrock" if AI_PROVIDER == "tiered" else AI_PROVIDER
 
 # ── AWS CLIENTS ───────────────────────────────────────────────────────────────
-dynamodb   = boto3.resource("dynamodb", region_name=AWS_REGION)
-table      = dynamodb.Table(TABLE_NAME)
-bedrock    = boto3.client("bedrock-runtime", region_name=AWS_REGION)
-comprehend = boto3.client("comprehend", region_name=AWS_REGION)
-events     = boto3.client("events", region_name=AWS_REGION)
-s3         = boto3.client("s3", region_name=AWS_REGION) if EXPORT_BUCKET else None
+# Built on first use (aws_clients.py); a cold start pays only for what it touches.
+aws = aws_clients.ClientRegistry(AWS_REGION, AWS_MAX_POOL_CONNECTIONS, AWS_MAX_ATTEMPTS)
+dynamodb   = aws.resource("dynamodb")
+table      = aws.table(TABLE_NAME)
+rollup_table = aws.table(ROLLUP_TABLE_NAME) if ROLLUP_TABLE_NAME else None
+bedrock    = aws.client("bedrock-runtime")
+comprehend = aws.client("comprehend")
+events     = aws.client("events")
+s3         = aws.client("s3") if EXPORT_BUCKET else None
+
+# ── WARM-CONTAINER STATE ──────────────────────────────────────────────────────
+metrics = Metrics(
+    METRICS_NAMESPACE,
+    {"Service": os.environ.get("AWS_LAMBDA_FUNCTION_NAME", "talent-insights")},
+    enabled=METRICS_ENABLED,
+    payload_sample_rate=LOG_PAYLOAD_SAMPLE_RATE,
+)
+io = fanout.FanOut(IO_CONCURRENCY)
+topic_normalizer = topic_norm.TopicNormalizer(topic_norm.parse_synonyms(TOPIC_SYNONYMS))
+if STORAGE_BACKEND not in storage.BACKENDS:
+    raise ValueError(f"STORAGE_BACKEND must be one of {storage.BACKENDS}, got {STORAGE_BACKEND!r}")
+store = (
+    SQLiteFeedbackStore(SQLITE_PATH, topic_normalizer,
+                        row_builder=lambda item: _review_row(item, date_only=True))
+    if STORAGE_BACKEND == storage.SQLITE
+    else storage.DynamoFeedbackStore(table, TABLE_NAME, INGEST_CONCURRENCY)
+)
+insights_cache = InsightsCache(INSIGHTS_CACHE_TTL, INSIGHTS_CACHE_SWR, INSIGHTS_CACHE_MAX)
+ai_result_cache = ai_cache.AIResultCache(
+    aws.table(AI_CACHE_TABLE_NAME) if AI_CACHE_TABLE_NAME else None,
+    max_entries=AI_CACHE_MAX_ENTRIES,
+    ttl_days=AI_CACHE_TTL_DAYS,
+)
+idempotency_store = idempotency.IdempotencyStore(
+    aws.table(IDEMPOTENCY_TABLE_NAME),
+    ttl_seconds=int(IDEMPOTENCY_TTL_HOURS * 3600),
+    lease_seconds=IDEMPOTENCY_LEASE_SECONDS,
+) if IDEMPOTENCY_TABLE_NAME else None
+bedrock_health = provider_health.ProviderHealth(
+    provider_health.ConcurrencyLimiter(
+        BEDROCK_CONCURRENCY, max_limit=BEDROCK_CONCURRENCY_MAX,
+        latency_target_ms=BEDROCK_LATENCY_TARGET_MS,
+    ),
+    provider_health.CircuitBreaker(
+        "bedrock", BREAKER_FAILURE_THRESHOLD, BREAKER_OPEN_SECONDS,
+        shared=provider_health.SharedBreakerState(
+            aws.table(PROVIDER_HEALTH_TABLE_NAME), "bedrock", PROVIDER_HEALTH_REFRESH_SECONDS,
+        ) if PROVIDER_HEALTH_TABLE_NAME else None,
+    ),
+    max_wait_s=BEDROCK_QUEUE_WAIT_MS / 1000,
+)
+if AWS_CLIENT_PREWARM:
+    aws.prewarm(n.strip() for n in AWS_CLIENT_PREWARM.split(","))
 
 # ─────────────────────────────────────────────────────────────────────────────
 # CORS HELPERS
@@ -43,9 +182,10 @@ s3         = boto3.client("s3", region_name=AWS_REGION) if EXPORT_BUCKET else No
 
 def _cors() -> Dict[str, str]:
     return {
-        "Access-Control-Allow-Origin":  "*",
-        "Access-Control-Allow-Methods": "GET,POST,OPTIONS",
-        "Access-Control-Allow-Headers": "Content-Type,Authorization",
+        "Access-Control-Allow-Origin":   "*",
+        "Access-Control-Allow-Methods":  "GET,POST,OPTIONS",
+        "Access-Control-Allow-Headers":  "Content-Type,Authorization,If-None-Match,Idempotency-Key",
+        "Access-Control-Expose-Headers": "ETag,X-Cache,Idempotent-Replayed",
     }
 
 
@@ -53,19 +193,83 @@ def _resp(status: int, body: Any) -> Dict[str, Any]:
     return {
         "statusCode": status,
         "headers":    _cors(),
-        "body":       json.dumps(body, default=str),
+        "body":       responses.dumps(body),
     }
 
 
+def _request_body(event: Dict[str, Any]) -> str:
+    """Raw request body; API Gateway base64-encodes it when binary media types match."""
+    body = event.get("body") or ""
+    if body and event.get("isBase64Encoded"):
+        body = base64.b64decode(body).decode("utf-8")
+    return body
+
+
+def _header(event: Dict[str, Any], name: str) -> Optional[str]:
+    """Case-insensitive request header lookup (API Gateway preserves client casing)."""
+    wanted = name.lower()
+    for key, value in (event.get("headers") or {}).items():
+        if key.lower() == wanted:
+            return value
+    return None
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # MAIN HANDLER
 # ─────────────────────────────────────────────────────────────────────────────
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    try:
+        return _dispatch(event, context)
+    finally:
+        io.drain()        # background writes finish before the container freezes
+        metrics.flush()   # one batch of EMF lines per invocation
+
+
+_DYNAMODB_ACTIONS = ("compact_exports", "index_time_buckets", "sweep_outbox", "backfill")
+
+
+def _dispatch(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     # ── EventBridge async trigger ─────────────────────────────────────────────
     if "detail" in event and event.get("source") == "talent.feedback":
+        if "items" in event["detail"]:
+            failed = handle_batch_analysis(batch_analysis.detail_records(event["detail"]))
+            return {"statusCode": 200, "body": json.dumps({"failed": failed})}
         return handle_async_analysis(event["detail"])
 
+    # ── DynamoDB stream → insights rollups ────────────────────────────────────
+    records = event.get("Records") or []
+    if records and records[0].get("eventSource") == "aws:dynamodb":
+        return handle_stream_batch(records)
+
+    # ── SQS (EventBridge → SQS) → micro-batched AI analysis ───────────────────
+    if records and records[0].get("eventSource") == "aws:sqs":
+        return handle_sqs_analysis(records)
+
+    # ── Stream, outbox, backfill and export jobs work on the DynamoDB table ───
+    if event.get("action") in _DYNAMODB_ACTIONS and store.name != storage.DYNAMODB:
+        return {"statusCode": 400, "body": f"{event['action']} needs STORAGE_BACKEND=dynamodb"}
+
+    # ── Maintenance: {"action": "rebuild_rollups"} ────────────────────────────
+    if event.get("action") == "rebuild_rollups":
+        return handle_rebuild_rollups()
+
+    # ── Scheduled: {"action": "compact_exports", "month": "YYYY-MM"?} ─────────
+    if event.get("action") == "compact_exports":
+        return handle_compact_exports(event, context)
+
+    # ── Maintenance: {"action": "index_time_buckets"} ─────────────────────────
+    if event.get("action") == "index_time_buckets":
+        return handle_index_time_buckets()
+
+    # ── Scheduled: {"action": "sweep_outbox"} ─────────────────────────────────
+    if event.get("action") == "sweep_outbox":
+        return handle_sweep_outbox(context)
+
+    # ── Maintenance: {"action": "backfill", ...} ──────────────────────────────
+    if event.get("action") == "backfill":
+        return handle_backfill(event, context)
+
     method = event.get("httpMethod", "")
     path   = event.get("path", "")
 
@@ -77,8 +281,14 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if path.endswith("/feedback") and method == "POST":
             return handle_post_feedback(event)
 
+        if path.endswith("/feedback/batch") and method == "POST":
+            return handle_post_feedback_batch(event)
+
         if path.endswith("/insights") and method == "GET":
-            return handle_get_insights()
+            return handle_get_insights(event)
+
+        if path.endswith("/reviews") and method == "GET":
+            return handle_get_reviews(event)
 
         return _resp(404, {"message": "Not Found"})
 
@@ -100,10 +310,87 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 def handle_post_feedback(event: Dict[str, Any]) -> Dict[str, Any]:
     # ── Parse body ────────────────────────────────────────────────────────────
     try:
-        body = json.loads(event.get("body") or "{}")
-    except json.JSONDecodeError:
+        body = json.loads(_request_body(event) or "{}")
+    except ValueError:   # bad JSON, base64 or UTF-8
         return _resp(400, {"message": "Invalid JSON body."})
 
+    item, error = _feedback_item(body)
+    if error:
+        return _resp(400, {"message": error})
+
+    # ── Idempotency: a retry replays the first response, writes nothing ───────
+    claim, key = None, ""
+    if idempotency_store is not None:
+        try:
+            key = idempotency.request_key(_header(event, "Idempotency-Key"), body)
+        except ValueError as exc:
+            return _resp(400, {"message": str(exc)})
+        with metrics.timer("IdempotencyClaimMs"):
+            claim = idempotency_store.claim(key, idempotency.request_hash(item, body.get("email")),
+                                            item["feedbackId"])
+        if claim.outcome != idempotency.NEW:
+            return _idempotent_refusal(claim)
+        item["feedbackId"] = claim.feedback_id   # a takeover keeps the original id
+    feedback_id, message, timestamp = item["feedbackId"], item["message"], item["timestamp"]
+
+    # ── Save (item + outbox marker in one write) ──────────────────────────────
+    # Under a claim the put is conditional: after a lease takeover the dead owner
+    # may already have written this feedbackId (and its analysis may have landed).
+    written = True
+    try:
+        with metrics.timer("FeedbackPutItemMs"):
+            if claim is not None:
+                written = store.put_if_absent(item)
+            else:
+                store.put(item)
+    except Exception:
+        if claim is not None:
+            idempotency_store.release(key, claim.token)
+        raise
+
+    # ── Fire EventBridge for async AI processing (one attempt; outbox retries) ─
+    if written:
+        print(f"[FEEDBACK SAVED] feedbackId={feedback_id}")
+        _fire_eventbridge(feedback_id, message, timestamp)
+    else:   # its outbox marker, if still set, gets the event republished
+        print(f"[FEEDBACK SAVED] feedbackId={feedback_id} already written by the previous owner")
+    insights_cache.invalidate()   # this container's next /insights sees the new item
+
+    # ── Return immediately (<1s) ──────────────────────────────────────────────
+    response = {
+        "feedbackId": feedback_id,
+        "message":    "Feedback received. AI analysis in progress.",
+    }
+    if claim is not None:
+        idempotency_store.complete(key, claim.token, 201, response)
+    return _resp(201, response)
+
+
+def _idempotent_refusal(claim: idempotency.Claim) -> Dict[str, Any]:
+    """Response for a duplicate: replay, still in flight, or the key reused for another body."""
+    metrics.add(f"Idempotency{claim.outcome.title().replace('_', '')}")
+    if claim.outcome == idempotency.REPLAY:
+        print(f"[IDEMPOTENCY] replay feedbackId={claim.feedback_id}")
+        resp = _resp(claim.response["statusCode"], claim.response["body"])
+        resp["headers"]["Idempotent-Replayed"] = "true"
+        return resp
+    if claim.outcome == idempotency.MISMATCH:
+        return _resp(422, {"message": "Idempotency-Key was already used for a different submission."})
+    resp = _resp(409, {"message": "A request with this Idempotency-Key is still in progress."})
+    resp["headers"]["Retry-After"] = "1"
+    return resp
+
+
+_TEXT_FIELDS = ("name", "email", "message", "employeeName", "department", "reviewPeriod")
+
+
+def _feedback_item(body: Any) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Validate one submission → (DynamoDB item, None) or (None, client error message)."""
+    if not isinstance(body, dict):
+        return None, "Each record must be a JSON object."
+    if any(not isinstance(body.get(f), (str, type(None))) for f in _TEXT_FIELDS):
+        return None, f"{', '.join(_TEXT_FIELDS)} must be strings."
+
     name    = (body.get("name")    or "").strip()[:200]
     email   = (body.get("email")   or "").strip()[:200]
     message = (body.get("message") or "").strip()[:MAX_MESSAGE_LEN]
@@ -123,10 +410,10 @@ def handle_post_feedback(event: Dict[str, Any]) -> Dict[str, Any]:
 
     # ── Validate ──────────────────────────────────────────────────────────────
     if not name or not email or not message:
-        return _resp(400, {"message": "name, email and message are required."})
+        return None, "name, email and message are required."
 
     if not _valid_email(email):
-        return _resp(400, {"message": "Invalid email address."})
+        return None, "Invalid email address."
 
     # ── Build record ──────────────────────────────────────────────────────────
     feedback_id = str(uuid.uuid4())
@@ -142,8 +429,10 @@ def handle_post_feedback(event: Dict[str, Any]) -> Dict[str, Any]:
         "topics":      [],
         "summary":     None,
         "timestamp":   timestamp,
+        "timeBucket":  insights_query.time_bucket(timestamp),   # partition of the date-window GSI
         "aiProcessed": False,
         "aiProvider":  AI_PROVIDER,
+        **outbox.marker(timestamp),           # event owed until the analysis lands
     }
     
     # Add optional fields if provided
@@ -155,18 +444,76 @@ def handle_post_feedback(event: Dict[str, Any]) -> Dict[str, Any]:
         item["reviewPeriod"] = review_period
     if rating is not None:
         item["rating"] = rating
+    return item, None
 
-    # ── Save to DynamoDB ──────────────────────────────────────────────────────
-    table.put_item(Item=item)
-    print(f"[FEEDBACK SAVED] feedbackId={feedback_id}")
 
-    # ── Fire EventBridge for async AI processing ──────────────────────────────
-    _fire_eventbridge(feedback_id, message, timestamp)
+# ─────────────────────────────────────────────────────────────────────────────
+# POST /feedback/batch
+# ─────────────────────────────────────────────────────────────────────────────
 
-    # ── Return immediately (<1s) ──────────────────────────────────────────────
-    return _resp(201, {
-        "feedbackId": feedback_id,
-        "message":    "Feedback received. AI analysis in progress.",
+def handle_post_feedback_batch(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Bulk ingest ({"records": [...]}). Each record is validated like POST
+    /feedback and answered by index. Stored records are written with
+    BatchWriteItem and announced with 10-entry PutEvents. Records whose event
+    did not get through stay in the outbox for the sweeper.
+    """
+    try:
+        body = json.loads(_request_body(event) or "{}")
+    except ValueError:
+        return _resp(400, {"message": "Invalid JSON body."})
+
+    records = body.get("records") if isinstance(body, dict) else None
+    if not isinstance(records, list) or not records:
+        return _resp(400, {"message": "records must be a non-empty array."})
+    if len(records) > FEEDBACK_BATCH_MAX:
+        return _resp(413, {"message": f"At most {FEEDBACK_BATCH_MAX} records per batch."})
+
+    # ── Validate ──────────────────────────────────────────────────────────────
+    results: List[Dict[str, Any]] = []
+    valid: List[Tuple[int, Dict[str, Any]]] = []
+    for index, record in enumerate(records):
+        item, error = _feedback_item(record)
+        if error:
+            results.append({"index": index, "error": error})
+        else:
+            valid.append((index, item))
+
+    # ── Save (BatchWriteItem with unprocessed retries, or one transaction) ───
+    with metrics.timer("FeedbackBatchWriteMs"):
+        unwritten = store.put_many([item for _, item in valid])
+    unwritten_ids = {item["feedbackId"] for item in unwritten}
+    stored = [(i, item) for i, item in valid if item["feedbackId"] not in unwritten_ids]
+    for index, item in valid:
+        if item["feedbackId"] in unwritten_ids:
+            results.append({"index": index, "error": "Not stored (throughput exceeded); retry this record."})
+        else:
+            results.append({"index": index, "feedbackId": item["feedbackId"]})
+    print(f"[FEEDBACK BATCH] records={len(records)} stored={len(stored)} "
+          f"invalid={len(records) - len(valid)} unwritten={len(unwritten)}")
+
+    # ── Fire EventBridge, 10 entries per call ─────────────────────────────────
+    pending: List[str] = []
+    if stored:
+        entries = [_feedback_event(item["feedbackId"], item["message"], item["timestamp"])
+                   for _, item in stored]
+        with metrics.timer("FeedbackPutEventsMs"):
+            failed = ingest.put_events(events, entries, concurrency=INGEST_CONCURRENCY, max_attempts=1)
+        if failed:
+            pending = [stored[i][1]["feedbackId"] for i in failed]
+            metrics.add("EventBridgeFailures", len(failed))
+            print(f"[EVENTBRIDGE ERROR] {len(failed)} batch event(s) not accepted — left in the outbox")
+        insights_cache.invalidate()
+
+    metrics.add("FeedbackBatchRecords", len(records))
+    metrics.add("FeedbackBatchRejected", len(records) - len(stored))
+    results.sort(key=lambda r: r["index"])
+    status = 400 if not stored else (201 if len(stored) == len(records) else 207)
+    return _resp(status, {
+        "accepted":        len(stored),
+        "rejected":        len(records) - len(stored),
+        "analysisPending": pending,
+        "results":         results,
     })
 
 
@@ -174,151 +521,544 @@ def handle_post_feedback(event: Dict[str, Any]) -> Dict[str, Any]:
 # ASYNC: EventBridge → Lambda (AI analysis)
 # ─────────────────────────────────────────────────────────────────────────────
 
-def handle_async_analysis(detail: Dict[str, Any]) -> Dict[str, Any]:
+def handle_async_analysis(detail: Dict[str, Any], leased: bool = False) -> Dict[str, Any]:
     feedback_id = detail.get("feedbackId")
     message     = detail.get("message", "")
     timestamp   = detail.get("timestamp", "")
 
+    if not leased and not _lease_analysis(feedback_id):
+        return {"statusCode": 200, "body": "duplicate"}
     print(f"[ASYNC AI] Processing feedbackId={feedback_id}, provider={AI_PROVIDER}")
 
     try:
-        ai_result = call_ai_analysis(message)
-        print(f"[ASYNC AI] Result: {json.dumps(ai_result)}")
-
-        # ── Update DynamoDB with AI results ───────────────────────────────────
-        update_expr = (
-            "SET sentiment = :s, topics = :t, summary = :m, "
-            "aiProcessed = :p, aiProvider = :ap"
-        )
-        attr_values = {
-            ":s":  ai_result["sentiment"],
-            ":t":  ai_result["topics"],
-            ":m":  ai_result["summary"],
-            ":p":  True,
-            ":ap": AI_PROVIDER,
-        }
-        
-        # Add new enhanced fields if present
-        if "strengths" in ai_result:
-            update_expr += ", strengths = :str"
-            attr_values[":str"] = ai_result["strengths"]
-        if "improvements" in ai_result:
-            update_expr += ", improvements = :imp"
-            attr_values[":imp"] = ai_result["improvements"]
-        if "competency_areas" in ai_result:
-            update_expr += ", competency_areas = :comp"
-            attr_values[":comp"] = ai_result["competency_areas"]
-        if "priority_level" in ai_result:
-            update_expr += ", priority_level = :pri"
-            attr_values[":pri"] = ai_result["priority_level"]
-        
-        table.update_item(
-            Key={"feedbackId": feedback_id},
-            UpdateExpression=update_expr,
-            ExpressionAttributeValues=attr_values,
-        )
-
-        # ── Export to S3 ──────────────────────────────────────────────────────
-        if s3 and EXPORT_BUCKET:
-            year_month = timestamp[:7]
-            key = f"exports/{year_month}/{feedback_id}.json"
-            s3.put_object(
-                Bucket=EXPORT_BUCKET,
-                Key=key,
-                Body=json.dumps({
-                    "feedbackId": feedback_id,
-                    "timestamp":  timestamp,
-                    **ai_result,
-                }),
-                ContentType="application/json",
-            )
-            print(f"[S3 EXPORT] s3://{EXPORT_BUCKET}/{key}")
+        ai_result = cached_ai_analysis(message)
+        if metrics.sample_payload():
+            print(f"[ASYNC AI] Result: {json.dumps(ai_result)}")
+        _store_ai_result(feedback_id, timestamp, ai_result)
 
     except Exception as exc:
-        print(f"[ASYNC AI ERROR] feedbackId={feedback_id}: {exc}")
-        traceback.print_exc()
-        # Mark as failed so we can retry if needed
-        table.update_item(
-            Key={"feedbackId": feedback_id},
-            UpdateExpression="SET aiProcessed = :p, aiError = :e",
-            ExpressionAttributeValues={":p": False, ":e": str(exc)[:500]},
-        )
+        metrics.add("AnalysisFailures")
+        _mark_ai_failed(feedback_id, exc)
 
     return {"statusCode": 200, "body": "processed"}
 
 
+def _lease_analysis(feedback_id: Optional[str]) -> bool:
+    """
+    Take the outbox analysis lease before paying for a model call, so the sweep
+    does not republish an analysis that is merely slow. False: another consumer
+    is analysing this item right now (a republished duplicate) — skip it.
+    Best effort: SQLite has no sweep, and a failed lease write only logs.
+    """
+    if store.name != storage.DYNAMODB or not feedback_id:
+        return True
+    try:
+        if outbox.lease(table, feedback_id, datetime.now(timezone.utc), OUTBOX_LEASE_SECONDS):
+            return True
+    except (BotoCoreError, ClientError) as exc:
+        print(f"[OUTBOX] lease for feedbackId={feedback_id} not recorded: {exc}")
+        return True
+    print(f"[ASYNC AI] feedbackId={feedback_id} is being analysed elsewhere — duplicate skipped")
+    metrics.add("AnalysisDuplicatesSkipped")
+    return False
+
+
+def _store_ai_result(feedback_id: str, timestamp: str, ai_result: Dict[str, Any],
+                     not_after: Optional[str] = None) -> bool:
+    """
+    Persist an analysis on the feedback item. The S3 analytics export follows
+    from the table stream in batches (exports.py). With `not_after`, the write is
+    conditional: it is skipped (returns False) if the item already carries a
+    result stamped later than that ISO time.
+    """
+    # ── Store the AI results ──────────────────────────────────────────────────
+    provider = ai_result.get("aiProvider") or MODEL_PROVIDER   # tiered: local or bedrock
+    values = {
+        "sentiment":       ai_result["sentiment"],
+        "topics":          ai_result["topics"],
+        "summary":         ai_result["summary"],
+        "aiProcessed":     True,
+        "aiProvider":      provider,
+        "aiModel":         _model_id(provider),
+        "aiPromptVersion": PROMPT_VERSION,
+        "aiAnalyzedAt":    datetime.now(timezone.utc).isoformat(),
+    }
+
+    # Add new enhanced fields if present
+    for field in ("strengths", "improvements", "competency_areas", "priority_level"):
+        if field in ai_result:
+            values[field] = ai_result[field]
+
+    # A summary puts the item in the sparse review index (GET /reviews).
+    remove = ["aiError", *outbox.CLEAR_ATTRS]   # analysed: no event owed
+    if ai_result["summary"] and timestamp:
+        values[review_index.REVIEW_BUCKET] = review_index.review_bucket(timestamp)
+    else:
+        remove.append(review_index.REVIEW_BUCKET)
+
+    with metrics.timer("AnalysisUpdateMs"):
+        stored = store.update(feedback_id, values, remove, not_after=not_after)
+    if not stored:
+        print(f"[AI RESULT] feedbackId={feedback_id} has a newer result — not overwritten")
+    return stored
+
+
+def _mark_ai_failed(feedback_id: str, exc: Exception) -> None:
+    print(f"[ASYNC AI ERROR] feedbackId={feedback_id}: {exc}")
+    traceback.print_exc()
+    # Mark as failed so we can retry if needed
+    store.update(feedback_id, {"aiProcessed": False, "aiError": str(exc)[:500]},
+                 [*outbox.CLEAR_ATTRS, review_index.REVIEW_BUCKET])
+
+
 # ─────────────────────────────────────────────────────────────────────────────
-# GET /insights
+# ASYNC BATCH: SQS / EventBridge batch → one Bedrock call per micro-batch
+# ─────────────────────────────────────────────────────────────────────────────
+
+def handle_batch_analysis(records: List[Dict[str, Any]]) -> List[str]:
+    """
+    Analyse many {feedbackId, message, timestamp} records. On Bedrock they are
+    packed into micro-batches (one invoke_model each); on Comprehend they go
+    25 at a time through the BatchDetect* APIs. Anything the batch call did not
+    answer cleanly is retried alone through handle_async_analysis.
+    Returns the feedbackIds whose processing raised (for partial-batch retry).
+    """
+    records = [r for r in records if r.get("feedbackId")]
+    print(f"[BATCH AI] {len(records)} records, provider={AI_PROVIDER}")
+
+    # ── Local / tiered: in-process scoring, confident results kept ────────────
+    results: Dict[str, Dict[str, Any]] = {}
+    if AI_PROVIDER in ("local", "tiered"):
+        for record in records:
+            screened = _local_screen(record.get("message", ""))
+            if screened is not None:
+                results[record["feedbackId"]] = screened
+    screened_count = len(results)
+
+    # ── Content-addressed cache first: identical texts never reach the model ─
+    keys = {r["feedbackId"]: _ai_cache_key(r.get("message", ""))
+            for r in records if r["feedbackId"] not in results}
+    for feedback_id, key in keys.items():
+        cached = ai_result_cache.get(key)
+        if cached is not None:
+            results[feedback_id] = cached
+    pending = [r for r in records if r["feedbackId"] not in results]
+    if len(results) > screened_count:
+        print(f"[AI CACHE] batch hits={len(results) - screened_count} {json.dumps(ai_result_cache.stats())}")
+
+    # ── Lease what goes to the model; drop what another consumer is analysing ─
+    if pending:
+        leases = io.together(*(lambda r=r: _lease_analysis(r["feedbackId"]) for r in pending))
+        skipped = {id(r) for r, ok in zip(pending, leases) if not ok}
+        pending = [r for r in pending if id(r) not in skipped]
+        records = [r for r in records if id(r) not in skipped]
+
+    if MODEL_PROVIDER == "bedrock":
+        for batch in batch_analysis.pack_batches(
+            pending, BEDROCK_BATCH_SIZE, BEDROCK_BATCH_INPUT_TOKENS,
+        ):
+            if len(batch) < 2:
+                continue
+            try:
+                answered, reason = bedrock_health.call(
+                    lambda: call_bedrock_batch_analysis(batch),
+                    (lambda: _failover_batch_analysis(batch)) if BEDROCK_FAILOVER else None,
+                )
+            except Exception as exc:
+                print(f"[BATCH AI ERROR] batch of {len(batch)} failed, retrying singly: {exc}")
+                continue
+            if reason is not None:
+                _note_failover(reason, len(answered))
+            for feedback_id, result in answered.items():
+                _remember_ai_result(keys[feedback_id], result)
+            results.update(answered)
+
+    elif AI_PROVIDER == "comprehend" and len(pending) > 1:
+        try:
+            answered = call_comprehend_batch_analysis(pending)
+        except Exception as exc:
+            print(f"[BATCH AI ERROR] Comprehend batch failed, retrying singly: {exc}")
+            answered = {}
+        for feedback_id, result in answered.items():
+            _remember_ai_result(keys[feedback_id], result)
+        results.update(answered)
+
+    failed: List[str] = []
+    singles = 0
+    for record in records:
+        feedback_id = record["feedbackId"]
+        try:
+            if feedback_id in results:
+                try:
+                    _store_ai_result(feedback_id, record.get("timestamp", ""), results[feedback_id])
+                except Exception as exc:
+                    _mark_ai_failed(feedback_id, exc)
+            else:
+                singles += 1
+                handle_async_analysis(record, leased=True)
+        except Exception as exc:
+            print(f"[BATCH AI ERROR] feedbackId={feedback_id}: {exc}")
+            failed.append(feedback_id)
+
+    print(f"[BATCH AI] batched={len(results)} single={singles} failed={len(failed)}")
+    return failed
+
+
+def handle_sqs_analysis(sqs_records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """SQS batch (EventBridge → SQS → Lambda) with partial-batch failure reporting."""
+    message_ids: Dict[str, str] = {}
+    records: List[Dict[str, Any]] = []
+    failures: List[Dict[str, str]] = []
+
+    for sqs_record in sqs_records:
+        try:
+            body = json.loads(sqs_record.get("body") or "{}")
+        except json.JSONDecodeError:
+            print(f"[BATCH AI] Dropping unparseable SQS message {sqs_record.get('messageId')}")
+            continue
+        detail = body.get("detail", body) if isinstance(body, dict) else body
+        if not isinstance(detail, dict):
+            # A list / string / number never becomes a record: redelivery would not help.
+            print(f"[BATCH AI] Dropping SQS message {sqs_record.get('messageId')}: "
+                  f"{type(detail).__name__} detail")
+            continue
+        for record in batch_analysis.detail_records(detail):
+            message_ids[record["feedbackId"]] = sqs_record.get("messageId", "")
+            records.append(record)
+
+    for feedback_id in handle_batch_analysis(records):
+        failures.append({"itemIdentifier": message_ids[feedback_id]})
+
+    return {"batchItemFailures": failures}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# BACKFILL: re-run analysis for failed / unprocessed / stale items
 # ─────────────────────────────────────────────────────────────────────────────
 
-def handle_get_insights() -> Dict[str, Any]:
-    # ── Scan with pagination ──────────────────────────────────────────────────
-    items: List[Dict[str, Any]] = []
-    response = table.scan()
-    items.extend(response.get("Items", []))
-    while "LastEvaluatedKey" in response:
-        response = table.scan(ExclusiveStartKey=response["LastEvaluatedKey"])
-        items.extend(response.get("Items", []))
+def run_backfill(mode: str, run_id: str, checkpoints: Any, segments: int = 4,
+                 concurrency: int = 4, rate: float = 2.0, max_rate: float = 20.0,
+                 grace_minutes: int = 15, page_size: Optional[int] = None,
+                 deadline: Optional[Any] = None) -> Dict[str, Any]:
+    cutoff = (datetime.now(timezone.utc) - timedelta(minutes=grace_minutes)).isoformat()
+
+    def _analyse(item: Dict[str, Any]) -> Dict[str, Any]:
+        # No failover: a throttle must reach the run's AIMD limiter, and a
+        # Comprehend answer would only be picked up again by the next stale pass.
+        return cached_ai_analysis(item.get("message", ""), failover=False)
+
+    def _write(item: Dict[str, Any], result: Dict[str, Any], started_at: str) -> bool:
+        return _store_ai_result(item["feedbackId"], item.get("timestamp", ""), result,
+                                not_after=started_at)
+
+    def _failed(item: Dict[str, Any], exc: Exception) -> None:
+        if item.get("aiProcessed"):
+            # Stale-but-valid result: record the error, keep the old analysis.
+            print(f"[BACKFILL] feedbackId={item['feedbackId']} reanalysis failed: {exc}")
+            store.update(item["feedbackId"], {"aiError": str(exc)[:500]})
+        else:
+            _mark_ai_failed(item["feedbackId"], exc)
+
+    job = backfill.BackfillRun(
+        client=table.meta.client,
+        table_name=TABLE_NAME,
+        mode=mode,
+        scan_kwargs=backfill.scan_filter(mode, _current_models(), PROMPT_VERSION, cutoff),
+        analyse=_analyse,
+        write=_write,
+        on_failure=_failed,
+        limiter=backfill.AdaptiveRateLimiter(rate, max_rate=max_rate),
+        checkpoints=checkpoints,
+        run_id=run_id,
+        segments=segments,
+        concurrency=concurrency,
+        page_size=page_size,
+        deadline=deadline,
+    )
+    return job.run()
+
+
+def handle_backfill(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    {"action": "backfill", "mode": "pending|failed|stale", "runId": "...",
+     "segments": 4, "concurrency": 4, "rate": 2}
+    Stops ~10s before the invocation deadline with a checkpoint in S3; invoke
+    again with the returned runId until "complete" is true.
+    """
+    mode = event.get("mode", "pending")
+    if mode not in backfill.MODES:
+        return {"statusCode": 400, "body": f"mode must be one of {backfill.MODES}"}
+    if not (s3 and EXPORT_BUCKET):
+        return {"statusCode": 400, "body": "EXPORT_BUCKET_NAME is required for checkpoints"}
+
+    run_id = event.get("runId") or backfill.new_run_id()
+    concurrency = int(event.get("concurrency", 4))
+    remaining = getattr(context, "get_remaining_time_in_millis", None)
+
+    report = run_backfill(
+        mode=mode,
+        run_id=run_id,
+        checkpoints=backfill.S3CheckpointStore(s3, EXPORT_BUCKET, f"backfill/{run_id}.json"),
+        segments=int(event.get("segments", 4)),
+        concurrency=concurrency,
+        rate=float(event.get("rate", 2.0)),
+        max_rate=float(event.get("maxRate", 20.0)),
+        grace_minutes=int(event.get("graceMinutes", 15)),
+        deadline=(lambda: remaining() < 10_000) if remaining else None,
+    )
+    return {"statusCode": 200, "body": json.dumps(report)}
 
-    total = len(items)
 
-    # ── Aggregate sentiment counts ────────────────────────────────────────────
-    sentiment_counts = {"positive": 0, "negative": 0, "neutral": 0}
-    summaries: List[Dict[str, Any]] = []
-    reviews: List[Dict[str, Any]] = []  # Employee reviews for frontend
-    all_topics: List[str] = []
-    monthly_sentiment: Dict[str, Dict[str, int]] = {}
+# ─────────────────────────────────────────────────────────────────────────────
+# GET /insights
+# ─────────────────────────────────────────────────────────────────────────────
 
+# Top-level payload sections per view; `fields=` selects a subset.
+INSIGHTS_VIEWS = {
+    "full": (
+        "totalSubmissions", "thisMonth", "positivePercent", "topTopic", "sentimentCounts",
+        "topTopics", "sentimentTrend", "recentSummaries", "summaries", "reviews", "topics",
+    ),
+    # No duplicated summaries; topics as capped, pre-weighted {topic, weight} pairs.
+    "compact": (
+        "totalSubmissions", "thisMonth", "positivePercent", "topTopic", "sentimentCounts",
+        "topTopics", "sentimentTrend", "reviews", "topics",
+    ),
+}
+
+
+def _insights_shape(params: Optional[Dict[str, str]]) -> Tuple[str, Tuple[str, ...]]:
+    """?view=full|compact&fields=a,b → (view, selected fields). Raises ValueError."""
+    params = params or {}
+    view = (params.get("view") or "full").strip().lower()
+    if view not in INSIGHTS_VIEWS:
+        raise ValueError(f"view must be one of {', '.join(INSIGHTS_VIEWS)}")
+    allowed = INSIGHTS_VIEWS[view]
+    requested = [f.strip() for f in (params.get("fields") or "").split(",") if f.strip()]
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise ValueError(f"unknown fields for view '{view}': {', '.join(unknown)}")
+    return view, tuple(f for f in allowed if f in requested) if requested else allowed
+
+
+def handle_get_insights(event: Dict[str, Any]) -> Dict[str, Any]:
+    # ── Optional slice (?department=&reviewPeriod=&from=&to=) and shape ───────
+    params = event.get("queryStringParameters")
+    try:
+        filters = insights_query.parse_filters(params)
+        view, fields = _insights_shape(params)
+    except ValueError as exc:
+        return _resp(400, {"message": str(exc)})
+
+    # ── Warm-container cache: hits skip scan, aggregation and serialization ───
+    cache_key = f"{filters.cache_key()}|{view}|{','.join(fields)}"
+    entry, status = insights_cache.get_or_compute(
+        cache_key, lambda: _compute_insights_body(filters, view, fields))
+    print(f"[INSIGHTS CACHE] {status} {json.dumps(insights_cache.stats())}")
+    metrics.add(f"InsightsCache{status.title()}")
+
+    # One ETag form per response: weak when the bytes are compressed. A 304 carries
+    # the tag the 200 would have, and the If-None-Match compare is weak (W/ ignored).
+    encoding = responses.negotiate(_header(event, "Accept-Encoding"))
+    compress = bool(encoding) and len(entry.body) >= COMPRESS_MIN_BYTES
+    etag = f"W/{entry.etag}" if compress else entry.etag   # same representation, different bytes
+    headers = {
+        **_cors(),
+        "ETag":          etag,
+        "Cache-Control": f"private, max-age={INSIGHTS_CACHE_TTL}, "
+                         f"stale-while-revalidate={INSIGHTS_CACHE_SWR}",
+        "X-Cache":       status,
+        "Vary":          "Accept-Encoding",
+    }
+    if etag_matches(_header(event, "If-None-Match"), etag):
+        return {"statusCode": 304, "headers": headers, "body": ""}
+
+    headers["Content-Type"] = "application/json"
+    if compress:
+        headers["Content-Encoding"] = encoding
+        return {
+            "statusCode":      200,
+            "headers":         headers,
+            "body":            responses.compressed_body(entry.body, encoding),
+            "isBase64Encoded": True,
+        }
+    return {"statusCode": 200, "headers": headers, "body": entry.body}
+
+
+def _compute_insights_body(filters: insights_query.InsightsFilter, view: str,
+                           fields: Tuple[str, ...]) -> str:
+    agg = None
+    if store.name != storage.DYNAMODB:
+        with metrics.timer("InsightsQueryMs"):
+            agg = store.aggregate(filters, datetime.now(timezone.utc).strftime("%Y-%m"),
+                                  TOPIC_SKETCH_CAPACITY)
+    if agg is not None:
+        payload = _payload_from_aggregate(agg, view)   # GROUP BY pushed down to the store
+    elif filters.empty:
+        payload = _compute_insights(view)
+    else:
+        with metrics.timer("InsightsScanMs"):
+            agg = _filtered_insights_aggregate(filters)
+        payload = _payload_from_aggregate(agg, view)
+    with metrics.timer("InsightsSerializeMs"):
+        return responses.dumps({f: payload[f] for f in fields})
+
+
+def _filtered_insights_aggregate(filters: insights_query.InsightsFilter) -> ColumnarAccumulator:
+    """Query the GSI partitions covering the slice; filtered scan when none bounds it."""
     now = datetime.now(timezone.utc)
     current_month_key = now.strftime("%Y-%m")
-    this_month = 0
-
-    for item in items:
-        sentiment = (item.get("sentiment") or "neutral").lower()
-        if sentiment not in sentiment_counts:
-            sentiment = "neutral"
-        sentiment_counts[sentiment] += 1
-
-        # Monthly trend aggregation
-        ts = item.get("timestamp", "")
-        month_key = ts[:7] if ts else "unknown"
-
-        if month_key == current_month_key:
-            this_month += 1
-
-        if month_key not in monthly_sentiment:
-            monthly_sentiment[month_key] = {"positive": 0, "negative": 0, "neutral": 0}
-        if sentiment in monthly_sentiment[month_key]:
-            monthly_sentiment[month_key][sentiment] += 1
-
-        # Summaries (only AI-processed ones) - for backward compatibility
-        if item.get("summary") and item.get("aiProcessed"):
-            summaries.append({
-                "summary":   item["summary"],
-                "sentiment": sentiment,
-                "topics":    item.get("topics", []),
-                "timestamp": ts[:10] if ts else "",
-            })
-            
-            # Employee reviews with full data
-            review = {
-                "employeeName": item.get("employeeName", "Unknown Employee"),
-                "department": item.get("department", ""),
-                "reviewPeriod": item.get("reviewPeriod", ""),
-                "rating": item.get("rating", 0),
-                "sentiment": sentiment,
-                "summary": item.get("summary", ""),
-                "topics": item.get("topics", []),
-                "timestamp": ts[:10] if ts else "",
-            }
-            reviews.append(review)
-
-        # Topics
-        if isinstance(item.get("topics"), list):
-            all_topics.extend(item["topics"])
+    queries = insights_query.plan_queries(filters, now.isoformat(), INSIGHTS_MAX_TIME_BUCKETS)
+    if queries is None:
+        print(f"[INSIGHTS] No index bounds {filters.cache_key()} — filtered scan")
+        return scan_engine.parallel_scan(
+            table.meta.client,
+            TABLE_NAME,
+            segments=SCAN_SEGMENTS,
+            new_partial=lambda: _new_aggregate(current_month_key),
+            fold_page=_fold_insights_page,
+            merge=ColumnarAccumulator.merge,
+            projection=PROJECTED_FIELDS,
+            scan_kwargs=insights_query.scan_filter(filters),
+        )
+    if not queries:
+        # A window that starts after now: no month bucket to query, nothing can match.
+        print(f"[INSIGHTS] {filters.cache_key()} → empty window, no queries")
+        return _new_aggregate(current_month_key)
+    print(f"[INSIGHTS] {filters.cache_key()} → {len(queries)} "
+          f"query(s) on {queries[0]['IndexName']}")
+    return scan_engine.parallel_query(
+        table.meta.client,
+        TABLE_NAME,
+        queries,
+        new_partial=lambda: _new_aggregate(current_month_key),
+        fold_page=_fold_insights_page,
+        merge=ColumnarAccumulator.merge,
+        projection=PROJECTED_FIELDS,
+    )
 
+
+def _new_aggregate(current_month_key: str, recent_size: int = RECENT_SIZE) -> ColumnarAccumulator:
+    return ColumnarAccumulator(current_month_key, recent_size=recent_size,
+                               normalize=topic_normalizer, topic_capacity=TOPIC_SKETCH_CAPACITY)
+
+
+def _fold_insights_page(partial: ColumnarAccumulator, items: List[Dict[str, Any]]) -> None:
+    # Summed across scan workers; InsightsScanMs minus this (per worker) is I/O wait.
+    metrics.add("InsightsScanPages")
+    with metrics.timer("InsightsAggregateMs", total=True):
+        partial.add_page(items)
+
+
+def _compute_insights(view: str = "full") -> Dict[str, Any]:
+    # ── Rollups (maintained from the table stream) → a handful of point reads ─
+    if rollup_table is not None:
+        with metrics.timer("InsightsRollupReadMs"):
+            rolled = rollups.read_rollups(
+                rollup_table,
+                current_month=datetime.now(timezone.utc).strftime("%Y-%m"),
+                normalize=topic_normalizer,
+                topic_capacity=TOPIC_SKETCH_CAPACITY,
+            )
+        if rolled is not None:
+            return _insights_from_rollups(rolled, view)
+        print("[INSIGHTS] Rollups not built yet — falling back to full scan")
+
+    # ── Parallel segmented scan, projected, folded page by page ──────────────
+    # Recent reviews come from the review index, so the scan skips that window.
+    with metrics.timer("InsightsScanMs"):
+        agg = _scan_insights_aggregate()
+    return _payload_from_aggregate(agg, view, recent=_recent_from_index())
+
+
+def _payload_from_aggregate(agg: ColumnarAccumulator, view: str = "full",
+                            recent: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    reviews = agg.reviews() if recent is None else recent
+    return _insights_payload(
+        total=agg.total,
+        this_month=agg.this_month,
+        sentiment_counts=agg.sentiment_counts,
+        monthly_sentiment=agg.monthly,
+        topic_counter=agg.topics,
+        summaries=_summary_rows(reviews),
+        reviews=reviews,
+        view=view,
+    )
+
+
+def _scan_insights_aggregate() -> ColumnarAccumulator:
+    """Full-table aggregate via SCAN_SEGMENTS parallel workers."""
+    current_month_key = datetime.now(timezone.utc).strftime("%Y-%m")
+    return scan_engine.parallel_scan(
+        table.meta.client,
+        TABLE_NAME,
+        segments=SCAN_SEGMENTS,
+        new_partial=lambda: _new_aggregate(current_month_key, recent_size=0),
+        fold_page=_fold_insights_page,
+        merge=ColumnarAccumulator.merge,
+        projection=PROJECTED_FIELDS,
+    )
+
+
+def _insights_from_rollups(rolled: Dict[str, Any], view: str = "full") -> Dict[str, Any]:
+    """Shape pre-aggregated rollups into the same payload as the scan path."""
+    current_month_key = datetime.now(timezone.utc).strftime("%Y-%m")
+    monthly_sentiment = rolled["monthly"]
+    this_month = sum(monthly_sentiment.get(current_month_key, {}).values())
+
+    reviews = _recent_from_index()
+    return _insights_payload(
+        total=rolled["total"],
+        this_month=this_month,
+        sentiment_counts=rolled["sentimentCounts"],
+        monthly_sentiment=monthly_sentiment,
+        topic_counter=rolled["topicCounter"],
+        summaries=_summary_rows(reviews),
+        reviews=reviews,
+        view=view,
+    )
+
+
+def _recent_from_index() -> List[Dict[str, Any]]:
+    """Newest RECENT_SIZE reviews from the review index, oldest first (like agg.reviews())."""
+    with metrics.timer("InsightsRecentMs"):
+        rows, _ = store.reviews_page(RECENT_SIZE, max_empty_months=REVIEWS_MAX_EMPTY_MONTHS)
+    return [_review_row(item, date_only=True) for item in reversed(rows)]
+
+
+def _review_row(item: Dict[str, Any], date_only: bool = False) -> Dict[str, Any]:
+    ts = item.get("timestamp", "")
+    return {
+        "employeeName": item.get("employeeName", "Unknown Employee"),
+        "department":   item.get("department", ""),
+        "reviewPeriod": item.get("reviewPeriod", ""),
+        "rating":       item.get("rating", 0),
+        "sentiment":    rollups.item_sentiment(item),
+        "summary":      item.get("summary", ""),
+        "topics":       item.get("topics", []),
+        "timestamp":    ts[:10] if date_only else ts,
+    }
+
+
+def _summary_rows(reviews: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {"summary": r["summary"], "sentiment": r["sentiment"],
+         "topics": r["topics"], "timestamp": r["timestamp"]}
+        for r in reviews
+    ]
+
+
+def _insights_payload(
+    total: int,
+    this_month: int,
+    sentiment_counts: Dict[str, int],
+    monthly_sentiment: Dict[str, Dict[str, int]],
+    topic_counter: Counter,
+    summaries: List[Dict[str, Any]],
+    reviews: List[Dict[str, Any]],
+    view: str = "full",
+) -> Dict[str, Any]:
     # ── Top topics by count ───────────────────────────────────────────────────
-    topic_counter = Counter(all_topics)
     top_topics = [
         {"topic": t, "count": c}
         for t, c in topic_counter.most_common(10)
@@ -348,7 +1088,7 @@ def handle_get_insights() -> Dict[str, Any]:
     # ── Top topic label ───────────────────────────────────────────────────────
     top_topic = top_topics[0]["topic"] if top_topics else "N/A"
 
-    return _resp(200, {
+    payload = {
         "totalSubmissions": total,
         "thisMonth":        this_month,
         "positivePercent":  positive_percent,
@@ -356,104 +1096,515 @@ def handle_get_insights() -> Dict[str, Any]:
         "sentimentCounts":  sentiment_counts,
         "topTopics":        top_topics,
         "sentimentTrend":   sentiment_trend,
-        "recentSummaries":  summaries[-20:],    # last 20 only (for backward compatibility)
-        "summaries":        [s["summary"] for s in summaries[-20:]],  # Simple string array (for backward compatibility)
         "reviews":          reviews[-50:],     # last 50 employee reviews with full data
-        "topics":           all_topics,         # raw flat list for word cloud
+    }
+    if view == "compact":
+        payload["topics"] = _topic_weights(topic_counter, INSIGHTS_TOPIC_LIMIT)
+        return payload
+
+    payload["recentSummaries"] = summaries[-20:]    # last 20 only (for backward compatibility)
+    payload["summaries"] = [s["summary"] for s in summaries[-20:]]  # Simple string array (for backward compatibility)
+    payload["topics"] = list(topic_counter.elements())   # raw flat list for word cloud
+    return payload
+
+
+def _topic_weights(topic_counter: Counter, limit: int) -> List[Dict[str, Any]]:
+    """Word-cloud input: top `limit` topics (already normalised), weight = count / max."""
+    top = topic_counter.most_common(limit)
+    if not top:
+        return []
+    peak = top[0][1]
+    return [{"topic": t, "weight": round(c / peak, 4)} for t, c in top]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# GET /reviews
+# ─────────────────────────────────────────────────────────────────────────────
+
+def handle_get_reviews(event: Dict[str, Any]) -> Dict[str, Any]:
+    """?limit=&cursor= → newest-first page of AI-processed reviews and the next cursor."""
+    params = event.get("queryStringParameters") or {}
+    try:
+        limit = int(params.get("limit") or REVIEWS_PAGE_DEFAULT)
+    except ValueError:
+        return _resp(400, {"message": "limit must be an integer"})
+    if not 1 <= limit <= REVIEWS_PAGE_MAX:
+        return _resp(400, {"message": f"limit must be between 1 and {REVIEWS_PAGE_MAX}"})
+
+    try:
+        with metrics.timer("ReviewsQueryMs"):
+            rows, next_cursor = store.reviews_page(
+                limit, cursor=params.get("cursor") or None,
+                max_empty_months=REVIEWS_MAX_EMPTY_MONTHS,
+            )
+    except ValueError as exc:
+        return _resp(400, {"message": str(exc)})
+
+    return _resp(200, {
+        "reviews":    [{"feedbackId": item["feedbackId"], **_review_row(item)} for item in rows],
+        "nextCursor": next_cursor,
     })
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# DynamoDB STREAM → ROLLUPS
+# ─────────────────────────────────────────────────────────────────────────────
+
+_last_rollup_prune = 0.0   # monotonic time of this container's last topic-shard prune
+
+
+def handle_stream_batch(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Fold the batch into the rollups and export newly analysed items to S3."""
+    global _last_rollup_prune
+    done = []
+    if rollup_table is not None:
+        with metrics.timer("RollupUpdateMs"):
+            stats = rollups.process_stream_batch(rollup_table, records, topic_normalizer)
+        print(f"[ROLLUPS] records={stats['records']} rollupItems={stats['rollupItems']} "
+              f"topicsRemoved={stats['topicsRemoved']}")
+        if time.monotonic() - _last_rollup_prune >= ROLLUP_PRUNE_SECONDS:
+            _last_rollup_prune = time.monotonic()
+            print(f"[ROLLUPS] prune {json.dumps(rollups.prune_topic_shards(rollup_table))}")
+        done.append("rolled up")
+
+    if s3 and EXPORT_BUCKET:
+        pairs = rollups.decode_stream_records(records)
+        with metrics.timer("ExportMs"):
+            stats = exports.export_stream_batch(s3, EXPORT_BUCKET, records, pairs)
+        metrics.add("ExportRows", stats["rows"])
+        metrics.add("ExportObjects", stats["objects"])
+        print(f"[S3 EXPORT] records={len(records)} rows={stats['rows']} objects={stats['objects']}")
+        done.append("exported")
+
+    if not done:
+        print("[STREAM] neither ROLLUP_TABLE_NAME nor EXPORT_BUCKET_NAME set — ignoring batch")
+    return {"statusCode": 200, "body": ", ".join(done) or "skipped"}
+
+
+def handle_rebuild_rollups() -> Dict[str, Any]:
+    """One-off bootstrap/repair: recompute rollups from a full table scan."""
+    if store.name == storage.SQLITE:
+        # No rollups: re-derive the normalized topic rows (after a TOPIC_SYNONYMS change).
+        stats = {"items": store.rebuild_topics()}
+        print(f"[ROLLUPS REBUILD] sqlite topics {json.dumps(stats)}")
+        return {"statusCode": 200, "body": json.dumps(stats)}
+    if rollup_table is None:
+        return {"statusCode": 400, "body": "ROLLUP_TABLE_NAME not set"}
+
+    def _all_items():
+        response = table.scan()
+        yield from response.get("Items", [])
+        while "LastEvaluatedKey" in response:
+            response = table.scan(ExclusiveStartKey=response["LastEvaluatedKey"])
+            yield from response.get("Items", [])
+
+    stats = rollups.rebuild_rollups(rollup_table, _all_items(), topic_normalizer)
+    print(f"[ROLLUPS REBUILD] {json.dumps(stats)}")
+    return {"statusCode": 200, "body": json.dumps(stats)}
+
+
+def handle_compact_exports(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Compact the given month, or by default the current and previous month
+    (late analyses and backfills still land in last month's partition).
+    Stops ~10s before the invocation deadline; the next run picks up the
+    parts that are left ("remaining" in the result).
+    """
+    if not (s3 and EXPORT_BUCKET):
+        return {"statusCode": 400, "body": "EXPORT_BUCKET_NAME not set"}
+    if event.get("month"):
+        months = [event["month"]]
+    else:
+        first_of_month = datetime.now(timezone.utc).replace(day=1)
+        months = [(first_of_month - timedelta(days=1)).strftime("%Y-%m"), first_of_month.strftime("%Y-%m")]
+    remaining = getattr(context, "get_remaining_time_in_millis", None)
+    deadline = (lambda: remaining() < 10_000) if remaining else None
+    results = [exports.compact_partition(s3, EXPORT_BUCKET, month, deadline=deadline) for month in months]
+    return {"statusCode": 200, "body": json.dumps(results)}
+
+
+def handle_index_time_buckets() -> Dict[str, Any]:
+    """
+    One-off migration: stamp timeBucket (date-window GSI) and, on analysed
+    items with a summary, reviewBucket (review index) where they are missing.
+    """
+    def _stamp(counts: Dict[str, int], items: List[Dict[str, Any]]) -> None:
+        for item in items:
+            names: Dict[str, str] = {}
+            values: Dict[str, Any] = {}
+            if insights_query.TIME_BUCKET_ATTR not in item:
+                names["#tb"] = insights_query.TIME_BUCKET_ATTR
+                values[":tb"] = insights_query.time_bucket(item["timestamp"])
+            if item.get("aiProcessed") and item.get("summary") \
+                    and review_index.REVIEW_BUCKET not in item:
+                names["#rb"] = review_index.REVIEW_BUCKET
+                values[":rb"] = review_index.review_bucket(item["timestamp"])
+            if not names:
+                continue
+            table.meta.client.update_item(
+                TableName=TABLE_NAME,
+                Key={"feedbackId": item["feedbackId"]},
+                UpdateExpression="SET " + ", ".join(f"{n} = :{n[1:]}" for n in names),
+                ConditionExpression="attribute_exists(feedbackId)",
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+            )
+            counts["updated"] += 1
+
+    stats = scan_engine.parallel_scan(
+        table.meta.client,
+        TABLE_NAME,
+        segments=SCAN_SEGMENTS,
+        new_partial=lambda: {"updated": 0},
+        fold_page=_stamp,
+        merge=lambda a, b: {"updated": a["updated"] + b["updated"]},
+        projection=("feedbackId", "timestamp", "aiProcessed", "summary",
+                    insights_query.TIME_BUCKET_ATTR, review_index.REVIEW_BUCKET),
+        scan_kwargs={
+            "FilterExpression": "attribute_exists(#ts) AND (attribute_not_exists(#tb) OR "
+                                "(aiProcessed = :t AND attribute_exists(summary) AND attribute_not_exists(#rb)))",
+            "ExpressionAttributeNames": {
+                "#tb": insights_query.TIME_BUCKET_ATTR,
+                "#rb": review_index.REVIEW_BUCKET,
+                "#ts": "timestamp",
+            },
+            "ExpressionAttributeValues": {":t": True},
+        },
+    )
+    print(f"[TIME BUCKETS] {json.dumps(stats)}")
+    return {"statusCode": 200, "body": json.dumps(stats)}
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # AI ANALYSIS DISPATCHER
 # ─────────────────────────────────────────────────────────────────────────────
 
-def call_ai_analysis(message: str) -> Dict[str, Any]:
+def call_ai_analysis(message: str, failover: bool = True) -> Dict[str, Any]:
+    if AI_PROVIDER in ("local", "tiered"):
+        screened = _local_screen(message)
+        if screened is not None:
+            return screened
     if AI_PROVIDER == "comprehend":
         return call_comprehend_analysis(message)
-    return call_bedrock_analysis(message)
+    return guarded_bedrock_analysis(message, failover)
+
+
+def guarded_bedrock_analysis(message: str, failover: bool = True) -> Dict[str, Any]:
+    """
+    Bedrock behind bedrock_health (provider_health.py). While the breaker is
+    open, the limit sheds the call, or Bedrock throttles / fails past the SDK
+    retries, Comprehend answers instead and the result says aiProvider=comprehend
+    (a later stale backfill upgrades it). failover=False only records health.
+    """
+    fallback = (lambda: _failover_analysis(message)) if failover and BEDROCK_FAILOVER else None
+    result, reason = bedrock_health.call(lambda: call_bedrock_analysis(message), fallback)
+    if reason is not None:
+        _note_failover(reason, 1)
+    return result
+
+
+def _failover_analysis(message: str) -> Dict[str, Any]:
+    return {**call_comprehend_analysis(message), "aiProvider": "comprehend"}
+
+
+def _failover_batch_analysis(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    return {feedback_id: {**result, "aiProvider": "comprehend"}
+            for feedback_id, result in call_comprehend_batch_analysis(records).items()}
+
+
+def _note_failover(reason: str, count: int) -> None:
+    metrics.add("ProviderFailover", count)
+    print(f"[PROVIDER HEALTH] bedrock → comprehend ({reason}) x{count} {json.dumps(bedrock_health.snapshot())}")
+
+
+def _local_screen(message: str) -> Optional[Dict[str, Any]]:
+    """
+    In-process analysis. AI_PROVIDER=local keeps every result; tiered keeps it
+    only for short messages scored with high confidence (None → escalate).
+    """
+    analysis = local_analysis.analyse(message)
+    if AI_PROVIDER == "tiered" and (
+            analysis.confidence < LOCAL_CONFIDENCE_MIN or len(message) > LOCAL_MAX_CHARS):
+        metrics.add("LocalEscalated")
+        return None
+    metrics.add("LocalAccepted")
+    return {**analysis.result, "aiProvider": "local"}
+
+
+def _model_id(provider: str) -> str:
+    if provider == "bedrock":
+        return BEDROCK_MODEL_ID
+    if provider == "local":
+        return local_analysis.MODEL_ID
+    return provider
+
+
+def _current_models() -> List[Tuple[str, str]]:
+    """(aiProvider, aiModel) pairs a fresh analysis is stamped with — anything else is stale."""
+    if AI_PROVIDER == "tiered":
+        return [("local", _model_id("local")), ("bedrock", _model_id("bedrock"))]
+    return [(AI_PROVIDER, _model_id(AI_PROVIDER))]
+
+
+def _ai_cache_key(message: str) -> str:
+    return ai_cache.cache_key(message, MODEL_PROVIDER, _model_id(MODEL_PROVIDER), PROMPT_VERSION)
+
+
+def cached_ai_analysis(message: str, failover: bool = True) -> Dict[str, Any]:
+    """call_ai_analysis behind the content-addressed result cache (local results skip it)."""
+    if AI_PROVIDER in ("local", "tiered"):
+        screened = _local_screen(message)
+        if screened is not None:
+            return screened   # cheaper to recompute than to look up
+    key = _ai_cache_key(message)
+    result = ai_result_cache.get(key)
+    if result is not None:
+        print(f"[AI CACHE] hit {json.dumps(ai_result_cache.stats())}")
+        return result
+
+    result = (guarded_bedrock_analysis(message, failover) if AI_PROVIDER == "tiered"
+              else call_ai_analysis(message, failover))
+    _remember_ai_result(key, result)
+    return result
+
+
+def _remember_ai_result(key: str, result: Dict[str, Any]) -> None:
+    # Parse-failure placeholders are never cached: the next attempt may succeed.
+    if result.pop("parseFailed", False):
+        return
+    # Nor are failover answers: the key stands for MODEL_PROVIDER's analysis.
+    if result.get("aiProvider", MODEL_PROVIDER) != MODEL_PROVIDER:
+        return
+    # In the background: the cache fill overlaps the feedback update that follows,
+    # and its failures are logged by the cache, never surfaced to the analysis.
+    io.background(
+        ai_result_cache.put, key, copy.deepcopy(result),
+        provider=MODEL_PROVIDER, modelId=_model_id(MODEL_PROVIDER), promptVersion=PROMPT_VERSION,
+    )
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # BEDROCK (Claude 3 Haiku)
 # ─────────────────────────────────────────────────────────────────────────────
 
+_PROMPT_PREAMBLE = (
+    "You are an expert HR analyst specializing in performance feedback analysis. "
+    "Analyze the following employee performance feedback with depth and precision.\n\n"
+    "Context: This feedback is part of a performance review system. Your analysis will help "
+    "HR identify patterns, skill gaps, and development opportunities.\n\n"
+)
+
+_PROMPT_FIELDS = (
+    "1. sentiment: Classify as 'positive', 'negative', or 'neutral' based on overall tone\n"
+    "2. topics: Extract 3-8 key topics/themes (e.g., 'communication skills', 'technical expertise', "
+    "'leadership', 'time management', 'collaboration', 'problem-solving'). Use specific, actionable terms.\n"
+    "3. summary: Write a 2-3 sentence professional summary that:\n"
+    "   - Captures the essence of the feedback\n"
+    "   - Highlights key strengths or concerns\n"
+    "   - Is suitable for HR review\n"
+    "4. strengths: List 2-4 specific strengths mentioned (if any), or empty array if none\n"
+    "5. improvements: List 2-4 specific areas for improvement mentioned (if any), or empty array if none\n"
+    "6. competency_areas: Identify 1-3 competency categories from: Technical Skills, "
+    "Communication, Leadership, Collaboration, Problem-Solving, Time Management, Innovation, "
+    "Customer Focus, Adaptability, Quality Focus. Return as array.\n"
+    "7. priority_level: 'high', 'medium', or 'low' based on urgency/importance of the feedback\n\n"
+)
+
+_PROMPT_SCHEMA = (
+    '"sentiment": "...", "topics": [...], "summary": "...", "strengths": [...], '
+    '"improvements": [...], "competency_areas": [...], "priority_level": "..."'
+)
+
+
+# Any edit to the prompt text changes this, which re-keys the AI result cache.
+PROMPT_VERSION = hashlib.sha256(
+    (_PROMPT_PREAMBLE + _PROMPT_FIELDS + _PROMPT_SCHEMA).encode("utf-8")
+).hexdigest()[:12]
+
+
 def call_bedrock_analysis(message: str) -> Dict[str, Any]:
     prompt = (
-        f"You are an expert HR analyst specializing in performance feedback analysis. "
-        f"Analyze the following employee performance feedback with depth and precision.\n\n"
-        f"Context: This feedback is part of a performance review system. Your analysis will help "
-        f"HR identify patterns, skill gaps, and development opportunities.\n\n"
+        f"{_PROMPT_PREAMBLE}"
         f"Feedback Text:\n\"\"\"{message}\"\"\"\n\n"
         f"Provide a comprehensive analysis in JSON format with these exact fields:\n"
-        f"1. sentiment: Classify as 'positive', 'negative', or 'neutral' based on overall tone\n"
-        f"2. topics: Extract 3-8 key topics/themes (e.g., 'communication skills', 'technical expertise', "
-        f"'leadership', 'time management', 'collaboration', 'problem-solving'). Use specific, actionable terms.\n"
-        f"3. summary: Write a 2-3 sentence professional summary that:\n"
-        f"   - Captures the essence of the feedback\n"
-        f"   - Highlights key strengths or concerns\n"
-        f"   - Is suitable for HR review\n"
-        f"4. strengths: List 2-4 specific strengths mentioned (if any), or empty array if none\n"
-        f"5. improvements: List 2-4 specific areas for improvement mentioned (if any), or empty array if none\n"
-        f"6. competency_areas: Identify 1-3 competency categories from: Technical Skills, "
-        f"Communication, Leadership, Collaboration, Problem-Solving, Time Management, Innovation, "
-        f"Customer Focus, Adaptability, Quality Focus. Return as array.\n"
-        f"7. priority_level: 'high', 'medium', or 'low' based on urgency/importance of the feedback\n\n"
+        f"{_PROMPT_FIELDS}"
         f"Respond ONLY with valid JSON, no markdown, no explanation:\n"
-        f'{{"sentiment": "...", "topics": [...], "summary": "...", "strengths": [...], '
-        f'"improvements": [...], "competency_areas": [...], "priority_level": "..."}}'
+        f"{{{_PROMPT_SCHEMA}}}"
+    )
+
+    budget = bedrock_stream.output_budget(message, BEDROCK_OUTPUT_TOKENS_MIN, BEDROCK_OUTPUT_TOKENS)
+    reply = _invoke_bedrock(prompt, max_tokens=budget)
+    if reply.value is None and reply.stop_reason == "max_tokens" and budget < BEDROCK_OUTPUT_TOKENS:
+        metrics.add("BedrockTruncated")
+        reply = _invoke_bedrock(prompt, max_tokens=BEDROCK_OUTPUT_TOKENS)
+
+    if reply.value is not None:
+        return _normalize_ai_result(reply.value)
+    # ── Safe JSON extraction (handles markdown fences) ────────────────────────
+    return _safe_parse_ai_response(reply.text)
+
+
+def call_bedrock_batch_analysis(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Score several feedback messages with ONE invoke_model call: the shared
+    instructions are sent once and the model answers with a JSON array keyed
+    by short per-item ids. Returns {feedbackId: normalized result} for the
+    entries that came back well-formed; the caller retries the rest singly.
+    """
+    labels = {f"f{i + 1}": r["feedbackId"] for i, r in enumerate(records)}
+    items  = "".join(
+        f"Feedback id=\"{label}\":\n\"\"\"{r.get('message', '')}\"\"\"\n\n"
+        for label, r in zip(labels, records)
     )
+    prompt = (
+        f"{_PROMPT_PREAMBLE}"
+        f"There are {len(records)} separate feedback texts below, each labelled with an id.\n\n"
+        f"{items}"
+        f"For EACH feedback, provide a comprehensive analysis with these exact fields:\n"
+        f"{_PROMPT_FIELDS}"
+        f"Respond ONLY with a valid JSON array holding exactly one object per feedback, "
+        f"each including its \"id\". No markdown, no explanation:\n"
+        f"[{{\"id\": \"f1\", {_PROMPT_SCHEMA}}}, ...]"
+    )
+
+    max_tokens = min(BEDROCK_MAX_OUTPUT_TOKENS, BEDROCK_BATCH_OUTPUT_TOKENS * len(records))
+    raw = _invoke_bedrock(prompt, max_tokens=max_tokens, opener="[").text
 
+    parsed = batch_analysis.parse_keyed_results(raw, labels, _normalize_ai_result)
+    print(f"[BEDROCK BATCH] answered {len(parsed)}/{len(records)}")
+    metrics.add("AIParseFailures", len(records) - len(parsed))
+    return {labels[label]: result for label, result in parsed.items()}
+
+
+def _invoke_bedrock(prompt: str, max_tokens: int, opener: str = "{") -> bedrock_stream.StreamedReply:
+    """
+    One Claude call. Streaming (BEDROCK_STREAMING) stops reading as soon as the
+    first top-level JSON value starting with `opener` is complete; `value` holds
+    it parsed. Blocking invoke_model leaves `value` None for the caller to salvage.
+    """
     body = {
         "anthropic_version": "bedrock-2023-05-31",
-        "max_tokens":        500,  # Increased for better summaries
+        "max_tokens":        max_tokens,
         "temperature":       0.2,  # Slight creativity for better summaries
         "messages": [
             {"role": "user", "content": [{"type": "text", "text": prompt}]}
         ],
     }
 
-    print(f"[BEDROCK REQUEST] model={BEDROCK_MODEL_ID}")
-    response = bedrock.invoke_model(
-        modelId=BEDROCK_MODEL_ID,
-        body=json.dumps(body),
-        contentType="application/json",
-        accept="application/json",
-    )
-
-    response_body = json.loads(response["body"].read())
-    print(f"[BEDROCK RESPONSE] {json.dumps(response_body)}")
-
-    text_chunks = [
-        c.get("text", "")
-        for c in response_body.get("content", [])
-        if c.get("type") == "text"
-    ]
-    raw = "".join(text_chunks).strip()
-
-    # ── Safe JSON extraction (handles markdown fences) ────────────────────────
-    return _safe_parse_ai_response(raw)
+    started = time.perf_counter()
+    if BEDROCK_STREAMING:
+        reply = bedrock_stream.read_stream(
+            bedrock.invoke_model_with_response_stream(
+                modelId=BEDROCK_MODEL_ID,
+                body=json.dumps(body),
+                contentType="application/json",
+                accept="application/json",
+            ),
+            opener=opener,
+            started=started,
+        )
+    else:
+        response = bedrock.invoke_model(
+            modelId=BEDROCK_MODEL_ID,
+            body=json.dumps(body),
+            contentType="application/json",
+            accept="application/json",
+        )
+        response_body = json.loads(response["body"].read())
+        usage = response_body.get("usage") or {}
+        text = "".join(
+            c.get("text", "")
+            for c in response_body.get("content", [])
+            if c.get("type") == "text"
+        ).strip()
+        reply = bedrock_stream.StreamedReply(
+            text=text, value=None, stop_reason=response_body.get("stop_reason"),
+            input_tokens=usage.get("input_tokens", 0), output_tokens=usage.get("output_tokens", 0),
+            first_token_ms=0.0, early=False,
+        )
+    latency_ms = (time.perf_counter() - started) * 1000
+
+    metrics.put("BedrockLatencyMs", latency_ms, MILLISECONDS)
+    metrics.put("BedrockInputTokens", reply.input_tokens, COUNT)
+    metrics.put("BedrockOutputTokens", reply.output_tokens, COUNT)
+    if BEDROCK_STREAMING:
+        metrics.put("BedrockFirstTokenMs", reply.first_token_ms, MILLISECONDS)
+    if reply.early:
+        metrics.add("BedrockEarlyStops")
+    print(f"[BEDROCK] model={BEDROCK_MODEL_ID} ms={latency_ms:.0f} "
+          f"in={reply.input_tokens} out={reply.output_tokens} max={max_tokens} "
+          f"stop={'early' if reply.early else reply.stop_reason}")
+    if metrics.sample_payload():
+        print(f"[BEDROCK RESPONSE] {json.dumps(reply.text)}")
+    return reply
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # COMPREHEND FALLBACK
 # ─────────────────────────────────────────────────────────────────────────────
 
+COMPREHEND_BATCH_LIMIT = 25   # documents per BatchDetect* request
+
+_COMPREHEND_SENTIMENTS = {"POSITIVE": "positive", "NEGATIVE": "negative",
+                          "NEUTRAL": "neutral", "MIXED": "neutral"}
+
+
 def call_comprehend_analysis(message: str) -> Dict[str, Any]:
     text = message.strip()[:4500]   # Comprehend limit
 
-    # Sentiment
-    sentiment_resp = comprehend.detect_sentiment(Text=text, LanguageCode="en")
-    sentiment_raw  = sentiment_resp.get("Sentiment", "NEUTRAL")
-    sentiment_map  = {"POSITIVE": "positive", "NEGATIVE": "negative",
-                      "NEUTRAL": "neutral", "MIXED": "neutral"}
-    sentiment = sentiment_map.get(sentiment_raw, "neutral")
+    # Sentiment and key phrases (→ topics) are independent: one round trip's wait.
+    with metrics.timer("ComprehendLatencyMs"):
+        sentiment_resp, kp_resp = io.together(
+            lambda: comprehend.detect_sentiment(Text=text, LanguageCode="en"),
+            lambda: comprehend.detect_key_phrases(Text=text, LanguageCode="en"),
+        )
+
+    return _comprehend_result(
+        sentiment_resp.get("Sentiment", "NEUTRAL"),
+        kp_resp.get("KeyPhrases", []),
+    )
+
+
+def call_comprehend_batch_analysis(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Analyse up to COMPREHEND_BATCH_LIMIT documents per request pair:
+    batch_detect_sentiment and batch_detect_key_phrases run together, and
+    each ResultList entry is mapped back to its feedbackId by Index. Documents
+    listed in either ErrorList are left out so the caller retries them singly.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for start in range(0, len(records), COMPREHEND_BATCH_LIMIT):
+        chunk = records[start:start + COMPREHEND_BATCH_LIMIT]
+        texts = [(r.get("message") or "").strip()[:4500] for r in chunk]
+        sentiment_resp, phrases_resp = io.together(
+            lambda: comprehend.batch_detect_sentiment(TextList=texts, LanguageCode="en"),
+            lambda: comprehend.batch_detect_key_phrases(TextList=texts, LanguageCode="en"),
+        )
 
-    # Key phrases as topics
-    kp_resp = comprehend.detect_key_phrases(Text=text, LanguageCode="en")
-    topics  = [
-        p["Text"] for p in kp_resp.get("KeyPhrases", [])
-        if p.get("Score", 0) > 0.85 and p.get("Text")
-    ][:10]
+        sentiments = {e["Index"]: e.get("Sentiment", "NEUTRAL")
+                      for e in sentiment_resp.get("ResultList", [])}
+        phrases    = {e["Index"]: e.get("KeyPhrases", [])
+                      for e in phrases_resp.get("ResultList", [])}
+        errors = sentiment_resp.get("ErrorList", []) + phrases_resp.get("ErrorList", [])
+        for err in errors:
+            print(f"[COMPREHEND BATCH] feedbackId={chunk[err['Index']]['feedbackId']} "
+                  f"{err.get('ErrorCode')}: {err.get('ErrorMessage')}")
+
+        for index, record in enumerate(chunk):
+            if index in sentiments and index in phrases:
+                results[record["feedbackId"]] = _comprehend_result(
+                    sentiments[index], phrases[index],
+                )
+    print(f"[COMPREHEND BATCH] answered {len(results)}/{len(records)}")
+    return results
+
+
+def _comprehend_result(sentiment_raw: str, key_phrases: List[Dict[str, Any]]) -> Dict[str, Any]:
+    sentiment = _COMPREHEND_SENTIMENTS.get(sentiment_raw, "neutral")
+    topics  = topic_normalizer.normalize_list(
+        (p["Text"] for p in key_phrases if p.get("Score", 0) > 0.85 and p.get("Text")),
+        limit=10,
+    )
 
     summary = (
         f"Feedback classified as {sentiment}. Key themes: {', '.join(topics[:5])}."
@@ -472,37 +1623,52 @@ def call_comprehend_analysis(message: str) -> Dict[str, Any]:
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# EVENTBRIDGE HELPER
+# EVENTBRIDGE HELPER + OUTBOX SWEEP
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _feedback_event(feedback_id: str, message: str, timestamp: str) -> Dict[str, Any]:
+    return {
+        "Source":       "talent.feedback",
+        "DetailType":   "FeedbackSubmitted",
+        "EventBusName": EVENT_BUS_NAME,
+        "Detail": json.dumps({
+            "feedbackId": feedback_id,
+            "message":    message,
+            "timestamp":  timestamp,
+        }),
+    }
+
+
 def _fire_eventbridge(feedback_id: str, message: str, timestamp: str) -> None:
     try:
-        events.put_events(Entries=[{
-            "Source":       "talent.feedback",
-            "DetailType":   "FeedbackSubmitted",
-            "EventBusName": EVENT_BUS_NAME,
-            "Detail": json.dumps({
-                "feedbackId": feedback_id,
-                "message":    message,
-                "timestamp":  timestamp,
-            }),
-        }])
+        with metrics.timer("FeedbackPutEventsMs"):
+            events.put_events(Entries=[_feedback_event(feedback_id, message, timestamp)])
         print(f"[EVENTBRIDGE] Event fired for feedbackId={feedback_id}")
     except Exception as exc:
-        # EventBridge failure must NOT block the user response
-        print(f"[EVENTBRIDGE ERROR] {exc}")
-        # Fallback: call AI synchronously so data is still processed
-        _sync_fallback_analysis(feedback_id, message, timestamp)
-
-
-def _sync_fallback_analysis(feedback_id: str, message: str, timestamp: str) -> None:
-    """Called only if EventBridge fails — keeps app working."""
-    print(f"[SYNC FALLBACK] Running AI for feedbackId={feedback_id}")
-    handle_async_analysis({
-        "feedbackId": feedback_id,
-        "message":    message,
-        "timestamp":  timestamp,
-    })
+        # EventBridge failure must NOT block the user response: the item carries
+        # an outbox marker, and the sweeper republishes it (handle_sweep_outbox).
+        print(f"[EVENTBRIDGE ERROR] {exc} — feedbackId={feedback_id} left in the outbox")
+        metrics.add("EventBridgeFailures")
+
+
+def handle_sweep_outbox(context: Any) -> Dict[str, Any]:
+    """Scheduled: republish events owed for items older than OUTBOX_GRACE_SECONDS."""
+    remaining = getattr(context, "get_remaining_time_in_millis", None)
+    with metrics.timer("OutboxSweepMs"):
+        stats = outbox.sweep(
+            table,
+            events,
+            lambda item: _feedback_event(item["feedbackId"], item.get("message", ""),
+                                         item.get("timestamp", "")),
+            grace_seconds=OUTBOX_GRACE_SECONDS,
+            max_attempts=OUTBOX_MAX_ATTEMPTS,
+            concurrency=INGEST_CONCURRENCY,
+            deadline=(lambda: remaining() < 10_000) if remaining else None,
+        )
+    metrics.add("OutboxRepublished", stats["published"])
+    metrics.add("OutboxAbandoned", stats["abandoned"])
+    print(f"[OUTBOX] {json.dumps(stats)}")
+    return {"statusCode": 200, "body": json.dumps(stats)}
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -530,8 +1696,9 @@ def _safe_parse_ai_response(raw: str) -> Dict[str, Any]:
         except json.JSONDecodeError:
             pass
 
-    # Final fallback — return safe defaults
+    # Final fallback — return safe defaults (flagged so they are never cached)
     print(f"[AI PARSE FAILED] Raw response: {raw[:200]}")
+    metrics.add("AIParseFailures")
     return {
         "sentiment": "neutral",
         "topics": [],
@@ -540,6 +1707,7 @@ def _safe_parse_ai_response(raw: str) -> Dict[str, Any]:
         "improvements": [],
         "competency_areas": [],
         "priority_level": "medium",
+        "parseFailed": True,
     }
 
 
@@ -552,7 +1720,7 @@ def _normalize_ai_result(parsed: Dict[str, Any]) -> Dict[str, Any]:
     topics = parsed.get("topics", [])
     if not isinstance(topics, list):
         topics = [str(topics)] if topics else []
-    topics = [str(t).strip() for t in topics if t][:10]  # Max 10 topics
+    topics = topic_normalizer.normalize_list(topics, limit=10)  # canonical labels, max 10
     
     summary = str(parsed.get("summary", "")).strip()[:500]
     
@@ -0,0 +1,317 @@
+"""
+Smart Talent Insight Hub — Local (In-Process) Analysis
+Lexicon-based scorer that returns the same normalized schema as the Bedrock
+prompt, with no network call. Used by AI_PROVIDER=local, and by
+AI_PROVIDER=tiered as a pre-screen that keeps only confident results.
+
+  sentiment         weighted word lexicon; negators ("not", "never", "n't")
+                    flip the next three words, intensifiers scale them, and
+                    the clause after "but"/"however" outweighs the one before
+  topics            keyword / two-word phrase table → topic labels
+  competency_areas  topic → the competency list from the Bedrock prompt
+  strengths /       topics in positive sentences vs. sentences that are
+  improvements      negative or carry an improvement cue ("should", "needs")
+  confidence        0..1 from polarity strength, amount of evidence and
+                    agreement between positive and negative signals
+
+One regex tokenisation and dict lookups per message; tens of thousands of
+short messages per second on one core (bench/local_bench.py).
+"""
+
+import hashlib
+import math
+import re
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+# ─────────────────────────────────────────────────────────────────────────────
+# LEXICONS
+# ─────────────────────────────────────────────────────────────────────────────
+
+SENTIMENT_WORDS: Dict[str, float] = {
+    # positive
+    "excellent": 3.0, "outstanding": 3.0, "exceptional": 3.0, "amazing": 3.0, "fantastic": 3.0,
+    "great": 2.5, "superb": 3.0, "brilliant": 2.8, "impressive": 2.5, "stellar": 2.8,
+    "strong": 2.0, "good": 1.8, "solid": 1.6, "reliable": 2.0, "dependable": 2.0,
+    "helpful": 2.0, "supportive": 2.0, "proactive": 2.0, "positive": 1.5, "clear": 1.3,
+    "clearly": 1.3, "effective": 2.0, "effectively": 2.0, "efficient": 1.8, "thorough": 1.8,
+    "creative": 1.8, "innovative": 2.0, "talented": 2.2, "skilled": 2.0, "knowledgeable": 2.0,
+    "dedicated": 2.0, "motivated": 1.8, "committed": 1.6, "consistent": 1.5,
+    "appreciate": 2.0, "appreciated": 2.0, "valuable": 2.0, "asset": 2.0, "enjoy": 1.8,
+    "love": 2.5, "loved": 2.5, "happy": 2.0, "pleased": 2.0, "well": 1.0, "best": 2.5,
+    "improved": 1.5, "exceeds": 2.5, "exceeded": 2.5, "initiative": 1.5, "mentors": 1.2,
+    "trusted": 1.8, "respected": 1.8, "collaborative": 1.8, "responsive": 1.5, "calm": 1.2,
+    "organized": 1.5, "organised": 1.5, "insightful": 2.0, "empathetic": 1.8, "kind": 1.5,
+    # negative
+    "poor": -2.5, "bad": -2.5, "terrible": -3.0, "awful": -3.0, "horrible": -3.0,
+    "weak": -2.0, "unreliable": -2.5, "late": -1.5, "lazy": -2.5, "rude": -2.8,
+    "careless": -2.2, "sloppy": -2.2, "disorganized": -2.0, "disorganised": -2.0,
+    "unprofessional": -2.8, "difficult": -1.5, "frustrating": -2.2, "frustrated": -2.0,
+    "disappointing": -2.5, "disappointed": -2.5, "problem": -1.2, "problems": -1.2,
+    "issue": -1.0, "issues": -1.2, "mistake": -1.5, "mistakes": -1.6, "errors": -1.4,
+    "misses": -1.8, "missed": -1.8, "missing": -1.2, "fails": -2.0, "failed": -2.0,
+    "failure": -2.2, "struggles": -1.8, "struggled": -1.8, "struggling": -1.8,
+    "lacks": -1.8, "lack": -1.6, "lacking": -1.8, "inconsistent": -1.8, "slow": -1.5,
+    "negative": -1.8, "concern": -1.5, "concerns": -1.5, "concerning": -1.8,
+    "unresponsive": -2.2, "ignores": -2.0, "ignored": -2.0, "blames": -2.2, "toxic": -3.0,
+    "conflict": -1.5, "complaints": -2.0, "complained": -1.8, "overdue": -1.8,
+    "underperforming": -2.5, "unacceptable": -3.0, "worse": -2.2, "worst": -3.0,
+}
+
+NEGATORS = frozenset({
+    "not", "no", "never", "nor", "none", "nothing", "hardly", "barely", "without",
+    "isn't", "wasn't", "aren't", "doesn't", "don't", "didn't", "can't", "cannot", "won't",
+    "shouldn't", "wouldn't", "couldn't", "hasn't", "haven't",
+})
+INTENSIFIERS: Dict[str, float] = {
+    "very": 1.4, "extremely": 1.6, "really": 1.3, "incredibly": 1.6, "highly": 1.4,
+    "consistently": 1.2, "always": 1.2, "truly": 1.3, "particularly": 1.2,
+    "somewhat": 0.7, "slightly": 0.6, "occasionally": 0.7, "sometimes": 0.8,
+}
+CONTRAST = frozenset({"but", "however", "although", "though", "yet", "whereas"})
+IMPROVEMENT_CUES = frozenset({
+    "improve", "improvement", "needs", "need", "should", "could", "must", "develop",
+    "work on", "focus on", "more", "better", "grow", "growth",
+})
+URGENT = frozenset({"urgent", "urgently", "immediately", "harassment", "unsafe", "escalate",
+                    "escalated", "hr", "misconduct", "discrimination", "threatened"})
+
+COMPETENCIES = (
+    "Technical Skills", "Communication", "Leadership", "Collaboration", "Problem-Solving",
+    "Time Management", "Innovation", "Customer Focus", "Adaptability", "Quality Focus",
+)
+
+# topic label → competency area
+TOPIC_COMPETENCY: Dict[str, str] = {
+    "technical expertise":     "Technical Skills",
+    "code quality":            "Quality Focus",
+    "communication skills":    "Communication",
+    "documentation":           "Communication",
+    "leadership":              "Leadership",
+    "mentoring":               "Leadership",
+    "ownership":               "Leadership",
+    "collaboration":           "Collaboration",
+    "problem-solving":         "Problem-Solving",
+    "time management":         "Time Management",
+    "planning":                "Time Management",
+    "delivery":                "Time Management",
+    "innovation":              "Innovation",
+    "customer focus":          "Customer Focus",
+    "stakeholder management":  "Customer Focus",
+    "adaptability":            "Adaptability",
+    "attention to detail":     "Quality Focus",
+    "testing":                 "Quality Focus",
+}
+
+# single words → topic
+TOPIC_WORDS: Dict[str, str] = {
+    "technical": "technical expertise", "technically": "technical expertise",
+    "engineering": "technical expertise", "architecture": "technical expertise",
+    "coding": "technical expertise", "expertise": "technical expertise",
+    "code": "code quality", "refactoring": "code quality", "reviews": "code quality",
+    "communication": "communication skills", "communicates": "communication skills",
+    "communicate": "communication skills", "communicating": "communication skills",
+    "presentation": "communication skills", "presentations": "communication skills",
+    "listens": "communication skills", "explains": "communication skills",
+    "documentation": "documentation", "document": "documentation", "documents": "documentation",
+    "leadership": "leadership", "leads": "leadership", "lead": "leadership", "leading": "leadership",
+    "mentor": "mentoring", "mentors": "mentoring", "mentoring": "mentoring", "coaching": "mentoring",
+    "juniors": "mentoring", "ownership": "ownership", "accountable": "ownership",
+    "accountability": "ownership", "owns": "ownership",
+    "collaboration": "collaboration", "collaborates": "collaboration", "collaborative": "collaboration",
+    "teamwork": "collaboration", "team": "collaboration", "cooperative": "collaboration",
+    "debugging": "problem-solving", "troubleshooting": "problem-solving",
+    "solves": "problem-solving", "analytical": "problem-solving",
+    "deadlines": "time management", "deadline": "time management", "punctual": "time management",
+    "late": "time management", "overdue": "time management", "prioritization": "time management",
+    "prioritisation": "time management", "prioritizes": "time management",
+    "planning": "planning", "plans": "planning", "estimates": "planning", "estimation": "planning",
+    "delivery": "delivery", "delivers": "delivery", "delivered": "delivery", "ships": "delivery",
+    "innovation": "innovation", "innovative": "innovation", "creative": "innovation",
+    "creativity": "innovation", "ideas": "innovation",
+    "customer": "customer focus", "customers": "customer focus", "clients": "customer focus",
+    "client": "customer focus", "users": "customer focus",
+    "stakeholders": "stakeholder management", "stakeholder": "stakeholder management",
+    "adaptable": "adaptability", "adaptability": "adaptability", "flexible": "adaptability",
+    "flexibility": "adaptability",
+    "detail": "attention to detail", "details": "attention to detail", "thorough": "attention to detail",
+    "careless": "attention to detail", "sloppy": "attention to detail",
+    "testing": "testing", "tests": "testing", "qa": "testing",
+}
+
+# two-word phrases → topic (checked before single words)
+TOPIC_PHRASES: Dict[Tuple[str, str], str] = {
+    ("time", "management"): "time management", ("on", "time"): "time management",
+    ("code", "quality"): "code quality", ("code", "review"): "code quality",
+    ("problem", "solving"): "problem-solving", ("solving", "problems"): "problem-solving",
+    ("root", "cause"): "problem-solving", ("customer", "focus"): "customer focus",
+    ("team", "player"): "collaboration", ("works", "well"): "collaboration",
+    ("takes", "initiative"): "ownership", ("shows", "initiative"): "ownership",
+    ("attention", "to"): "attention to detail", ("new", "ideas"): "innovation",
+}
+
+# Bumped with any lexicon edit: stamped as aiModel, so `backfill --mode stale`
+# re-scores local results when the lexicon changes.
+MODEL_ID = "local-lexicon-" + hashlib.sha256(repr((
+    sorted(SENTIMENT_WORDS.items()), sorted(NEGATORS), sorted(INTENSIFIERS.items()),
+    sorted(TOPIC_WORDS.items()), sorted(TOPIC_PHRASES.items()), sorted(TOPIC_COMPETENCY.items()),
+)).encode("utf-8")).hexdigest()[:8]
+
+_TOKEN    = re.compile(r"[a-z]+(?:'[a-z]+)?|[.!?;\n]")
+_BOUNDARY = frozenset(".!?;\n")
+_ALPHA    = 15.0   # VADER-style normalisation constant
+
+
+class LocalAnalysis(NamedTuple):
+    result:     Dict[str, Any]
+    confidence: float
+
+
+def _normalise(score: float) -> float:
+    return score / math.sqrt(score * score + _ALPHA)
+
+
+def _sentences(tokens: List[str]) -> List[List[str]]:
+    sentences: List[List[str]] = [[]]
+    for tok in tokens:
+        if tok in _BOUNDARY:
+            if sentences[-1]:
+                sentences.append([])
+        else:
+            sentences[-1].append(tok)
+    return [s for s in sentences if s]
+
+
+def _clauses(words: List[str]) -> List[Tuple[List[str], float]]:
+    """Split a sentence at "but"/"however"; the last clause carries the opinion."""
+    clauses: List[List[str]] = [[]]
+    for word in words:
+        if word in CONTRAST:
+            if clauses[-1]:
+                clauses.append([])
+        else:
+            clauses[-1].append(word)
+    clauses = [c for c in clauses if c]
+    if len(clauses) < 2:
+        return [(c, 1.0) for c in clauses]
+    return [(c, 0.5) for c in clauses[:-1]] + [(clauses[-1], 1.5)]
+
+
+def _score(words: List[str], weight: float) -> Tuple[float, float, float, int]:
+    """(weighted score, positive mass, negative mass, sentiment hits) for one clause."""
+    score = pos = neg = 0.0
+    hits = 0
+    negate_left = 0
+    scale = 1.0
+    for word in words:
+        if word in NEGATORS:
+            negate_left = 3
+            continue
+        if word in INTENSIFIERS:
+            scale *= INTENSIFIERS[word]
+            continue
+        valence = SENTIMENT_WORDS.get(word)
+        if valence is not None:
+            value = valence * scale * weight
+            if negate_left:
+                value *= -0.75
+                negate_left = 0
+            score += value
+            if value > 0:
+                pos += value
+            else:
+                neg -= value
+            hits += 1
+            scale = 1.0
+        elif negate_left:
+            negate_left -= 1
+    return score, pos, neg, hits
+
+
+def _topics(words: List[str]) -> List[str]:
+    found: List[str] = []
+    i, n = 0, len(words)
+    while i < n:
+        topic = TOPIC_PHRASES.get((words[i], words[i + 1])) if i + 1 < n else None
+        if topic is not None:
+            i += 2
+        else:
+            topic = TOPIC_WORDS.get(words[i])
+            i += 1
+        if topic is not None and topic not in found:
+            found.append(topic)
+    return found
+
+
+def analyse(text: str) -> LocalAnalysis:
+    tokens = _TOKEN.findall(text.lower())
+    total = pos_mass = neg_mass = 0.0
+    hits = 0
+    topics: List[str] = []
+    strengths: List[str] = []
+    improvements: List[str] = []
+    urgent = False
+
+    for sentence in _sentences(tokens):
+        urgent = urgent or any(w in URGENT for w in sentence)
+        for words, weight in _clauses(sentence):
+            score, pos, neg, n = _score(words, weight)
+            total += score
+            pos_mass += pos
+            neg_mass += neg
+            hits += n
+            clause_topics = _topics(words)
+            for topic in clause_topics:
+                if topic not in topics:
+                    topics.append(topic)
+            cue = any(w in IMPROVEMENT_CUES for w in words) or \
+                any(f"{a} {b}" in IMPROVEMENT_CUES for a, b in zip(words, words[1:]))
+            bucket = improvements if (score < 0 or (cue and score < 1.5)) else \
+                strengths if score > 0 else None
+            if bucket is not None:
+                for topic in clause_topics:
+                    if topic not in bucket:
+                        bucket.append(topic)
+
+    compound = _normalise(total)
+    sentiment = "positive" if compound >= 0.25 else "negative" if compound <= -0.25 else "neutral"
+
+    competencies: List[str] = []
+    for topic in topics:
+        area = TOPIC_COMPETENCY[topic]
+        if area not in competencies:
+            competencies.append(area)
+
+    if urgent or compound <= -0.6:
+        priority = "high"
+    elif compound >= 0.5 and not improvements:
+        priority = "low"
+    else:
+        priority = "medium"
+
+    # Confidence: strong polarity, several pieces of evidence, little disagreement.
+    agreement = 1.0 - (min(pos_mass, neg_mass) / max(pos_mass, neg_mass) if hits else 1.0)
+    evidence = min(1.0, hits / 3.0)
+    polarity = abs(compound) if sentiment != "neutral" else (1.0 - abs(compound) / 0.25) * 0.5
+    confidence = polarity * evidence * (0.5 + 0.5 * agreement) * (1.0 if topics else 0.8)
+
+    result = {
+        "sentiment":        sentiment,
+        "topics":           topics[:8],
+        "summary":          _summary(sentiment, strengths, improvements, topics),
+        "strengths":        strengths[:4],
+        "improvements":     improvements[:4],
+        "competency_areas": competencies[:3],
+        "priority_level":   priority,
+    }
+    return LocalAnalysis(result, round(max(0.0, min(1.0, confidence)), 3))
+
+
+def _summary(sentiment: str, strengths: List[str], improvements: List[str], topics: List[str]) -> str:
+    opening = {"positive": "Positive feedback", "negative": "Critical feedback",
+               "neutral": "Mixed or neutral feedback"}[sentiment]
+    parts = [f"{opening}" + (f" centred on {', '.join(topics[:3])}." if topics else ".")]
+    if strengths:
+        parts.append(f"Strengths noted: {', '.join(strengths[:3])}.")
+    if improvements:
+        parts.append(f"Areas to develop: {', '.join(improvements[:3])}.")
+    return " ".join(parts)
@@ -0,0 +1,132 @@
+"""
+Smart Talent Insight Hub — Stage Metrics (CloudWatch Embedded Metric Format)
+Timers and counters around the handler's stages, buffered per invocation
+and written as EMF JSON lines on flush(). CloudWatch Logs turns those lines
+into metrics, with no PutMetricData calls and no agent.
+
+  timer(name)          elapsed milliseconds of a `with` block, one sample
+  timer(name, total=True)  ...summed into a single value per invocation
+                       (per-page work such as aggregation)
+  add(name, n, unit)   counter, summed per invocation
+  put(name, v, unit)   one sample (e.g. a token count per model call)
+  flush()              emit and reset; call once at the end of each invocation
+  sample_payload()     True for LOG_PAYLOAD_SAMPLE_RATE of calls — gates
+                       verbose payload logging independently of metrics
+
+Samples of one metric share a line as a value array. Lines are split to stay
+within the EMF limits of 100 metrics and 100 values per metric. When disabled,
+timer() returns a shared no-op context manager and the other calls return
+at once.
+"""
+
+import json
+import random
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional, Tuple
+
+MILLISECONDS = "Milliseconds"
+COUNT        = "Count"
+BYTES        = "Bytes"
+
+MAX_METRICS_PER_LINE = 100
+MAX_VALUES_PER_METRIC = 100
+
+_NULL_TIMER = nullcontext()
+
+
+class _Timer:
+    __slots__ = ("_metrics", "_name", "_total", "_start")
+
+    def __init__(self, metrics: "Metrics", name: str, total: bool) -> None:
+        self._metrics, self._name, self._total = metrics, name, total
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        elapsed_ms = (time.perf_counter() - self._start) * 1000.0
+        if self._total:
+            self._metrics.add(self._name, elapsed_ms, MILLISECONDS)
+        else:
+            self._metrics.put(self._name, elapsed_ms, MILLISECONDS)
+
+
+class Metrics:
+    def __init__(self, namespace: str, dimensions: Dict[str, str], enabled: bool = True,
+                 payload_sample_rate: float = 0.0) -> None:
+        self.namespace  = namespace
+        self.dimensions = dimensions
+        self.enabled    = enabled
+        self.payload_sample_rate = max(0.0, min(1.0, payload_sample_rate))
+        self._samples: Dict[str, Tuple[str, List[float]]] = {}   # name → (unit, values)
+        self._totals: Dict[str, Tuple[str, float]] = {}          # name → (unit, sum)
+        self._lock = threading.Lock()
+
+    # ── recording ─────────────────────────────────────────────────────────────
+    def timer(self, name: str, total: bool = False) -> Any:
+        return _Timer(self, name, total) if self.enabled else _NULL_TIMER
+
+    def add(self, name: str, value: float = 1, unit: str = COUNT) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            _, current = self._totals.get(name, (unit, 0.0))
+            self._totals[name] = (unit, current + value)
+
+    def put(self, name: str, value: float, unit: str = COUNT) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._samples.setdefault(name, (unit, []))[1].append(value)
+
+    def sample_payload(self) -> bool:
+        return self.payload_sample_rate > 0 and random.random() < self.payload_sample_rate
+
+    # ── EMF output ────────────────────────────────────────────────────────────
+    def _drain(self) -> List[Tuple[str, str, List[float]]]:
+        with self._lock:
+            series = [(name, unit, values) for name, (unit, values) in self._samples.items()]
+            series += [(name, unit, [value]) for name, (unit, value) in self._totals.items()]
+            self._samples, self._totals = {}, {}
+        return series
+
+    def emf_lines(self, timestamp_ms: Optional[int] = None) -> List[str]:
+        """Drain the buffer into EMF documents (one JSON string per line)."""
+        chunks: List[Tuple[str, str, List[float]]] = []
+        for name, unit, values in self._drain():
+            for start in range(0, len(values), MAX_VALUES_PER_METRIC):
+                chunks.append((name, unit, values[start:start + MAX_VALUES_PER_METRIC]))
+
+        timestamp_ms = timestamp_ms if timestamp_ms is not None else int(time.time() * 1000)
+        lines: List[str] = []
+        while chunks:
+            line: Dict[str, Any] = dict(self.dimensions)
+            definitions: List[Dict[str, str]] = []
+            rest: List[Tuple[str, str, List[float]]] = []
+            for name, unit, values in chunks:
+                if name in line or len(definitions) >= MAX_METRICS_PER_LINE:
+                    rest.append((name, unit, values))   # next line
+                    continue
+                definitions.append({"Name": name, "Unit": unit})
+                rounded = [round(v, 3) for v in values]
+                line[name] = rounded[0] if len(rounded) == 1 else rounded
+            line["_aws"] = {
+                "Timestamp": timestamp_ms,
+                "CloudWatchMetrics": [{
+                    "Namespace":  self.namespace,
+                    "Dimensions": [sorted(self.dimensions)],
+                    "Metrics":    definitions,
+                }],
+            }
+            lines.append(json.dumps(line, separators=(",", ":")))
+            chunks = rest
+        return lines
+
+    def flush(self) -> None:
+        if not self.enabled:
+            return
+        for line in self.emf_lines():
+            print(line)
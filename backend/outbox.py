@@ -0,0 +1,173 @@
+"""
+Smart Talent Insight Hub — Event Outbox
+Transactional outbox for the FeedbackSubmitted event, so a POST never waits
+on (or runs the analysis in place of) a degraded EventBridge.
+
+The marker lives on the feedback item itself, so the same PutItem /
+BatchWriteItem that stores the feedback also records "event owed":
+
+  outbox          "pending"  — hash key of the sparse `outbox-index` GSI
+  outboxAt        ISO time the event is next due (initially the submit time)
+  outboxAttempts  republish count (ADD-ed by the sweeper)
+  outboxLease     ISO time until which a consumer is analysing the item
+
+The request publishes once, best effort, and returns. The marker is removed
+by the analysis write (CLEAR_ATTRS in its REMOVE list), never by the
+publisher: the marker means "not analysed yet", and a lost event after a
+successful publish also shows up as an old marker.
+
+Before it calls the model, the consumer takes the analysis lease with
+lease(): a conditional update that fails while another consumer's lease is
+live. The sweep leaves leased rows alone, so a slow analysis is not
+republished (and paid for) a second time; a duplicate that arrives while the
+lease is live is skipped. A consumer that dies lets the lease lapse
+(`lease_seconds`, above the function timeout) and the sweep picks the row up.
+
+sweep() (scheduled, {"action": "sweep_outbox"}) queries markers older than
+`grace_seconds`, skips those under a live lease, and claims each other one with a conditional update (outboxAt moves
+to now, attempts + 1), so overlapping sweeps never publish the same claim
+twice. It then republishes the claimed events 10 per PutEvents with backoff.
+A claim whose publish fails is simply due again one grace period later.
+After `max_attempts` the marker is dropped with an aiError, leaving the item
+to `backfill --mode failed`. Delivery is at-least-once; a duplicate after the
+analysis landed rewrites the same result (and is an AI cache hit).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+
+from botocore.exceptions import ClientError
+
+import ingest
+
+OUTBOX_INDEX  = "outbox-index"
+OUTBOX_ATTR   = "outbox"
+DUE_ATTR      = "outboxAt"
+ATTEMPTS_ATTR = "outboxAttempts"
+LEASE_ATTR    = "outboxLease"
+PENDING       = "pending"
+CLEAR_ATTRS   = (OUTBOX_ATTR, DUE_ATTR, ATTEMPTS_ATTR, LEASE_ATTR)
+
+_NOT_LEASED = "(attribute_not_exists(#l) OR #l < :now)"
+
+
+def marker(timestamp: str) -> Dict[str, Any]:
+    """Attributes to merge into a new feedback item."""
+    return {OUTBOX_ATTR: PENDING, DUE_ATTR: timestamp}
+
+
+def _due_pages(client: Any, table_name: str, cutoff: str, page_size: int):
+    kwargs: Dict[str, Any] = {
+        "TableName": table_name,
+        "IndexName": OUTBOX_INDEX,
+        "KeyConditionExpression": "#o = :pending AND #due < :cutoff",
+        "ExpressionAttributeNames": {
+            "#o": OUTBOX_ATTR, "#due": DUE_ATTR, "#id": "feedbackId",
+            "#msg": "message", "#ts": "timestamp", "#n": ATTEMPTS_ATTR, "#l": LEASE_ATTR,
+        },
+        "ExpressionAttributeValues": {":pending": PENDING, ":cutoff": cutoff},
+        "ProjectionExpression": "#id, #msg, #ts, #due, #n, #l",
+        "Limit": page_size,
+    }
+    while True:
+        resp = client.query(**kwargs)
+        yield resp.get("Items", [])
+        if "LastEvaluatedKey" not in resp:
+            return
+        kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+
+def _conditional(table: Any, **kwargs: Any) -> bool:
+    """update_item that returns False instead of raising when its condition fails."""
+    try:
+        table.update_item(**kwargs)
+        return True
+    except ClientError as exc:
+        if exc.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+            return False
+        raise
+
+
+def lease(table: Any, feedback_id: str, now: datetime, lease_seconds: int) -> bool:
+    """Take the analysis of one item. False while another consumer's lease is live."""
+    return _conditional(
+        table,
+        Key={"feedbackId": feedback_id},
+        UpdateExpression="SET #l = :until",
+        ConditionExpression=_NOT_LEASED,
+        ExpressionAttributeNames={"#l": LEASE_ATTR},
+        ExpressionAttributeValues={":until": (now + timedelta(seconds=lease_seconds)).isoformat(),
+                                   ":now": now.isoformat()},
+    )
+
+
+def _claim(table: Any, item: Dict[str, Any], now: str) -> bool:
+    # Only if the marker is still the one we read: cleared by the analysis, or
+    # claimed by an overlapping sweep, means somebody else owns it. A lease
+    # taken since the read means the analysis is running.
+    return _conditional(
+        table,
+        Key={"feedbackId": item["feedbackId"]},
+        UpdateExpression="SET #due = :now ADD #n :one",
+        ConditionExpression=f"#due = :seen AND {_NOT_LEASED}",
+        ExpressionAttributeNames={"#due": DUE_ATTR, "#n": ATTEMPTS_ATTR, "#l": LEASE_ATTR},
+        ExpressionAttributeValues={":now": now, ":one": 1, ":seen": item[DUE_ATTR]},
+    )
+
+
+def _give_up(table: Any, item: Dict[str, Any], attempts: int, now: str) -> bool:
+    return _conditional(
+        table,
+        Key={"feedbackId": item["feedbackId"]},
+        UpdateExpression=f"SET aiError = :e REMOVE {', '.join(CLEAR_ATTRS)}",
+        ConditionExpression=f"#due = :seen AND {_NOT_LEASED}",
+        ExpressionAttributeNames={"#due": DUE_ATTR, "#l": LEASE_ATTR},
+        ExpressionAttributeValues={
+            ":e": f"FeedbackSubmitted event not delivered after {attempts} republish attempts",
+            ":seen": item[DUE_ATTR], ":now": now,
+        },
+    )
+
+
+def sweep(table: Any, events: Any, make_entry: Callable[[Dict[str, Any]], Dict[str, Any]],
+          grace_seconds: int = 120, max_attempts: int = 5, page_size: int = 100,
+          concurrency: int = 4, deadline: Optional[Callable[[], bool]] = None,
+          now: Optional[datetime] = None) -> Dict[str, int]:
+    """Republish overdue outbox events. Returns counts for the log line."""
+    now = now or datetime.now(timezone.utc)
+    now_iso = now.isoformat()
+    cutoff = (now - timedelta(seconds=grace_seconds)).isoformat()
+    stats = {"due": 0, "in_flight": 0, "claimed": 0, "published": 0, "failed": 0,
+             "abandoned": 0, "raced": 0}
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        for page in _due_pages(table.meta.client, table.name, cutoff, page_size):
+            if not page:
+                continue
+            stats["due"] += len(page)
+            idle = [it for it in page if it.get(LEASE_ATTR, "") < now_iso]
+            stats["in_flight"] += len(page) - len(idle)
+            retire = [it for it in idle if int(it.get(ATTEMPTS_ATTR, 0)) >= max_attempts]
+            active = [it for it in idle if int(it.get(ATTEMPTS_ATTR, 0)) < max_attempts]
+
+            for item, done in zip(retire, pool.map(
+                    lambda it: _give_up(table, it, int(it.get(ATTEMPTS_ATTR, 0)), now_iso), retire)):
+                stats["abandoned" if done else "raced"] += 1
+                if done:
+                    print(f"[OUTBOX] feedbackId={item['feedbackId']} abandoned — left for backfill")
+
+            claims = list(pool.map(lambda it: _claim(table, it, now_iso), active))
+            claimed = [it for it, ok in zip(active, claims) if ok]
+            stats["raced"]   += len(active) - len(claimed)
+            stats["claimed"] += len(claimed)
+            if claimed:
+                failed = ingest.put_events(events, [make_entry(it) for it in claimed],
+                                           concurrency=concurrency)
+                stats["failed"]    += len(failed)
+                stats["published"] += len(claimed) - len(failed)
+
+            if deadline is not None and deadline():
+                print("[OUTBOX] stopping early: invocation deadline near")
+                break
+    return stats
@@ -0,0 +1,283 @@
+"""
+Smart Talent Insight Hub — AI Provider Health
+Keeps a Bedrock burst from turning into a pile of aiError items: calls are
+admitted by an adaptive concurrency limit, repeated failures open a circuit
+breaker, and while Bedrock is shed or open the caller's fallback (Comprehend)
+answers instead.
+
+  ConcurrencyLimiter  AIMD limit on calls in flight: +1/limit per healthy
+                      call, ×decrease on a throttle or a call slower than
+                      latency_target_ms (at most once per round of calls in
+                      flight). A caller with a fallback waits max_wait_s for
+                      a slot, then is shed rather than queued.
+  CircuitBreaker      closed → open after `failure_threshold` consecutive
+                      throttles / timeouts / 5xx; open for `open_seconds`,
+                      then half-open lets one probe through: success closes
+                      it, failure re-opens it, a probe shed for want of a
+                      slot is handed back. Client errors (a bad request)
+                      mean the service answered and count as healthy.
+  SharedBreakerState  optional DynamoDB item (hash key `provider`, TTL
+                      attribute expiresAt) holding the open-until time, so an
+                      open breaker on one container fails over the others.
+                      Written on open/close only, read at most every
+                      `refresh_seconds`; its errors are logged, never raised.
+  ProviderHealth      call(primary, fallback) → (result, failover reason or
+                      None), the glue used around call_ai_analysis.
+
+All of it is warm-container state: one instance per provider, shared by
+every invocation (and every thread) the container serves.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from backfill import THROTTLE_CODES, is_throttle
+
+CLOSED    = "closed"
+OPEN      = "open"
+HALF_OPEN = "half_open"
+
+# Failover reasons returned by ProviderHealth.call.
+BREAKER_OPEN = "breaker_open"
+SHED         = "shed"
+FAILED       = "failed"
+
+# Server-side failures worth failing over for (throttles come from is_throttle).
+UNAVAILABLE_CODES = {
+    "ServiceUnavailableException", "InternalServerException", "InternalFailure",
+    "ModelTimeoutException", "ModelNotReadyException", "ServiceUnavailable",
+    "ModelStreamErrorException",
+}
+
+
+def is_unhealthy(exc: Exception) -> bool:
+    """Throttled, timed out, unreachable or 5xx — as opposed to a request the service rejected."""
+    if is_throttle(exc):
+        return True
+    if isinstance(exc, ClientError):
+        # Errors inside a response stream arrive as e.g. "throttlingException".
+        code = exc.response.get("Error", {}).get("Code") or ""
+        code = code[:1].upper() + code[1:]
+        return code in THROTTLE_CODES or code in UNAVAILABLE_CODES
+    return isinstance(exc, BotoCoreError)   # read / connect timeouts, connection errors
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CONCURRENCY LIMIT
+# ─────────────────────────────────────────────────────────────────────────────
+
+class ConcurrencyLimiter:
+    def __init__(self, initial: int = 8, min_limit: int = 1, max_limit: int = 64,
+                 decrease: float = 0.5, latency_target_ms: float = 0.0) -> None:
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit     = float(max(self.min_limit, min(initial, self.max_limit)))
+        self.decrease  = decrease
+        self.latency_target_ms = latency_target_ms
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[float]:
+        """Take a slot; returns its start time, or None if none freed up within `timeout`."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            self.in_flight += 1
+            return time.monotonic()
+
+    def release(self, started: float, overloaded: bool) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            latency_ms = (time.monotonic() - started) * 1000
+            if overloaded or (self.latency_target_ms and latency_ms > self.latency_target_ms):
+                # Calls admitted before the last cut saw the old limit: one cut per round.
+                if started >= self._last_decrease:
+                    self.limit = max(float(self.min_limit), self.limit * self.decrease)
+                    self._last_decrease = time.monotonic()
+            else:
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            self._cond.notify()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CIRCUIT BREAKER
+# ─────────────────────────────────────────────────────────────────────────────
+
+class SharedBreakerState:
+    def __init__(self, table: Any, provider: str, refresh_seconds: float = 5.0,
+                 clock=time.time) -> None:
+        self.table    = table
+        self.provider = provider
+        self.refresh_seconds = refresh_seconds
+        self._clock   = clock
+        self._checked = float("-inf")
+        self._open_until = 0.0
+
+    def open_until(self) -> float:
+        """The cross-container open-until epoch (0 = closed), re-read every refresh_seconds."""
+        now = self._clock()
+        if now - self._checked >= self.refresh_seconds:
+            self._checked = now
+            try:
+                item = self.table.get_item(Key={"provider": self.provider}).get("Item") or {}
+                self._open_until = float(item.get("openUntil", 0))
+            except Exception as exc:
+                print(f"[PROVIDER HEALTH] shared state read failed: {exc}")
+        return self._open_until
+
+    def publish_open(self, until: float, failures: int) -> None:
+        self._open_until = max(self._open_until, until)
+        try:
+            self.table.put_item(
+                Item={"provider": self.provider, "openUntil": int(until) + 1,
+                      "openedAt": int(self._clock()), "failures": failures,
+                      "expiresAt": int(until) + 86400},
+                # Never shorten a window another container opened for longer.
+                ConditionExpression="attribute_not_exists(#u) OR #u < :until",
+                ExpressionAttributeNames={"#u": "openUntil"},
+                ExpressionAttributeValues={":until": int(until) + 1},
+            )
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                print(f"[PROVIDER HEALTH] shared state write failed: {exc}")
+        except Exception as exc:
+            print(f"[PROVIDER HEALTH] shared state write failed: {exc}")
+
+    def publish_closed(self) -> None:
+        now = int(self._clock())
+        self._open_until = 0.0
+        try:
+            self.table.update_item(
+                Key={"provider": self.provider},
+                UpdateExpression="SET #u = :zero",
+                # A window re-opened elsewhere since ours elapsed stays open.
+                ConditionExpression="#u <= :now",
+                ExpressionAttributeNames={"#u": "openUntil"},
+                ExpressionAttributeValues={":zero": 0, ":now": now},
+            )
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                print(f"[PROVIDER HEALTH] shared state write failed: {exc}")
+        except Exception as exc:
+            print(f"[PROVIDER HEALTH] shared state write failed: {exc}")
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = 5, open_seconds: float = 30.0,
+                 shared: Optional[SharedBreakerState] = None, clock=time.time) -> None:
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.open_seconds = open_seconds
+        self.shared   = shared
+        self.state    = CLOSED
+        self.failures = 0
+        self.opened   = 0
+        self._open_until = 0.0
+        self._probing = False
+        self._prober  = None   # thread holding the half-open probe
+        self._clock   = clock
+        self._lock    = threading.Lock()
+
+    def allow(self) -> bool:
+        """May a call go to the provider now? In half-open state, one probe at a time."""
+        with self._lock:
+            now = self._clock()
+            if self.state == CLOSED and self.shared is not None:
+                until = self.shared.open_until()
+                if until > now:
+                    self._trip(until, "opened by another container")
+            if self.state == OPEN and now >= self._open_until:
+                self.state, self._probing = HALF_OPEN, False
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing, self._prober = True, threading.get_ident()
+                return True
+            return self.state == CLOSED
+
+    def release_probe(self) -> None:
+        """The probe this thread claimed never reached the provider: let the next call probe."""
+        with self._lock:
+            if self._probing and self._prober == threading.get_ident():
+                self._probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            if self.state != CLOSED:
+                self.state, self._probing = CLOSED, False
+                print(f"[PROVIDER HEALTH] {self.name} breaker closed")
+                if self.shared is not None:
+                    self.shared.publish_closed()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                until = self._clock() + self.open_seconds
+                self._trip(until, f"{self.failures} consecutive failures")
+                if self.shared is not None:
+                    self.shared.publish_open(until, self.failures)
+
+    def _trip(self, until: float, why: str) -> None:
+        self.state, self._probing = OPEN, False
+        self._open_until = until
+        self.opened += 1
+        print(f"[PROVIDER HEALTH] {self.name} breaker open for "
+              f"{until - self._clock():.0f}s: {why}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, "opened": self.opened}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ROUTER
+# ─────────────────────────────────────────────────────────────────────────────
+
+class ProviderHealth:
+    def __init__(self, limiter: ConcurrencyLimiter, breaker: CircuitBreaker,
+                 max_wait_s: float = 2.0) -> None:
+        self.limiter    = limiter
+        self.breaker    = breaker
+        self.max_wait_s = max_wait_s
+
+    def call(self, primary: Callable[[], Any],
+             fallback: Optional[Callable[[], Any]] = None) -> Tuple[Any, Optional[str]]:
+        """
+        Run `primary` under the limit and breaker. With a `fallback`, an open
+        breaker, a shed slot or an unhealthy failure runs it instead and the
+        reason is returned; without one, primary's errors propagate as before.
+        """
+        if fallback is not None and not self.breaker.allow():
+            return fallback(), BREAKER_OPEN
+        started = self.limiter.acquire(self.max_wait_s if fallback is not None else None)
+        if started is None:
+            self.breaker.release_probe()   # a shed probe settles nothing
+            return fallback(), SHED
+        try:
+            result = primary()
+        except Exception as exc:
+            unhealthy = is_unhealthy(exc)
+            self.limiter.release(started, overloaded=unhealthy)
+            if not unhealthy:
+                self.breaker.record_success()
+                raise
+            self.breaker.record_failure()
+            if fallback is None:
+                raise
+            print(f"[PROVIDER HEALTH] {self.breaker.name} failed, falling over: {exc}")
+            return fallback(), FAILED
+        self.limiter.release(started, overloaded=False)
+        self.breaker.record_success()
+        return result, None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**self.breaker.snapshot(), "limit": round(self.limiter.limit, 2),
+                "inFlight": self.limiter.in_flight}
@@ -0,0 +1,88 @@
+"""
+Smart Talent Insight Hub — Response Encoding
+JSON serialization and Content-Encoding negotiation for API responses.
+
+  dumps()            orjson when installed, else stdlib json; DynamoDB
+                     Decimals become int/float (not strings), unknown
+                     types raise instead of being silently str()-ed
+  negotiate()        picks br / gzip from Accept-Encoding (q-values honoured;
+                     br only when the optional `brotli` module is present)
+  compressed_body()  base64 of the compressed body for API Gateway, memoised
+                     per (body, encoding) so cached /insights bodies are
+                     compressed once per warm container
+"""
+
+import base64
+import gzip
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:   # optional: ~3-10x faster dumps
+    orjson = None
+
+try:
+    import brotli
+except ImportError:   # optional: br is offered only when available
+    brotli = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default).decode("utf-8")
+    return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False)
+
+
+def _accepted(accept_encoding: str) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if token:
+            accepted[token.strip().lower()] = q
+    return accepted
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best supported Content-Encoding the client accepts, or None for identity."""
+    if not accept_encoding:
+        return None
+    accepted = _accepted(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    candidates = (("br", "gzip") if brotli is not None else ("gzip",))
+    best, best_q = None, 0.0
+    for encoding in candidates:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+@lru_cache(maxsize=32)
+def compressed_body(body: str, encoding: str) -> str:
+    raw = body.encode("utf-8")
+    if encoding == "br":
+        data = brotli.compress(raw, quality=5)
+    else:
+        data = gzip.compress(raw, compresslevel=6)
+    return base64.b64encode(data).decode("ascii")
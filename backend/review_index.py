@@ -0,0 +1,125 @@
+"""
+Smart Talent Insight Hub — Review Index
+Newest-first listing of AI-processed reviews, for GET /reviews and the
+recent-review sections of GET /insights.
+
+Sparse GSI `reviewBucket-timestamp-index`:
+  reviewBucket   "YYYY-MM" of the submit time. Written by the analysis
+                 update only when it yields a summary, removed when an
+                 analysis fails, so pending items never enter the index
+  timestamp      range key (ISO submit time)
+
+A page walks months newest → oldest, one Query per month with
+ScanIndexForward=False and Limit = rows still wanted, so it reads about
+`limit` items plus one Query per month crossed. The walk ends after
+`max_empty_months` consecutive months with nothing indexed (the start of
+the data).
+
+The cursor is opaque to clients: base64url JSON of the month to resume in
+and that month's LastEvaluatedKey (null: start at its newest review).
+"""
+
+import base64
+import binascii
+import json
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+REVIEW_INDEX  = "reviewBucket-timestamp-index"
+REVIEW_BUCKET = "reviewBucket"
+REVIEW_FIELDS = (
+    "feedbackId", "employeeName", "department", "reviewPeriod", "rating",
+    "sentiment", "summary", "topics", "timestamp",
+)
+
+_MONTH = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+_KEY_ATTRS = {"feedbackId", "timestamp", REVIEW_BUCKET}
+
+
+def review_bucket(timestamp: str) -> str:
+    """Index partition for an item submitted at `timestamp`."""
+    return timestamp[:7]
+
+
+def previous_month(month: str) -> str:
+    year, mon = int(month[:4]), int(month[5:7])
+    return f"{year - 1}-12" if mon == 1 else f"{year}-{mon - 1:02d}"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CURSOR
+# ─────────────────────────────────────────────────────────────────────────────
+
+def encode_cursor(month: str, last_key: Optional[Dict[str, Any]]) -> str:
+    raw = json.dumps({"m": month, "k": last_key}, separators=(",", ":"), sort_keys=True)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """→ (month, ExclusiveStartKey or None). Raises ValueError on anything not minted here."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw.decode("utf-8"))
+    except (binascii.Error, ValueError):
+        raise ValueError("invalid cursor") from None
+    if not isinstance(data, dict) or not isinstance(data.get("m"), str) or not _MONTH.match(data["m"]):
+        raise ValueError("invalid cursor")
+    key = data.get("k")
+    if key is not None and not (
+            isinstance(key, dict) and set(key) == _KEY_ATTRS
+            and all(isinstance(v, str) for v in key.values())
+            and key[REVIEW_BUCKET] == data["m"]):
+        raise ValueError("invalid cursor")
+    return data["m"], key
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PAGED QUERY
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _query_month(client: Any, table_name: str, month: str, limit: int,
+                 start: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    names = {f"#p{i}": f for i, f in enumerate(REVIEW_FIELDS)}
+    kwargs: Dict[str, Any] = {
+        "TableName":                 table_name,
+        "IndexName":                 REVIEW_INDEX,
+        "KeyConditionExpression":    "#rb = :rb",
+        "ExpressionAttributeNames":  {**names, "#rb": REVIEW_BUCKET},
+        "ExpressionAttributeValues": {":rb": month},
+        "ProjectionExpression":      ", ".join(names),
+        "ScanIndexForward":          False,
+        "Limit":                     limit,
+    }
+    if start:
+        kwargs["ExclusiveStartKey"] = start
+    return client.query(**kwargs)
+
+
+def page(table: Any, limit: int, cursor: Optional[str] = None, max_empty_months: int = 12,
+         now: Optional[datetime] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Up to `limit` reviews, newest first, and the cursor for the next page
+    (None once the index is exhausted). Raises ValueError for a bad cursor.
+    """
+    if cursor:
+        month, start = decode_cursor(cursor)
+    else:
+        month, start = (now or datetime.now(timezone.utc)).strftime("%Y-%m"), None
+
+    rows: List[Dict[str, Any]] = []
+    empty = 0
+    found = start is not None   # resuming inside a month that had reviews
+    while len(rows) < limit:
+        resp = _query_month(table.meta.client, table.name, month, limit - len(rows), start)
+        items = resp.get("Items", [])
+        rows.extend(items)
+        found = found or bool(items)
+        start = resp.get("LastEvaluatedKey")
+        if start:
+            continue   # Limit or the 1 MB page cut this month short
+        empty = 0 if found else empty + 1
+        if empty >= max_empty_months:
+            return rows, None
+        month, found = previous_month(month), False
+    return rows, encode_cursor(month, start)
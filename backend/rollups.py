@@ -0,0 +1,392 @@
+"""
+Smart Talent Insight Hub — Insights Rollups
+Pre-aggregated counters for GET /insights, maintained from the
+FeedbackSubmissions DynamoDB stream (NEW_AND_OLD_IMAGES).
+
+Rollup items (table hash key: rollupId):
+  global         — total / positive / negative / neutral + set of months seen
+  month#YYYY-MM  — same counters for one calendar month
+  topics#NN      — one ADD-able attribute per normalised topic ("t:<topic>"),
+                   hash-sharded (topic_norm.TopicNormalizer)
+
+Topic shards stay bounded: a batch that lowers a topic's counter follows its
+transaction with a conditional REMOVE of any counter that reached zero, and
+prune_topic_shards (run periodically and by the rebuild) keeps each shard's
+TOPIC_SHARD_KEEP largest counters. 16 × TOPIC_SHARD_KEEP is well above what
+the read-side sketch reports; a pruned tail topic that comes back restarts
+from its new count until the next rebuild.
+
+Recent reviews are not rolled up: they are read from the sparse review
+index (review_index.py), which is time-ordered already.
+
+Every stream record is folded as (contribution of NEW image) minus
+(contribution of OLD image), so the aiProcessed false → true flip moves an
+item from "neutral" to its real sentiment instead of counting it twice.
+"""
+
+import hashlib
+import json
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
+
+import topic_norm
+
+SENTIMENTS       = ("positive", "negative", "neutral")
+GLOBAL_ID        = "global"
+TOPIC_SHARDS     = 16
+TOPIC_PREFIX     = "t:"
+TOPIC_SHARD_KEEP = 250   # topic counters kept per shard by the prune / rebuild
+MAX_TX_ITEMS     = 100   # DynamoDB TransactWriteItems limit
+PRUNE_CHUNK      = 50    # attributes per conditional REMOVE
+
+_deserializer = TypeDeserializer()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CONTRIBUTION OF ONE FEEDBACK ITEM
+# ─────────────────────────────────────────────────────────────────────────────
+
+def item_sentiment(item: Dict[str, Any]) -> str:
+    """Same bucketing as the scan path: missing/unknown → neutral."""
+    sentiment = (item.get("sentiment") or "neutral").lower()
+    return sentiment if sentiment in SENTIMENTS else "neutral"
+
+
+def item_month(item: Dict[str, Any]) -> str:
+    ts = item.get("timestamp", "")
+    return ts[:7] if ts else "unknown"
+
+
+class RollupDelta:
+    """Signed counter deltas accumulated over a batch of stream records."""
+
+    def __init__(self, normalize: Callable[[Any], str] = topic_norm.normalize_topic) -> None:
+        self.normalize = normalize
+        self.totals: Counter = Counter()
+        self.months: Dict[str, Counter] = {}
+        self.topics: Counter = Counter()
+
+    def add_item(self, item: Optional[Dict[str, Any]], sign: int) -> None:
+        if not item:
+            return
+        sentiment = item_sentiment(item)
+        month     = item_month(item)
+
+        self.totals["total"]   += sign
+        self.totals[sentiment] += sign
+
+        bucket = self.months.setdefault(month, Counter())
+        bucket["total"]   += sign
+        bucket[sentiment] += sign
+
+        topics = item.get("topics")
+        if isinstance(topics, list):
+            for topic in topics:
+                label = self.normalize(topic)
+                if label:
+                    self.topics[label] += sign
+
+    def add_record(self, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> None:
+        self.add_item(old, -1)
+        self.add_item(new, +1)
+
+    def is_empty(self) -> bool:
+        return (
+            not any(self.totals.values())
+            and not any(any(c.values()) for c in self.months.values())
+            and not any(self.topics.values())
+        )
+
+
+def topic_shard(topic: str) -> str:
+    digest = hashlib.md5(topic.encode("utf-8")).digest()
+    return f"topics#{digest[0] % TOPIC_SHARDS:02d}"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# STREAM CONSUMER
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _image(record: Dict[str, Any], key: str) -> Optional[Dict[str, Any]]:
+    raw = record.get("dynamodb", {}).get(key)
+    if not raw:
+        return None
+    return {k: _deserializer.deserialize(v) for k, v in raw.items()}
+
+
+def decode_stream_records(records: Iterable[Dict[str, Any]]) -> List[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+    """Turn raw stream records into (old_image, new_image) pairs of plain dicts."""
+    return [(_image(r, "OldImage"), _image(r, "NewImage")) for r in records]
+
+
+def _counter_update(rollup_table: str, rollup_id: str, counts: Dict[str, int],
+                    months: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+    names: Dict[str, str] = {}
+    values: Dict[str, Any] = {}
+    clauses: List[str] = []
+    for i, (attr, n) in enumerate(sorted(counts.items())):
+        if not n:
+            continue
+        names[f"#a{i}"]  = attr
+        values[f":v{i}"] = n
+        clauses.append(f"#a{i} :v{i}")
+    if months:
+        names["#months"]  = "months"
+        values[":months"] = set(months)
+        clauses.append("#months :months")
+    if not clauses:
+        return None
+    return {"Update": {
+        "TableName": rollup_table,
+        "Key": {"rollupId": rollup_id},
+        "UpdateExpression": "ADD " + ", ".join(clauses),
+        "ExpressionAttributeNames": names,
+        "ExpressionAttributeValues": values,
+    }}
+
+
+def build_transact_items(rollup_table: str, delta: RollupDelta) -> List[Dict[str, Any]]:
+    """One ADD-only Update per touched rollup item."""
+    items: List[Dict[str, Any]] = []
+
+    new_months = [m for m, c in delta.months.items() if any(c.values())]
+    update = _counter_update(rollup_table, GLOBAL_ID, dict(delta.totals), new_months)
+    if update:
+        items.append(update)
+
+    for month, counts in sorted(delta.months.items()):
+        update = _counter_update(rollup_table, f"month#{month}", dict(counts))
+        if update:
+            items.append(update)
+
+    shards: Dict[str, Dict[str, int]] = {}
+    for topic, n in delta.topics.items():
+        if n:
+            shards.setdefault(topic_shard(topic), {})[TOPIC_PREFIX + topic] = n
+    for shard_id, counts in sorted(shards.items()):
+        update = _counter_update(rollup_table, shard_id, counts)
+        if update:
+            items.append(update)
+
+    return items
+
+
+def _batch_token(records: List[Dict[str, Any]], chunk: int) -> str:
+    """Deterministic idempotency token: a Lambda retry of the same batch is a no-op."""
+    seqs = [r.get("dynamodb", {}).get("SequenceNumber", "") for r in records]
+    ids  = [r.get("eventID", "") for r in records]
+    digest = hashlib.sha256(json.dumps([seqs, ids, chunk]).encode("utf-8")).hexdigest()
+    return digest[:36]
+
+
+def apply_counter_deltas(client: Any, rollup_table: str, delta: RollupDelta,
+                         records: List[Dict[str, Any]]) -> int:
+    """Apply counter deltas atomically (per 100-item chunk). Returns items written."""
+    tx_items = build_transact_items(rollup_table, delta)
+    for chunk, start in enumerate(range(0, len(tx_items), MAX_TX_ITEMS)):
+        client.transact_write_items(
+            TransactItems=tx_items[start:start + MAX_TX_ITEMS],
+            ClientRequestToken=_batch_token(records, chunk),
+        )
+    return len(tx_items)
+
+
+def _conditional_failed(exc: ClientError) -> bool:
+    return exc.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException"
+
+
+def remove_zeroed_topics(rollups: Any, delta: RollupDelta) -> int:
+    """Drop the counters of topics this delta lowered, if they are now zero or below."""
+    removed = 0
+    for topic, n in sorted(delta.topics.items()):
+        if n >= 0:
+            continue
+        try:
+            rollups.update_item(
+                Key={"rollupId": topic_shard(topic)},
+                UpdateExpression="REMOVE #a",
+                ConditionExpression="#a <= :zero",
+                ExpressionAttributeNames={"#a": TOPIC_PREFIX + topic},
+                ExpressionAttributeValues={":zero": 0},
+            )
+            removed += 1
+        except ClientError as exc:
+            if not _conditional_failed(exc):
+                raise
+    return removed
+
+
+def process_stream_batch(rollups: Any, records: List[Dict[str, Any]],
+                         normalize: Callable[[Any], str] = topic_norm.normalize_topic) -> Dict[str, int]:
+    """
+    Fold one DynamoDB stream batch into the rollup table.
+    Counters are applied in a transaction whose token is derived from the
+    batch, so a retried batch never double counts.
+    """
+    pairs = decode_stream_records(records)
+    delta = RollupDelta(normalize)
+    for old, new in pairs:
+        delta.add_record(old, new)
+
+    written = removed = 0
+    if not delta.is_empty():
+        written = apply_counter_deltas(rollups.meta.client, rollups.name, delta, records)
+        removed = remove_zeroed_topics(rollups, delta)
+    return {"records": len(records), "rollupItems": written, "topicsRemoved": removed}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# READ SIDE
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _batch_get(rollups: Any, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    client = rollups.meta.client
+    found: Dict[str, Dict[str, Any]] = {}
+    pending = [{"rollupId": i} for i in dict.fromkeys(ids)]
+    while pending:
+        chunk, pending = pending[:100], pending[100:]
+        request = {rollups.name: {"Keys": chunk}}
+        while request:
+            resp = client.batch_get_item(RequestItems=request)
+            for item in resp.get("Responses", {}).get(rollups.name, []):
+                found[item["rollupId"]] = item
+            request = resp.get("UnprocessedKeys") or None
+    return found
+
+
+def read_rollups(rollups: Any, trend_months: int = 6,
+                 current_month: str = "",
+                 normalize: Callable[[Any], str] = topic_norm.normalize_topic,
+                 topic_capacity: int = topic_norm.DEFAULT_CAPACITY) -> Optional[Dict[str, Any]]:
+    """
+    Load everything /insights needs with two point-read round trips.
+    Returns None when the rollups have never been built. Topic attributes are
+    re-normalised on read, so counters written under older spellings (or an
+    older synonym map) fold into their current label until the next rebuild.
+    """
+    head = rollups.get_item(Key={"rollupId": GLOBAL_ID}).get("Item")
+    if not head:
+        return None
+
+    months = sorted(m for m in head.get("months", set()) if m)
+    wanted = months[-trend_months:]
+    if current_month and current_month not in wanted:
+        wanted.append(current_month)
+
+    ids = [f"month#{m}" for m in wanted]
+    ids += [f"topics#{i:02d}" for i in range(TOPIC_SHARDS)]
+    found = _batch_get(rollups, ids)
+
+    monthly: Dict[str, Dict[str, int]] = {}
+    for m in wanted:
+        item = found.get(f"month#{m}")
+        if item and int(item.get("total", 0)) > 0:
+            monthly[m] = {s: int(item.get(s, 0)) for s in SENTIMENTS}
+
+    sketch = topic_norm.SpaceSaving(topic_capacity)
+    for i in range(TOPIC_SHARDS):
+        for attr, n in found.get(f"topics#{i:02d}", {}).items():
+            if attr.startswith(TOPIC_PREFIX) and int(n) > 0:
+                label = normalize(attr[len(TOPIC_PREFIX):])
+                if label:
+                    sketch.add(label, int(n))
+    topic_counter = Counter(dict(sketch.top(len(sketch))))
+
+    return {
+        "total":           int(head.get("total", 0)),
+        "sentimentCounts": {s: int(head.get(s, 0)) for s in SENTIMENTS},
+        "monthly":         monthly,
+        "topicCounter":    topic_counter,
+    }
+
+
+def _shard_tail(counts: Dict[str, int], keep: int) -> List[str]:
+    """Attributes beyond the `keep` largest counters, plus any at zero or below."""
+    ranked = sorted(counts, key=lambda a: (-counts[a], a))
+    return ranked[keep:] + [a for a in ranked[:keep] if counts[a] <= 0]
+
+
+def prune_topic_shards(rollups: Any, keep: int = TOPIC_SHARD_KEEP) -> Dict[str, int]:
+    """
+    Cap every topic shard at its `keep` largest counters. Removals are
+    conditional on the counter not having grown since it was read; one that
+    did is left for the next prune.
+    """
+    found = _batch_get(rollups, [f"topics#{i:02d}" for i in range(TOPIC_SHARDS)])
+    stats = {"shards": len(found), "removed": 0, "raced": 0}
+    for shard_id, item in sorted(found.items()):
+        counts = {a: int(n) for a, n in item.items() if a.startswith(TOPIC_PREFIX)}
+        tail = _shard_tail(counts, keep)
+        for start in range(0, len(tail), PRUNE_CHUNK):
+            chunk = tail[start:start + PRUNE_CHUNK]
+            try:
+                rollups.update_item(
+                    Key={"rollupId": shard_id},
+                    UpdateExpression="REMOVE " + ", ".join(f"#a{i}" for i in range(len(chunk))),
+                    ConditionExpression=" AND ".join(f"#a{i} <= :v{i}" for i in range(len(chunk))),
+                    ExpressionAttributeNames={f"#a{i}": a for i, a in enumerate(chunk)},
+                    ExpressionAttributeValues={f":v{i}": counts[a] for i, a in enumerate(chunk)},
+                )
+                stats["removed"] += len(chunk)
+            except ClientError as exc:
+                if not _conditional_failed(exc):
+                    raise
+                stats["raced"] += len(chunk)
+    return stats
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# FULL REBUILD (bootstrap / repair)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def rebuild_rollups(rollups: Any, items: Iterable[Dict[str, Any]],
+                    normalize: Callable[[Any], str] = topic_norm.normalize_topic,
+                    keep: int = TOPIC_SHARD_KEEP) -> Dict[str, int]:
+    """
+    Recompute every rollup from scratch and overwrite the table, each topic
+    shard capped at its `keep` largest counters.
+    Run with the stream mapping paused; concurrent stream batches would race.
+    Also the way to re-key topic counters after a TOPIC_SYNONYMS change.
+    """
+    delta = RollupDelta(normalize)
+    count = 0
+    for item in items:
+        count += 1
+        delta.add_item(item, +1)
+
+    old_ids = [i["rollupId"] for i in _scan_ids(rollups)]
+    with rollups.batch_writer() as batch:
+        for rollup_id in old_ids:
+            batch.delete_item(Key={"rollupId": rollup_id})
+
+    with rollups.batch_writer() as batch:
+        batch.put_item(Item={
+            "rollupId": GLOBAL_ID,
+            **{k: v for k, v in delta.totals.items()},
+            **({"months": set(delta.months)} if delta.months else {}),
+        })
+        for month, counts in delta.months.items():
+            batch.put_item(Item={"rollupId": f"month#{month}", **dict(counts)})
+        shards: Dict[str, Dict[str, int]] = {}
+        for topic, n in delta.topics.items():
+            shards.setdefault(topic_shard(topic), {})[TOPIC_PREFIX + topic] = n
+        for shard_id, counts in shards.items():
+            for attr in _shard_tail(counts, keep):
+                del counts[attr]
+            batch.put_item(Item={"rollupId": shard_id, **counts})
+
+    return {"items": count, "months": len(delta.months), "topics": len(delta.topics)}
+
+
+def _scan_ids(rollups: Any) -> List[Dict[str, Any]]:
+    ids: List[Dict[str, Any]] = []
+    kwargs: Dict[str, Any] = {"ProjectionExpression": "rollupId"}
+    while True:
+        resp = rollups.scan(**kwargs)
+        ids.extend(resp.get("Items", []))
+        if "LastEvaluatedKey" not in resp:
+            return ids
+        kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
@@ -0,0 +1,149 @@
+"""
+Smart Talent Insight Hub — Parallel Scan Engine
+Runs a DynamoDB parallel scan (Segment / TotalSegments) on a thread pool.
+
+Each worker pages through its own segment with a ProjectionExpression and
+folds every page into a per-segment partial as soon as it arrives, so no
+worker ever holds more than one page of items. The partials are merged by
+the caller-supplied function once all segments finish.
+
+parallel_query does the same for a set of independent Query requests
+(e.g. one per GSI partition), so filtered reads cost what the slice costs.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar
+
+P = TypeVar("P")
+
+
+def projection_args(fields: Sequence[str]) -> Dict[str, Any]:
+    """ProjectionExpression with every name aliased (timestamp, name … are reserved)."""
+    names = {f"#p{i}": f for i, f in enumerate(fields)}
+    return {
+        "ProjectionExpression":     ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
+
+
+def _with_projection(kwargs: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """Add a projection without clobbering names a filter/key condition already uses."""
+    merged = dict(kwargs)
+    if fields:
+        projection = projection_args(fields)
+        merged["ProjectionExpression"] = projection["ProjectionExpression"]
+        merged["ExpressionAttributeNames"] = {
+            **kwargs.get("ExpressionAttributeNames", {}),
+            **projection["ExpressionAttributeNames"],
+        }
+    return merged
+
+
+def scan_segment(
+    client: Any,
+    table_name: str,
+    segment: int,
+    total_segments: int,
+    fold_page: Callable[[P, List[Dict[str, Any]]], None],
+    partial: P,
+    scan_kwargs: Optional[Dict[str, Any]] = None,
+) -> P:
+    """Page through one segment, folding each page into `partial`."""
+    kwargs: Dict[str, Any] = dict(scan_kwargs or {})
+    kwargs["TableName"] = table_name
+    if total_segments > 1:
+        kwargs["Segment"]       = segment
+        kwargs["TotalSegments"] = total_segments
+    while True:
+        response = client.scan(**kwargs)
+        fold_page(partial, response.get("Items", []))
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return partial
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def query_pages(
+    client: Any,
+    table_name: str,
+    fold_page: Callable[[P, List[Dict[str, Any]]], None],
+    partial: P,
+    query_kwargs: Dict[str, Any],
+) -> P:
+    """Page through one Query, folding each page into `partial`."""
+    kwargs: Dict[str, Any] = dict(query_kwargs)
+    kwargs["TableName"] = table_name
+    while True:
+        response = client.query(**kwargs)
+        fold_page(partial, response.get("Items", []))
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return partial
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def parallel_query(
+    client: Any,
+    table_name: str,
+    queries: Sequence[Dict[str, Any]],
+    new_partial: Callable[[], P],
+    fold_page: Callable[[P, List[Dict[str, Any]]], None],
+    merge: Callable[[P, P], P],
+    projection: Optional[Sequence[str]] = None,
+    max_workers: int = 8,
+) -> P:
+    """Run independent Query requests concurrently and return the merged partial."""
+    queries = [_with_projection(q, projection) for q in queries]
+    if len(queries) <= 1:
+        partial = new_partial()
+        for query in queries:
+            query_pages(client, table_name, fold_page, partial, query)
+        return partial
+
+    workers = max(1, min(max_workers, len(queries)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="query") as pool:
+        futures = [
+            pool.submit(query_pages, client, table_name, fold_page, new_partial(), query)
+            for query in queries
+        ]
+        partials = [f.result() for f in futures]
+
+    result = partials[0]
+    for partial in partials[1:]:
+        result = merge(result, partial)
+    return result
+
+
+def parallel_scan(
+    client: Any,
+    table_name: str,
+    segments: int,
+    new_partial: Callable[[], P],
+    fold_page: Callable[[P, List[Dict[str, Any]]], None],
+    merge: Callable[[P, P], P],
+    projection: Optional[Sequence[str]] = None,
+    scan_kwargs: Optional[Dict[str, Any]] = None,
+) -> P:
+    """
+    Scan `table_name` with `segments` concurrent workers and return the merged
+    partial. `client` must be thread-safe (a boto3 client — e.g.
+    `table.meta.client` — not a Table resource).
+    """
+    segments = max(1, int(segments))
+    kwargs = _with_projection(scan_kwargs or {}, projection)
+
+    if segments == 1:
+        return scan_segment(client, table_name, 0, 1, fold_page, new_partial(), kwargs)
+
+    with ThreadPoolExecutor(max_workers=segments, thread_name_prefix="scan") as pool:
+        futures = [
+            pool.submit(scan_segment, client, table_name, seg, segments,
+                        fold_page, new_partial(), kwargs)
+            for seg in range(segments)
+        ]
+        partials = [f.result() for f in futures]
+
+    result = partials[0]
+    for partial in partials[1:]:
+        result = merge(result, partial)
+    return result
@@ -0,0 +1,314 @@
+"""
+Smart Talent Insight Hub — SQLite Feedback Store
+Embedded storage backend (STORAGE_BACKEND=sqlite) for on-prem and CI runs:
+one database file, no AWS. Same interface as storage.DynamoFeedbackStore,
+but /insights is answered by indexed GROUP BY queries instead of rollups or
+a scan folded in Python.
+
+Schema:
+  feedback         one row per submission: the item as JSON plus the
+                   columns queries filter / group on (timestamp, month,
+                   bucketed sentiment, department, reviewPeriod, aiProcessed,
+                   reviewBucket, aiAnalyzedAt)
+  feedback_topics  normalized (feedbackId, topic, n) rows, topic labels
+                   canonicalised on write (topic_norm) and n the times the
+                   label occurs in the item (counted like rollups / the
+                   scan). The slice columns (department, reviewPeriod,
+                   timestamp) are copied in, so a filtered top-k is a range
+                   of one covering index rather than a join per item.
+
+  indexes          every filter column leads a covering index whose tail is
+                   what aggregate() reads — (department | reviewPeriod,
+                   month, sentiment, timestamp) and (timestamp, month,
+                   sentiment) on feedback, (…, topic, n) on feedback_topics;
+                   (month, sentiment) and (topic, n) for the unfiltered
+                   view; (aiProcessed, timestamp) for pending work; a
+                   partial (timestamp, feedbackId) index over reviewed rows
+                   for GET /reviews
+
+aggregate() is three statements: month × sentiment counts (→ total,
+sentimentCounts, monthly trend, thisMonth), the top `topic_limit` topics,
+and the newest reviews in the slice. Filters become WHERE clauses on the
+indexed columns.
+
+WAL journal: readers never block the writer or each other. Connections are
+per thread (sqlite3 objects are not shareable), writes take the database
+lock up front (BEGIN IMMEDIATE) so read-modify-write updates are atomic.
+"""
+
+import json
+import sqlite3
+import threading
+from collections import Counter
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import review_index
+import topic_norm
+from aggregation import RECENT_SIZE, SENTIMENTS
+from rollups import item_month, item_sentiment
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback (
+    feedbackId   TEXT PRIMARY KEY,
+    timestamp    TEXT NOT NULL DEFAULT '',
+    month        TEXT NOT NULL DEFAULT 'unknown',
+    sentiment    TEXT NOT NULL DEFAULT 'neutral',
+    department   TEXT,
+    reviewPeriod TEXT,
+    aiProcessed  INTEGER NOT NULL DEFAULT 0,
+    reviewBucket TEXT,
+    aiAnalyzedAt TEXT,
+    item         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS feedback_timestamp       ON feedback (timestamp, month, sentiment);
+CREATE INDEX IF NOT EXISTS feedback_department      ON feedback (department, month, sentiment, timestamp);
+CREATE INDEX IF NOT EXISTS feedback_review_period   ON feedback (reviewPeriod, month, sentiment, timestamp);
+CREATE INDEX IF NOT EXISTS feedback_ai_processed    ON feedback (aiProcessed, timestamp);
+CREATE INDEX IF NOT EXISTS feedback_month_sentiment ON feedback (month, sentiment);
+CREATE INDEX IF NOT EXISTS feedback_reviews         ON feedback (timestamp, feedbackId)
+    WHERE reviewBucket IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS feedback_topics (
+    feedbackId   TEXT NOT NULL,
+    topic        TEXT NOT NULL,
+    n            INTEGER NOT NULL,
+    department   TEXT,
+    reviewPeriod TEXT,
+    timestamp    TEXT NOT NULL,
+    PRIMARY KEY (feedbackId, topic)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS feedback_topics_topic         ON feedback_topics (topic, n);
+CREATE INDEX IF NOT EXISTS feedback_topics_department    ON feedback_topics (department, topic, timestamp, n);
+CREATE INDEX IF NOT EXISTS feedback_topics_review_period ON feedback_topics (reviewPeriod, topic, timestamp, n);
+CREATE INDEX IF NOT EXISTS feedback_topics_timestamp     ON feedback_topics (timestamp, topic, n);
+
+-- Unfiltered top-k without a GROUP BY over every topic row: kept by triggers.
+CREATE TABLE IF NOT EXISTS topic_totals (
+    topic TEXT PRIMARY KEY,
+    n     INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS feedback_topics_added AFTER INSERT ON feedback_topics BEGIN
+    INSERT INTO topic_totals (topic, n) VALUES (NEW.topic, NEW.n)
+        ON CONFLICT (topic) DO UPDATE SET n = n + excluded.n;
+END;
+CREATE TRIGGER IF NOT EXISTS feedback_topics_removed AFTER DELETE ON feedback_topics BEGIN
+    UPDATE topic_totals SET n = n - OLD.n WHERE topic = OLD.topic;
+END;
+"""
+
+_UPSERT = """
+INSERT INTO feedback (feedbackId, timestamp, month, sentiment, department, reviewPeriod,
+                      aiProcessed, reviewBucket, aiAnalyzedAt, item)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (feedbackId) DO UPDATE SET
+    timestamp = excluded.timestamp, month = excluded.month, sentiment = excluded.sentiment,
+    department = excluded.department, reviewPeriod = excluded.reviewPeriod,
+    aiProcessed = excluded.aiProcessed, reviewBucket = excluded.reviewBucket,
+    aiAnalyzedAt = excluded.aiAnalyzedAt, item = excluded.item
+"""
+_INSERT_TOPIC = """
+INSERT INTO feedback_topics (feedbackId, topic, n, department, reviewPeriod, timestamp)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, set):
+        return sorted(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class SQLAggregate:
+    """The ColumnarAccumulator results the /insights payload reads, from GROUP BY rows."""
+
+    def __init__(self, current_month: str, cells: Iterable[Tuple[str, str, int]],
+                 topics: Counter, recent: List[Dict[str, Any]]) -> None:
+        self.monthly: Dict[str, Dict[str, int]] = {}
+        for month, sentiment, count in cells:
+            self.monthly.setdefault(month, dict.fromkeys(SENTIMENTS, 0))[sentiment] += count
+        self.sentiment_counts = {s: sum(m[s] for m in self.monthly.values()) for s in SENTIMENTS}
+        self.total      = sum(self.sentiment_counts.values())
+        self.this_month = sum(self.monthly.get(current_month, {}).values())
+        self.topics     = topics
+        self._recent    = recent
+
+    def reviews(self) -> List[Dict[str, Any]]:
+        """Newest processed reviews, oldest first (so [-N:] keeps the newest N)."""
+        return self._recent
+
+
+class SQLiteFeedbackStore:
+    name = "sqlite"
+
+    def __init__(self, path: str, normalize: Callable[[Any], str] = topic_norm.normalize_topic,
+                 row_builder: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None) -> None:
+        self.path       = path
+        self._normalize = normalize
+        self._review_row = row_builder or (lambda item: item)
+        self._local     = threading.local()
+        self._init_lock = threading.Lock()
+        self._ready     = False
+
+    # ── connections ───────────────────────────────────────────────────────────
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")   # durable at checkpoints; WAL keeps it consistent
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-65536")     # 64 MiB: index pages of a large file stay hot
+            conn.execute("PRAGMA mmap_size=268435456")
+            with self._init_lock:
+                if not self._ready:
+                    conn.executescript(SCHEMA)
+                    self._ready = True
+            self._local.conn = conn
+        return conn
+
+    def _write(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    # ── rows ──────────────────────────────────────────────────────────────────
+    def _row(self, item: Dict[str, Any]) -> Tuple[Any, ...]:
+        return (
+            item["feedbackId"], item.get("timestamp") or "", item_month(item), item_sentiment(item),
+            item.get("department") or None, item.get("reviewPeriod") or None,
+            1 if item.get("aiProcessed") else 0, item.get(review_index.REVIEW_BUCKET),
+            item.get("aiAnalyzedAt"), json.dumps(item, default=_json_default),
+        )
+
+    def _topic_rows(self, item: Dict[str, Any]) -> List[Tuple[Any, ...]]:
+        topics = item.get("topics")
+        if not isinstance(topics, list):
+            return []
+        labels = Counter(self._normalize(t) for t in topics if t)
+        slice_columns = (item.get("department") or None, item.get("reviewPeriod") or None,
+                         item.get("timestamp") or "")
+        return [(item["feedbackId"], label, n, *slice_columns) for label, n in labels.items() if label]
+
+    def _store(self, conn: sqlite3.Connection, items: List[Dict[str, Any]]) -> None:
+        conn.executemany(_UPSERT, [self._row(item) for item in items])
+        conn.executemany("DELETE FROM feedback_topics WHERE feedbackId = ?",
+                         [(item["feedbackId"],) for item in items])
+        conn.executemany(_INSERT_TOPIC, [row for item in items for row in self._topic_rows(item)])
+
+    # ── writes ────────────────────────────────────────────────────────────────
+    def put(self, item: Dict[str, Any]) -> None:
+        self._write(lambda conn: self._store(conn, [item]))
+
+    def put_if_absent(self, item: Dict[str, Any]) -> bool:
+        def _insert(conn: sqlite3.Connection) -> bool:
+            if conn.execute("SELECT 1 FROM feedback WHERE feedbackId = ?", (item["feedbackId"],)).fetchone():
+                return False
+            self._store(conn, [item])
+            return True
+        return self._write(_insert)
+
+    def put_many(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if items:
+            self._write(lambda conn: self._store(conn, items))
+        return []   # one transaction: all written or an exception
+
+    def update(self, feedback_id: str, values: Dict[str, Any], remove: Iterable[str] = (),
+               not_after: Optional[str] = None) -> bool:
+        def _apply(conn: sqlite3.Connection) -> bool:
+            row = conn.execute("SELECT item FROM feedback WHERE feedbackId = ?", (feedback_id,)).fetchone()
+            item = json.loads(row[0]) if row else {"feedbackId": feedback_id}
+            if not_after is not None and item.get("aiAnalyzedAt") and item["aiAnalyzedAt"] > not_after:
+                return False
+            item.update(values)
+            for attr in remove:
+                item.pop(attr, None)
+            self._store(conn, [item])
+            return True
+        return self._write(_apply)
+
+    def rebuild_topics(self) -> int:
+        """Re-normalise every stored topic (after a TOPIC_SYNONYMS change); returns rows read."""
+        def _rebuild(conn: sqlite3.Connection) -> int:
+            conn.execute("DELETE FROM feedback_topics")
+            conn.execute("DELETE FROM topic_totals")
+            count = 0
+            for (raw,) in conn.execute("SELECT item FROM feedback"):
+                conn.executemany(_INSERT_TOPIC, self._topic_rows(json.loads(raw)))
+                count += 1
+            return count
+        return self._write(_rebuild)
+
+    # ── reads ─────────────────────────────────────────────────────────────────
+    def get(self, feedback_id: str) -> Optional[Dict[str, Any]]:
+        row = self.connection().execute(
+            "SELECT item FROM feedback WHERE feedbackId = ?", (feedback_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @staticmethod
+    def _where(filters: Any) -> Tuple[List[str], List[Any]]:
+        """Filter → clauses on the slice columns both tables carry, and their parameters."""
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (("department", filters.department),
+                              ("reviewPeriod", filters.review_period)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if filters.from_ts:
+            clauses.append("timestamp >= ?")
+            params.append(filters.from_ts)
+        if filters.to_ts:
+            clauses.append("timestamp <= ?")
+            params.append(filters.to_ts)
+        return clauses, params
+
+    def aggregate(self, filters: Any, current_month: str, topic_limit: int) -> SQLAggregate:
+        conn = self.connection()
+        clauses, params = self._where(filters)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        cells = conn.execute(
+            f"SELECT month, sentiment, COUNT(*) FROM feedback{where} GROUP BY month, sentiment",
+            params).fetchall()
+        topic_sql = (f"SELECT topic, SUM(n) AS total FROM feedback_topics{where} GROUP BY topic" if clauses
+                     else "SELECT topic, n AS total FROM topic_totals WHERE n > 0")
+        topics = Counter(dict(conn.execute(
+            f"{topic_sql} ORDER BY total DESC, topic LIMIT ?", params + [topic_limit]).fetchall()))
+
+        # Order by key columns only; the (large) item JSON is read for the winners.
+        reviewed = " WHERE " + " AND ".join(clauses + ["reviewBucket IS NOT NULL"])
+        newest = conn.execute(
+            f"SELECT timestamp, feedbackId, item FROM feedback WHERE rowid IN ("
+            f"SELECT rowid FROM feedback{reviewed} ORDER BY timestamp DESC, feedbackId DESC LIMIT ?)",
+            params + [RECENT_SIZE]).fetchall()
+        recent = [self._review_row(json.loads(raw)) for _, _, raw in sorted(newest)]
+        return SQLAggregate(current_month, cells, topics, recent)
+
+    def reviews_page(self, limit: int, cursor: Optional[str] = None,
+                     max_empty_months: int = 12) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Keyset pages over the partial reviews index; the cursor is review_index's format."""
+        sql, params = "SELECT item FROM feedback WHERE reviewBucket IS NOT NULL", []
+        if cursor:
+            _, start = review_index.decode_cursor(cursor)
+            if start is not None:
+                sql += " AND (timestamp, feedbackId) < (?, ?)"
+                params += [start["timestamp"], start["feedbackId"]]
+        rows = [json.loads(raw) for (raw,) in self.connection().execute(
+            f"{sql} ORDER BY timestamp DESC, feedbackId DESC LIMIT ?", params + [limit + 1]).fetchall()]
+        if len(rows) <= limit:
+            return rows, None
+        rows, last = rows[:limit], rows[limit - 1]
+        month = review_index.review_bucket(last["timestamp"])
+        return rows, review_index.encode_cursor(month, {
+            "feedbackId": last["feedbackId"], "timestamp": last["timestamp"],
+            review_index.REVIEW_BUCKET: month,
+        })
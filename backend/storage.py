@@ -0,0 +1,109 @@
+"""
+Smart Talent Insight Hub — Feedback Storage
+The persistence the request handlers need, behind one small interface, so
+the same handlers run on DynamoDB (AWS) or on an embedded SQLite file
+(on-prem, CI, local runs — sqlite_store.py). STORAGE_BACKEND picks one.
+
+  put(item)                 store a new submission (PutItem semantics)
+  put_if_absent(item)       store it unless its feedbackId exists → False
+                            when it did (a retry finishing a dead writer's job)
+  put_many(items)           bulk store → the items NOT written (retry them)
+  get(id)                   one stored submission, or None
+  update(id, values, remove, not_after)
+                            set / remove attributes on one submission; with
+                            not_after, skipped (False) when the stored
+                            aiAnalyzedAt is later than that ISO time
+  aggregate(filters, current_month, topic_limit)
+                            /insights counters computed by the backend
+                            itself, or None when it cannot (DynamoDB: the
+                            handler uses rollups, GSI queries or a scan)
+  reviews_page(limit, cursor, max_empty_months)
+                            GET /reviews: newest-first AI-processed reviews
+                            and an opaque cursor; ValueError for a bad cursor
+
+Items are plain dicts shaped like the DynamoDB items. Maintenance that is
+DynamoDB-specific (streams → rollups, outbox sweep, backfill, Parquet
+compaction) keeps working on the table directly.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+import ingest
+import review_index
+
+DYNAMODB = "dynamodb"
+SQLITE   = "sqlite"
+BACKENDS = (DYNAMODB, SQLITE)
+
+
+class DynamoFeedbackStore:
+    name = DYNAMODB
+
+    def __init__(self, table: Any, table_name: str, ingest_concurrency: int = 4) -> None:
+        self.table      = table
+        self.table_name = table_name
+        self.ingest_concurrency = ingest_concurrency
+
+    def put(self, item: Dict[str, Any]) -> None:
+        self.table.put_item(Item=item)
+
+    def put_if_absent(self, item: Dict[str, Any]) -> bool:
+        try:
+            self.table.put_item(Item=item, ConditionExpression="attribute_not_exists(feedbackId)")
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+        return True
+
+    def put_many(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return ingest.write_items(self.table.meta.client, self.table_name, items,
+                                  concurrency=self.ingest_concurrency)
+
+    def get(self, feedback_id: str) -> Optional[Dict[str, Any]]:
+        return self.table.get_item(Key={"feedbackId": feedback_id}).get("Item")
+
+    def update(self, feedback_id: str, values: Dict[str, Any], remove: Iterable[str] = (),
+               not_after: Optional[str] = None) -> bool:
+        names: Dict[str, str] = {}
+        attr_values: Dict[str, Any] = {}
+        sets = []
+        for i, (attr, value) in enumerate(values.items()):
+            names[f"#s{i}"], attr_values[f":s{i}"] = attr, value
+            sets.append(f"#s{i} = :s{i}")
+        removes = []
+        for i, attr in enumerate(remove):
+            names[f"#r{i}"] = attr
+            removes.append(f"#r{i}")
+        expression = " ".join(part for part in (
+            "SET " + ", ".join(sets) if sets else "",
+            "REMOVE " + ", ".join(removes) if removes else "",
+        ) if part)
+
+        condition: Dict[str, Any] = {}
+        if not_after is not None:
+            names["#na"], attr_values[":na"] = "aiAnalyzedAt", not_after
+            condition["ConditionExpression"] = "attribute_not_exists(#na) OR #na <= :na"
+        try:
+            self.table.update_item(
+                Key={"feedbackId": feedback_id},
+                UpdateExpression=expression,
+                ExpressionAttributeNames=names,
+                **({"ExpressionAttributeValues": attr_values} if attr_values else {}),
+                **condition,
+            )
+        except ClientError as exc:
+            if not_after is not None and \
+                    exc.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+        return True
+
+    def aggregate(self, filters: Any, current_month: str, topic_limit: int) -> None:
+        return None   # no server-side GROUP BY: rollups / GSI queries / scan in the handler
+
+    def reviews_page(self, limit: int, cursor: Optional[str] = None,
+                     max_empty_months: int = 12) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return review_index.page(self.table, limit, cursor=cursor, max_empty_months=max_empty_months)
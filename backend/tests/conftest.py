@@ -0,0 +1,14 @@
+"""
+Backend unit tests. The backend modules are flat (imported as `lambda_function`,
+`storage`, ...) and the in-process AWS stand-ins live in bench/local_aws.py,
+so tests run with backend/ on the path and never touch AWS:
+
+    cd backend && python -m pytest -q tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("AWS_DEFAULT_REGION", "ca-central-1")
+os.environ.setdefault("METRICS_ENABLED", "false")
@@ -0,0 +1,78 @@
+import pytest
+from botocore.exceptions import ClientError
+
+import ai_cache
+import backfill
+import lambda_function as lf
+import provider_health
+import storage
+from bench.local_aws import LocalBedrock, LocalComprehend, LocalDynamoDB
+from bench.synthetic import feedback_items
+
+
+class ThrottlingBedrock(LocalBedrock):
+    """Throttles every `every`-th call, streamed or not."""
+
+    def __init__(self, every: int) -> None:
+        super().__init__()
+        self.every, self.seen = every, 0
+
+    def _maybe_throttle(self, op: str) -> None:
+        with self._lock:
+            self.seen += 1
+            throttle = self.seen % self.every == 0
+        if throttle:
+            raise ClientError({"Error": {"Code": "ThrottlingException", "Message": "slow down"}}, op)
+
+    def invoke_model(self, **kwargs):
+        self._maybe_throttle("InvokeModel")
+        return super().invoke_model(**kwargs)
+
+    def invoke_model_with_response_stream(self, **kwargs):
+        self._maybe_throttle("InvokeModelWithResponseStream")
+        return super().invoke_model_with_response_stream(**kwargs)
+
+
+class MemoryCheckpoints:
+    def __init__(self) -> None:
+        self.state = None
+
+    def load(self):
+        return self.state
+
+    def save(self, state) -> None:
+        self.state = state
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    table = LocalDynamoDB().Table(lf.TABLE_NAME)
+    items = list(feedback_items(40, seed=3))
+    for item in items:
+        item.update(aiProcessed=False, timestamp="2020-01-01T00:00:00+00:00")
+    table.load(items)
+    monkeypatch.setattr(lf, "table", table)
+    monkeypatch.setattr(lf, "rollup_table", None)
+    monkeypatch.setattr(lf, "store", storage.DynamoFeedbackStore(table, lf.TABLE_NAME))
+    monkeypatch.setattr(lf, "bedrock", ThrottlingBedrock(every=10))
+    monkeypatch.setattr(lf, "comprehend", LocalComprehend())
+    monkeypatch.setattr(lf, "AI_PROVIDER", "bedrock")
+    monkeypatch.setattr(lf, "MODEL_PROVIDER", "bedrock")
+    monkeypatch.setattr(lf, "BEDROCK_FAILOVER", True)
+    monkeypatch.setattr(lf, "ai_result_cache", ai_cache.AIResultCache(None, max_entries=0))
+    monkeypatch.setattr(lf, "bedrock_health", provider_health.ProviderHealth(
+        provider_health.ConcurrencyLimiter(initial=8),
+        provider_health.CircuitBreaker("bedrock", failure_threshold=2, open_seconds=60),
+    ))
+    monkeypatch.setattr(backfill.time, "sleep", lambda s: None)
+    return table
+
+
+def test_backfill_throttles_reach_its_limiter_not_the_failover(backend):
+    report = lf.run_backfill("pending", "t1", MemoryCheckpoints(), segments=2,
+                             concurrency=4, rate=500, max_rate=500)
+    assert report["complete"] and report["failed"] == 0
+    assert report["throttles"] > 0 and report["retries"] > 0
+    assert report["written"] == len(backend.items)
+    assert {i.get("aiProvider") for i in backend.items.values()} == {"bedrock"}
+    assert lf.comprehend.calls == {}
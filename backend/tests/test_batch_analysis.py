@@ -0,0 +1,165 @@
+import io
+import json
+
+import boto3
+import pytest
+from botocore.response import StreamingBody
+from botocore.stub import Stubber
+
+import ai_cache
+import batch_analysis
+import lambda_function as lf
+import provider_health
+import storage
+from bench.local_aws import LocalDynamoDB
+
+
+def _normalize(entry: dict) -> dict:
+    return {"sentiment": entry["sentiment"], "summary": entry["summary"]}
+
+
+def _answer(sentiment: str = "positive", summary: str = "Strong delivery.") -> dict:
+    return {"sentiment": sentiment, "summary": summary, "topics": ["delivery"]}
+
+
+# ── pack_batches ─────────────────────────────────────────────────────────────
+
+def _records(*lengths: int) -> list:
+    return [{"feedbackId": f"id{i}", "message": "x" * n} for i, n in enumerate(lengths)]
+
+
+def test_pack_batches_closes_on_item_count():
+    batches = batch_analysis.pack_batches(_records(*[40] * 5), max_items=2, max_input_tokens=10_000)
+    assert [len(b) for b in batches] == [2, 2, 1]
+
+
+def test_pack_batches_closes_on_token_budget_and_isolates_oversized():
+    # 400 chars ≈ 101 + 12 framing tokens; 4000 chars alone exceeds the budget.
+    batches = batch_analysis.pack_batches(_records(400, 400, 4000, 400), max_items=8, max_input_tokens=250)
+    assert [[r["feedbackId"] for r in b] for b in batches] == [["id0", "id1"], ["id2"], ["id3"]]
+
+
+def test_pack_batches_keeps_arrival_order():
+    records = _records(10, 20, 30)
+    assert [r for b in batch_analysis.pack_batches(records, 8, 10_000) for r in b] == records
+
+
+# ── parse_keyed_results ──────────────────────────────────────────────────────
+
+LABELS = {"f1": "a", "f2": "b", "f3": "c"}
+
+
+def test_parse_keyed_results_maps_ids():
+    raw = json.dumps([{"id": "f1", **_answer()}, {"id": "f2", **_answer("negative", "Late.")}])
+    assert batch_analysis.parse_keyed_results(raw, LABELS, _normalize) == {
+        "f1": {"sentiment": "positive", "summary": "Strong delivery."},
+        "f2": {"sentiment": "negative", "summary": "Late."},
+    }
+
+
+def test_parse_keyed_results_drops_missing_extra_and_duplicate_ids():
+    raw = json.dumps([
+        {"id": "f1", **_answer()},
+        {"id": "f1", **_answer("negative", "second answer for f1")},
+        {"id": "f9", **_answer()},                 # not in this batch
+        {**_answer()},                             # no id at all
+    ])
+    parsed = batch_analysis.parse_keyed_results(raw, LABELS, _normalize)
+    assert parsed == {"f1": {"sentiment": "positive", "summary": "Strong delivery."}}   # f2, f3 missing
+
+
+def test_parse_keyed_results_drops_malformed_entries():
+    raw = json.dumps([
+        {"id": "f1", "sentiment": "positive"},     # no summary
+        {"id": "f2", "sentiment": "", "summary": "x"},
+        "f3",
+        {"id": "f3", **_answer()},
+    ])
+    assert set(batch_analysis.parse_keyed_results(raw, LABELS, _normalize)) == {"f3"}
+
+
+def test_parse_keyed_results_accepts_fenced_array_and_keyed_object():
+    fenced = "Here you go:\n```json\n" + json.dumps([{"id": "f2", **_answer()}]) + "\n```"
+    assert set(batch_analysis.parse_keyed_results(fenced, LABELS, _normalize)) == {"f2"}
+    keyed = json.dumps({"f1": _answer(), "f3": _answer()})
+    assert set(batch_analysis.parse_keyed_results(keyed, LABELS, _normalize)) == {"f1", "f3"}
+
+
+@pytest.mark.parametrize("raw", ["", "not json", "{\"f1\": 3}", "[1, 2", "42"])
+def test_parse_keyed_results_unparseable_is_empty(raw):
+    assert batch_analysis.parse_keyed_results(raw, LABELS, _normalize) == {}
+
+
+# ── handle_batch_analysis with a stubbed bedrock-runtime client ──────────────
+
+def _claude_reply(payload) -> dict:
+    data = json.dumps({
+        "content": [{"type": "text", "text": json.dumps(payload)}],
+        "stop_reason": "end_turn", "usage": {"input_tokens": 100, "output_tokens": 40},
+    }).encode("utf-8")
+    return {"body": StreamingBody(io.BytesIO(data), len(data)), "contentType": "application/json"}
+
+
+@pytest.fixture
+def bedrock(monkeypatch):
+    table = LocalDynamoDB().Table(lf.TABLE_NAME)
+    table.load([{"feedbackId": fid, "message": f"message {fid}", "timestamp": "2026-10-01T00:00:00+00:00",
+                 "aiProcessed": False} for fid in ("a", "b", "c")])
+    client = boto3.client("bedrock-runtime", region_name="ca-central-1",
+                          aws_access_key_id="test", aws_secret_access_key="test")
+    monkeypatch.setattr(lf, "table", table)
+    monkeypatch.setattr(lf, "rollup_table", None)
+    monkeypatch.setattr(lf, "store", storage.DynamoFeedbackStore(table, lf.TABLE_NAME))
+    monkeypatch.setattr(lf, "bedrock", client)
+    monkeypatch.setattr(lf, "AI_PROVIDER", "bedrock")
+    monkeypatch.setattr(lf, "MODEL_PROVIDER", "bedrock")
+    monkeypatch.setattr(lf, "BEDROCK_STREAMING", False)
+    monkeypatch.setattr(lf, "BEDROCK_BATCH_SIZE", 8)
+    monkeypatch.setattr(lf, "ai_result_cache", ai_cache.AIResultCache(None, max_entries=0))
+    monkeypatch.setattr(lf, "bedrock_health", provider_health.ProviderHealth(
+        provider_health.ConcurrencyLimiter(initial=8),
+        provider_health.CircuitBreaker("bedrock", failure_threshold=5, open_seconds=30),
+    ))
+    with Stubber(client) as stubber:
+        yield stubber, table
+        stubber.assert_no_pending_responses()
+
+
+def _records_for(table) -> list:
+    return [{k: table.items[fid][k] for k in ("feedbackId", "message", "timestamp")} for fid in ("a", "b", "c")]
+
+
+def test_failed_batch_is_retried_item_by_item(bedrock):
+    stubber, table = bedrock
+    stubber.add_client_error("invoke_model", "ValidationException", "Input is too long")
+    for _ in range(3):
+        stubber.add_response("invoke_model", _claude_reply(_answer()))
+
+    assert lf.handle_batch_analysis(_records_for(table)) == []
+    assert all(table.items[fid]["aiProcessed"] for fid in ("a", "b", "c"))
+    assert {table.items[fid]["sentiment"] for fid in ("a", "b", "c")} == {"positive"}
+
+
+def test_items_the_batch_left_out_are_retried_alone(bedrock):
+    stubber, table = bedrock
+    stubber.add_response("invoke_model", _claude_reply([
+        {"id": "f1", **_answer("negative", "Missed deadlines.")},
+        {"id": "f2", "sentiment": "neutral"},      # malformed: no summary
+    ]))                                            # f3 omitted
+    stubber.add_response("invoke_model", _claude_reply(_answer()))
+    stubber.add_response("invoke_model", _claude_reply(_answer("neutral", "Steady.")))
+
+    assert lf.handle_batch_analysis(_records_for(table)) == []
+    assert [table.items[fid]["summary"] for fid in ("a", "b", "c")] == \
+        ["Missed deadlines.", "Strong delivery.", "Steady."]
+
+
+def test_sqs_bodies_that_are_not_objects_are_dropped(bedrock):
+    stubber, table = bedrock
+    stubber.add_response("invoke_model", _claude_reply(_answer()))
+    valid = {"detail": {"feedbackId": "a", "message": "message a", "timestamp": "2026-10-01T00:00:00+00:00"}}
+    bodies = ["[1, 2]", '"text"', "7", "null", json.dumps({"detail": ["a"]}), "{oops", json.dumps(valid)]
+    records = [{"messageId": f"m{i}", "eventSource": "aws:sqs", "body": body} for i, body in enumerate(bodies)]
+
+    assert lf.handle_sqs_analysis(records) == {"batchItemFailures": []}
+    assert table.items["a"]["aiProcessed"]
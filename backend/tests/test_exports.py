@@ -0,0 +1,53 @@
+import exports
+from bench.local_aws import LocalS3
+
+MONTH = "2026-10"
+
+
+def _row(n: int, analysed: str = "2026-10-02T00:00:00+00:00", summary: str = "first") -> dict:
+    return {"feedbackId": f"f{n:04d}", "timestamp": f"{MONTH}-01T00:00:{n % 60:02d}+00:00",
+            "sentiment": "positive", "summary": summary, "aiAnalyzedAt": analysed}
+
+
+def _put_part(s3: LocalS3, name: str, rows: list) -> None:
+    s3.put_object(Bucket="b", Key=f"{exports.ndjson_prefix(MONTH)}part-{name}.ndjson.gz",
+                  Body=exports.encode_ndjson(rows))
+
+
+def _keys(s3: LocalS3, prefix: str) -> list:
+    return exports.list_keys(s3, "b", prefix)
+
+
+def test_compaction_stops_at_deadline_and_resumes():
+    s3 = LocalS3()
+    for p in range(6):
+        _put_part(s3, f"p{p}", [_row(p * 10 + i) for i in range(10)])
+
+    calls = iter([False, True])   # time for one file only
+    first = exports.compact_partition(s3, "b", MONTH, rows_per_file=20, workers=2, fmt="ndjson",
+                                      deadline=lambda: next(calls))
+    assert (first["files"], first["parts"], first["remaining"]) == (1, 2, 4)
+    assert len(_keys(s3, exports.ndjson_prefix(MONTH))) == 4
+
+    second = exports.compact_partition(s3, "b", MONTH, rows_per_file=20, workers=2, fmt="ndjson")
+    assert (second["files"], second["parts"], second["remaining"]) == (2, 4, 0)
+    assert _keys(s3, exports.ndjson_prefix(MONTH)) == []
+    assert len(exports.read_partition(s3, "b", MONTH)) == 60
+
+
+def test_compaction_leaves_earlier_files_alone():
+    s3 = LocalS3()
+    _put_part(s3, "old", [_row(1), _row(2)])
+    exports.compact_partition(s3, "b", MONTH, fmt="ndjson")
+    [earlier] = _keys(s3, exports.compacted_prefix(MONTH))
+    before = s3.objects["b"][earlier]
+
+    _put_part(s3, "new", [_row(2, analysed="2026-10-05T00:00:00+00:00", summary="reanalysed")])
+    s3.calls.clear()
+    stats = exports.compact_partition(s3, "b", MONTH, fmt="ndjson")
+    assert (stats["parts"], stats["rows"]) == (1, 1)
+    assert s3.calls["GetObject"] == 1   # only the new part is read
+    assert s3.objects["b"][earlier] == before
+
+    rows = {r["feedbackId"]: r["summary"] for r in exports.read_partition(s3, "b", MONTH)}
+    assert rows == {"f0001": "first", "f0002": "reanalysed"}
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+import idempotency
+import lambda_function as lf
+import storage
+from bench import storage_bench
+from bench.local_aws import LocalDynamoDB
+
+BODY = {"name": "Dana", "email": "dana@example.com", "message": "Mentors the new hires.",
+        "employeeName": "Sam", "department": "Engineering", "reviewPeriod": "2026-H2", "rating": 5}
+
+
+class Clock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(params=storage.BACKENDS)
+def records(request, tmp_path, monkeypatch):
+    for name in ("table", "rollup_table", "store", "events", "bedrock", "comprehend"):
+        monkeypatch.setattr(lf, name, getattr(lf, name))
+    storage_bench._install(request.param, [], str(tmp_path / "feedback.db"))
+    table = LocalDynamoDB().Table("idempotency", "idempotencyKey")
+    monkeypatch.setattr(lf, "idempotency_store",
+                        idempotency.IdempotencyStore(table, lease_seconds=30, clock=Clock(1_800_000_000)))
+    return table
+
+
+def _post(raw_body: str, key: str = "k1"):
+    resp = lf.lambda_handler({"httpMethod": "POST", "path": "/feedback", "body": raw_body,
+                              "headers": {"Idempotency-Key": key}}, None)
+    return resp["statusCode"], json.loads(resp["body"]), resp["headers"]
+
+
+def test_retry_spelled_differently_is_replayed(records):
+    status, first, _ = _post(json.dumps(BODY))
+    assert status == 201
+
+    respelled = dict(reversed(list({**BODY, "rating": 5.0, "message": "  Mentors the new hires. "}.items())))
+    status, again, headers = _post(json.dumps(respelled, indent=2))
+    assert (status, again["feedbackId"]) == (201, first["feedbackId"])
+    assert headers["Idempotent-Replayed"] == "true"
+    assert len(lf.events.entries) == 1
+
+
+def test_different_submission_under_the_same_key_is_refused(records):
+    assert _post(json.dumps(BODY))[0] == 201
+    assert _post(json.dumps({**BODY, "rating": 4}))[0] == 422
+
+
+def _dead_claim(records, feedback_id: str) -> None:
+    item, _ = lf._feedback_item(dict(BODY))
+    now = int(lf.idempotency_store._clock())
+    records.put_item(Item={
+        "idempotencyKey": "key:k1", "requestHash": idempotency.request_hash(item, BODY["email"]),
+        "feedbackId": feedback_id, "state": idempotency.PENDING, "lease": "dead",
+        "leaseUntil": now - 1, "createdAt": now - 60, "expiresAt": now + 3600,
+    })
+
+
+def test_takeover_does_not_overwrite_what_the_dead_owner_wrote(records):
+    _dead_claim(records, "fixed-id")
+    written, _ = lf._feedback_item(dict(BODY))
+    lf.store.put({**written, "feedbackId": "fixed-id", "aiProcessed": True, "sentiment": "positive"})
+
+    status, body, _ = _post(json.dumps(BODY))
+    assert (status, body["feedbackId"]) == (201, "fixed-id")
+    stored = lf.store.get("fixed-id")
+    assert stored["aiProcessed"] is True and stored["sentiment"] == "positive"
+    assert lf.events.entries == []
+
+    status, body, headers = _post(json.dumps(BODY))
+    assert (status, body["feedbackId"], headers["Idempotent-Replayed"]) == (201, "fixed-id", "true")
+
+
+def test_takeover_writes_when_the_dead_owner_did_not(records):
+    _dead_claim(records, "fixed-id")
+    status, body, _ = _post(json.dumps(BODY))
+    assert (status, body["feedbackId"]) == (201, "fixed-id")
+    assert lf.store.get("fixed-id")["aiProcessed"] is False
+    assert len(lf.events.entries) == 1
@@ -0,0 +1,88 @@
+import threading
+
+import lambda_function as lf
+import storage
+from bench import storage_bench
+from insights_cache import InsightsCache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _blocking(body: str, started: threading.Event, release: threading.Event):
+    def compute() -> str:
+        started.set()
+        release.wait(5)
+        return body
+    return compute
+
+
+def test_refresh_started_before_invalidate_is_discarded():
+    clock = Clock()
+    cache = InsightsCache(ttl_seconds=10, swr_seconds=60, max_entries=8, clock=clock)
+    cache.get_or_compute("k", lambda: "v1")
+    clock.now = 20   # stale: the next read starts a background refresh
+
+    started, release = threading.Event(), threading.Event()
+    entry, status = cache.get_or_compute("k", _blocking("pre-write", started, release))
+    assert (entry.body, status) == ("v1", "STALE")
+    assert started.wait(5)
+    cache.invalidate()
+    release.set()
+    for thread in threading.enumerate():
+        if thread.name == "insights-refresh":
+            thread.join(5)
+
+    entry, status = cache.get_or_compute("k", lambda: "post-write")
+    assert (entry.body, status) == ("post-write", "MISS")
+
+
+def test_inline_miss_racing_invalidate_is_served_not_stored():
+    cache = InsightsCache(ttl_seconds=10, swr_seconds=0, max_entries=8, clock=Clock())
+    started, release = threading.Event(), threading.Event()
+    result = {}
+    reader = threading.Thread(target=lambda: result.update(
+        pair=cache.get_or_compute("k", _blocking("pre-write", started, release))))
+    reader.start()
+    assert started.wait(5)
+    cache.invalidate("k")
+    release.set()
+    reader.join(5)
+
+    assert result["pair"][0].body == "pre-write"
+    assert cache.get_or_compute("k", lambda: "post-write")[0].body == "post-write"
+
+
+def test_keyed_invalidate_leaves_other_keys_cached():
+    cache = InsightsCache(ttl_seconds=10, swr_seconds=0, max_entries=8, clock=Clock())
+    cache.get_or_compute("a", lambda: "a1")
+    cache.invalidate("b")
+    assert cache.get_or_compute("a", lambda: "a2")[0].body == "a1"
+
+
+def _insights(headers):
+    return lf.lambda_handler({"httpMethod": "GET", "path": "/insights", "headers": headers,
+                              "queryStringParameters": None}, None)
+
+
+def test_compressed_etag_revalidates(tmp_path, monkeypatch):
+    for name in ("table", "rollup_table", "store", "events", "bedrock", "comprehend"):
+        monkeypatch.setattr(lf, name, getattr(lf, name))
+    monkeypatch.setattr(lf, "COMPRESS_MIN_BYTES", 0)
+    monkeypatch.setattr(lf, "insights_cache", InsightsCache(60, 0, 8))
+    storage_bench._install(storage.SQLITE, storage_bench._seed_items(50), str(tmp_path / "f.db"))
+
+    first = _insights({"Accept-Encoding": "gzip"})
+    etag = first["headers"]["ETag"]
+    assert first["statusCode"] == 200 and etag.startswith('W/"')
+
+    again = _insights({"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert again["statusCode"] == 304 and again["headers"]["ETag"] == etag
+
+    plain = _insights({"If-None-Match": etag})
+    assert plain["statusCode"] == 304 and plain["headers"]["ETag"] == etag[2:]
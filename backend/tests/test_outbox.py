@@ -0,0 +1,80 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import ai_cache
+import lambda_function as lf
+import outbox
+import storage
+from bench.local_aws import LocalBedrock, LocalDynamoDB, LocalEventBridge
+
+SUBMITTED = datetime(2026, 10, 1, 9, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def table(monkeypatch):
+    table = LocalDynamoDB().Table(lf.TABLE_NAME)
+    table.add_index(outbox.OUTBOX_INDEX, outbox.OUTBOX_ATTR, outbox.DUE_ATTR)
+    table.load([{"feedbackId": fid, "message": f"Mentors juniors and ships on time ({fid}).",
+                 "timestamp": SUBMITTED.isoformat(), "aiProcessed": False,
+                 **outbox.marker(SUBMITTED.isoformat())} for fid in ("a", "b")])
+    monkeypatch.setattr(lf, "table", table)
+    monkeypatch.setattr(lf, "rollup_table", None)
+    monkeypatch.setattr(lf, "store", storage.DynamoFeedbackStore(table, lf.TABLE_NAME))
+    monkeypatch.setattr(lf, "events", LocalEventBridge())
+    monkeypatch.setattr(lf, "bedrock", LocalBedrock())
+    monkeypatch.setattr(lf, "AI_PROVIDER", "bedrock")
+    monkeypatch.setattr(lf, "MODEL_PROVIDER", "bedrock")
+    monkeypatch.setattr(lf, "BEDROCK_FAILOVER", False)
+    monkeypatch.setattr(lf, "ai_result_cache", ai_cache.AIResultCache(None, max_entries=0))
+    return table
+
+
+def _sweep(table, now):
+    make_entry = lambda it: lf._feedback_event(it["feedbackId"], it.get("message", ""), it.get("timestamp", ""))
+    return outbox.sweep(table, lf.events, make_entry, grace_seconds=120, now=now)
+
+
+def _event(fid, table):
+    item = table.items[fid]
+    return {"feedbackId": fid, "message": item["message"], "timestamp": item["timestamp"]}
+
+
+def test_sweep_leaves_a_leased_analysis_alone(table):
+    started = SUBMITTED + timedelta(minutes=5)
+    assert outbox.lease(table, "a", started, lease_seconds=60)
+
+    stats = _sweep(table, started + timedelta(seconds=30))
+    assert (stats["in_flight"], stats["claimed"]) == (1, 1)
+    assert [json.loads(e["Detail"])["feedbackId"] for e in lf.events.entries] == ["b"]
+
+    stats = _sweep(table, started + timedelta(seconds=90))   # lease lapsed: the consumer died
+    assert (stats["in_flight"], stats["claimed"]) == (0, 1)
+    assert [json.loads(e["Detail"])["feedbackId"] for e in lf.events.entries] == ["b", "a"]
+
+
+def test_second_lease_is_refused_until_the_first_lapses(table):
+    now = datetime.now(timezone.utc)
+    assert outbox.lease(table, "a", now, lease_seconds=60)
+    assert not outbox.lease(table, "a", now + timedelta(seconds=30), lease_seconds=60)
+    assert outbox.lease(table, "a", now + timedelta(seconds=61), lease_seconds=60)
+
+
+def test_duplicate_of_an_in_flight_analysis_skips_the_model(table):
+    assert outbox.lease(table, "a", datetime.now(timezone.utc), lease_seconds=60)
+    lf.handle_async_analysis(_event("a", table))
+    assert lf.bedrock.calls == 0
+    assert table.items["a"]["aiProcessed"] is False
+
+    lf.handle_async_analysis(_event("b", table))
+    assert lf.bedrock.calls == 1
+    assert table.items["b"]["aiProcessed"] is True
+    assert not set(outbox.CLEAR_ATTRS) & set(table.items["b"])
+
+
+def test_batch_skips_records_another_consumer_holds(table):
+    assert outbox.lease(table, "a", datetime.now(timezone.utc), lease_seconds=60)
+    assert lf.handle_batch_analysis([_event("a", table), _event("b", table)]) == []
+    assert table.items["a"]["aiProcessed"] is False
+    assert table.items["b"]["aiProcessed"] is True
@@ -0,0 +1,65 @@
+import threading
+
+import provider_health
+from provider_health import CLOSED, HALF_OPEN, OPEN, BREAKER_OPEN, SHED
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _health(clock: Clock) -> provider_health.ProviderHealth:
+    return provider_health.ProviderHealth(
+        provider_health.ConcurrencyLimiter(initial=1, min_limit=1, max_limit=1),
+        provider_health.CircuitBreaker("bedrock", failure_threshold=1, open_seconds=30, clock=clock),
+        max_wait_s=0.01,
+    )
+
+
+def _trip(health: provider_health.ProviderHealth, clock: Clock) -> None:
+    health.breaker.record_failure()
+    assert health.breaker.state == OPEN
+    clock.now += 31
+
+
+def test_shed_probe_is_handed_back():
+    clock = Clock()
+    health = _health(clock)
+    _trip(health, clock)
+
+    # The one slot is held (a no-fallback caller) while the half-open probe arrives.
+    held = health.limiter.acquire()
+    assert health.call(lambda: "bedrock", lambda: "fb") == ("fb", SHED)
+    assert health.breaker.state == HALF_OPEN
+    health.limiter.release(held, overloaded=False)
+
+    # The next call gets the probe, reaches the provider and closes the breaker.
+    assert health.call(lambda: "bedrock", lambda: "fb") == ("bedrock", None)
+    assert health.breaker.state == CLOSED
+
+
+def test_half_open_admits_one_probe_at_a_time():
+    clock = Clock()
+    health = _health(clock)
+    _trip(health, clock)
+    assert health.breaker.allow() is True
+    assert health.breaker.allow() is False
+    assert health.call(lambda: "bedrock", lambda: "fb") == ("fb", BREAKER_OPEN)
+
+
+def test_release_probe_only_frees_own_probe():
+    clock = Clock()
+    breaker = provider_health.CircuitBreaker("bedrock", failure_threshold=1, open_seconds=30, clock=clock)
+    breaker.record_failure()
+    clock.now += 31
+    assert breaker.allow() is True
+    other = threading.Thread(target=breaker.release_probe)
+    other.start()
+    other.join()
+    assert breaker.allow() is False
+    breaker.release_probe()
+    assert breaker.allow() is True
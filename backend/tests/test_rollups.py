@@ -0,0 +1,63 @@
+from decimal import Decimal
+
+from boto3.dynamodb.types import TypeSerializer
+
+import rollups
+from bench.local_aws import LocalDynamoDB
+
+_serializer = TypeSerializer()
+
+
+def _image(item: dict) -> dict:
+    return {k: _serializer.serialize(Decimal(v) if isinstance(v, int) and not isinstance(v, bool) else v)
+            for k, v in item.items()}
+
+
+def _record(seq: int, old: dict = None, new: dict = None) -> dict:
+    data = {"SequenceNumber": str(seq)}
+    if old:
+        data["OldImage"] = _image(old)
+    if new:
+        data["NewImage"] = _image(new)
+    return {"eventID": f"e{seq}", "eventSource": "aws:dynamodb", "dynamodb": data}
+
+
+def _feedback(topics: list) -> dict:
+    return {"feedbackId": "f1", "timestamp": "2026-10-01T00:00:00+00:00", "sentiment": "positive",
+            "topics": topics}
+
+
+def _topic_counts(table) -> dict:
+    return {attr[len(rollups.TOPIC_PREFIX):]: int(n) for item in table.items.values()
+            for attr, n in item.items() if attr.startswith(rollups.TOPIC_PREFIX)}
+
+
+def test_counters_that_reach_zero_are_removed():
+    table = LocalDynamoDB().Table("rollups", "rollupId")
+    first = _feedback(["mentoring", "delivery"])
+    rollups.process_stream_batch(table, [_record(1, new=first)], normalize=str)
+    assert _topic_counts(table) == {"mentoring": 1, "delivery": 1}
+
+    stats = rollups.process_stream_batch(table, [_record(2, old=first, new=_feedback(["delivery"]))],
+                                         normalize=str)
+    assert stats["topicsRemoved"] == 1
+    assert _topic_counts(table) == {"delivery": 1}
+
+
+def test_retried_batch_is_not_counted_twice():
+    table = LocalDynamoDB().Table("rollups", "rollupId")
+    batch = [_record(1, new=_feedback(["mentoring"]))]
+    rollups.process_stream_batch(table, batch, normalize=str)
+    rollups.process_stream_batch(table, batch, normalize=str)
+    assert _topic_counts(table) == {"mentoring": 1}
+
+
+def test_prune_caps_each_shard_at_its_largest_counters():
+    table = LocalDynamoDB().Table("rollups", "rollupId")
+    shard = "topics#03"
+    table.put_item(Item={"rollupId": shard, **{f"t:topic{n:03d}": n for n in range(1, 121)},
+                         "t:gone": 0})
+    stats = rollups.prune_topic_shards(table, keep=50)
+    assert stats["removed"] == 71 and stats["raced"] == 0
+    kept = _topic_counts(table)
+    assert len(kept) == 50 and min(kept.values()) == 71 and "gone" not in kept
@@ -0,0 +1,110 @@
+from collections import Counter
+
+import pytest
+
+import insights_query
+import lambda_function as lf
+import storage
+from bench import storage_bench
+
+ITEMS = storage_bench._seed_items(400)
+
+FILTERS = [
+    {"department": "Engineering"},
+    {"reviewPeriod": "2026-H1"},
+    {"from": "2026-01-01", "to": "2026-03-31"},
+    {"department": "Sales", "from": "2025-06-01"},
+]
+
+
+@pytest.fixture(params=storage.BACKENDS)
+def backend(request, tmp_path, monkeypatch):
+    for name in ("table", "rollup_table", "store", "events", "bedrock", "comprehend"):
+        monkeypatch.setattr(lf, name, getattr(lf, name))
+    storage_bench._install(request.param, ITEMS, str(tmp_path / "feedback.db"))
+    yield request.param
+    lf.insights_cache.invalidate()
+
+
+def _matching(params):
+    f = insights_query.parse_filters(params)
+    return [it for it in ITEMS
+            if (not f.department or it.get("department") == f.department)
+            and (not f.review_period or it.get("reviewPeriod") == f.review_period)
+            and (not f.from_ts or it["timestamp"] >= f.from_ts)
+            and (not f.to_ts or it["timestamp"] <= f.to_ts)]
+
+
+def _item(feedback_id, **extra):
+    return {"feedbackId": feedback_id, "timestamp": "2026-10-01T09:00:00+00:00",
+            "department": "Engineering", "reviewPeriod": "2026-H2", "message": "Ships on time.",
+            "aiProcessed": False, **extra}
+
+
+def test_put_then_get(backend):
+    lf.store.put(_item("put-1"))
+    assert lf.store.get("put-1")["message"] == "Ships on time."
+    assert lf.store.get("missing") is None
+
+
+def test_put_many_writes_every_item(backend):
+    assert lf.store.put_many([_item(f"bulk-{i}") for i in range(30)]) == []
+    assert all(lf.store.get(f"bulk-{i}") for i in range(30))
+
+
+def test_update_sets_and_removes(backend):
+    lf.store.put(_item("upd-1", analysisError="timeout"))
+    assert lf.store.update("upd-1", {"aiProcessed": True, "sentiment": "positive"},
+                           remove=["analysisError"])
+    stored = lf.store.get("upd-1")
+    assert stored["aiProcessed"] is True and stored["sentiment"] == "positive"
+    assert "analysisError" not in stored
+
+
+def test_update_skips_an_older_analysis(backend):
+    lf.store.put(_item("upd-2", aiProcessed=True, sentiment="negative",
+                       aiAnalyzedAt="2026-10-02T00:00:00+00:00"))
+    assert not lf.store.update("upd-2", {"sentiment": "positive",
+                                         "aiAnalyzedAt": "2026-10-01T00:00:00+00:00"},
+                               not_after="2026-10-01T00:00:00+00:00")
+    assert lf.store.get("upd-2")["sentiment"] == "negative"
+
+    assert lf.store.update("upd-2", {"sentiment": "positive",
+                                     "aiAnalyzedAt": "2026-10-03T00:00:00+00:00"},
+                           not_after="2026-10-03T00:00:00+00:00")
+    assert lf.store.get("upd-2")["sentiment"] == "positive"
+
+
+def test_update_with_condition_on_unanalysed_item(backend):
+    lf.store.put(_item("upd-3"))
+    assert lf.store.update("upd-3", {"sentiment": "neutral",
+                                     "aiAnalyzedAt": "2026-10-01T00:00:00+00:00"},
+                           not_after="2026-10-01T00:00:00+00:00")
+    assert lf.store.get("upd-3")["sentiment"] == "neutral"
+
+
+@pytest.mark.parametrize("params", FILTERS, ids=lambda p: "&".join(f"{k}={v}" for k, v in p.items()))
+def test_filtered_insights(backend, params):
+    expected = _matching(params)
+    status, payload = storage_bench._get("/insights", params)
+    assert status == 200
+    assert payload["totalSubmissions"] == len(expected)
+
+    sentiments = Counter(it.get("sentiment") or "neutral" for it in expected)
+    assert payload["sentimentCounts"] == {s: sentiments[s] for s in ("positive", "negative", "neutral")}
+
+    topics = Counter(lf.topic_normalizer(t) for it in expected for t in it.get("topics") or [])
+    assert payload["topTopics"]
+    assert {t["topic"]: t["count"] for t in payload["topTopics"]} == \
+        {t["topic"]: topics[t["topic"]] for t in payload["topTopics"]}
+    assert payload["topTopics"][0]["count"] == max(topics.values())
+
+
+def test_topic_totals(backend):
+    status, payload = storage_bench._get("/insights", None)
+    assert status == 200
+    assert payload["totalSubmissions"] == len(ITEMS)
+    topics = Counter(lf.topic_normalizer(t) for it in ITEMS for t in it.get("topics") or [])
+    ranked = sorted(payload["topTopics"], key=lambda t: (-t["count"], t["topic"]))
+    assert [t["count"] for t in ranked] == sorted(topics.values(), reverse=True)[:len(ranked)]
+    assert all(topics[t["topic"]] == t["count"] for t in ranked)
@@ -0,0 +1,231 @@
+"""
+Smart Talent Insight Hub — Topic Normalisation & Top-k Sketch
+One canonical label per topic, and bounded-memory topic counting for /insights.
+
+  TopicNormalizer   raw model/Comprehend topic → canonical label:
+                      case folding, punctuation → space ("problem-solving" ==
+                      "problem solving"), whitespace collapsed, plural tokens
+                      singularised ("skills" → "skill"), then a synonym map
+                      (DEFAULT_SYNONYMS, extended by TOPIC_SYNONYMS) picks the
+                      display label. Memoised per distinct raw string (bounded
+                      LRU), so aggregation pays once per spelling, not per item.
+  SpaceSaving       heavy-hitters sketch (Metwally, Agrawal & El Abbadi 2005)
+                      holding at most `capacity` counters, whatever the number
+                      of distinct topics.
+
+Space-Saving error bounds (N = total weight added, k = capacity):
+  • every estimate overcounts, never undercounts: true ∈ [count - error, count],
+    with `error` tracked per counter;
+  • on a single stream error ≤ N/k, and any topic whose true count exceeds N/k
+    is guaranteed to hold a counter;
+  • merge() adds counts, and a topic missing from a full sketch is charged that
+    sketch's floor (its smallest counter, ≤ N/k). Merging two stream sketches
+    therefore keeps error ≤ (N₁ + N₂)/k. Chained merges can loosen that bound,
+    but error(topic) always reports the exact bound of a counter;
+  • while the number of distinct topics stays ≤ k the sketch is exact
+    (error 0). Normalised topic vocabularies are usually far below the
+    default capacity, so top-10 and word-cloud weights match an exact count.
+"""
+
+import heapq
+import json
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+DEFAULT_CAPACITY   = 1000
+DEFAULT_CACHE_SIZE = 4096
+MAX_TOPIC_CHARS    = 80
+
+# variant (any spelling; normalised on load) → canonical display label
+DEFAULT_SYNONYMS: Dict[str, str] = {
+    "communication":            "communication skills",
+    "communication skills":     "communication skills",
+    "communications":           "communication skills",
+    "verbal communication":     "communication skills",
+    "written communication":    "communication skills",
+    "technical skills":         "technical expertise",
+    "technical ability":        "technical expertise",
+    "technical knowledge":      "technical expertise",
+    "technical":                "technical expertise",
+    "problem solving":          "problem-solving",
+    "problem solving skills":   "problem-solving",
+    "troubleshooting":          "problem-solving",
+    "teamwork":                 "collaboration",
+    "team work":                "collaboration",
+    "team player":              "collaboration",
+    "leadership skills":        "leadership",
+    "mentorship":               "mentoring",
+    "coaching":                 "mentoring",
+    "punctuality":              "time management",
+    "meeting deadlines":        "time management",
+    "attention to details":     "attention to detail",
+    "detail orientation":       "attention to detail",
+    "detail oriented":          "attention to detail",
+    "customer service":         "customer focus",
+    "client focus":             "customer focus",
+    "code reviews":             "code quality",
+}
+
+_NON_WORD = re.compile(r"[^a-z0-9+#]+")
+# plurals left alone: -ss (process), -us (status), -is (analysis), -ics (analytics)
+_KEEP_S   = ("ss", "us", "is", "ics")
+
+
+def _lemma(token: str) -> str:
+    """Light plural → singular; deliberately conservative (no stemming)."""
+    if len(token) <= 3 or not token.endswith("s") or token.endswith(_KEEP_S):
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith(("ches", "shes", "xes", "sses")):
+        return token[:-2]
+    return token[:-1]
+
+
+def topic_key(raw: str) -> str:
+    """Matching key: folded, punctuation-free, single-spaced, singularised."""
+    cleaned = _NON_WORD.sub(" ", raw.casefold()[:MAX_TOPIC_CHARS])
+    return " ".join(_lemma(t) for t in cleaned.split())
+
+
+def parse_synonyms(raw: str) -> Dict[str, str]:
+    """TOPIC_SYNONYMS env value: a JSON object {"variant": "canonical label"}."""
+    if not raw.strip():
+        return {}
+    mapping = json.loads(raw)
+    if not isinstance(mapping, dict):
+        raise ValueError("TOPIC_SYNONYMS must be a JSON object of variant → label")
+    return {str(k): str(v) for k, v in mapping.items()}
+
+
+class TopicNormalizer:
+    """Callable raw topic → canonical label ("" for blank / punctuation-only input)."""
+
+    def __init__(self, synonyms: Optional[Mapping[str, str]] = None,
+                 cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        merged = dict(DEFAULT_SYNONYMS)
+        merged.update(synonyms or {})
+        # Canonical labels map to themselves, so a label is a fixed point.
+        self.synonyms: Dict[str, str] = {}
+        for label in merged.values():
+            self.synonyms[topic_key(label)] = label.strip().casefold()
+        for variant, label in merged.items():
+            self.synonyms[topic_key(variant)] = label.strip().casefold()
+        self._cached = lru_cache(maxsize=cache_size)(self._normalize)
+
+    def _normalize(self, raw: str) -> str:
+        key = topic_key(raw)
+        return self.synonyms.get(key, key)
+
+    def __call__(self, raw: object) -> str:
+        if not raw:
+            return ""
+        return self._cached(raw if isinstance(raw, str) else str(raw))
+
+    def normalize_list(self, raw_topics: Iterable[object], limit: int = 10) -> List[str]:
+        """Normalise, drop blanks and duplicates (first occurrence wins), cap at `limit`."""
+        out: List[str] = []
+        for raw in raw_topics:
+            label = self(raw)
+            if label and label not in out:
+                out.append(label)
+                if len(out) >= limit:
+                    break
+        return out
+
+
+normalize_topic = TopicNormalizer()
+
+
+class SpaceSaving:
+    """Top-k counter in O(capacity) memory; see the module docstring for bounds."""
+
+    __slots__ = ("capacity", "total", "_counts", "_errors", "_heap")
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.total    = 0
+        self._counts: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._heap: List[Tuple[int, str]] = []   # lazy (count, item) min-heap
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def _min_entry(self) -> Tuple[int, str]:
+        heap, counts = self._heap, self._counts
+        while True:
+            count, item = heap[0]
+            if counts.get(item) == count:
+                return count, item
+            heapq.heappop(heap)   # stale: item was incremented or evicted
+
+    def _compact(self) -> None:
+        if len(self._heap) > 4 * self.capacity + 64:
+            self._heap = [(c, i) for i, c in self._counts.items()]
+            heapq.heapify(self._heap)
+
+    @property
+    def floor(self) -> int:
+        """Largest possible true count of a topic that holds no counter."""
+        if len(self._counts) < self.capacity:
+            return 0
+        return self._min_entry()[0]
+
+    def add(self, item: str, count: int = 1) -> None:
+        if count <= 0:
+            return
+        self.total += count
+        counts = self._counts
+        current = counts.get(item)
+        if current is not None:
+            counts[item] = current + count
+        elif len(counts) < self.capacity:
+            counts[item] = count
+            self._errors[item] = 0
+        else:
+            floor, victim = self._min_entry()
+            heapq.heappop(self._heap)
+            del counts[victim], self._errors[victim]
+            counts[item] = floor + count
+            self._errors[item] = floor
+        heapq.heappush(self._heap, (counts[item], item))
+        self._compact()
+
+    def update(self, counts: Mapping[str, int]) -> None:
+        for item, n in counts.items():
+            self.add(item, n)
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        floor_a, floor_b = self.floor, other.floor
+        merged: Dict[str, Tuple[int, int]] = {}
+        for item in self._counts.keys() | other._counts.keys():
+            a = self._counts.get(item)
+            b = other._counts.get(item)
+            merged[item] = (
+                (floor_a if a is None else a) + (floor_b if b is None else b),
+                (floor_a if a is None else self._errors[item])
+                + (floor_b if b is None else other._errors[item]),
+            )
+        keep = heapq.nlargest(self.capacity, merged.items(), key=lambda kv: kv[1][0])
+        self.total   += other.total
+        self._counts  = {item: c for item, (c, _) in keep}
+        self._errors  = {item: e for item, (_, e) in keep}
+        self._heap    = [(c, i) for i, c in self._counts.items()]
+        heapq.heapify(self._heap)
+        return self
+
+    def error(self, item: str) -> int:
+        """Maximum overcount of `item`'s estimate (floor if it holds no counter)."""
+        return self._errors.get(item, self.floor)
+
+    def top(self, n: int) -> List[Tuple[str, int]]:
+        """n largest (topic, estimated count), ties broken by topic for stable output."""
+        return heapq.nsmallest(n, self._counts.items(), key=lambda kv: (-kv[1], kv[0]))
+
+    def counter(self) -> Counter:
+        return Counter(self._counts)
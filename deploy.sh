@@ -100,8 +100,8 @@ python3.12 -m pip install \
     --upgrade \
     --quiet
 
-info "Copying Lambda handler..."
-cp "$BACKEND_DIR/lambda_function.py" "$PACKAGE_DIR/lambda_function.py"
+info "Copying Lambda handler modules..."
+cp "$BACKEND_DIR"/*.py "$PACKAGE_DIR/"
 
 log "Backend package ready ($(du -sh $PACKAGE_DIR | cut -f1))"
 
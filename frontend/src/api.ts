@@ -58,7 +58,13 @@ export interface InsightsResponse {
     negative: number;
     neutral: number;
   }>;
-  topics: string[];
+  // view=full: flat topic list; view=compact: top topics pre-weighted for the word cloud
+  topics: string[] | TopicWeight[];
+}
+
+export interface TopicWeight {
+  topic: string;
+  weight: number;  // count / max count, 0..1
 }
 
 export async function submitFeedback(payload: FeedbackPayload) {
@@ -67,7 +73,7 @@ export async function submitFeedback(payload: FeedbackPayload) {
 }
 
 export async function fetchInsights(): Promise<InsightsResponse> {
-  const res = await api.get(`/insights`);
+  const res = await api.get(`/insights`, { params: { view: "compact" } });
   return res.data;
 }
 
@@ -235,7 +235,11 @@ const InsightsPage: React.FC = () => {
 
   const topicFreq = useMemo(() => {
     const freq: Record<string, number> = {};
-    topics.forEach(t => { const k = t.toLowerCase(); freq[k] = (freq[k] || 0) + 1; });
+    topics.forEach(t => {
+      // compact view: server-side weights; full view: count the raw list
+      if (typeof t === "string") { const k = t.toLowerCase(); freq[k] = (freq[k] || 0) + 1; }
+      else freq[t.topic] = t.weight;
+    });
     return Object.entries(freq).sort((a, b) => b[1] - a[1]);
   }, [topics]);
   const maxFreq = topicFreq[0]?.[1] || 1;
@@ -134,6 +134,7 @@ data "aws_iam_policy_document" "lambda_policy" {
     effect  = "Allow"
     actions = [
       "dynamodb:PutItem",
+      "dynamodb:BatchWriteItem",
       "dynamodb:UpdateItem",
       "dynamodb:Scan",
       "dynamodb:GetItem",
@@ -144,25 +145,96 @@ data "aws_iam_policy_document" "lambda_policy" {
 
   statement {
     effect    = "Allow"
-    actions   = ["bedrock:InvokeModel"]
+    actions   = ["dynamodb:Query"]
+    resources = ["${aws_dynamodb_table.feedback_table.arn}/index/*"]
+  }
+
+  statement {
+    effect  = "Allow"
+    actions = [
+      "dynamodb:GetItem",
+      "dynamodb:BatchGetItem",
+      "dynamodb:PutItem",
+      "dynamodb:UpdateItem",
+      "dynamodb:DeleteItem",
+      "dynamodb:BatchWriteItem",
+      "dynamodb:Scan",
+    ]
+    resources = [aws_dynamodb_table.insights_rollups.arn]
+  }
+
+  statement {
+    effect    = "Allow"
+    actions   = ["dynamodb:GetItem", "dynamodb:PutItem"]
+    resources = [aws_dynamodb_table.ai_result_cache.arn]
+  }
+
+  statement {
+    effect    = "Allow"
+    actions   = ["dynamodb:GetItem", "dynamodb:PutItem", "dynamodb:UpdateItem", "dynamodb:DeleteItem"]
+    resources = [aws_dynamodb_table.idempotency.arn]
+  }
+
+  statement {
+    effect    = "Allow"
+    actions   = ["dynamodb:GetItem", "dynamodb:PutItem", "dynamodb:UpdateItem"]
+    resources = [aws_dynamodb_table.provider_health.arn]
+  }
+
+  statement {
+    effect  = "Allow"
+    actions = [
+      "dynamodb:DescribeStream",
+      "dynamodb:GetRecords",
+      "dynamodb:GetShardIterator",
+      "dynamodb:ListStreams",
+    ]
+    resources = [aws_dynamodb_table.feedback_table.stream_arn]
+  }
+
+  statement {
+    effect    = "Allow"
+    actions   = ["bedrock:InvokeModel", "bedrock:InvokeModelWithResponseStream"]
     resources = ["*"]
   }
 
+  dynamic "statement" {
+    for_each = var.analysis_queue_enabled ? [1] : []
+    content {
+      effect = "Allow"
+      actions = [
+        "sqs:ReceiveMessage",
+        "sqs:DeleteMessage",
+        "sqs:GetQueueAttributes",
+      ]
+      resources = [aws_sqs_queue.analysis[0].arn]
+    }
+  }
+
   statement {
     effect  = "Allow"
     actions = [
       "comprehend:DetectSentiment",
       "comprehend:DetectKeyPhrases",
+      "comprehend:BatchDetectSentiment",
+      "comprehend:BatchDetectKeyPhrases",
     ]
     resources = ["*"]
   }
 
   statement {
     effect    = "Allow"
-    actions   = ["s3:PutObject", "s3:GetObject"]
+    actions   = ["s3:PutObject", "s3:GetObject", "s3:DeleteObject"]
     resources = ["${aws_s3_bucket.export_bucket.arn}/*"]
   }
 
+  # Export compaction lists a month's partition before merging it.
+  statement {
+    effect    = "Allow"
+    actions   = ["s3:ListBucket"]
+    resources = [aws_s3_bucket.export_bucket.arn]
+  }
+
   statement {
     effect    = "Allow"
     actions   = ["events:PutEvents"]
@@ -204,8 +276,83 @@ resource "aws_dynamodb_table" "feedback_table" {
     type = "S"
   }
 
+  attribute {
+    name = "timestamp"
+    type = "S"
+  }
+
+  attribute {
+    name = "department"
+    type = "S"
+  }
+
+  attribute {
+    name = "reviewPeriod"
+    type = "S"
+  }
+
+  attribute {
+    name = "timeBucket"
+    type = "S"
+  }
+
+  attribute {
+    name = "reviewBucket"
+    type = "S"
+  }
+
+  attribute {
+    name = "outbox"
+    type = "S"
+  }
+
+  attribute {
+    name = "outboxAt"
+    type = "S"
+  }
+
+  # Filtered GET /insights (backend/insights_query.py). Sparse: items without
+  # the partition attribute are simply not indexed. Each index carries only
+  # the attributes the aggregation reads.
+  # Items written before timeBucket existed: invoke {"action": "index_time_buckets"} once.
+  dynamic "global_secondary_index" {
+    for_each = {
+      "department-timestamp-index"   = "department"
+      "reviewPeriod-timestamp-index" = "reviewPeriod"
+      "timeBucket-timestamp-index"   = "timeBucket"
+    }
+    content {
+      name               = global_secondary_index.key
+      hash_key           = global_secondary_index.value
+      range_key          = "timestamp"
+      projection_type    = "INCLUDE"
+      non_key_attributes = tolist(setsubtract(local.insights_projected_attributes, [global_secondary_index.value]))
+    }
+  }
+
+  # GET /reviews and the recent reviews in /insights (backend/review_index.py):
+  # sparse — the analysis write sets reviewBucket only when it yields a summary.
+  # Items analysed before it existed: {"action": "index_time_buckets"} stamps them.
+  global_secondary_index {
+    name               = "reviewBucket-timestamp-index"
+    hash_key           = "reviewBucket"
+    range_key          = "timestamp"
+    projection_type    = "INCLUDE"
+    non_key_attributes = local.insights_projected_attributes
+  }
+
+  # Event outbox (backend/outbox.py): sparse — only items whose analysis has
+  # not landed yet carry `outbox`, so the sweeper's query reads just those.
+  global_secondary_index {
+    name               = "outbox-index"
+    hash_key           = "outbox"
+    range_key          = "outboxAt"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["message", "timestamp", "outboxAttempts"]
+  }
+
   stream_enabled   = true
-  stream_view_type = "NEW_IMAGE"
+  stream_view_type = "NEW_AND_OLD_IMAGES"   # rollups fold (new − old) per record
 
   point_in_time_recovery {
     enabled = true
@@ -214,6 +361,78 @@ resource "aws_dynamodb_table" "feedback_table" {
   tags = local.common_tags
 }
 
+# Pre-aggregated /insights counters, maintained from the feedback table stream.
+# Bootstrap once after creation: invoke the Lambda with {"action": "rebuild_rollups"}.
+resource "aws_dynamodb_table" "insights_rollups" {
+  name         = "${var.feedback_table_name}-rollups"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "rollupId"
+
+  attribute {
+    name = "rollupId"
+    type = "S"
+  }
+
+  tags = local.common_tags
+}
+
+# Content-addressed AI result cache (tier 2 behind the in-memory LRU).
+resource "aws_dynamodb_table" "ai_result_cache" {
+  name         = "${var.feedback_table_name}-ai-cache"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "cacheKey"
+
+  attribute {
+    name = "cacheKey"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expiresAt"
+    enabled        = true
+  }
+
+  tags = local.common_tags
+}
+
+# POST /feedback Idempotency-Key records (backend/idempotency.py); TTL-reaped.
+resource "aws_dynamodb_table" "idempotency" {
+  name         = "${var.feedback_table_name}-idempotency"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "idempotencyKey"
+
+  attribute {
+    name = "idempotencyKey"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expiresAt"
+    enabled        = true
+  }
+
+  tags = local.common_tags
+}
+
+# Bedrock circuit-breaker state shared by all containers (backend/provider_health.py).
+resource "aws_dynamodb_table" "provider_health" {
+  name         = "${var.feedback_table_name}-provider-health"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "provider"
+
+  attribute {
+    name = "provider"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "expiresAt"
+    enabled        = true
+  }
+
+  tags = local.common_tags
+}
+
 ###############################################################################
 # S3 — FEEDBACK JSON EXPORTS
 ###############################################################################
@@ -360,7 +579,7 @@ resource "aws_s3_bucket_policy" "frontend_bucket" {
 resource "null_resource" "pip_install" {
   triggers = {
     requirements = filemd5("${path.module}/../backend/requirements.txt")
-    handler      = filemd5("${path.module}/../backend/lambda_function.py")
+    handler      = sha1(join("", [for f in fileset("${path.module}/../backend", "*.py") : filemd5("${path.module}/../backend/${f}")]))
   }
 
   provisioner "local-exec" {
@@ -371,8 +590,8 @@ resource "null_resource" "pip_install" {
         -t ${path.module}/../backend/package \
         --upgrade \
         --quiet && \
-      cp ${path.module}/../backend/lambda_function.py \
-         ${path.module}/../backend/package/lambda_function.py
+      cp ${path.module}/../backend/*.py \
+         ${path.module}/../backend/package/
     EOT
   }
 }
@@ -417,6 +636,10 @@ resource "aws_lambda_function" "feedback_api" {
     mode = "Active"
   }
 
+  # pyarrow for Parquet export compaction (e.g. the AWS SDK for pandas layer);
+  # without it compaction writes gzip'd NDJSON.
+  layers = var.parquet_layer_arn != "" ? [var.parquet_layer_arn] : []
+
   environment {
     variables = {
       FEEDBACK_TABLE_NAME = aws_dynamodb_table.feedback_table.name
@@ -426,6 +649,18 @@ resource "aws_lambda_function" "feedback_api" {
       AI_PROVIDER         = var.ai_provider
       EVENT_BUS_NAME      = var.event_bus_name
       MAX_MESSAGE_LEN     = "3000"
+      ROLLUP_TABLE_NAME   = aws_dynamodb_table.insights_rollups.name
+      SCAN_SEGMENTS       = tostring(var.scan_segments)
+      INSIGHTS_CACHE_TTL  = "30"
+      INSIGHTS_CACHE_SWR  = "300"
+      BEDROCK_BATCH_SIZE  = tostring(var.bedrock_batch_size)
+      AI_CACHE_TABLE_NAME = aws_dynamodb_table.ai_result_cache.name
+      AI_CACHE_TTL_DAYS   = "30"
+      IDEMPOTENCY_TABLE_NAME = aws_dynamodb_table.idempotency.name
+      IDEMPOTENCY_TTL_HOURS  = "24"
+      PROVIDER_HEALTH_TABLE_NAME = aws_dynamodb_table.provider_health.name
+      BREAKER_FAILURE_THRESHOLD  = "5"
+      BREAKER_OPEN_SECONDS       = "30"
     }
   }
 
@@ -437,6 +672,20 @@ resource "aws_lambda_function" "feedback_api" {
   tags = local.common_tags
 }
 
+###############################################################################
+# DYNAMODB STREAM — INSIGHTS ROLLUPS
+###############################################################################
+
+resource "aws_lambda_event_source_mapping" "feedback_stream" {
+  event_source_arn                   = aws_dynamodb_table.feedback_table.stream_arn
+  function_name                      = aws_lambda_function.feedback_api.arn
+  starting_position                  = "LATEST"
+  batch_size                         = 100
+  maximum_batching_window_in_seconds = 5
+  maximum_retry_attempts             = 10
+  bisect_batch_on_function_error     = false   # batch-derived idempotency token
+}
+
 ###############################################################################
 # EVENTBRIDGE — ASYNC AI PROCESSING
 ###############################################################################
@@ -455,6 +704,7 @@ resource "aws_cloudwatch_event_rule" "feedback_submitted" {
 }
 
 resource "aws_cloudwatch_event_target" "lambda_target" {
+  count          = var.analysis_queue_enabled ? 0 : 1
   rule           = aws_cloudwatch_event_rule.feedback_submitted.name
   event_bus_name = var.event_bus_name
   target_id      = "FeedbackLambdaTarget"
@@ -462,6 +712,7 @@ resource "aws_cloudwatch_event_target" "lambda_target" {
 }
 
 resource "aws_lambda_permission" "eventbridge_invoke" {
+  count         = var.analysis_queue_enabled ? 0 : 1
   statement_id  = "AllowEventBridgeInvoke"
   action        = "lambda:InvokeFunction"
   function_name = aws_lambda_function.feedback_api.function_name
@@ -469,6 +720,118 @@ resource "aws_lambda_permission" "eventbridge_invoke" {
   source_arn    = aws_cloudwatch_event_rule.feedback_submitted.arn
 }
 
+# Nightly merge of the current and previous month's NDJSON export parts
+# into compacted Parquet files (backend/exports.py).
+resource "aws_cloudwatch_event_rule" "export_compaction" {
+  name                = "${var.project_name}-export-compaction"
+  description         = "Compact analytics export partitions"
+  schedule_expression = var.export_compaction_schedule
+  tags                = local.common_tags
+}
+
+resource "aws_cloudwatch_event_target" "export_compaction" {
+  rule  = aws_cloudwatch_event_rule.export_compaction.name
+  arn   = aws_lambda_function.feedback_api.arn
+  input = jsonencode({ action = "compact_exports" })
+}
+
+resource "aws_lambda_permission" "export_compaction" {
+  statement_id  = "AllowExportCompactionSchedule"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.feedback_api.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.export_compaction.arn
+}
+
+# Republishes FeedbackSubmitted events a POST could not hand to EventBridge.
+resource "aws_cloudwatch_event_rule" "outbox_sweep" {
+  name                = "${var.project_name}-outbox-sweep"
+  description         = "Republish pending feedback events from the outbox"
+  schedule_expression = var.outbox_sweep_schedule
+  tags                = local.common_tags
+}
+
+resource "aws_cloudwatch_event_target" "outbox_sweep" {
+  rule  = aws_cloudwatch_event_rule.outbox_sweep.name
+  arn   = aws_lambda_function.feedback_api.arn
+  input = jsonencode({ action = "sweep_outbox" })
+}
+
+resource "aws_lambda_permission" "outbox_sweep" {
+  statement_id  = "AllowOutboxSweepSchedule"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.feedback_api.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.outbox_sweep.arn
+}
+
+###############################################################################
+# SQS — MICRO-BATCHED AI ANALYSIS (optional: var.analysis_queue_enabled)
+# EventBridge → SQS → Lambda, so several submissions share one Bedrock call.
+###############################################################################
+
+resource "aws_sqs_queue" "analysis_dlq" {
+  count                     = var.analysis_queue_enabled ? 1 : 0
+  name                      = "${var.project_name}-analysis-dlq"
+  message_retention_seconds = 1209600
+  tags                      = local.common_tags
+}
+
+resource "aws_sqs_queue" "analysis" {
+  count                      = var.analysis_queue_enabled ? 1 : 0
+  name                       = "${var.project_name}-analysis"
+  visibility_timeout_seconds = 180   # ≥ 6 × Lambda timeout
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.analysis_dlq[0].arn
+    maxReceiveCount     = 3
+  })
+  tags = local.common_tags
+}
+
+data "aws_iam_policy_document" "analysis_queue" {
+  count = var.analysis_queue_enabled ? 1 : 0
+
+  statement {
+    effect    = "Allow"
+    actions   = ["sqs:SendMessage"]
+    resources = [aws_sqs_queue.analysis[0].arn]
+    principals {
+      type        = "Service"
+      identifiers = ["events.amazonaws.com"]
+    }
+    condition {
+      test     = "ArnEquals"
+      variable = "aws:SourceArn"
+      values   = [aws_cloudwatch_event_rule.feedback_submitted.arn]
+    }
+  }
+}
+
+resource "aws_sqs_queue_policy" "analysis" {
+  count     = var.analysis_queue_enabled ? 1 : 0
+  queue_url = aws_sqs_queue.analysis[0].id
+  policy    = data.aws_iam_policy_document.analysis_queue[0].json
+}
+
+resource "aws_cloudwatch_event_target" "analysis_queue" {
+  count          = var.analysis_queue_enabled ? 1 : 0
+  rule           = aws_cloudwatch_event_rule.feedback_submitted.name
+  event_bus_name = var.event_bus_name
+  target_id      = "FeedbackAnalysisQueue"
+  arn            = aws_sqs_queue.analysis[0].arn
+}
+
+resource "aws_lambda_event_source_mapping" "analysis_queue" {
+  count                              = var.analysis_queue_enabled ? 1 : 0
+  event_source_arn                   = aws_sqs_queue.analysis[0].arn
+  function_name                      = aws_lambda_function.feedback_api.arn
+  # One Bedrock micro-batch per invocation: the batches run one after another,
+  # and several (plus any single-item retries) do not fit the 30 s timeout.
+  batch_size                         = var.bedrock_batch_size
+  maximum_batching_window_in_seconds = 10
+  function_response_types            = ["ReportBatchItemFailures"]
+}
+
 ###############################################################################
 # API GATEWAY
 ###############################################################################
@@ -477,6 +840,10 @@ resource "aws_api_gateway_rest_api" "api" {
   name        = "${var.project_name}-api"
   description = "Smart Talent Insight Hub REST API"
 
+  # Lets the Lambda return gzip/br-encoded /insights bodies (isBase64Encoded).
+  # Text request bodies then arrive base64-encoded; the handler decodes them.
+  binary_media_types = ["*/*"]
+
   endpoint_configuration {
     types = ["REGIONAL"]
   }
@@ -499,12 +866,24 @@ resource "aws_api_gateway_resource" "feedback_resource" {
   path_part   = "feedback"
 }
 
+resource "aws_api_gateway_resource" "feedback_batch_resource" {
+  rest_api_id = aws_api_gateway_rest_api.api.id
+  parent_id   = aws_api_gateway_resource.feedback_resource.id
+  path_part   = "batch"
+}
+
 resource "aws_api_gateway_resource" "insights_resource" {
   rest_api_id = aws_api_gateway_rest_api.api.id
   parent_id   = aws_api_gateway_rest_api.api.root_resource_id
   path_part   = "insights"
 }
 
+resource "aws_api_gateway_resource" "reviews_resource" {
+  rest_api_id = aws_api_gateway_rest_api.api.id
+  parent_id   = aws_api_gateway_rest_api.api.root_resource_id
+  path_part   = "reviews"
+}
+
 resource "aws_api_gateway_method" "feedback_post" {
   rest_api_id   = aws_api_gateway_rest_api.api.id
   resource_id   = aws_api_gateway_resource.feedback_resource.id
@@ -520,6 +899,21 @@ resource "aws_api_gateway_method" "feedback_options" {
   authorization = "NONE"
 }
 
+resource "aws_api_gateway_method" "feedback_batch_post" {
+  rest_api_id   = aws_api_gateway_rest_api.api.id
+  resource_id   = aws_api_gateway_resource.feedback_batch_resource.id
+  http_method   = "POST"
+  authorization = "COGNITO_USER_POOLS"
+  authorizer_id = aws_api_gateway_authorizer.cognito.id
+}
+
+resource "aws_api_gateway_method" "feedback_batch_options" {
+  rest_api_id   = aws_api_gateway_rest_api.api.id
+  resource_id   = aws_api_gateway_resource.feedback_batch_resource.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
 resource "aws_api_gateway_method" "insights_get" {
   rest_api_id   = aws_api_gateway_rest_api.api.id
   resource_id   = aws_api_gateway_resource.insights_resource.id
@@ -535,6 +929,21 @@ resource "aws_api_gateway_method" "insights_options" {
   authorization = "NONE"
 }
 
+resource "aws_api_gateway_method" "reviews_get" {
+  rest_api_id   = aws_api_gateway_rest_api.api.id
+  resource_id   = aws_api_gateway_resource.reviews_resource.id
+  http_method   = "GET"
+  authorization = "COGNITO_USER_POOLS"
+  authorizer_id = aws_api_gateway_authorizer.cognito.id
+}
+
+resource "aws_api_gateway_method" "reviews_options" {
+  rest_api_id   = aws_api_gateway_rest_api.api.id
+  resource_id   = aws_api_gateway_resource.reviews_resource.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
 resource "aws_api_gateway_integration" "feedback_post" {
   rest_api_id             = aws_api_gateway_rest_api.api.id
   resource_id             = aws_api_gateway_resource.feedback_resource.id
@@ -553,6 +962,24 @@ resource "aws_api_gateway_integration" "feedback_options" {
   uri                     = aws_lambda_function.feedback_api.invoke_arn
 }
 
+resource "aws_api_gateway_integration" "feedback_batch_post" {
+  rest_api_id             = aws_api_gateway_rest_api.api.id
+  resource_id             = aws_api_gateway_resource.feedback_batch_resource.id
+  http_method             = aws_api_gateway_method.feedback_batch_post.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.feedback_api.invoke_arn
+}
+
+resource "aws_api_gateway_integration" "feedback_batch_options" {
+  rest_api_id             = aws_api_gateway_rest_api.api.id
+  resource_id             = aws_api_gateway_resource.feedback_batch_resource.id
+  http_method             = aws_api_gateway_method.feedback_batch_options.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.feedback_api.invoke_arn
+}
+
 resource "aws_api_gateway_integration" "insights_get" {
   rest_api_id             = aws_api_gateway_rest_api.api.id
   resource_id             = aws_api_gateway_resource.insights_resource.id
@@ -571,6 +998,24 @@ resource "aws_api_gateway_integration" "insights_options" {
   uri                     = aws_lambda_function.feedback_api.invoke_arn
 }
 
+resource "aws_api_gateway_integration" "reviews_get" {
+  rest_api_id             = aws_api_gateway_rest_api.api.id
+  resource_id             = aws_api_gateway_resource.reviews_resource.id
+  http_method             = aws_api_gateway_method.reviews_get.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.feedback_api.invoke_arn
+}
+
+resource "aws_api_gateway_integration" "reviews_options" {
+  rest_api_id             = aws_api_gateway_rest_api.api.id
+  resource_id             = aws_api_gateway_resource.reviews_resource.id
+  http_method             = aws_api_gateway_method.reviews_options.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.feedback_api.invoke_arn
+}
+
 resource "aws_lambda_permission" "apigw_lambda" {
   statement_id  = "AllowAPIGatewayInvoke"
   action        = "lambda:InvokeFunction"
@@ -586,8 +1031,12 @@ resource "aws_api_gateway_deployment" "deployment" {
     redeploy = sha1(jsonencode([
       aws_api_gateway_integration.feedback_post,
       aws_api_gateway_integration.feedback_options,
+      aws_api_gateway_integration.feedback_batch_post,
+      aws_api_gateway_integration.feedback_batch_options,
       aws_api_gateway_integration.insights_get,
       aws_api_gateway_integration.insights_options,
+      aws_api_gateway_integration.reviews_get,
+      aws_api_gateway_integration.reviews_options,
     ]))
   }
 
@@ -598,8 +1047,12 @@ resource "aws_api_gateway_deployment" "deployment" {
   depends_on = [
     aws_api_gateway_integration.feedback_post,
     aws_api_gateway_integration.feedback_options,
+    aws_api_gateway_integration.feedback_batch_post,
+    aws_api_gateway_integration.feedback_batch_options,
     aws_api_gateway_integration.insights_get,
     aws_api_gateway_integration.insights_options,
+    aws_api_gateway_integration.reviews_get,
+    aws_api_gateway_integration.reviews_options,
   ]
 }
 
@@ -742,6 +1195,12 @@ locals {
     ManagedBy   = "terraform"
     Region      = var.aws_region
   }
+
+  # aggregation.PROJECTED_FIELDS minus the table / index key attributes
+  insights_projected_attributes = [
+    "sentiment", "summary", "aiProcessed", "topics",
+    "employeeName", "department", "reviewPeriod", "rating",
+  ]
 }
 
 ###############################################################################
@@ -50,14 +50,60 @@ variable "bedrock_model_id" {
 variable "ai_provider" {
   type        = string
   default     = "bedrock"
-  description = "AI provider: 'bedrock' (Claude via Bedrock) or 'comprehend' (Amazon Comprehend fallback)"
+  description = "AI provider: 'bedrock' (Claude via Bedrock), 'comprehend' (Amazon Comprehend fallback), 'local' (in-process lexicon scorer) or 'tiered' (local first, low-confidence / long messages to Bedrock)"
 
   validation {
-    condition     = contains(["bedrock", "comprehend"], var.ai_provider)
-    error_message = "ai_provider must be 'bedrock' or 'comprehend'."
+    condition     = contains(["bedrock", "comprehend", "local", "tiered"], var.ai_provider)
+    error_message = "ai_provider must be 'bedrock', 'comprehend', 'local' or 'tiered'."
   }
 }
 
+variable "scan_segments" {
+  type        = number
+  default     = 4
+  description = "Parallel Scan segments (worker threads) for the /insights full-recompute fallback"
+
+  validation {
+    condition     = var.scan_segments >= 1 && var.scan_segments <= 32
+    error_message = "scan_segments must be between 1 and 32."
+  }
+}
+
+variable "analysis_queue_enabled" {
+  type        = bool
+  default     = false
+  description = "Route FeedbackSubmitted events through SQS so the Lambda analyses them in micro-batches"
+}
+
+variable "bedrock_batch_size" {
+  type        = number
+  default     = 8
+  description = "Max feedback messages packed into one Bedrock invocation on the batched path"
+
+  validation {
+    condition     = var.bedrock_batch_size >= 1 && var.bedrock_batch_size <= 10
+    error_message = "bedrock_batch_size must be between 1 and 10."
+  }
+}
+
+variable "export_compaction_schedule" {
+  type        = string
+  default     = "cron(15 3 * * ? *)"
+  description = "EventBridge schedule for compacting analytics export partitions (UTC)"
+}
+
+variable "outbox_sweep_schedule" {
+  type        = string
+  default     = "rate(2 minutes)"
+  description = "How often pending FeedbackSubmitted events are republished from the outbox"
+}
+
+variable "parquet_layer_arn" {
+  type        = string
+  default     = ""
+  description = "Optional Lambda layer ARN providing pyarrow (e.g. AWS SDK for pandas); enables Parquet compaction"
+}
+
 variable "api_stage_name" {
   type        = string
   default     = "prod"